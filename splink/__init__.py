@@ -1,6 +1,10 @@
 from typing import TYPE_CHECKING
 
-from splink.internals.blocking_rule_library import block_on
+from splink.internals.blocking_rule_library import (
+    MinHashLSHRule,
+    SortedNeighbourhoodRule,
+    block_on,
+)
 from splink.internals.column_expression import ColumnExpression
 from splink.internals.datasets import splink_datasets
 from splink.internals.linker import Linker
@@ -47,7 +51,9 @@ __all__ = [
     "ColumnExpression",
     "DuckDBAPI",
     "Linker",
+    "MinHashLSHRule",
     "SettingsCreator",
+    "SortedNeighbourhoodRule",
     "SparkAPI",
     "splink_datasets",
 ]
@@ -4,7 +4,7 @@ from copy import deepcopy
 from typing import TYPE_CHECKING, Optional
 
 from splink.internals.block_from_labels import block_from_labels
-from splink.internals.blocking import BlockingRule
+from splink.internals.blocking import BlockingRule, SortedNeighbourhoodBlockingRule
 from splink.internals.comparison_vector_values import (
     compute_comparison_vector_values_sql,
 )
@@ -293,8 +293,15 @@ def _select_found_by_blocking_rules(linker: "Linker") -> str:
     brs = linker._settings_obj._blocking_rules_to_generate_predictions
 
     if brs:
+        # Whether a sorted neighbourhood rule generates a pair depends on the
+        # other records, so it cannot be evaluated on the pair alone.  Such rules
+        # are treated as finding every pair
         br_strings = [
-            move_l_r_table_prefix_to_column_suffix(b.blocking_rule_sql, b.sql_dialect)
+            "1=1"
+            if isinstance(b, SortedNeighbourhoodBlockingRule)
+            else move_l_r_table_prefix_to_column_suffix(
+                b.blocking_rule_sql, b.sql_dialect
+            )
             for b in brs
         ]
         wrapped_br_strings = [f"(coalesce({b}, false))" for b in br_strings]
@@ -24,6 +24,7 @@ logger = logging.getLogger(__name__)
 # Dict because there's not really a 'tablish' type in Athena
 class AthenaAPI(DatabaseAPI[dict[str, Any]]):
     sql_dialect = AthenaDialect()
+    _supports_concurrent_execution = True
 
     def __init__(
         self,
@@ -2,17 +2,19 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import TYPE_CHECKING, Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional
 
 import awswrangler as wr
 import numpy as np
 from pandas import DataFrame as pd_DataFrame
 
 from ..input_column import InputColumn
-from ..splink_dataframe import SplinkDataFrame
+from ..splink_dataframe import SplinkDataFrame, _import_pyarrow
 
 logger = logging.getLogger(__name__)
 if TYPE_CHECKING:
+    import pyarrow as pa
+
     from .database_api import AthenaAPI
 
 
@@ -117,3 +119,25 @@ class AthenaDataFrame(SplinkDataFrame):
         out_df = self.as_pandas_dataframe(limit)
         out_df = out_df.fillna(np.nan).replace([np.nan], [None])
         return out_df.to_dict(orient="records")
+
+    def as_arrow_table(self, limit: Optional[int] = None) -> pa.Table:
+        pa = _import_pyarrow()
+        return pa.Table.from_pandas(
+            self.as_pandas_dataframe(limit), preserve_index=False
+        )
+
+    def _iter_row_batches(
+        self, batch_size: int, limit: Optional[int] = None
+    ) -> Iterator[list[Dict[str, Any]]]:
+        chunks = wr.athena.read_sql_query(
+            sql=self._select_all_sql(limit),
+            database=self.db_api.output_schema,
+            s3_output=self.db_api.s3_output,
+            keep_files=False,
+            ctas_approach=True,
+            chunksize=batch_size,
+            boto3_session=self.db_api.boto3_session,
+        )
+        for chunk in chunks:
+            chunk = chunk.fillna(np.nan).replace([np.nan], [None])
+            yield chunk.to_dict(orient="records")
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+from collections import Counter
 from typing import TYPE_CHECKING, Any, List, Literal, Optional
 
-from sqlglot import parse_one
-from sqlglot.expressions import Column, Expression, Identifier, Join
+from sqlglot.expressions import Column, Condition, Expression, Identifier, Join
 from sqlglot.optimizer.eliminate_joins import join_condition
 from sqlglot.optimizer.optimizer import optimize
 
@@ -13,7 +14,10 @@ from splink.internals.exceptions import SplinkException
 from splink.internals.input_column import InputColumn
 from splink.internals.misc import ensure_is_list
 from splink.internals.pipeline import CTEPipeline
+from splink.internals.pipeline_scheduler import PipelineDAG
 from splink.internals.splink_dataframe import SplinkDataFrame
+from splink.internals.sql_parse_cache import parse_one_cached
+from splink.internals.sql_transform import add_table_to_all_column_identifiers
 from splink.internals.unique_id_concat import _composite_unique_id_from_nodes_sql
 from splink.internals.vertically_concatenate import vertically_concatenate_sql
 
@@ -21,6 +25,7 @@ logger = logging.getLogger(__name__)
 
 # https://stackoverflow.com/questions/39740632/python-type-hinting-without-cyclic-imports
 if TYPE_CHECKING:
+    from splink.internals.dialects import SplinkDialect
     from splink.internals.settings import LinkTypeLiteralType
 
 user_input_link_type_options = Literal["link_only", "link_and_dedupe", "dedupe_only"]
@@ -29,17 +34,35 @@ backend_link_type_options = Literal[
     "link_only", "link_and_dedupe", "dedupe_only", "two_dataset_link_only", "self_link"
 ]
 
+BlockingDeduplicationStrategy = Literal["exclude_preceding_rules", "min_match_key"]
+blocking_deduplication_strategies = ("exclude_preceding_rules", "min_match_key")
+
 
 def blocking_rule_to_obj(br: BlockingRule | dict[str, Any] | str) -> BlockingRule:
     if isinstance(br, BlockingRule):
         return br
     elif isinstance(br, dict):
+        if "sort_keys" in br:
+            return SortedNeighbourhoodBlockingRule(
+                br["sort_keys"], br["window_size"], br.get("sql_dialect", None)
+            )
+        if "lsh_column" in br:
+            return MinHashLSHBlockingRule(
+                br["lsh_column"],
+                br["num_bands"],
+                br["rows_per_band"],
+                tokens=br.get("tokens", "qgrams"),
+                qgram_size=br.get("qgram_size", 2),
+                sqlglot_dialect=br.get("sql_dialect", None),
+            )
+
         blocking_rule = br.get("blocking_rule", None)
         if blocking_rule is None:
             raise ValueError("No blocking rule submitted...")
         sqlglot_dialect = br.get("sql_dialect", None)
 
         salting_partitions = br.get("salting_partitions", None)
+        salting_min_block_size = br.get("salting_min_block_size", None)
         arrays_to_explode = br.get("arrays_to_explode", None)
 
         if arrays_to_explode is not None and salting_partitions is not None:
@@ -50,12 +73,19 @@ def blocking_rule_to_obj(br: BlockingRule | dict[str, Any] | str) -> BlockingRul
 
         if salting_partitions is not None:
             return SaltedBlockingRule(
-                blocking_rule, sqlglot_dialect, salting_partitions
+                blocking_rule,
+                sqlglot_dialect,
+                salting_partitions,
+                salting_min_block_size=salting_min_block_size,
             )
 
         if arrays_to_explode is not None:
             return ExplodingBlockingRule(
-                blocking_rule, sqlglot_dialect, arrays_to_explode
+                blocking_rule,
+                sqlglot_dialect,
+                arrays_to_explode,
+                max_array_length=br.get("max_array_length", None),
+                max_array_element_frequency=br.get("max_array_element_frequency", None),
             )
 
         return BlockingRule(blocking_rule, sqlglot_dialect)
@@ -65,6 +95,12 @@ def blocking_rule_to_obj(br: BlockingRule | dict[str, Any] | str) -> BlockingRul
         return br
 
 
+def _column_equality_sql(expression: str, sqlglot_dialect: str | None) -> str:
+    expr_l = add_table_to_all_column_identifiers(expression, "l", sqlglot_dialect)
+    expr_r = add_table_to_all_column_identifiers(expression, "r", sqlglot_dialect)
+    return f"{expr_l} = {expr_r}"
+
+
 def combine_unique_id_input_columns(
     source_dataset_input_column: Optional[InputColumn],
     unique_id_input_column: InputColumn,
@@ -93,6 +129,11 @@ class BlockingRule:
         self.blocking_rule_sql = blocking_rule_sql
         self.preceding_rules: List[BlockingRule] = []
         self.sqlglot_dialect = sqlglot_dialect
+        # If set, pairs are generated by joining these (left, right) blocking key
+        # index tables, rather than the input tables
+        self.blocking_key_index_tables: Optional[
+            tuple[SplinkDataFrame, SplinkDataFrame]
+        ] = None
 
     @property
     def sql_dialect(self):
@@ -141,6 +182,94 @@ class BlockingRule:
         previous_rules = " OR ".join(or_clauses)
         return f"AND NOT ({previous_rules})"
 
+    def create_blocking_input_sqls(
+        self,
+        *,
+        source_dataset_input_column: Optional[InputColumn],
+        unique_id_input_column: InputColumn,
+        input_tablename_l: str,
+        input_tablename_r: str,
+    ) -> list[dict[str, str]]:
+        """Any SQL which must be enqueued before `create_blocked_pairs_sql` (and
+        before the `exclude_pairs_generated_by_this_rule_sql` of this rule is
+        used by subsequent rules)"""
+        return []
+
+    @property
+    def _can_use_blocking_key_index(self) -> bool:
+        """Whether the rule's pairs can be generated from a blocking key index,
+        which requires the rule to consist only of equi-join conditions comparing
+        the same expression of `l` and `r`"""
+        if type(self) is not BlockingRule:
+            return False
+        join_conditions = self._equi_join_conditions
+        return (
+            bool(join_conditions)
+            and all(l_key == r_key for l_key, r_key in join_conditions)
+            and self._filter_conditions in ("", "TRUE")
+        )
+
+    @property
+    def _blocking_key_columns(self) -> dict[str, str]:
+        """The name of the blocking key index column of each of the rule's join
+        keys, mapped to the key expression.  Names are derived from the expression,
+        so rules sharing a key share its column"""
+        return {
+            "__splink_block_key_"
+            + hashlib.sha256(l_key.encode("utf-8")).hexdigest()[:12]: l_key
+            for l_key, _ in self._equi_join_conditions
+        }
+
+    def detach_blocking_key_index_tables(self):
+        # The tables are left in the cache so that they can be reused
+        self.blocking_key_index_tables = None
+
+    def _blocking_key_equality_sql(self) -> str:
+        return " and ".join(f"l.{c} = r.{c}" for c in self._blocking_key_columns)
+
+    def _blocked_pairs_from_blocking_key_index_sql(
+        self,
+        *,
+        source_dataset_input_column: Optional[InputColumn],
+        unique_id_input_column: InputColumn,
+        where_condition: str,
+        exclude_preceding_rules: bool,
+    ) -> str:
+        """Generate the rule's pairs by joining its blocking key index tables.
+        Preceding rules with an index are excluded by comparing their key columns,
+        which are included in this rule's index tables"""
+        index_table_l, index_table_r = self.blocking_key_index_tables
+        unique_id_columns = combine_unique_id_input_columns(
+            source_dataset_input_column, unique_id_input_column
+        )
+        uid_l_expr = _composite_unique_id_from_nodes_sql(unique_id_columns, "l")
+        uid_r_expr = _composite_unique_id_from_nodes_sql(unique_id_columns, "r")
+
+        exclude_sql = ""
+        if exclude_preceding_rules and self.preceding_rules:
+            or_clauses = [
+                f"coalesce(({br._blocking_key_equality_sql()}),false)"
+                if br._can_use_blocking_key_index
+                else br.exclude_pairs_generated_by_this_rule_sql(
+                    source_dataset_input_column, unique_id_input_column
+                )
+                for br in self.preceding_rules
+            ]
+            exclude_sql = f"AND NOT ({' OR '.join(or_clauses)})"
+
+        return f"""
+            select
+            '{self.match_key}' as match_key,
+            {uid_l_expr} as join_key_l,
+            {uid_r_expr} as join_key_r
+            from {index_table_l.physical_name} as l
+            inner join {index_table_r.physical_name} as r
+            on
+            ({self._blocking_key_equality_sql()})
+            {where_condition}
+            {exclude_sql}
+            """
+
     def create_blocked_pairs_sql(
         self,
         *,
@@ -149,7 +278,16 @@ class BlockingRule:
         input_tablename_l: str,
         input_tablename_r: str,
         where_condition: str,
+        exclude_preceding_rules: bool = True,
     ) -> str:
+        if self.blocking_key_index_tables is not None:
+            return self._blocked_pairs_from_blocking_key_index_sql(
+                source_dataset_input_column=source_dataset_input_column,
+                unique_id_input_column=unique_id_input_column,
+                where_condition=where_condition,
+                exclude_preceding_rules=exclude_preceding_rules,
+            )
+
         if source_dataset_input_column:
             unique_id_columns = [source_dataset_input_column, unique_id_input_column]
         else:
@@ -158,6 +296,13 @@ class BlockingRule:
         uid_l_expr = _composite_unique_id_from_nodes_sql(unique_id_columns, "l")
         uid_r_expr = _composite_unique_id_from_nodes_sql(unique_id_columns, "r")
 
+        if exclude_preceding_rules:
+            exclude_sql = self.exclude_pairs_generated_by_all_preceding_rules_sql(
+                source_dataset_input_column, unique_id_input_column
+            )
+        else:
+            exclude_sql = ""
+
         sql = f"""
             select
             '{self.match_key}' as match_key,
@@ -168,18 +313,17 @@ class BlockingRule:
             on
             ({self.blocking_rule_sql})
             {where_condition}
-            {self.exclude_pairs_generated_by_all_preceding_rules_sql(
-                source_dataset_input_column,
-                unique_id_input_column)
-            }
+            {exclude_sql}
             """
         return sql
 
     @property
     def _parsed_join_condition(self) -> Join:
-        br = self.blocking_rule_sql
-        return parse_one("INNER JOIN r", into=Join).on(
-            br, dialect=self.sqlglot_dialect
+        condition = parse_one_cached(
+            self.blocking_rule_sql, read=self.sqlglot_dialect, into=Condition
+        )
+        return parse_one_cached("INNER JOIN r", into=Join).on(
+            condition, copy=False
         )  # using sqlglot==11.4.1
 
     @property
@@ -233,6 +377,12 @@ class BlockingRule:
 
             return filter_condition.sql(self.sqlglot_dialect)
 
+    @property
+    def _input_columns_sql(self) -> str:
+        """A condition on `l` and `r` which uses all the input columns the rule
+        reads, used to validate the rule and retain its columns in predictions"""
+        return self.blocking_rule_sql
+
     def as_dict(self):
         "The minimal representation of the blocking rule"
         output = {}
@@ -268,16 +418,27 @@ class SaltedBlockingRule(BlockingRule):
         blocking_rule: str,
         sqlglot_dialect: str = None,
         salting_partitions: int = 1,
+        salting_min_block_size: int = None,
     ):
         if salting_partitions is None or salting_partitions <= 1:
             raise ValueError("Salting partitions must be specified and > 1")
 
         super().__init__(blocking_rule, sqlglot_dialect)
         self.salting_partitions = salting_partitions
+        # If set, only blocks generating more than this many comparisons are
+        # salted, as recorded in heavy_block_keys_table
+        self.salting_min_block_size = salting_min_block_size
+        self.heavy_block_keys_table: Optional[SplinkDataFrame] = None
+
+    @property
+    def is_adaptive(self) -> bool:
+        return self.salting_min_block_size is not None
 
     def as_dict(self):
         output = super().as_dict()
         output["salting_partitions"] = self.salting_partitions
+        if self.is_adaptive:
+            output["salting_min_block_size"] = self.salting_min_block_size
         return output
 
     def _as_completed_dict(self):
@@ -286,6 +447,40 @@ class SaltedBlockingRule(BlockingRule):
     def _salting_condition(self, salt):
         return f"AND ceiling(l.__splink_salt * {self.salting_partitions}) = {salt + 1}"
 
+    def drop_heavy_block_keys_dataframe(self):
+        if self.heavy_block_keys_table is not None:
+            self.heavy_block_keys_table.drop_table_from_database_and_remove_from_cache()
+        self.heavy_block_keys_table = None
+
+    def _heavy_block_flagged_input_sql(self, input_tablename: str, side: str) -> str:
+        """A subquery of the input table, aliased as `side` ("l" or "r"), with a
+        column `__splink_heavy_block` which is 1 where the record falls into one
+        of the blocks in heavy_block_keys_table and 0 otherwise.
+
+        The table's key_0, key_1, ... columns correspond to the left hand side of
+        the rule's equi-join conditions, and the right hand side gives the same
+        keys for the records in a block, so each input record is classified
+        once, before records are joined into pairs.
+        """
+        key_conditions = []
+        for i, join_keys in enumerate(self._equi_join_conditions):
+            key = join_keys[0] if side == "l" else join_keys[1]
+            key_tree = parse_one_cached(key, read=self.sqlglot_dialect)
+            for c in key_tree.find_all(Column):
+                c.set("table", Identifier(this=side))
+            key_sql = key_tree.sql(dialect=self.sqlglot_dialect)
+            key_conditions.append(f"heavy_blocks.key_{i} = {key_sql}")
+
+        return f"""(
+            select
+            {side}.*,
+            case when heavy_blocks.key_0 is null then 0 else 1 end
+                as __splink_heavy_block
+            from {input_tablename} as {side}
+            left join {self.heavy_block_keys_table.physical_name} as heavy_blocks
+            on {" and ".join(key_conditions)}
+        )"""
+
     def create_blocked_pairs_sql(
         self,
         *,
@@ -294,6 +489,7 @@ class SaltedBlockingRule(BlockingRule):
         input_tablename_l: str,
         input_tablename_r: str,
         where_condition: str,
+        exclude_preceding_rules: bool = True,
     ) -> str:
         if source_dataset_input_column:
             unique_id_columns = [source_dataset_input_column, unique_id_input_column]
@@ -304,9 +500,44 @@ class SaltedBlockingRule(BlockingRule):
         uid_r_expr = _composite_unique_id_from_nodes_sql(unique_id_columns, "r")
 
         sqls = []
-        exclude_sql = self.exclude_pairs_generated_by_all_preceding_rules_sql(
-            source_dataset_input_column, unique_id_input_column
-        )
+        if exclude_preceding_rules:
+            exclude_sql = self.exclude_pairs_generated_by_all_preceding_rules_sql(
+                source_dataset_input_column, unique_id_input_column
+            )
+        else:
+            exclude_sql = ""
+        # In adaptive mode, blocks which are not heavy are joined without salting,
+        # and salting is restricted to the heavy blocks.  Both records of a pair
+        # are in the same block, so the light and heavy blocks can be separated
+        # by filtering each side before the join
+        if self.heavy_block_keys_table is not None:
+            input_tablename_l = self._heavy_block_flagged_input_sql(
+                input_tablename_l, "l"
+            )
+            input_tablename_r = self._heavy_block_flagged_input_sql(
+                input_tablename_r, "r"
+            )
+            sql = f"""
+            select
+            '{self.match_key}' as match_key,
+            {uid_l_expr} as join_key_l,
+            {uid_r_expr} as join_key_r
+            from {input_tablename_l} as l
+            inner join {input_tablename_r} as r
+            on
+            ({self.blocking_rule_sql})
+            {where_condition}
+            AND l.__splink_heavy_block = 0
+            AND r.__splink_heavy_block = 0
+            {exclude_sql}
+            """
+            sqls.append(sql)
+            salted_block_condition = (
+                "AND l.__splink_heavy_block = 1 AND r.__splink_heavy_block = 1"
+            )
+        else:
+            salted_block_condition = ""
+
         for salt in range(self.salting_partitions):
             salt_condition = self._salting_condition(salt)
             sql = f"""
@@ -319,6 +550,7 @@ class SaltedBlockingRule(BlockingRule):
             on
             ({self.blocking_rule_sql} {salt_condition})
             {where_condition}
+            {salted_block_condition}
             {exclude_sql}
             """
 
@@ -326,6 +558,182 @@ class SaltedBlockingRule(BlockingRule):
         return " UNION ALL ".join(sqls)
 
 
+class SortedNeighbourhoodBlockingRule(BlockingRule):
+    """Pairs each record with its `window_size` nearest neighbours when all
+    records are sorted by `sort_keys`, rather than joining on a condition.
+
+    Records with a null in any sort key are not compared.  Each record is compared
+    with at most 2 * `window_size` others, so for n records the number of pairs
+    generated is at most n * `window_size` (exactly
+    n * window_size - window_size * (window_size + 1) / 2 for a deduplication).
+    """
+
+    def __init__(
+        self,
+        sort_keys: list[str],
+        window_size: int,
+        sqlglot_dialect: str = None,
+    ):
+        if not sort_keys:
+            raise ValueError("Must provide at least one sort key")
+        if not isinstance(window_size, int) or window_size < 1:
+            raise ValueError(
+                f"window_size must be a positive integer, got {window_size!r}"
+            )
+        # The pairs are not defined by a join condition, so blocking_rule_sql is
+        # a description of the rule which is used to label it in outputs, and
+        # cannot be evaluated on a pair of records
+        super().__init__(
+            f"sorted_neighbourhood({', '.join(sort_keys)}, window={window_size})",
+            sqlglot_dialect,
+        )
+        self.sort_keys = list(sort_keys)
+        self.window_size = window_size
+
+    @property
+    def _ranks_table_name(self) -> str:
+        return f"__splink__sorted_neighbourhood_ranks_mk_{self.match_key}"
+
+    def create_blocking_input_sqls(
+        self,
+        *,
+        source_dataset_input_column: Optional[InputColumn],
+        unique_id_input_column: InputColumn,
+        input_tablename_l: str,
+        input_tablename_r: str,
+    ) -> list[dict[str, str]]:
+        unique_id_input_columns = combine_unique_id_input_columns(
+            source_dataset_input_column, unique_id_input_column
+        )
+        uid_expr = _composite_unique_id_from_nodes_sql(unique_id_input_columns)
+
+        sort_keys_sql = ", ".join(
+            f"{key} as sort_key_{i}" for i, key in enumerate(self.sort_keys)
+        )
+        not_null_sql = " and ".join(f"{key} is not null" for key in self.sort_keys)
+
+        tablenames = [input_tablename_l]
+        if input_tablename_r != input_tablename_l:
+            tablenames.append(input_tablename_r)
+
+        records_sql = " UNION ALL ".join(
+            f"""
+            select {uid_expr} as join_key, {sort_keys_sql}
+            from {tablename}
+            where {not_null_sql}
+            """
+            for tablename in tablenames
+        )
+
+        order_by_sql = ", ".join(f"sort_key_{i}" for i in range(len(self.sort_keys)))
+        sql = f"""
+        select
+            join_key,
+            row_number() over (order by {order_by_sql}, join_key) as sort_rank
+        from ({records_sql}) as records
+        """
+        return [{"sql": sql, "output_table_name": self._ranks_table_name}]
+
+    @property
+    def _parsed_join_condition(self) -> Join:
+        raise SplinkException(
+            "Sorted neighbourhood blocking rules are not defined by a join "
+            f"condition, so `{self.blocking_rule_sql}` cannot be parsed as SQL"
+        )
+
+    def _window_offsets_sql(self) -> str:
+        offsets = [o for o in range(-self.window_size, self.window_size + 1) if o != 0]
+        return " UNION ALL ".join(f"select {o} as sort_offset" for o in offsets)
+
+    def exclude_pairs_generated_by_this_rule_sql(
+        self,
+        source_dataset_input_column: Optional[InputColumn],
+        unique_id_input_column: InputColumn,
+    ) -> str:
+        unique_id_input_columns = combine_unique_id_input_columns(
+            source_dataset_input_column, unique_id_input_column
+        )
+        id_expr_l = _composite_unique_id_from_nodes_sql(unique_id_input_columns, "l")
+        id_expr_r = _composite_unique_id_from_nodes_sql(unique_id_input_columns, "r")
+
+        return f"""EXISTS (
+            select 1
+            from {self._ranks_table_name} as sn_l, {self._ranks_table_name} as sn_r
+            where sn_l.join_key = {id_expr_l}
+            and sn_r.join_key = {id_expr_r}
+            and abs(sn_l.sort_rank - sn_r.sort_rank) <= {self.window_size}
+        )
+        """
+
+    def create_blocked_pairs_sql(
+        self,
+        *,
+        source_dataset_input_column: Optional[InputColumn],
+        unique_id_input_column: InputColumn,
+        input_tablename_l: str,
+        input_tablename_r: str,
+        where_condition: str,
+        exclude_preceding_rules: bool = True,
+    ) -> str:
+        unique_id_input_columns = combine_unique_id_input_columns(
+            source_dataset_input_column, unique_id_input_column
+        )
+        uid_l_expr = _composite_unique_id_from_nodes_sql(unique_id_input_columns, "l")
+        uid_r_expr = _composite_unique_id_from_nodes_sql(unique_id_input_columns, "r")
+
+        if exclude_preceding_rules:
+            exclude_sql = self.exclude_pairs_generated_by_all_preceding_rules_sql(
+                source_dataset_input_column, unique_id_input_column
+            )
+        else:
+            exclude_sql = ""
+
+        # Neighbours are found by an equi-join on rank + offset, which (unlike a
+        # range join) parallelises well on all backends.  Both directions are
+        # generated, so the link type's where condition selects one of each pair
+        sql = f"""
+            select
+            '{self.match_key}' as match_key,
+            {uid_l_expr} as join_key_l,
+            {uid_r_expr} as join_key_r
+            from {self._ranks_table_name} as sn_l
+            cross join ({self._window_offsets_sql()}) as offsets
+            inner join {self._ranks_table_name} as sn_r
+            on sn_r.sort_rank = sn_l.sort_rank + offsets.sort_offset
+            inner join {input_tablename_l} as l
+            on {uid_l_expr} = sn_l.join_key
+            inner join {input_tablename_r} as r
+            on {uid_r_expr} = sn_r.join_key
+            {where_condition}
+            {exclude_sql}
+            """
+        return sql
+
+    @property
+    def _input_columns_sql(self) -> str:
+        return " AND ".join(
+            _column_equality_sql(key, self.sqlglot_dialect) for key in self.sort_keys
+        )
+
+    def as_dict(self):
+        return {
+            "sort_keys": self.sort_keys,
+            "window_size": self.window_size,
+            "sql_dialect": self.sql_dialect,
+        }
+
+    def _as_completed_dict(self):
+        return self.as_dict()
+
+    def _abbreviated_sql(self, cutoff=75):
+        sql = f"window of {self.window_size} sorted by {', '.join(self.sort_keys)}"
+        return (sql[:cutoff] + "...") if len(sql) > cutoff else sql
+
+    @property
+    def descr(self):
+        return "Sorted neighbourhood"
+
+
 def _explode_arrays_sql(db_api, tbl_name, columns_to_explode, other_columns_to_retain):
     return db_api.sql_dialect.explode_arrays_sql(
         tbl_name, columns_to_explode, other_columns_to_retain
@@ -338,7 +746,15 @@ class ExplodingBlockingRule(BlockingRule):
         blocking_rule: BlockingRule | dict[str, Any] | str,
         sqlglot_dialect: str = None,
         array_columns_to_explode: list[str] = [],
+        max_array_length: Optional[int] = None,
+        max_array_element_frequency: Optional[int] = None,
     ):
+        for name, value in [
+            ("max_array_length", max_array_length),
+            ("max_array_element_frequency", max_array_element_frequency),
+        ]:
+            if value is not None and (not isinstance(value, int) or value < 1):
+                raise ValueError(f"{name} must be a positive integer, got {value!r}")
         if isinstance(blocking_rule, BlockingRule):
             blocking_rule_sql = blocking_rule.blocking_rule_sql
         elif isinstance(blocking_rule, dict):
@@ -347,8 +763,101 @@ class ExplodingBlockingRule(BlockingRule):
             blocking_rule_sql = blocking_rule
         super().__init__(blocking_rule_sql, sqlglot_dialect)
         self.array_columns_to_explode: List[str] = array_columns_to_explode
+        self.max_array_length = max_array_length
+        self.max_array_element_frequency = max_array_element_frequency
         self.exploded_id_pair_table: Optional[SplinkDataFrame] = None
 
+    @property
+    def unnested_table_key(self) -> str:
+        """Exploding rules with the same key share a single unnested input table"""
+        key = "__splink__df_concat_unnested_" + "_".join(self.array_columns_to_explode)
+        if self.max_array_length is not None:
+            key += f"_len_{self.max_array_length}"
+        if self.max_array_element_frequency is not None:
+            key += f"_freq_{self.max_array_element_frequency}"
+        return key
+
+    def unnest_sqls(
+        self,
+        sql_dialect: SplinkDialect,
+        input_tablename: str,
+        input_colnames: set[str],
+        unique_id_input_columns: list[InputColumn],
+    ) -> list[dict[str, str]]:
+        """SQL to create `__splink__df_concat_unnested` from the input table,
+        with one row per element of the arrays to explode.
+
+        If `max_array_length` is set, only the first `max_array_length` elements
+        of each array are exploded.  If `max_array_element_frequency` is set,
+        elements found in the arrays of more than this many records (e.g. very
+        common tokens) are removed, as they would generate huge blocks.
+        """
+        sqls = []
+        arrays_to_explode_quoted = [
+            InputColumn(colname, sql_dialect=sql_dialect.name).quote().name
+            for colname in self.array_columns_to_explode
+        ]
+        other_colnames = sorted(input_colnames.difference(arrays_to_explode_quoted))
+
+        if self.max_array_length is not None:
+            capped_arrays_sql = ", ".join(
+                f"{sql_dialect.array_first_n_sql(c, self.max_array_length)} as {c}"
+                for c in arrays_to_explode_quoted
+            )
+            sqls.append(
+                {
+                    "sql": f"""
+                    select {", ".join(other_colnames)}, {capped_arrays_sql}
+                    from {input_tablename}
+                    """,
+                    "output_table_name": "__splink__df_concat_arrays_capped",
+                }
+            )
+            input_tablename = "__splink__df_concat_arrays_capped"
+
+        sql = sql_dialect.explode_arrays_sql(
+            input_tablename, self.array_columns_to_explode, other_colnames
+        )
+        if self.max_array_element_frequency is None:
+            sqls.append(
+                {"sql": sql, "output_table_name": "__splink__df_concat_unnested"}
+            )
+            return sqls
+
+        sqls.append({"sql": sql, "output_table_name": "__splink__df_concat_exploded"})
+        uid_expr = _composite_unique_id_from_nodes_sql(unique_id_input_columns)
+        unnested_tablename = "__splink__df_concat_exploded"
+        for i, c in enumerate(arrays_to_explode_quoted):
+            frequent_elements_sql = f"""
+            select {c}
+            from __splink__df_concat_exploded
+            where {c} is not null
+            group by {c}
+            having count(distinct {uid_expr}) > {self.max_array_element_frequency}
+            """
+            sqls.append(
+                {
+                    "sql": frequent_elements_sql,
+                    "output_table_name": f"__splink__frequent_array_elements_{i}",
+                }
+            )
+            sqls.append(
+                {
+                    "sql": f"""
+                    select u.*
+                    from {unnested_tablename} as u
+                    left join __splink__frequent_array_elements_{i} as f
+                    on u.{c} = f.{c}
+                    where f.{c} is null
+                    """,
+                    "output_table_name": f"__splink__df_concat_pruned_{i}",
+                }
+            )
+            unnested_tablename = f"__splink__df_concat_pruned_{i}"
+
+        sqls[-1]["output_table_name"] = "__splink__df_concat_unnested"
+        return sqls
+
     def marginal_exploded_id_pairs_table_sql(
         self,
         source_dataset_input_column: Optional[InputColumn],
@@ -441,7 +950,10 @@ class ExplodingBlockingRule(BlockingRule):
         input_tablename_l: str,
         input_tablename_r: str,
         where_condition: str,
+        exclude_preceding_rules: bool = True,
     ) -> str:
+        # Pairs generated by preceding rules are already excluded from the
+        # materialised table of exploded id pairs
         if self.exploded_id_pair_table is None:
             raise ValueError(
                 "Exploding blocking rules are not supported for the function you have"
@@ -473,9 +985,166 @@ class ExplodingBlockingRule(BlockingRule):
     def as_dict(self):
         output = super().as_dict()
         output["arrays_to_explode"] = self.array_columns_to_explode
+        if self.max_array_length is not None:
+            output["max_array_length"] = self.max_array_length
+        if self.max_array_element_frequency is not None:
+            output["max_array_element_frequency"] = self.max_array_element_frequency
         return output
 
 
+def lsh_probability_of_pairing(
+    jaccard_similarity: float, num_bands: int, rows_per_band: int
+) -> float:
+    """The probability that MinHash LSH with the given banding pairs two values
+    whose token sets have the given Jaccard similarity"""
+    return 1 - (1 - jaccard_similarity**rows_per_band) ** num_bands
+
+
+class MinHashLSHBlockingRule(ExplodingBlockingRule):
+    """Pairs records whose values of `column_expression` have similar sets of
+    tokens (words or q-grams), using MinHash locality sensitive hashing.
+
+    Each record gets a MinHash signature of `num_bands` * `rows_per_band` values,
+    which is split into `num_bands` bands.  Each band is hashed to a band key, and
+    records sharing any band key are paired, by exploding the band keys and
+    equi-joining on them.  Two values with a Jaccard similarity of s between
+    their token sets are paired with probability 1 - (1 - s^rows_per_band)^num_bands.
+    """
+
+    band_key_column_name = "__splink_lsh_band_key"
+
+    def __init__(
+        self,
+        column_expression: str,
+        num_bands: int,
+        rows_per_band: int,
+        tokens: Literal["qgrams", "words"] = "qgrams",
+        qgram_size: int = 2,
+        sqlglot_dialect: str = None,
+    ):
+        for name, value in [
+            ("num_bands", num_bands),
+            ("rows_per_band", rows_per_band),
+            ("qgram_size", qgram_size),
+        ]:
+            if not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name} must be a positive integer, got {value!r}")
+        if tokens not in ("qgrams", "words"):
+            raise ValueError(f"tokens must be 'qgrams' or 'words', got {tokens!r}")
+
+        col = self.band_key_column_name
+        super().__init__(f"l.{col} = r.{col}", sqlglot_dialect, [col])
+        self.column_expression = column_expression
+        self.num_bands = num_bands
+        self.rows_per_band = rows_per_band
+        self.tokens = tokens
+        self.qgram_size = qgram_size
+
+    def probability_of_pairing(self, jaccard_similarity: float) -> float:
+        """The probability that two values whose token sets have the given
+        Jaccard similarity share at least one band key, i.e. the expected recall
+        of the rule for pairs of that similarity"""
+        return lsh_probability_of_pairing(
+            jaccard_similarity, self.num_bands, self.rows_per_band
+        )
+
+    @property
+    def similarity_threshold(self) -> float:
+        """The approximate Jaccard similarity at which the probability of pairing
+        rises most steeply"""
+        return (1 / self.num_bands) ** (1 / self.rows_per_band)
+
+    @property
+    def unnested_table_key(self) -> str:
+        return f"__splink__df_concat_unnested_lsh_mk_{self.match_key}"
+
+    def band_keys_sqls(
+        self,
+        sql_dialect: SplinkDialect,
+        input_tablename: str,
+        columns_to_retain: list[str],
+        output_tablename: str,
+    ) -> list[dict[str, str]]:
+        """SQL to create a table with one row per record and band key, retaining
+        `columns_to_retain` from the input table"""
+        signature_sql = sql_dialect.minhash_signature_sql(
+            self.column_expression,
+            self.num_bands * self.rows_per_band,
+            self.tokens,
+            self.qgram_size,
+        )
+        band_keys_sql = sql_dialect.minhash_band_keys_sql(
+            "__splink_lsh_signature", self.num_bands, self.rows_per_band
+        )
+        retain_sql = "".join(f"{c}, " for c in columns_to_retain)
+        col = self.band_key_column_name
+        return [
+            {
+                "sql": f"""
+                select {retain_sql}{signature_sql} as __splink_lsh_signature
+                from {input_tablename}
+                """,
+                "output_table_name": f"{output_tablename}_signatures",
+            },
+            {
+                "sql": f"""
+                select {retain_sql}{band_keys_sql} as {col}
+                from {output_tablename}_signatures
+                """,
+                "output_table_name": f"{output_tablename}_band_key_arrays",
+            },
+            {
+                "sql": sql_dialect.explode_arrays_sql(
+                    f"{output_tablename}_band_key_arrays", [col], columns_to_retain
+                ),
+                "output_table_name": output_tablename,
+            },
+        ]
+
+    def unnest_sqls(
+        self,
+        sql_dialect: SplinkDialect,
+        input_tablename: str,
+        input_colnames: set[str],
+        unique_id_input_columns: list[InputColumn],
+    ) -> list[dict[str, str]]:
+        return self.band_keys_sqls(
+            sql_dialect,
+            input_tablename,
+            sorted(input_colnames),
+            "__splink__df_concat_unnested",
+        )
+
+    @property
+    def _input_columns_sql(self) -> str:
+        return _column_equality_sql(self.column_expression, self.sqlglot_dialect)
+
+    def as_dict(self):
+        return {
+            "lsh_column": self.column_expression,
+            "num_bands": self.num_bands,
+            "rows_per_band": self.rows_per_band,
+            "tokens": self.tokens,
+            "qgram_size": self.qgram_size,
+            "sql_dialect": self.sql_dialect,
+        }
+
+    def _as_completed_dict(self):
+        return self.as_dict()
+
+    def _abbreviated_sql(self, cutoff=75):
+        tokens = f"{self.qgram_size}-grams" if self.tokens == "qgrams" else "words"
+        sql = (
+            f"{self.num_bands} bands of {self.rows_per_band} MinHashes of the "
+            f"{tokens} of {self.column_expression}"
+        )
+        return (sql[:cutoff] + "...") if len(sql) > cutoff else sql
+
+    @property
+    def descr(self):
+        return "MinHash LSH"
+
+
 def materialise_exploded_id_tables(
     link_type: "LinkTypeLiteralType",
     blocking_rules: List[BlockingRule],
@@ -490,7 +1159,6 @@ def materialise_exploded_id_tables(
 
     if len(exploding_blocking_rules) == 0:
         return []
-    exploded_tables = []
 
     pipeline = CTEPipeline()
 
@@ -504,26 +1172,34 @@ def materialise_exploded_id_tables(
 
     input_colnames = {col.name for col in nodes_concat.columns}
 
-    for br in exploding_blocking_rules:
-        pipeline = CTEPipeline([nodes_concat])
-        arrays_to_explode_quoted = [
-            InputColumn(colname, sql_dialect=db_api.sql_dialect.name).quote().name
-            for colname in br.array_columns_to_explode
-        ]
+    base_name = "__splink__marginal_exploded_ids_blocking_rule"
+    unique_id_input_columns = combine_unique_id_input_columns(
+        source_dataset_input_column, unique_id_input_column
+    )
 
-        expl_sql = db_api.sql_dialect.explode_arrays_sql(
+    def unnest_sqls(br: ExplodingBlockingRule) -> list[dict[str, str]]:
+        return br.unnest_sqls(
+            db_api.sql_dialect,
             "__splink__df_concat",
-            br.array_columns_to_explode,
-            list(input_colnames.difference(arrays_to_explode_quoted)),
+            input_colnames,
+            unique_id_input_columns,
         )
 
-        pipeline.enqueue_sql(
-            expl_sql,
-            "__splink__df_concat_unnested",
-        )
-
-        base_name = "__splink__marginal_exploded_ids_blocking_rule"
-        table_name = f"{base_name}_mk_{br.match_key}"
+    def enqueue_marginal_ids_sqls(
+        pipeline: CTEPipeline, br: ExplodingBlockingRule
+    ) -> None:
+        # Sorted neighbourhood rules need their ranks to exclude their pairs, so
+        # `pipeline` must have __splink__df_concat as an input if there are any
+        for pbr in br.preceding_rules:
+            if isinstance(pbr, SortedNeighbourhoodBlockingRule):
+                pipeline.enqueue_list_of_sqls(
+                    pbr.create_blocking_input_sqls(
+                        source_dataset_input_column=source_dataset_input_column,
+                        unique_id_input_column=unique_id_input_column,
+                        input_tablename_l="__splink__df_concat",
+                        input_tablename_r="__splink__df_concat",
+                    )
+                )
 
         sql = br.marginal_exploded_id_pairs_table_sql(
             source_dataset_input_column=source_dataset_input_column,
@@ -531,16 +1207,192 @@ def materialise_exploded_id_tables(
             br=br,
             link_type=link_type,
         )
+        pipeline.enqueue_sql(sql, f"{base_name}_mk_{br.match_key}")
+
+    # When pipelines are executed serially, a rule's unnested table is a CTE in
+    # the pipeline computing its id pairs, unless other rules explode the same
+    # arrays.  Then it is materialised once, and dropped after the last of
+    # these rules
+    if db_api._effective_max_concurrency == 1:
+        last_rule_using_unnested_table = {
+            br.unnested_table_key: i for i, br in enumerate(exploding_blocking_rules)
+        }
+        num_rules_using_unnested_table = Counter(
+            br.unnested_table_key for br in exploding_blocking_rules
+        )
+        shared_unnested_tables: dict[str, SplinkDataFrame] = {}
+        for i, br in enumerate(exploding_blocking_rules):
+            key = br.unnested_table_key
+            if num_rules_using_unnested_table[key] == 1:
+                pipeline = CTEPipeline([nodes_concat])
+                pipeline.enqueue_list_of_sqls(unnest_sqls(br))
+            else:
+                if key not in shared_unnested_tables:
+                    unnest_pipeline = CTEPipeline([nodes_concat])
+                    unnest_pipeline.enqueue_list_of_sqls(unnest_sqls(br))
+                    shared_unnested_tables[key] = (
+                        db_api.sql_pipeline_to_splink_dataframe(unnest_pipeline)
+                    )
+                pipeline = CTEPipeline([shared_unnested_tables[key], nodes_concat])
+            enqueue_marginal_ids_sqls(pipeline, br)
+            br.exploded_id_pair_table = db_api.sql_pipeline_to_splink_dataframe(
+                pipeline
+            )
+            if (
+                key in shared_unnested_tables
+                and last_rule_using_unnested_table[key] == i
+            ):
+                shared_unnested_tables.pop(
+                    key
+                ).drop_table_from_database_and_remove_from_cache()
+        return exploding_blocking_rules
+
+    # Otherwise, unnesting is independent for each distinct set of array
+    # columns, so these pipelines can be executed concurrently.  However, the
+    # marginal id pairs for each rule exclude pairs generated by preceding rules,
+    # so each depends on the id pair tables of all preceding exploding rules.
+    # Unnested tables can be very large, so they are transient: each is dropped
+    # as soon as the id pairs of the last rule using it have been computed
+    dag = PipelineDAG()
+
+    def unnested_node_name(br: ExplodingBlockingRule) -> str:
+        return br.unnested_table_key
+
+    def marginal_ids_pipeline_factory(br, preceding_exploding_rules):
+        def make_pipeline(deps: dict[str, SplinkDataFrame]) -> CTEPipeline:
+            for preceding_br in preceding_exploding_rules:
+                table_name = f"{base_name}_mk_{preceding_br.match_key}"
+                preceding_br.exploded_id_pair_table = deps[table_name]
+
+            input_dataframes = [deps[unnested_node_name(br)]]
+            if any(
+                isinstance(pbr, SortedNeighbourhoodBlockingRule)
+                for pbr in br.preceding_rules
+            ):
+                input_dataframes.append(nodes_concat)
+            pipeline = CTEPipeline(input_dataframes)
+            enqueue_marginal_ids_sqls(pipeline, br)
+            return pipeline
+
+        return make_pipeline
+
+    # Each rule's unnested table is added just before its id pairs, so that
+    # unnested tables are computed no sooner than they are needed
+    for i, br in enumerate(exploding_blocking_rules):
+        node_name = unnested_node_name(br)
+        if node_name not in dag.nodes:
+            pipeline = CTEPipeline([nodes_concat])
+            pipeline.enqueue_list_of_sqls(unnest_sqls(br))
+            dag.add_pipeline(node_name, pipeline, transient=True)
+
+        preceding_exploding_rules = exploding_blocking_rules[:i]
+        dag.add_pipeline(
+            f"{base_name}_mk_{br.match_key}",
+            marginal_ids_pipeline_factory(br, preceding_exploding_rules),
+            depends_on=[node_name]
+            + [f"{base_name}_mk_{pbr.match_key}" for pbr in preceding_exploding_rules],
+        )
 
-        pipeline.enqueue_sql(sql, table_name)
+    results = db_api.sql_pipeline_dag_to_splink_dataframes(dag)
 
-        marginal_ids_table = db_api.sql_pipeline_to_splink_dataframe(pipeline)
-        br.exploded_id_pair_table = marginal_ids_table
-        exploded_tables.append(marginal_ids_table)
+    for br in exploding_blocking_rules:
+        br.exploded_id_pair_table = results[f"{base_name}_mk_{br.match_key}"]
 
     return exploding_blocking_rules
 
 
+def materialise_blocking_key_index_tables(
+    *,
+    link_type: backend_link_type_options,
+    blocking_rules: List[BlockingRule],
+    db_api: DatabaseAPISubClass,
+    splink_df_dict: dict[str, SplinkDataFrame],
+    source_dataset_input_column: Optional[InputColumn],
+    unique_id_input_column: InputColumn,
+    deduplication_strategy: BlockingDeduplicationStrategy = "exclude_preceding_rules",
+) -> list[BlockingRule]:
+    """If the blocking key index is enabled on `db_api`, set the
+    `blocking_key_index_tables` of each rule which can use them.
+
+    A rule's index table holds the unique id columns of each record with non-null
+    join keys, and the values of its join keys, ordered by key.  It is computed
+    from the input tables, so is retrieved from the cache (and, with a persistent
+    cache, reused across sessions) whenever the same rule is used again.  If
+    preceding rules must be excluded, their keys are also included, so a rule
+    can only use an index if each preceding rule can be excluded without
+    reference to the input columns.
+
+    Returns the rules for which index tables have been set.
+    """
+    if not db_api._blocking_key_index_enabled:
+        return []
+
+    exclude_preceding_rules = deduplication_strategy == "exclude_preceding_rules"
+
+    def preceding_rule_excludable(br: BlockingRule) -> bool:
+        return br._can_use_blocking_key_index or isinstance(
+            br, (ExplodingBlockingRule, SortedNeighbourhoodBlockingRule)
+        )
+
+    indexed_rules = [
+        br
+        for br in blocking_rules
+        if br._can_use_blocking_key_index
+        and not (
+            exclude_preceding_rules
+            and not all(preceding_rule_excludable(p) for p in br.preceding_rules)
+        )
+    ]
+
+    unique_id_columns = combine_unique_id_input_columns(
+        source_dataset_input_column, unique_id_input_column
+    )
+    uid_cols_sql = ", ".join(c.name for c in unique_id_columns)
+    concat_sql = vertically_concatenate_sql(
+        splink_df_dict,
+        salting_required=False,
+        source_dataset_input_column=source_dataset_input_column,
+    )
+
+    for br in indexed_rules:
+        key_columns = dict(br._blocking_key_columns)
+        if exclude_preceding_rules:
+            for preceding_br in br.preceding_rules:
+                if preceding_br._can_use_blocking_key_index:
+                    key_columns.update(preceding_br._blocking_key_columns)
+        keys_sql = ", ".join(f"{expr} as {name}" for name, expr in key_columns.items())
+        not_null_sql = " and ".join(
+            f"{expr} is not null" for expr in br._blocking_key_columns.values()
+        )
+        order_by_sql = ", ".join(br._blocking_key_columns)
+
+        sides = {"": ""}
+        if link_type == "two_dataset_link_only":
+            # As for the inputs to blocking, split the records by source dataset
+            sd = source_dataset_input_column.name
+            sides = {
+                "_left": f"and {sd} = (select min({sd}) from __splink__df_concat)",
+                "_right": f"and {sd} = (select max({sd}) from __splink__df_concat)",
+            }
+
+        index_tables = []
+        for suffix, side_condition_sql in sides.items():
+            pipeline = CTEPipeline()
+            pipeline.enqueue_sql(concat_sql, "__splink__df_concat")
+            sql = f"""
+            select {uid_cols_sql}, {keys_sql}
+            from __splink__df_concat
+            where {not_null_sql} {side_condition_sql}
+            order by {order_by_sql}
+            """
+            pipeline.enqueue_sql(sql, f"__splink__blocking_key_index{suffix}")
+            index_tables.append(db_api.sql_pipeline_to_splink_dataframe(pipeline))
+
+        br.blocking_key_index_tables = (index_tables[0], index_tables[-1])
+
+    return indexed_rules
+
+
 def _sql_gen_where_condition(
     link_type: backend_link_type_options, unique_id_cols: List[InputColumn]
 ) -> str:
@@ -569,14 +1421,30 @@ def block_using_rules_sqls(
     link_type: "LinkTypeLiteralType",
     source_dataset_input_column: Optional[InputColumn],
     unique_id_input_column: InputColumn,
+    deduplication_strategy: BlockingDeduplicationStrategy = "exclude_preceding_rules",
 ) -> list[dict[str, str]]:
     """Use the blocking rules specified in the linker's settings object to
     generate a SQL statement that will create pairwise record comparions
     according to the blocking rule(s).
 
     Where there are multiple blocking rules, the SQL statement contains logic
-    so that duplicate comparisons are not generated.
+    so that duplicate comparisons are not generated. `deduplication_strategy`
+    controls how:
+
+    - `exclude_preceding_rules`: each rule's join excludes pairs matching any
+        preceding rule, by re-evaluating the preceding rules on every candidate
+        pair.
+    - `min_match_key`: each rule's pairs are generated independently, and
+        duplicate pairs are then removed with a group by, keeping the pair from
+        the first rule that generated it. The cost of this does not grow with
+        the number of preceding rules, so it is faster for models with many
+        blocking rules, at the cost of materialising duplicate pairs.
     """
+    if deduplication_strategy not in blocking_deduplication_strategies:
+        raise ValueError(
+            f"Unknown blocking deduplication strategy '{deduplication_strategy}'. "
+            f"Must be one of {blocking_deduplication_strategies}"
+        )
 
     sqls = []
 
@@ -593,6 +1461,20 @@ def block_using_rules_sqls(
     if not blocking_rules:
         blocking_rules = [BlockingRule("1=1")]
 
+    group_by_match_key = (
+        deduplication_strategy == "min_match_key" and len(blocking_rules) > 1
+    )
+
+    for br in blocking_rules:
+        sqls.extend(
+            br.create_blocking_input_sqls(
+                unique_id_input_column=unique_id_input_column,
+                source_dataset_input_column=source_dataset_input_column,
+                input_tablename_l=input_tablename_l,
+                input_tablename_r=input_tablename_r,
+            )
+        )
+
     br_sqls = []
 
     for br in blocking_rules:
@@ -602,11 +1484,30 @@ def block_using_rules_sqls(
             input_tablename_l=input_tablename_l,
             input_tablename_r=input_tablename_r,
             where_condition=where_condition,
+            exclude_preceding_rules=not group_by_match_key,
         )
         br_sqls.append(sql)
 
     sql = " UNION ALL ".join(br_sqls)
 
+    if not group_by_match_key:
+        sqls.append({"sql": sql, "output_table_name": "__splink__blocked_id_pairs"})
+        return sqls
+
+    sqls.append(
+        {"sql": sql, "output_table_name": "__splink__blocked_id_pairs_with_duplicates"}
+    )
+
+    # Each pair is attributed to the first rule that generated it, matching the
+    # match_key assigned by the exclude_preceding_rules strategy
+    sql = """
+    select
+        cast(min(cast(match_key as int)) as varchar) as match_key,
+        join_key_l,
+        join_key_r
+    from __splink__blocked_id_pairs_with_duplicates
+    group by join_key_l, join_key_r
+    """
     sqls.append({"sql": sql, "output_table_name": "__splink__blocked_id_pairs"})
 
     return sqls
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import math
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 import pandas as pd
@@ -8,9 +9,14 @@ import sqlglot
 
 from splink.internals.blocking import (
     BlockingRule,
+    ExplodingBlockingRule,
+    MinHashLSHBlockingRule,
+    SaltedBlockingRule,
+    SortedNeighbourhoodBlockingRule,
     _sql_gen_where_condition,
     backend_link_type_options,
     block_using_rules_sqls,
+    materialise_blocking_key_index_tables,
     materialise_exploded_id_tables,
     user_input_link_type_options,
 )
@@ -21,10 +27,12 @@ from splink.internals.charts import (
     cumulative_blocking_rule_comparisons_generated,
 )
 from splink.internals.database_api import AcceptableInputTableType, DatabaseAPISubClass
+from splink.internals.exceptions import SplinkException
 from splink.internals.input_column import InputColumn
 from splink.internals.misc import calculate_cartesian, ensure_is_iterable
 from splink.internals.pipeline import CTEPipeline
 from splink.internals.splink_dataframe import SplinkDataFrame
+from splink.internals.unique_id_concat import _composite_unique_id_from_nodes_sql
 from splink.internals.vertically_concatenate import (
     split_df_concat_with_tf_into_two_tables_sqls,
     vertically_concatenate_sql,
@@ -32,6 +40,36 @@ from splink.internals.vertically_concatenate import (
 
 logger = logging.getLogger(__name__)
 
+# Approximate counts are estimated from this proportion of the input data, unless
+# a sample_proportion is given
+DEFAULT_APPROXIMATE_SAMPLE_PROPORTION = 0.1
+# Confidence intervals of approximate counts are 95% normal approximation intervals
+APPROXIMATE_COUNT_Z_SCORE = 1.96
+
+
+def _validate_sample_proportion(sample_proportion: float) -> None:
+    if not 0 < sample_proportion <= 1:
+        raise ValueError(
+            f"sample_proportion must be in (0, 1], got {sample_proportion}"
+        )
+
+
+def _resolve_sample_proportion(
+    approximate: bool, sample_proportion: Optional[float]
+) -> Optional[float]:
+    """The proportion of the input data from which to estimate counts, or None if
+    counts are to be computed exactly"""
+    if sample_proportion is None and approximate:
+        return DEFAULT_APPROXIMATE_SAMPLE_PROPORTION
+    return sample_proportion
+
+
+def _qualify_columns_sql(sql: str, table_name: str, db_api: DatabaseAPISubClass) -> str:
+    tree = sqlglot.parse_one(sql, dialect=db_api.sql_dialect.sqlglot_name)
+    for node in tree.find_all(sqlglot.expressions.Column):
+        node.set("table", table_name)
+    return tree.sql(dialect=db_api.sql_dialect.sqlglot_name)
+
 
 def _number_of_comparisons_generated_by_blocking_rule_post_filters_sqls(
     input_data_dict: dict[str, "SplinkDataFrame"],
@@ -40,7 +78,10 @@ def _number_of_comparisons_generated_by_blocking_rule_post_filters_sqls(
     db_api: DatabaseAPISubClass,
     unique_id_input_column: InputColumn,
     source_dataset_input_column: Optional[InputColumn],
+    group_by_block: bool = False,
 ) -> list[dict[str, str]]:
+    """If `group_by_block`, count the comparisons in each block of the rule's
+    equi-join keys, rather than in total"""
     input_dataframes = list(input_data_dict.values())
 
     two_dataset_link_only = link_type == "link_only" and len(input_dataframes) == 2
@@ -72,6 +113,43 @@ def _number_of_comparisons_generated_by_blocking_rule_post_filters_sqls(
         input_tablename_l = "__splink__df_concat"
         input_tablename_r = "__splink__df_concat"
 
+    if isinstance(blocking_rule, MinHashLSHBlockingRule):
+        # Join on band keys, counting pairs which share several band keys once
+        # The source dataset column is only added when the inputs are concatenated
+        pair_id_cols = unique_id_cols
+        if two_dataset_link_only:
+            pair_id_cols = [unique_id_input_column]
+        sqls.extend(
+            _lsh_band_keys_sqls(
+                blocking_rule,
+                db_api,
+                input_tablename_l,
+                input_tablename_r,
+                [c.name for c in pair_id_cols],
+            )
+        )
+        uid_l_expr = _composite_unique_id_from_nodes_sql(pair_id_cols, "l")
+        uid_r_expr = _composite_unique_id_from_nodes_sql(pair_id_cols, "r")
+        sql = f"""
+        select count(*) as count_of_pairwise_comparisons_generated
+        from (
+            select distinct {uid_l_expr} as id_l, {uid_r_expr} as id_r
+            from __splink__lsh_band_keys_l as l
+            inner join __splink__lsh_band_keys_r as r
+            on
+            {blocking_rule.blocking_rule_sql}
+            {where_condition}
+        ) as pairs
+        """
+        sqls.append(
+            {"sql": sql, "output_table_name": "__splink__comparions_post_filter"}
+        )
+        return sqls
+
+    block_keys_sql = ", ".join(
+        _qualify_columns_sql(l_key, "l", db_api)
+        for l_key, _ in blocking_rule._equi_join_conditions
+    )
     sql = f"""
     select count(*) as count_of_pairwise_comparisons_generated
 
@@ -80,11 +158,42 @@ def _number_of_comparisons_generated_by_blocking_rule_post_filters_sqls(
     on
     {blocking_rule.blocking_rule_sql}
     {where_condition}
+    {"group by " + block_keys_sql if group_by_block else ""}
     """
     sqls.append({"sql": sql, "output_table_name": "__splink__comparions_post_filter"})
     return sqls
 
 
+def _lsh_band_keys_sqls(
+    blocking_rule: MinHashLSHBlockingRule,
+    db_api: DatabaseAPISubClass,
+    input_tablename_l: str,
+    input_tablename_r: str,
+    columns_to_retain: list[str],
+) -> list[dict[str, str]]:
+    """Tables of the band keys of the left and right input tables, named
+    `__splink__lsh_band_keys_l` and `__splink__lsh_band_keys_r`"""
+    sqls = blocking_rule.band_keys_sqls(
+        db_api.sql_dialect,
+        input_tablename_l,
+        columns_to_retain,
+        "__splink__lsh_band_keys_l",
+    )
+    if input_tablename_r == input_tablename_l:
+        sql = "select * from __splink__lsh_band_keys_l"
+        sqls.append({"sql": sql, "output_table_name": "__splink__lsh_band_keys_r"})
+    else:
+        sqls.extend(
+            blocking_rule.band_keys_sqls(
+                db_api.sql_dialect,
+                input_tablename_r,
+                columns_to_retain,
+                "__splink__lsh_band_keys_r",
+            )
+        )
+    return sqls
+
+
 def _count_comparisons_from_blocking_rule_pre_filter_conditions_sqls(
     input_data_dict: dict[str, "SplinkDataFrame"],
     blocking_rule: "BlockingRule",
@@ -110,6 +219,15 @@ def _count_comparisons_from_blocking_rule_pre_filter_conditions_sqls(
         input_tablename_l = "__splink__df_concat"
         input_tablename_r = "__splink__df_concat"
 
+    if isinstance(blocking_rule, MinHashLSHBlockingRule):
+        sqls.extend(
+            _lsh_band_keys_sqls(
+                blocking_rule, db_api, input_tablename_l, input_tablename_r, []
+            )
+        )
+        input_tablename_l = "__splink__lsh_band_keys_l"
+        input_tablename_r = "__splink__lsh_band_keys_r"
+
     l_cols_sel = []
     r_cols_sel = []
     l_cols_gb = []
@@ -185,6 +303,221 @@ def _count_comparisons_from_blocking_rule_pre_filter_conditions_sqls(
     return sqls
 
 
+def _count_comparisons_from_blocking_rules_pre_filter_conditions(
+    *,
+    splink_df_dict: dict[str, "SplinkDataFrame"],
+    blocking_rules: List[BlockingRule],
+    link_type: backend_link_type_options,
+    db_api: DatabaseAPISubClass,
+    unique_id_input_column: InputColumn,
+    source_dataset_input_column: Optional[InputColumn],
+) -> list[Optional[int]]:
+    """The number of comparisons generated by each blocking rule before filter
+    conditions are applied, as computed by
+    `_count_comparisons_generated_from_blocking_rule`.
+
+    Rules whose equi-join conditions compare the same expression of `l` and `r`
+    (the usual case) are counted together in a single scan of the input data,
+    with one grouping set per distinct set of join keys.  Other rules are counted
+    individually.  Sorted neighbourhood rules do not generate blocks, so have a
+    count of None.
+    """
+    counts: list[Optional[int]] = [None] * len(blocking_rules)
+
+    key_exprs: list[str] = []
+    key_sets: list[tuple[int, ...]] = []
+    key_set_of_rule: dict[int, int] = {}
+
+    for i, br in enumerate(blocking_rules):
+        if isinstance(br, SortedNeighbourhoodBlockingRule):
+            continue
+        join_conditions = br._equi_join_conditions
+        if isinstance(br, ExplodingBlockingRule) or any(
+            l_key != r_key for l_key, r_key in join_conditions
+        ):
+            counts[i] = _count_comparisons_generated_from_blocking_rule(
+                splink_df_dict=splink_df_dict,
+                blocking_rule=br,
+                link_type=link_type,
+                db_api=db_api,
+                compute_post_filter_count=False,
+                unique_id_input_column=unique_id_input_column,
+                source_dataset_input_column=source_dataset_input_column,
+            )["number_of_comparisons_generated_pre_filter_conditions"]
+            continue
+
+        for l_key, _ in join_conditions:
+            if l_key not in key_exprs:
+                key_exprs.append(l_key)
+        key_set = tuple(
+            sorted({key_exprs.index(l_key) for l_key, _ in join_conditions})
+        )
+        if key_set not in key_sets:
+            key_sets.append(key_set)
+        key_set_of_rule[i] = key_sets.index(key_set)
+
+    if not key_set_of_rule:
+        return counts
+
+    input_dataframes = list(splink_df_dict.values())
+    if link_type == "link_only" and len(input_dataframes) == 2:
+        input_sqls = {
+            "l": f"select * from {input_dataframes[0].physical_name}",
+            "r": f"select * from {input_dataframes[1].physical_name}",
+        }
+    else:
+        input_sqls = {
+            "l": vertically_concatenate_sql(
+                splink_df_dict, salting_required=False, source_dataset_input_column=None
+            )
+        }
+
+    # The block sizes are materialised so that the input data is scanned once,
+    # however many sets of keys there are
+    keys = [f"key_{k}" for k in range(len(key_exprs))]
+    keys_sql = "".join(f"{expr} as key_{k}, " for k, expr in enumerate(key_exprs))
+    block_sizes = {}
+    for side, input_sql in input_sqls.items():
+        pipeline = CTEPipeline()
+        pipeline.enqueue_sql(input_sql, "__splink__df_concat")
+        # The constant column ensures there is something to select if no rule has
+        # equi-join conditions
+        sql = f"select {keys_sql}1 as all_records from __splink__df_concat"
+        pipeline.enqueue_sql(sql, "__splink__blocking_keys")
+        sql = _block_sizes_for_key_sets_sql(
+            "__splink__blocking_keys", keys, key_sets, db_api
+        )
+        pipeline.enqueue_sql(sql, f"__splink__block_sizes_{side}")
+        block_sizes[side] = db_api.sql_pipeline_to_splink_dataframe(pipeline)
+
+    block_sizes_l = block_sizes["l"]
+    block_sizes_r = block_sizes.get("r", block_sizes_l)
+    sqls = []
+    for key_set_index, key_set in enumerate(key_sets):
+        # The equi-join on the keys also excludes blocks with a null key
+        join_sql = " and ".join(f"l.key_{k} = r.key_{k}" for k in key_set) or "1=1"
+        grouping_sql = " and ".join(
+            f"{t}.grouping_{k} = {0 if k in key_set else 1}"
+            for t in ["l", "r"]
+            for k in range(len(keys))
+        )
+        sqls.append(
+            f"""
+            select
+                {key_set_index} as key_set_index,
+                cast(sum(l.block_size * r.block_size) as bigint) as block_count
+            from {block_sizes_l.physical_name} as l
+            inner join {block_sizes_r.physical_name} as r
+            on {join_sql}
+            {"where " + grouping_sql if grouping_sql else ""}
+            """
+        )
+    pipeline = CTEPipeline(list(block_sizes.values()))
+    pipeline.enqueue_sql(" UNION ALL ".join(sqls), "__splink__block_counts_by_key_set")
+
+    block_counts_df = db_api.sql_pipeline_to_splink_dataframe(pipeline)
+    block_counts = {
+        r["key_set_index"]: r["block_count"] or 0
+        for r in block_counts_df.as_record_dict()
+    }
+    block_counts_df.drop_table_from_database_and_remove_from_cache()
+    for df in block_sizes.values():
+        df.drop_table_from_database_and_remove_from_cache()
+
+    for i, key_set_index in key_set_of_rule.items():
+        counts[i] = int(block_counts.get(key_set_index, 0))
+    return counts
+
+
+def _block_sizes_for_key_sets_sql(
+    keys_tablename: str,
+    keys: list[str],
+    key_sets: list[tuple[int, ...]],
+    db_api: DatabaseAPISubClass,
+) -> str:
+    """The number of records with each value of each set of keys, with a column
+    `grouping_k` which is 0 if key_k is in the set and 1 otherwise"""
+    if db_api.sql_dialect.supports_grouping_sets:
+        grouping_sets_sql = ", ".join(
+            "(" + ", ".join(keys[k] for k in key_set) + ")" for key_set in key_sets
+        )
+        select_sql = "".join(
+            f"{key}, grouping({key}) as grouping_{k}, " for k, key in enumerate(keys)
+        )
+        return f"""
+        select {select_sql}count(*) as block_size
+        from {keys_tablename}
+        group by grouping sets ({grouping_sets_sql})
+        """
+
+    sqls = []
+    for key_set in key_sets:
+        select_sql = "".join(
+            f"{key if k in key_set else 'null'} as {key}, "
+            f"{0 if k in key_set else 1} as grouping_{k}, "
+            for k, key in enumerate(keys)
+        )
+        group_by_sql = ", ".join(keys[k] for k in key_set)
+        sqls.append(
+            f"""
+            select {select_sql}count(*) as block_size
+            from {keys_tablename}
+            {"group by " + group_by_sql if group_by_sql else ""}
+            """
+        )
+    return " UNION ALL ".join(sqls)
+
+
+def materialise_heavy_block_keys_tables(
+    *,
+    blocking_rules: List[BlockingRule],
+    link_type: user_input_link_type_options,
+    db_api: DatabaseAPISubClass,
+    splink_df_dict: dict[str, SplinkDataFrame],
+) -> list[SaltedBlockingRule]:
+    """For salted blocking rules with a `salting_min_block_size`, materialise a
+    table of the blocking keys whose blocks would generate more than
+    `salting_min_block_size` comparisons (before filter conditions), so that only
+    these blocks are salted.
+
+    Returns the rules for which a table has been materialised.
+    """
+    adaptive_rules = [
+        br
+        for br in blocking_rules
+        if isinstance(br, SaltedBlockingRule) and br.is_adaptive
+    ]
+
+    rules_with_tables = []
+    for br in adaptive_rules:
+        join_conditions = br._equi_join_conditions
+        if not join_conditions:
+            logger.warning(
+                f"Blocking rule {br.blocking_rule_sql} has no equi-join conditions, "
+                "so block sizes cannot be computed. All blocks will be salted."
+            )
+            continue
+
+        sqls = _count_comparisons_from_blocking_rule_pre_filter_conditions_sqls(
+            splink_df_dict, br, link_type, db_api
+        )
+        pipeline = CTEPipeline()
+        pipeline.enqueue_list_of_sqls(sqls)
+
+        keys = ", ".join(f"key_{i}" for i in range(len(join_conditions)))
+        sql = f"""
+        select {keys}
+        from __splink__block_counts
+        where block_count > {br.salting_min_block_size}
+        """
+        pipeline.enqueue_sql(sql, "__splink__heavy_block_keys")
+
+        br.heavy_block_keys_table = db_api.sql_pipeline_to_splink_dataframe(pipeline)
+        rules_with_tables.append(br)
+
+    return rules_with_tables
+
+
 def _row_counts_per_input_table(
     *,
     splink_df_dict: dict[str, "SplinkDataFrame"],
@@ -276,6 +609,36 @@ def _process_unique_id_columns(
         )
 
 
+def _sample_input_tables(
+    *,
+    splink_df_dict: dict[str, "SplinkDataFrame"],
+    unique_id_input_column: InputColumn,
+    sample_proportion: float,
+    db_api: DatabaseAPISubClass,
+) -> dict[str, "SplinkDataFrame"]:
+    """Materialise a sample of each input table, selecting records using a hash of
+    their unique id so that the sample is reproducible.  Each pair of records is
+    in the sample with probability sample_proportion**2"""
+    num_partitions = 1_000_000
+    threshold = round(sample_proportion * num_partitions)
+    uid = unique_id_input_column.name
+
+    sampled_df_dict = {}
+    for i, (name, df) in enumerate(splink_df_dict.items()):
+        # Tables are sampled independently, even if their unique ids overlap
+        partition_sql = db_api.sql_dialect.hash_partition_sql(
+            f"'{i}-' || {uid}", num_partitions
+        )
+        pipeline = CTEPipeline()
+        sql = f"""
+        select * from {df.physical_name}
+        where {partition_sql} < {threshold}
+        """
+        pipeline.enqueue_sql(sql, f"{df.templated_name}_sample")
+        sampled_df_dict[name] = db_api.sql_pipeline_to_splink_dataframe(pipeline)
+    return sampled_df_dict
+
+
 def _cumulative_comparisons_to_be_scored_from_blocking_rules(
     *,
     splink_df_dict: dict[str, "SplinkDataFrame"],
@@ -285,26 +648,29 @@ def _cumulative_comparisons_to_be_scored_from_blocking_rules(
     max_rows_limit: int = int(1e9),
     unique_id_input_column: InputColumn,
     source_dataset_input_column: Optional[InputColumn],
+    sample_proportion: Optional[float] = None,
 ) -> pd.DataFrame:
+    if sample_proportion is not None:
+        _validate_sample_proportion(sample_proportion)
+    # A pair of records is only compared if both are sampled
+    pair_sample_proportion = 1.0 if sample_proportion is None else sample_proportion**2
+
     # Check none of the blocking rules will create a vast/computationally
     # intractable number of comparisons
-    for br in blocking_rules:
-        # TODO: Deal properly with exlpoding rules
-        count = _count_comparisons_generated_from_blocking_rule(
-            splink_df_dict=splink_df_dict,
-            blocking_rule=br,
-            link_type=link_type,
-            db_api=db_api,
-            max_rows_limit=max_rows_limit,
-            compute_post_filter_count=False,
-            unique_id_input_column=unique_id_input_column,
-            source_dataset_input_column=source_dataset_input_column,
-        )
-        count_pre_filter = count[
-            "number_of_comparisons_generated_pre_filter_conditions"
-        ]
+    counts_pre_filter = _count_comparisons_from_blocking_rules_pre_filter_conditions(
+        splink_df_dict=splink_df_dict,
+        blocking_rules=blocking_rules,
+        link_type=link_type,
+        db_api=db_api,
+        unique_id_input_column=unique_id_input_column,
+        source_dataset_input_column=source_dataset_input_column,
+    )
+    for br, count_pre_filter in zip(blocking_rules, counts_pre_filter):
+        # Sorted neighbourhood rules generate at most n * window_size comparisons
+        if count_pre_filter is None:
+            continue
 
-        if float(count_pre_filter) > max_rows_limit:
+        if float(count_pre_filter) * pair_sample_proportion > max_rows_limit:
             # TODO: Use a SplinkException?  Want this to give a sensible message
             # when ocoming from estimate_probability_two_random_records_match
             raise ValueError(
@@ -323,6 +689,15 @@ def _cumulative_comparisons_to_be_scored_from_blocking_rules(
 
     cartesian_count = calculate_cartesian(rc, link_type)
 
+    if sample_proportion is not None:
+        splink_df_dict = _sample_input_tables(
+            splink_df_dict=splink_df_dict,
+            unique_id_input_column=unique_id_input_column,
+            sample_proportion=sample_proportion,
+            db_api=db_api,
+        )
+    sampled_tables = list(splink_df_dict.values()) if sample_proportion else []
+
     for n, br in enumerate(blocking_rules):
         br.add_preceding_rules(blocking_rules[:n])
 
@@ -366,6 +741,15 @@ def _cumulative_comparisons_to_be_scored_from_blocking_rules(
         blocking_input_tablename_l = "__splink__df_concat_left"
         blocking_input_tablename_r = "__splink__df_concat_right"
 
+    br_with_blocking_key_index_tables = materialise_blocking_key_index_tables(
+        link_type=link_type,
+        blocking_rules=blocking_rules,
+        db_api=db_api,
+        splink_df_dict=splink_df_dict,
+        source_dataset_input_column=source_dataset_input_column,
+        unique_id_input_column=unique_id_input_column,
+    )
+
     sqls = block_using_rules_sqls(
         input_tablename_l=blocking_input_tablename_l,
         input_tablename_r=blocking_input_tablename_r,
@@ -377,17 +761,22 @@ def _cumulative_comparisons_to_be_scored_from_blocking_rules(
 
     pipeline.enqueue_list_of_sqls(sqls)
 
-    sql = """
-        select
-        count(*) as row_count,
-        match_key
-        from __splink__blocked_id_pairs
-        group by match_key
-        order by cast(match_key as int) asc
-    """
-    pipeline.enqueue_sql(sql, "__splink__df_count_cumulative_blocks")
+    if sample_proportion is None:
+        sql = """
+            select
+            count(*) as row_count,
+            match_key
+            from __splink__blocked_id_pairs
+            group by match_key
+            order by cast(match_key as int) asc
+        """
+        pipeline.enqueue_sql(sql, "__splink__df_count_cumulative_blocks")
+    else:
+        pipeline.enqueue_list_of_sqls(_sampled_pair_counts_and_degrees_sqls())
 
     result_df = db_api.sql_pipeline_to_splink_dataframe(pipeline).as_pandas_dataframe()
+    if sample_proportion is not None:
+        result_df = _estimate_row_counts_from_sample(result_df, sample_proportion)
 
     # The above table won't include rules that have no matches
     all_rules_df = pd.DataFrame(
@@ -398,7 +787,7 @@ def _cumulative_comparisons_to_be_scored_from_blocking_rules(
     )
     if len(result_df) > 0:
         complete_df = all_rules_df.merge(result_df, on="match_key", how="left").fillna(
-            {"row_count": 0}
+            {"row_count": 0, "row_count_ci_lower": 0, "row_count_ci_upper": 0}
         )
 
         complete_df["cumulative_rows"] = complete_df["row_count"].cumsum().astype(int)
@@ -414,8 +803,15 @@ def _cumulative_comparisons_to_be_scored_from_blocking_rules(
         complete_df["cumulative_rows"] = 0
         complete_df["cartesian"] = cartesian_count
         complete_df["start"] = 0
+        if sample_proportion is not None:
+            complete_df["row_count_ci_lower"] = 0
+            complete_df["row_count_ci_upper"] = 0
 
     [b.drop_materialised_id_pairs_dataframe() for b in exploding_br_with_id_tables]
+    for br in br_with_blocking_key_index_tables:
+        br.detach_blocking_key_index_tables()
+    for sampled_table in sampled_tables:
+        sampled_table.drop_table_from_database_and_remove_from_cache()
 
     col_order = [
         "blocking_rule",
@@ -425,10 +821,115 @@ def _cumulative_comparisons_to_be_scored_from_blocking_rules(
         "match_key",
         "start",
     ]
+    if sample_proportion is not None:
+        col_order += ["row_count_ci_lower", "row_count_ci_upper"]
+        for c in ["row_count_ci_lower", "row_count_ci_upper"]:
+            complete_df[c] = complete_df[c].astype(int)
 
     return complete_df[col_order]
 
 
+def _sampled_pair_counts_and_degrees_sqls() -> list[dict[str, str]]:
+    """The number of sampled pairs generated by each blocking rule, and the number
+    of ordered pairs of these pairs which share a record, sum(degree * (degree - 1))
+    where the degree of a record is the number of pairs it is in"""
+    sql = """
+    select match_key, join_key, count(*) as degree
+    from (
+        select match_key, join_key_l as join_key from __splink__blocked_id_pairs
+        union all
+        select match_key, join_key_r as join_key from __splink__blocked_id_pairs
+    ) as pair_records
+    group by match_key, join_key
+    """
+    sqls = [{"sql": sql, "output_table_name": "__splink__sampled_record_degrees"}]
+
+    # Each pair contributes to the degree of both of its records
+    sql = """
+    select
+        cast(sum(degree) / 2 as bigint) as row_count,
+        cast(sum(cast(degree as double) * (degree - 1)) as double)
+            as pairs_sharing_a_record,
+        match_key
+    from __splink__sampled_record_degrees
+    group by match_key
+    order by cast(match_key as int) asc
+    """
+    sqls.append(
+        {"sql": sql, "output_table_name": "__splink__df_count_cumulative_blocks"}
+    )
+    return sqls
+
+
+def _estimate_row_counts_from_sample(
+    sampled_counts_df: pd.DataFrame, sample_proportion: float
+) -> pd.DataFrame:
+    """Scale up the number of pairs generated by each blocking rule from a sample
+    of records, and add a confidence interval.
+
+    A pair is sampled with probability p², so the estimate is count / p².  Two
+    pairs which share a record are both sampled with probability p³, so the
+    variance of the estimate is estimated by
+    (count * (1 - p²) + pairs_sharing_a_record * (1 - p)) / p⁴.
+    """
+    p = sample_proportion
+    rows = []
+    for r in sampled_counts_df.to_dict(orient="records"):
+        count = float(r["row_count"])
+        variance = (
+            count * (1 - p**2) + float(r["pairs_sharing_a_record"]) * (1 - p)
+        ) / p**4
+        estimate, lower, upper = _estimate_with_confidence_interval(
+            count / p**2, variance, count
+        )
+        rows.append(
+            {
+                "row_count": estimate,
+                "match_key": r["match_key"],
+                "row_count_ci_lower": lower,
+                "row_count_ci_upper": upper,
+            }
+        )
+    return pd.DataFrame(
+        rows,
+        columns=["row_count", "match_key", "row_count_ci_lower", "row_count_ci_upper"],
+    )
+
+
+def _conditions_identified(
+    blocking_rule: BlockingRule,
+    link_type: backend_link_type_options,
+    db_api: DatabaseAPISubClass,
+    unique_id_input_column: InputColumn,
+    source_dataset_input_column: Optional[InputColumn],
+) -> dict[str, str]:
+    equi_join_conditions = [
+        _qualify_columns_sql(i, "l", db_api)
+        + " = "
+        + _qualify_columns_sql(j, "r", db_api)
+        for i, j in blocking_rule._equi_join_conditions
+    ]
+
+    equi_join_conditions_joined = " AND ".join(equi_join_conditions)
+
+    filter_conditions = blocking_rule._filter_conditions
+    if filter_conditions == "TRUE":
+        filter_conditions = ""
+
+    if source_dataset_input_column:
+        uid_for_where = [source_dataset_input_column, unique_id_input_column]
+    else:
+        uid_for_where = [unique_id_input_column]
+
+    link_type_join_condition_sql = _sql_gen_where_condition(link_type, uid_for_where)
+
+    return {
+        "filter_conditions_identified": filter_conditions,
+        "equi_join_conditions_identified": equi_join_conditions_joined,
+        "link_type_join_condition": link_type_join_condition_sql,
+    }
+
+
 def _count_comparisons_generated_from_blocking_rule(
     *,
     splink_df_dict: dict[str, "SplinkDataFrame"],
@@ -439,8 +940,38 @@ def _count_comparisons_generated_from_blocking_rule(
     max_rows_limit: int = int(1e9),
     unique_id_input_column: InputColumn,
     source_dataset_input_column: Optional[InputColumn],
+    sample_proportion: Optional[float] = None,
 ) -> dict[str, Union[int, str]]:
     # TODO: if it's an exploding blocking rule, make sure we error out
+    if isinstance(blocking_rule, SortedNeighbourhoodBlockingRule):
+        raise SplinkException(
+            "Sorted neighbourhood blocking rules do not generate blocks, so "
+            "comparisons cannot be counted per block. Use "
+            "`cumulative_comparisons_to_be_scored_from_blocking_rules_data` instead."
+        )
+    conditions_identified = _conditions_identified(
+        blocking_rule,
+        link_type,
+        db_api,
+        unique_id_input_column,
+        source_dataset_input_column,
+    )
+    if sample_proportion is not None:
+        return {
+            **_estimate_comparisons_generated_from_blocking_rule(
+                splink_df_dict=splink_df_dict,
+                blocking_rule=blocking_rule,
+                link_type=link_type,
+                db_api=db_api,
+                compute_post_filter_count=compute_post_filter_count,
+                max_rows_limit=max_rows_limit,
+                unique_id_input_column=unique_id_input_column,
+                source_dataset_input_column=source_dataset_input_column,
+                sample_proportion=sample_proportion,
+            ),
+            **conditions_identified,
+        }
+
     pipeline = CTEPipeline()
     sqls = _count_comparisons_from_blocking_rule_pre_filter_conditions_sqls(
         splink_df_dict, blocking_rule, link_type, db_api
@@ -461,37 +992,11 @@ def _count_comparisons_generated_from_blocking_rule(
     ]
     pre_filter_total_df.drop_table_from_database_and_remove_from_cache()
 
-    def add_l_r(sql, table_name):
-        tree = sqlglot.parse_one(sql, dialect=db_api.sql_dialect.sqlglot_name)
-        for node in tree.find_all(sqlglot.expressions.Column):
-            node.set("table", table_name)
-        return tree.sql(dialect=db_api.sql_dialect.sqlglot_name)
-
-    equi_join_conditions = [
-        add_l_r(i, "l") + " = " + add_l_r(j, "r")
-        for i, j in blocking_rule._equi_join_conditions
-    ]
-
-    equi_join_conditions_joined = " AND ".join(equi_join_conditions)
-
-    filter_conditions = blocking_rule._filter_conditions
-    if filter_conditions == "TRUE":
-        filter_conditions = ""
-
-    if source_dataset_input_column:
-        uid_for_where = [source_dataset_input_column, unique_id_input_column]
-    else:
-        uid_for_where = [unique_id_input_column]
-
-    link_type_join_condition_sql = _sql_gen_where_condition(link_type, uid_for_where)
-
     if not compute_post_filter_count:
         return {
             "number_of_comparisons_generated_pre_filter_conditions": pre_filter_total,
             "number_of_comparisons_to_be_scored_post_filter_conditions": "not computed",
-            "filter_conditions_identified": filter_conditions,
-            "equi_join_conditions_identified": equi_join_conditions_joined,
-            "link_type_join_condition": link_type_join_condition_sql,
+            **conditions_identified,
         }
 
     if pre_filter_total < max_rows_limit:
@@ -512,25 +1017,201 @@ def _count_comparisons_generated_from_blocking_rule(
         post_filter_total_df.drop_table_from_database_and_remove_from_cache()
     else:
         post_filter_total = "exceeded max_rows_limit, see warning"
-
-        logger.warning(
-            "WARNING:\nComputation of number of comparisons post-filter conditions was "
-            f"skipped because the number of comparisons generated by your "
-            f"blocking rule exceeded max_rows_limit={max_rows_limit:.2e}."
-            "\nIt would be likely to be slow to compute.\nIf you still want to go ahead"
-            " increase the value of max_rows_limit argument to above "
-            f"{pre_filter_total:.3e}.\nRead more about the definitions here:\n"
-            "https://moj-analytical-services.github.io/splink/topic_guides/blocking/performance.html?h=filter+cond#filter-conditions"
-        )
+        _warn_post_filter_count_skipped(max_rows_limit, pre_filter_total)
 
     return {
         "number_of_comparisons_generated_pre_filter_conditions": pre_filter_total,
         "number_of_comparisons_to_be_scored_post_filter_conditions": post_filter_total,
-        "filter_conditions_identified": filter_conditions,
-        "equi_join_conditions_identified": equi_join_conditions_joined,
-        "link_type_join_condition": link_type_join_condition_sql,
+        **conditions_identified,
+    }
+
+
+def _warn_post_filter_count_skipped(max_rows_limit: int, pre_filter_total: int) -> None:
+    logger.warning(
+        "WARNING:\nComputation of number of comparisons post-filter conditions was "
+        f"skipped because the number of comparisons generated by your "
+        f"blocking rule exceeded max_rows_limit={max_rows_limit:.2e}."
+        "\nIt would be likely to be slow to compute.\nIf you still want to go ahead"
+        " increase the value of max_rows_limit argument to above "
+        f"{pre_filter_total:.3e}.\nRead more about the definitions here:\n"
+        "https://moj-analytical-services.github.io/splink/topic_guides/blocking/performance.html?h=filter+cond#filter-conditions"
+    )
+
+
+def _sample_blocks_of_input_tables(
+    *,
+    splink_df_dict: dict[str, "SplinkDataFrame"],
+    blocking_rule: BlockingRule,
+    sample_proportion: float,
+    db_api: DatabaseAPISubClass,
+) -> dict[str, "SplinkDataFrame"]:
+    """Materialise the records of each input table which are in a sample of the
+    blocks of `blocking_rule`, selecting blocks using a hash of their equi-join
+    keys.  Each block is in the sample with probability sample_proportion, and
+    is either entirely in the sample or entirely excluded from it"""
+    join_conditions = blocking_rule._equi_join_conditions
+    if (
+        isinstance(blocking_rule, (ExplodingBlockingRule, MinHashLSHBlockingRule))
+        or not join_conditions
+        or any(l_key != r_key for l_key, r_key in join_conditions)
+    ):
+        raise SplinkException(
+            f"Blocking rule {blocking_rule.blocking_rule_sql} cannot be analysed "
+            "approximately, because its blocks cannot be sampled. This requires "
+            "equi-join conditions which compare the same expression of `l` and `r`"
+            ", e.g. `block_on`. Use approximate=False instead."
+        )
+
+    # A null key never joins, so it does not matter that its hash is null
+    keys = [l_key for l_key, _ in join_conditions]
+    if len(keys) == 1:
+        key_sql = keys[0]
+    else:
+        key_sql = " || '|' || ".join(f"cast({key} as varchar)" for key in keys)
+
+    num_partitions = 1_000_000
+    threshold = round(sample_proportion * num_partitions)
+    partition_sql = db_api.sql_dialect.hash_partition_sql(key_sql, num_partitions)
+
+    sampled_df_dict = {}
+    for name, df in splink_df_dict.items():
+        pipeline = CTEPipeline()
+        sql = f"""
+        select * from {df.physical_name}
+        where {partition_sql} < {threshold}
+        """
+        pipeline.enqueue_sql(sql, f"{df.templated_name}_block_sample")
+        sampled_df_dict[name] = db_api.sql_pipeline_to_splink_dataframe(pipeline)
+    return sampled_df_dict
+
+
+def _estimate_with_confidence_interval(
+    sampled_total: float, variance: float, lower_bound: float
+) -> tuple[int, int, int]:
+    """The estimate rounded to an integer, and a normal approximation confidence
+    interval for it, which is no lower than `lower_bound`"""
+    estimate = sampled_total
+    half_width = APPROXIMATE_COUNT_Z_SCORE * math.sqrt(max(variance, 0))
+    return (
+        round(estimate),
+        round(max(estimate - half_width, lower_bound)),
+        round(estimate + half_width),
+    )
+
+
+def _estimate_comparisons_generated_from_blocking_rule(
+    *,
+    splink_df_dict: dict[str, "SplinkDataFrame"],
+    blocking_rule: BlockingRule,
+    link_type: backend_link_type_options,
+    db_api: DatabaseAPISubClass,
+    compute_post_filter_count: bool,
+    max_rows_limit: int,
+    unique_id_input_column: InputColumn,
+    source_dataset_input_column: Optional[InputColumn],
+    sample_proportion: float,
+) -> dict[str, Union[int, str]]:
+    """Estimate the number of comparisons generated by a blocking rule from a
+    sample of its blocks.
+
+    The number of comparisons in each sampled block is weighted by
+    1 / sample_proportion (the Horvitz-Thompson estimator).  As blocks are sampled
+    independently, the variance of the estimate is estimated by
+    sum(count²) * (1 - p) / p² over the sampled blocks.
+    """
+    _validate_sample_proportion(sample_proportion)
+    p = sample_proportion
+
+    sampled_df_dict = _sample_blocks_of_input_tables(
+        splink_df_dict=splink_df_dict,
+        blocking_rule=blocking_rule,
+        sample_proportion=p,
+        db_api=db_api,
+    )
+
+    pipeline = CTEPipeline()
+    sqls = _count_comparisons_from_blocking_rule_pre_filter_conditions_sqls(
+        sampled_df_dict, blocking_rule, link_type, db_api
+    )
+    pipeline.enqueue_list_of_sqls(sqls)
+    sql = """
+    select
+        cast(sum(block_count) as bigint) as sampled_count,
+        sum(cast(block_count as double) * block_count) as sum_of_squared_counts
+    from __splink__block_counts
+    """
+    pipeline.enqueue_sql(sql, "__splink__sampled_total_of_block_counts")
+    pre_filter = _fetch_sampled_totals(db_api, pipeline)
+    pre_filter_estimate = _estimate_with_confidence_interval(
+        pre_filter["sampled_count"] / p,
+        pre_filter["sum_of_squared_counts"] * (1 - p) / p**2,
+        pre_filter["sampled_count"],
+    )
+
+    results: dict[str, Union[int, str]] = {
+        "number_of_comparisons_generated_pre_filter_conditions": pre_filter_estimate[0],
+        "number_of_comparisons_generated_pre_filter_conditions_ci_lower": (
+            pre_filter_estimate[1]
+        ),
+        "number_of_comparisons_generated_pre_filter_conditions_ci_upper": (
+            pre_filter_estimate[2]
+        ),
     }
 
+    post_filter_key = "number_of_comparisons_to_be_scored_post_filter_conditions"
+    if not compute_post_filter_count:
+        results[post_filter_key] = "not computed"
+    elif pre_filter["sampled_count"] < max_rows_limit:
+        pipeline = CTEPipeline()
+        sqls = _number_of_comparisons_generated_by_blocking_rule_post_filters_sqls(
+            sampled_df_dict,
+            blocking_rule,
+            link_type,
+            db_api,
+            unique_id_input_column,
+            source_dataset_input_column,
+            group_by_block=True,
+        )
+        pipeline.enqueue_list_of_sqls(sqls)
+        sql = """
+        select
+            cast(sum(count_of_pairwise_comparisons_generated) as bigint)
+                as sampled_count,
+            sum(
+                cast(count_of_pairwise_comparisons_generated as double)
+                * count_of_pairwise_comparisons_generated
+            ) as sum_of_squared_counts
+        from __splink__comparions_post_filter
+        """
+        pipeline.enqueue_sql(sql, "__splink__sampled_total_post_filter")
+        post_filter = _fetch_sampled_totals(db_api, pipeline)
+        post_filter_estimate = _estimate_with_confidence_interval(
+            post_filter["sampled_count"] / p,
+            post_filter["sum_of_squared_counts"] * (1 - p) / p**2,
+            post_filter["sampled_count"],
+        )
+        results[post_filter_key] = post_filter_estimate[0]
+        results[f"{post_filter_key}_ci_lower"] = post_filter_estimate[1]
+        results[f"{post_filter_key}_ci_upper"] = post_filter_estimate[2]
+    else:
+        results[post_filter_key] = "exceeded max_rows_limit, see warning"
+        _warn_post_filter_count_skipped(max_rows_limit, pre_filter["sampled_count"])
+
+    for sampled_table in sampled_df_dict.values():
+        sampled_table.drop_table_from_database_and_remove_from_cache()
+
+    return results
+
+
+def _fetch_sampled_totals(
+    db_api: DatabaseAPISubClass, pipeline: CTEPipeline
+) -> dict[str, float]:
+    totals_df = db_api.sql_pipeline_to_splink_dataframe(pipeline)
+    totals = totals_df.as_record_dict()[0]
+    totals_df.drop_table_from_database_and_remove_from_cache()
+    # An empty sample has a null sum
+    return {k: float(v or 0) for k, v in totals.items()}
+
 
 def count_comparisons_from_blocking_rule(
     *,
@@ -542,6 +1223,8 @@ def count_comparisons_from_blocking_rule(
     source_dataset_column_name: Optional[str] = None,
     compute_post_filter_count: bool = True,
     max_rows_limit: int = int(1e9),
+    approximate: bool = False,
+    sample_proportion: Optional[float] = None,
 ) -> dict[str, Union[int, str]]:
     """Analyse a blocking rule to understand the number of comparisons it will generate.
 
@@ -563,6 +1246,15 @@ def count_comparisons_from_blocking_rule(
         max_rows_limit (int, optional): Calculation of post filter counts will only
             proceed if the fast method returns a value below this limit. Defaults
             to int(1e9).
+        approximate (bool, optional): If True, estimate the counts from a sample of
+            the blocks generated by the rule, and return a 95% confidence interval
+            for each count in the `_ci_lower` and `_ci_upper` entries. Blocks are
+            sampled using a hash of their equi-join keys, so only rules whose
+            equi-join conditions compare the same expression of `l` and `r` can be
+            analysed approximately. `max_rows_limit` applies to the comparisons
+            generated from the sample. Defaults to False.
+        sample_proportion (float, optional): The proportion of blocks to sample.
+            Implies `approximate=True`. Defaults to 0.1 if `approximate` is True.
 
     Returns:
         dict[str, Union[int, str]]: A dictionary containing the results
@@ -592,6 +1284,7 @@ def count_comparisons_from_blocking_rule(
         max_rows_limit=max_rows_limit,
         unique_id_input_column=unique_id_input_column,
         source_dataset_input_column=source_dataset_input_column,
+        sample_proportion=_resolve_sample_proportion(approximate, sample_proportion),
     )
 
 
@@ -604,8 +1297,43 @@ def cumulative_comparisons_to_be_scored_from_blocking_rules_data(
     unique_id_column_name: str = "unique_id",
     max_rows_limit: int = int(1e9),
     source_dataset_column_name: Optional[str] = None,
+    sample_proportion: Optional[float] = None,
+    approximate: bool = False,
 ) -> pd.DataFrame:
-    """TODO: Add docstring here"""
+    """Compute the number of comparisons generated by each of a list of blocking
+    rules, excluding comparisons generated by the preceding rules, and the
+    cumulative number of comparisons.
+
+    The number of comparisons each rule generates before filter conditions is
+    checked against `max_rows_limit` before any comparisons are generated. For
+    rules with equi-join conditions, these counts are computed for all rules in a
+    single scan of the input data.
+
+    Args:
+        table_or_tables (dataframe, str): Input data
+        blocking_rules (Iterable): The blocking rules, in the order they will be
+            applied
+        link_type (user_input_link_type_options): The link type - "link_only",
+            "dedupe_only" or "link_and_dedupe"
+        db_api (DatabaseAPISubClass): Database API
+        unique_id_column_name (str, optional): Defaults to "unique_id".
+        max_rows_limit (int, optional): The maximum number of comparisons any
+            one blocking rule may generate. Defaults to int(1e9).
+        source_dataset_column_name (Optional[str], optional): Defaults to None.
+        sample_proportion (float, optional): If provided, estimate the counts
+            from a sample of this proportion of the input records, rather than
+            generating every comparison. A pair of records is in the sample with
+            probability `sample_proportion`², so counts are scaled up by
+            1 / `sample_proportion`². Records are sampled using a hash of their
+            unique id, so estimates are reproducible. Estimated counts have a 95%
+            confidence interval in the `row_count_ci_lower` and
+            `row_count_ci_upper` columns. Defaults to None (exact counts).
+        approximate (bool, optional): If True, estimate the counts from a sample,
+            with `sample_proportion` defaulting to 0.1. Defaults to False.
+
+    Returns:
+        pd.DataFrame: One row per blocking rule
+    """
     splink_df_dict = db_api.register_multiple_tables(table_or_tables)
 
     # whilst they're named blocking_rules, this is actually a list of
@@ -634,6 +1362,7 @@ def cumulative_comparisons_to_be_scored_from_blocking_rules_data(
         max_rows_limit=max_rows_limit,
         unique_id_input_column=unique_id_input_column,
         source_dataset_input_column=source_dataset_input_column,
+        sample_proportion=_resolve_sample_proportion(approximate, sample_proportion),
     )
 
 
@@ -646,8 +1375,17 @@ def cumulative_comparisons_to_be_scored_from_blocking_rules_chart(
     unique_id_column_name: str = "unique_id",
     max_rows_limit: int = int(1e9),
     source_dataset_column_name: Optional[str] = None,
+    sample_proportion: Optional[float] = None,
+    approximate: bool = False,
 ) -> ChartReturnType:
-    """TODO: Add docstring here"""
+    """Chart the number of comparisons generated by each of a list of blocking
+    rules, excluding comparisons generated by the preceding rules.
+
+    Takes the same arguments as
+    `cumulative_comparisons_to_be_scored_from_blocking_rules_data`, including
+    `approximate` and `sample_proportion` to estimate the counts from a sample of
+    the input records.
+    """
     splink_df_dict = db_api.register_multiple_tables(table_or_tables)
 
     # whilst they're named blocking_rules, this is actually a list of
@@ -676,6 +1414,7 @@ def cumulative_comparisons_to_be_scored_from_blocking_rules_chart(
         max_rows_limit=max_rows_limit,
         unique_id_input_column=unique_id_input_column,
         source_dataset_input_column=source_dataset_input_column,
+        sample_proportion=_resolve_sample_proportion(approximate, sample_proportion),
     )
 
     return cumulative_blocking_rule_comparisons_generated(
@@ -716,6 +1455,12 @@ def n_largest_blocks(
     blocking_rule_as_br = to_blocking_rule_creator(blocking_rule).get_blocking_rule(
         db_api.sql_dialect.name
     )
+    if isinstance(blocking_rule_as_br, SortedNeighbourhoodBlockingRule):
+        raise SplinkException(
+            "Sorted neighbourhood blocking rules do not generate blocks, so "
+            "there are no largest blocks to find. Each record is compared with at "
+            f"most {2 * blocking_rule_as_br.window_size} others."
+        )
 
     splink_df_dict = db_api.register_multiple_tables(table_or_tables)
 
@@ -12,9 +12,15 @@ class BlockingRuleCreator(ABC):
         self,
         salting_partitions: int | None = None,
         arrays_to_explode: list[str] | None = None,
+        salting_min_block_size: int | None = None,
+        max_array_length: int | None = None,
+        max_array_element_frequency: int | None = None,
     ):
         self._salting_partitions = salting_partitions
         self._arrays_to_explode = arrays_to_explode
+        self._salting_min_block_size = salting_min_block_size
+        self._max_array_length = max_array_length
+        self._max_array_element_frequency = max_array_element_frequency
 
     # @property because merged levels need logic to determine salting partitions
     @property
@@ -25,27 +31,63 @@ class BlockingRuleCreator(ABC):
     def arrays_to_explode(self):
         return self._arrays_to_explode
 
+    @property
+    def salting_min_block_size(self):
+        return self._salting_min_block_size
+
+    @property
+    def max_array_length(self):
+        return self._max_array_length
+
+    @property
+    def max_array_element_frequency(self):
+        return self._max_array_element_frequency
+
     @abstractmethod
     def create_sql(self, sql_dialect: SplinkDialect) -> str:
         pass
 
+    def _blocking_rule_dict_entries(self, sql_dialect: SplinkDialect) -> dict[str, Any]:
+        return {"blocking_rule": self.create_sql(sql_dialect)}
+
     @final
     def create_blocking_rule_dict(self, sql_dialect_str: str) -> dict[str, Any]:
         sql_dialect = SplinkDialect.from_string(sql_dialect_str)
         level_dict = {
-            "blocking_rule": self.create_sql(sql_dialect),
+            **self._blocking_rule_dict_entries(sql_dialect),
             "sql_dialect": sql_dialect_str,
         }
 
         if self.salting_partitions and self.arrays_to_explode:
             raise ValueError("Cannot use both salting_partitions and arrays_to_explode")
 
+        if self.salting_min_block_size is not None and not self.salting_partitions:
+            raise ValueError("salting_min_block_size requires salting_partitions")
+
         if self.salting_partitions:
             level_dict["salting_partitions"] = self.salting_partitions
 
+        if self.salting_min_block_size is not None:
+            level_dict["salting_min_block_size"] = self.salting_min_block_size
+
+        if (
+            self.max_array_length is not None
+            or self.max_array_element_frequency is not None
+        ) and not self.arrays_to_explode:
+            raise ValueError(
+                "max_array_length and max_array_element_frequency require "
+                "arrays_to_explode"
+            )
+
         if self.arrays_to_explode:
             level_dict["arrays_to_explode"] = self.arrays_to_explode
 
+        if self.max_array_length is not None:
+            level_dict["max_array_length"] = self.max_array_length
+
+        if self.max_array_element_frequency is not None:
+            level_dict["max_array_element_frequency"] = self.max_array_element_frequency
+
         return level_dict
 
     @final
@@ -6,13 +6,19 @@ from splink.internals.blocking import BlockingRule
 from splink.internals.blocking_rule_creator import BlockingRuleCreator
 from splink.internals.misc import ensure_is_iterable
 
-from .blocking_rule_library import CustomRule
+from .blocking_rule_library import CustomRule, MinHashLSHRule, SortedNeighbourhoodRule
 
 
 def to_blocking_rule_creator(
     blocking_rule_creator: Union[dict[str, Any], str, BlockingRuleCreator],
 ) -> BlockingRuleCreator:
     if isinstance(blocking_rule_creator, dict):
+        if "sort_keys" in blocking_rule_creator:
+            br = dict(blocking_rule_creator)
+            return SortedNeighbourhoodRule(*br.pop("sort_keys"), **br)
+        if "lsh_column" in blocking_rule_creator:
+            br = dict(blocking_rule_creator)
+            return MinHashLSHRule(br.pop("lsh_column"), **br)
         return CustomRule(**blocking_rule_creator)
     if isinstance(blocking_rule_creator, str):
         return CustomRule(blocking_rule_creator)
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-from typing import Any, Union, final
+from typing import Any, Literal, Union, final
 
-from sqlglot import TokenError, parse_one
+from sqlglot import TokenError
 
+from splink.internals.blocking import (
+    MinHashLSHBlockingRule,
+    lsh_probability_of_pairing,
+)
 from splink.internals.blocking_rule_creator import BlockingRuleCreator
 from splink.internals.column_expression import ColumnExpression
 from splink.internals.dialects import SplinkDialect
+from splink.internals.sql_parse_cache import transpile_cached
 
 
 def _translate_sql_string(
@@ -14,9 +19,28 @@ def _translate_sql_string(
     to_sqlglot_dialect: str,
     from_sqlglot_dialect: str = None,
 ) -> str:
-    tree = parse_one(sqlglot_base_dialect_sql, read=from_sqlglot_dialect)
+    return transpile_cached(
+        sqlglot_base_dialect_sql, read=from_sqlglot_dialect, write=to_sqlglot_dialect
+    )
 
-    return tree.sql(dialect=to_sqlglot_dialect)
+
+def _expression_name_in_dialect(
+    col_expression: ColumnExpression,
+    sql_dialect: SplinkDialect,
+    base_dialect_str: str | None,
+) -> str:
+    col_expression.sql_dialect = sql_dialect
+    name = col_expression.name
+    if base_dialect_str is not None:
+        base_dialect = SplinkDialect.from_string(base_dialect_str)
+        if sql_dialect != base_dialect:
+            try:
+                name = _translate_sql_string(
+                    name, sql_dialect.sqlglot_name, base_dialect.sqlglot_name
+                )
+            except TokenError:
+                pass
+    return name
 
 
 class ExactMatchRule(BlockingRuleCreator):
@@ -25,9 +49,16 @@ class ExactMatchRule(BlockingRuleCreator):
         col_name_or_expr: Union[str, ColumnExpression],
         salting_partitions: int = None,
         arrays_to_explode: list[str] | None = None,
+        salting_min_block_size: int | None = None,
+        max_array_length: int | None = None,
+        max_array_element_frequency: int | None = None,
     ):
         super().__init__(
-            salting_partitions=salting_partitions, arrays_to_explode=arrays_to_explode
+            salting_partitions=salting_partitions,
+            arrays_to_explode=arrays_to_explode,
+            salting_min_block_size=salting_min_block_size,
+            max_array_length=max_array_length,
+            max_array_element_frequency=max_array_element_frequency,
         )
         self.col_expression = ColumnExpression.instantiate_if_str(col_name_or_expr)
 
@@ -44,9 +75,16 @@ class CustomRule(BlockingRuleCreator):
         sql_dialect: str = None,
         salting_partitions: int | None = None,
         arrays_to_explode: list[str] | None = None,
+        salting_min_block_size: int | None = None,
+        max_array_length: int | None = None,
+        max_array_element_frequency: int | None = None,
     ):
         super().__init__(
-            salting_partitions=salting_partitions, arrays_to_explode=arrays_to_explode
+            salting_partitions=salting_partitions,
+            arrays_to_explode=arrays_to_explode,
+            salting_min_block_size=salting_min_block_size,
+            max_array_length=max_array_length,
+            max_array_element_frequency=max_array_element_frequency,
         )
         self.sql_condition = blocking_rule
 
@@ -142,12 +180,17 @@ class Or(_Merge):
 
 class Not(BlockingRuleCreator):
     def __init__(self, blocking_rule_creator):
+        super().__init__()
         self.blocking_rule_creator = blocking_rule_creator
 
     @property
     def salting_partitions(self):
         return self.blocking_rule_creator.salting_partitions
 
+    @property
+    def salting_min_block_size(self):
+        return self.blocking_rule_creator.salting_min_block_size
+
     @property
     def arrays_to_explode(self):
         if self.blocking_rule_creator.arrays_to_explode:
@@ -159,10 +202,134 @@ class Not(BlockingRuleCreator):
         return f"NOT ({self.blocking_rule_creator.create_sql(sql_dialect)})"
 
 
+class SortedNeighbourhoodRule(BlockingRuleCreator):
+    def __init__(
+        self,
+        *sort_keys: Union[str, ColumnExpression],
+        window_size: int,
+        sql_dialect: str | None = None,
+    ):
+        """Sorted neighbourhood blocking. Records are ordered by the sort keys,
+        and each record is compared to the `window_size` records which follow it
+        in that order.
+
+        Unlike equi-join blocking rules, the number of comparisons generated is
+        predictable: at most n × `window_size` for n input records, regardless
+        of how skewed the sort keys are. Records with a null in any sort key are
+        not compared.
+
+        Args:
+            sort_keys: Input columns or SQL expressions to sort records by.
+            window_size (int): The number of following records each record is
+                compared to.
+            sql_dialect (optional, str): The dialect the sort key expressions
+                are written in, if they need translating to the backend's dialect.
+
+        Examples:
+            ``` python
+            from splink import SortedNeighbourhoodRule
+            br = SortedNeighbourhoodRule("surname", "first_name", window_size=10)
+            ```
+        """
+        super().__init__()
+        if len(sort_keys) == 0:
+            raise ValueError("Must provide at least one sort key")
+        if not isinstance(window_size, int) or window_size < 1:
+            raise ValueError("window_size must be a positive integer")
+        self.sort_keys = [ColumnExpression.instantiate_if_str(k) for k in sort_keys]
+        self.window_size = window_size
+        self.base_dialect_str = sql_dialect
+
+    def create_sql(self, sql_dialect: SplinkDialect) -> str:
+        return "1=1"
+
+    def _blocking_rule_dict_entries(self, sql_dialect: SplinkDialect) -> dict[str, Any]:
+        sort_keys = [
+            _expression_name_in_dialect(k, sql_dialect, self.base_dialect_str)
+            for k in self.sort_keys
+        ]
+        return {"sort_keys": sort_keys, "window_size": self.window_size}
+
+
+class MinHashLSHRule(BlockingRuleCreator):
+    def __init__(
+        self,
+        col_name_or_expr: Union[str, ColumnExpression],
+        num_bands: int,
+        rows_per_band: int,
+        tokens: Literal["qgrams", "words"] = "qgrams",
+        qgram_size: int = 2,
+        sql_dialect: str | None = None,
+    ):
+        """MinHash locality sensitive hashing (LSH) blocking, which pairs records
+        whose values of a column have similar sets of tokens, e.g. names or
+        addresses with typos or with words in a different order.
+
+        Each record's tokens are summarised by `num_bands` × `rows_per_band`
+        MinHash values, split into `num_bands` bands. Records are compared if
+        all the MinHash values in any one band are equal. Two values whose token
+        sets have a Jaccard similarity of s are compared with probability
+        1 - (1 - s^`rows_per_band`)^`num_bands`, which is available from
+        `probability_of_pairing()`.
+
+        Args:
+            col_name_or_expr: The input column or SQL expression to tokenise.
+            num_bands (int): The number of bands. More bands increase recall.
+            rows_per_band (int): The number of MinHash values in each band. More
+                rows per band reduce the number of dissimilar pairs compared.
+            tokens (str, optional): Whether to tokenise into overlapping
+                character `"qgrams"`, or space separated `"words"`. Defaults to
+                `"qgrams"`.
+            qgram_size (int, optional): The length of the q-grams. Defaults to 2.
+            sql_dialect (optional, str): The dialect the column expression is
+                written in, if it needs translating to the backend's dialect.
+
+        Examples:
+            ``` python
+            from splink import MinHashLSHRule
+            br = MinHashLSHRule("address", num_bands=20, rows_per_band=3)
+            br.probability_of_pairing(0.7)
+            ```
+        """
+        super().__init__()
+        self.col_expression = ColumnExpression.instantiate_if_str(col_name_or_expr)
+        self.num_bands = num_bands
+        self.rows_per_band = rows_per_band
+        self.tokens = tokens
+        self.qgram_size = qgram_size
+        self.base_dialect_str = sql_dialect
+
+    def probability_of_pairing(self, jaccard_similarity: float) -> float:
+        """The probability that two values whose token sets have the given
+        Jaccard similarity are compared, i.e. the expected recall of the rule for
+        pairs of that similarity"""
+        return lsh_probability_of_pairing(
+            jaccard_similarity, self.num_bands, self.rows_per_band
+        )
+
+    def create_sql(self, sql_dialect: SplinkDialect) -> str:
+        col = MinHashLSHBlockingRule.band_key_column_name
+        return f"l.{col} = r.{col}"
+
+    def _blocking_rule_dict_entries(self, sql_dialect: SplinkDialect) -> dict[str, Any]:
+        return {
+            "lsh_column": _expression_name_in_dialect(
+                self.col_expression, sql_dialect, self.base_dialect_str
+            ),
+            "num_bands": self.num_bands,
+            "rows_per_band": self.rows_per_band,
+            "tokens": self.tokens,
+            "qgram_size": self.qgram_size,
+        }
+
+
 def block_on(
     *col_names_or_exprs: Union[str, ColumnExpression],
     salting_partitions: int | None = None,
     arrays_to_explode: list[str] | None = None,
+    salting_min_block_size: int | None = None,
+    max_array_length: int | None = None,
+    max_array_element_frequency: int | None = None,
 ) -> BlockingRuleCreator:
     """Generates blocking rules of equality conditions  based on the columns
     or SQL expressions specified.
@@ -182,6 +349,16 @@ def block_on(
             be found within the docs.
         arrays_to_explode (optional, List[str]): List of arrays to explode
             before applying the blocking rule.
+        salting_min_block_size (optional, int): If specified alongside
+            `salting_partitions`, only salt the blocks which would generate more
+            than this many comparisons (before filter conditions), leaving
+            the remaining blocks unsalted.
+        max_array_length (optional, int): If specified alongside
+            `arrays_to_explode`, only the first `max_array_length` elements of
+            each array are exploded.
+        max_array_element_frequency (optional, int): If specified alongside
+            `arrays_to_explode`, array elements found in more than this many
+            records (e.g. very common tokens) are not used for blocking.
 
     Examples:
         ``` python
@@ -190,6 +367,26 @@ def block_on(
         br_2 = block_on("substr(surname,1,2)", "surname")
         ```
 
+        Only salt the largest blocks, e.g. the 'John Smith' block:
+        ``` python
+        br_3 = block_on(
+            "first_name",
+            "surname",
+            salting_partitions=8,
+            salting_min_block_size=1_000_000,
+        )
+        ```
+
+        Block on shared tokens, ignoring tokens found in over 1,000 records:
+        ``` python
+        br_4 = block_on(
+            "name_tokens",
+            arrays_to_explode=["name_tokens"],
+            max_array_length=20,
+            max_array_element_frequency=1_000,
+        )
+        ```
+
     """
     if isinstance(col_names_or_exprs[0], list):
         raise TypeError(
@@ -205,6 +402,12 @@ def block_on(
 
     if salting_partitions:
         br._salting_partitions = salting_partitions
+    if salting_min_block_size is not None:
+        br._salting_min_block_size = salting_min_block_size
     if arrays_to_explode:
         br._arrays_to_explode = arrays_to_explode
+    if max_array_length is not None:
+        br._max_array_length = max_array_length
+    if max_array_element_frequency is not None:
+        br._max_array_element_frequency = max_array_element_frequency
     return br
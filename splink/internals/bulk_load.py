@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import datetime
+import math
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Literal, Sequence
+
+import pandas as pd
+
+from splink.internals.splink_dataframe import _import_pyarrow
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+ColumnKind = Literal[
+    "integer", "float", "boolean", "date", "timestamp", "string", "other"
+]
+
+DEFAULT_LOAD_BATCH_SIZE = 100_000
+
+
+def is_arrow_table(obj: Any) -> bool:
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return False
+    return isinstance(obj, pa.Table)
+
+
+def is_parquet_path(obj: Any) -> bool:
+    return isinstance(obj, (str, Path)) and Path(obj).suffix == ".parquet"
+
+
+def read_parquet_as_arrow_table(path: str | Path) -> pa.Table:
+    _import_pyarrow()
+    import pyarrow.parquet as pq
+
+    return pq.read_table(path)
+
+
+def _kind_of_arrow_type(arrow_type: pa.DataType) -> ColumnKind:
+    import pyarrow as pa
+
+    if pa.types.is_boolean(arrow_type):
+        return "boolean"
+    if pa.types.is_integer(arrow_type):
+        return "integer"
+    if pa.types.is_floating(arrow_type) or pa.types.is_decimal(arrow_type):
+        return "float"
+    if pa.types.is_date(arrow_type):
+        return "date"
+    if pa.types.is_timestamp(arrow_type):
+        return "timestamp"
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return "string"
+    return "other"
+
+
+def _kind_of_pandas_series(series: pd.Series) -> ColumnKind:
+    if pd.api.types.is_bool_dtype(series):
+        return "boolean"
+    if pd.api.types.is_integer_dtype(series):
+        return "integer"
+    if pd.api.types.is_float_dtype(series):
+        return "float"
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return "timestamp"
+    return _kind_of_values(series.dropna().head(1).tolist())
+
+
+def _kind_of_values(values: Sequence[Any]) -> ColumnKind:
+    # Inferred from the first non-null value, as pandas does for object columns
+    for v in values:
+        if v is None or (isinstance(v, float) and math.isnan(v)):
+            continue
+        if isinstance(v, bool):
+            return "boolean"
+        if isinstance(v, int):
+            return "integer"
+        if isinstance(v, float):
+            return "float"
+        if isinstance(v, datetime.datetime):
+            return "timestamp"
+        if isinstance(v, datetime.date):
+            return "date"
+        if isinstance(v, str):
+            return "string"
+        return "other"
+    return "string"
+
+
+class BulkLoadTable:
+    """A uniform, row-oriented view of an in-memory input table (a pyarrow Table,
+    pandas DataFrame, dict of columns or list of records), for backends which
+    load data using batched inserts or COPY rather than reading pandas or Arrow
+    data natively.
+
+    Rows are produced in batches of tuples, with missing values (including NaN
+    and NaT) as None, so the whole table is never converted to Python objects at
+    once.
+    """
+
+    def __init__(self, input: Any):
+        if isinstance(input, dict):
+            input = pd.DataFrame(input)
+        elif isinstance(input, list):
+            input = pd.DataFrame.from_records(input)
+
+        self.input = input
+        if is_arrow_table(input):
+            self.columns = list(input.schema.names)
+            self.kinds = [_kind_of_arrow_type(t) for t in input.schema.types]
+        elif isinstance(input, pd.DataFrame):
+            self.columns = [str(c) for c in input.columns]
+            self.kinds = [_kind_of_pandas_series(input[c]) for c in input.columns]
+        else:
+            raise TypeError(
+                f"Cannot load input of type {type(input).__name__}. Input must be "
+                "a pandas DataFrame, pyarrow Table, dict or list of records."
+            )
+
+    @property
+    def column_kinds(self) -> Dict[str, ColumnKind]:
+        return dict(zip(self.columns, self.kinds))
+
+    def iter_row_batches(
+        self, batch_size: int = DEFAULT_LOAD_BATCH_SIZE
+    ) -> Iterator[List[tuple[Any, ...]]]:
+        input = self.input
+        if is_arrow_table(input):
+            for batch in input.to_batches(max_chunksize=batch_size):
+                yield list(zip(*(c.to_pylist() for c in batch.columns)))
+        else:
+            for start in range(0, len(input), batch_size):
+                chunk = input.iloc[start : start + batch_size]
+                yield list(
+                    zip(
+                        *(
+                            s.astype(object).where(s.notna(), None).tolist()
+                            for _, s in chunk.items()
+                        )
+                    )
+                )
@@ -1,7 +1,9 @@
 import logging
-from collections import UserDict
+import re
+import weakref
+from collections import OrderedDict, UserDict
 from copy import copy
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from splink.internals.splink_dataframe import SplinkDataFrame
 
@@ -12,12 +14,34 @@ if TYPE_CHECKING:
 else:
     TypedUserDict = UserDict
 
+# Tables which are reused throughout a session, and are expensive to recompute,
+# are never evicted when a cache budget is set
+DEFAULT_PINNED_TABLES = [
+    r"__splink__df_concat",
+    r"__splink__df_concat_with_tf",
+    r"__splink__df_tf_.+",
+    r"__splink__df_concat_unnested",
+    r"__splink__marginal_exploded_ids_blocking_rule.*",
+]
+
 
 class CacheDictWithLogging(TypedUserDict):
     def __init__(self):
         super().__init__()
         self.executed_queries = []
         self.queries_retrieved_from_cache = []
+        self.evicted_tables = []
+
+        # Least recently used first.  Maps physical name -> (rows, bytes)
+        self._table_sizes: OrderedDict[str, Tuple[int, Optional[int]]] = OrderedDict()
+        self._max_rows: Optional[int] = None
+        self._max_bytes: Optional[int] = None
+        self._pinned_tables: List[str] = DEFAULT_PINNED_TABLES
+
+        # SplinkDataFrames handed out by the cache which are still referenced,
+        # e.g. by a caller or as the input of a pipeline.  Their tables are in
+        # use, so are never evicted.  Maps physical name -> frames
+        self._live_frames: Dict[str, weakref.WeakSet[SplinkDataFrame]] = {}
 
     def __getitem__(self, key: str) -> SplinkDataFrame:
         splink_dataframe = super().__getitem__(key)
@@ -30,14 +54,30 @@ class CacheDictWithLogging(TypedUserDict):
         if not isinstance(value, SplinkDataFrame):
             raise TypeError("Cached items must be of type SplinkDataFrame")
 
-        super().__setitem__(key, value)
+        # Store a copy, so that the caller's frame marks the table as in use
+        # only for as long as the caller holds it
+        super().__setitem__(key, copy(value))
+        self._track_live_frame(value)
 
         logger.log(
             1, f"Setting cache for {key}" f" with physical name {value.physical_name}"
         )
 
+        if self.has_budget:
+            self._track_table_size(value)
+            self._evict_to_budget(protect=value.physical_name)
+
+    def __delitem__(self, key):
+        physical_name = self.data[key].physical_name
+        super().__delitem__(key)
+        if not any(df.physical_name == physical_name for df in self.data.values()):
+            self._table_sizes.pop(physical_name, None)
+            self._live_frames.pop(physical_name, None)
+
     def invalidate_cache(self):
         self.data = dict()
+        self._table_sizes = OrderedDict()
+        self._live_frames = {}
 
     def get_with_logging(self, key):
         df = self[key]
@@ -45,10 +85,99 @@ class CacheDictWithLogging(TypedUserDict):
         logger.debug(
             f"Using cache for template name {key}" f" with physical name {phy_name}"
         )
-        self.queries_retrieved_from_cache.append(df)
+        self.queries_retrieved_from_cache.append(copy(df))
+        if phy_name in self._table_sizes:
+            self._table_sizes.move_to_end(phy_name)
+        self._track_live_frame(df)
 
         return df
 
+    def _track_live_frame(self, splink_dataframe: SplinkDataFrame) -> None:
+        physical_name = splink_dataframe.physical_name
+        self._live_frames.setdefault(physical_name, weakref.WeakSet()).add(
+            splink_dataframe
+        )
+
+    def _is_in_use(self, physical_name: str) -> bool:
+        live_frames = self._live_frames.get(physical_name)
+        return live_frames is not None and len(live_frames) > 0
+
+    @property
+    def has_budget(self) -> bool:
+        return self._max_rows is not None or self._max_bytes is not None
+
+    def set_budget(
+        self,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        pinned_tables: Optional[List[str]] = None,
+    ) -> None:
+        self._max_rows = max_rows
+        self._max_bytes = max_bytes
+        if pinned_tables is not None:
+            self._pinned_tables = pinned_tables
+
+        if self.has_budget:
+            for df in self.data.values():
+                self._track_table_size(df)
+            self._evict_to_budget()
+
+    def _is_evictable(self, splink_dataframe: SplinkDataFrame) -> bool:
+        if not splink_dataframe.created_by_splink:
+            return False
+        return not re.fullmatch(
+            r"|".join(self._pinned_tables), splink_dataframe.templated_name
+        )
+
+    def _track_table_size(self, splink_dataframe: SplinkDataFrame) -> None:
+        physical_name = splink_dataframe.physical_name
+        if physical_name in self._table_sizes:
+            self._table_sizes.move_to_end(physical_name)
+            return
+        if not self._is_evictable(splink_dataframe):
+            return
+        db_api = splink_dataframe.db_api
+        self._table_sizes[physical_name] = db_api._table_size(physical_name)
+
+    def _total_size(self) -> Tuple[int, int]:
+        rows = sum(r for r, _ in self._table_sizes.values())
+        size_bytes = sum(b or 0 for _, b in self._table_sizes.values())
+        return rows, size_bytes
+
+    def _over_budget(self) -> bool:
+        rows, size_bytes = self._total_size()
+        if self._max_rows is not None and rows > self._max_rows:
+            return True
+        if self._max_bytes is not None and size_bytes > self._max_bytes:
+            return True
+        return False
+
+    def _evict_to_budget(self, protect: Optional[str] = None) -> None:
+        candidates = [
+            name
+            for name in self._table_sizes
+            if name != protect and not self._is_in_use(name)
+        ]
+        for physical_name in candidates:
+            if not self._over_budget():
+                break
+            self._evict(physical_name)
+
+    def _evict(self, physical_name: str) -> None:
+        splink_dataframe = next(
+            df for df in self.data.values() if df.physical_name == physical_name
+        )
+        rows, size_bytes = self._table_sizes[physical_name]
+        logger.debug(
+            f"Evicting {splink_dataframe.templated_name} with physical name "
+            f"{physical_name} ({rows} rows) from cache to stay within budget"
+        )
+        # This also removes every key that refers to this table from the cache
+        splink_dataframe.drop_table_from_database_and_remove_from_cache()
+        self._table_sizes.pop(physical_name, None)
+        self._live_frames.pop(physical_name, None)
+        self.evicted_tables.append(splink_dataframe)
+
     def reset_executed_queries_tracker(self):
         self.executed_queries = []
 
@@ -78,3 +207,18 @@ class CacheDictWithLogging(TypedUserDict):
                 names.append(df.templated_name)
 
         return name_to_find in names
+
+    def reset_evicted_tables_tracker(self):
+        self.evicted_tables = []
+
+    def is_in_evicted_tables(
+        self, name_to_find, search_physical=True, search_templated=True
+    ):
+        names = []
+        for df in self.evicted_tables:
+            if search_physical:
+                names.append(df.physical_name)
+            if search_templated:
+                names.append(df.templated_name)
+
+        return name_to_find in names
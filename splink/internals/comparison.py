@@ -146,14 +146,30 @@ class Comparison:
         return any([cl._has_tf_adjustments for cl in self.comparison_levels])
 
     @property
-    def _case_statement(self):
+    def _case_expression(self):
         sqls = [
             cl._when_then_comparison_vector_value_sql for cl in self.comparison_levels
         ]
         sql = " ".join(sqls)
-        sql = f"CASE {sql} END as {self._gamma_column_name}"
+        return f"CASE {sql} END"
+
+    @property
+    def _case_statement(self):
+        return f"{self._case_expression} as {self._gamma_column_name}"
+
+    @property
+    def _memoised_table_name(self):
+        return f"__splink__memoised_{self._gamma_column_name}"
 
-        return sql
+    @property
+    def _memoised_case_statement(self):
+        # Pairs of values not found in the memoised table, e.g. because one of
+        # them is null, fall back to evaluating the case expression
+        gamma = f"{self._memoised_table_name}.{self._gamma_column_name}"
+        return (
+            f"CASE WHEN {gamma} IS NOT NULL THEN {gamma} "
+            f"ELSE {self._case_expression} END as {self._gamma_column_name}"
+        )
 
     @property
     def _input_columns_used_by_case_statement(self):
@@ -199,7 +215,9 @@ class Comparison:
 
         return dedupe_preserving_order(cols)
 
-    def _columns_to_select_for_comparison_vector_values(self, retain_matching_columns):
+    def _columns_to_select_for_comparison_vector_values(
+        self, retain_matching_columns, memoised=False
+    ):
         input_cols = []
         for cl in self.comparison_levels:
             input_cols.extend(cl._input_columns_used_by_sql_condition)
@@ -209,7 +227,10 @@ class Comparison:
             for col in input_cols:
                 output_cols.extend(col.names_l_r)
 
-        output_cols.append(self._case_statement)
+        if memoised:
+            output_cols.append(self._memoised_case_statement)
+        else:
+            output_cols.append(self._case_statement)
 
         for cl in self.comparison_levels:
             if cl._has_tf_adjustments:
@@ -222,6 +243,7 @@ class Comparison:
         self,
         retain_matching_columns: bool,
         retain_intermediate_calculation_columns: bool,
+        bayes_factor_from_lookup: bool = False,
     ) -> List[str]:
         input_cols = []
         for cl in self.comparison_levels:
@@ -240,14 +262,18 @@ class Comparison:
                     col = cl._tf_adjustment_input_column
                     output_cols.extend(col.tf_name_l_r)
 
-        # Bayes factor case when statement
-        sqls = [
-            cl._bayes_factor_sql(self._gamma_column_name)
-            for cl in self.comparison_levels
-        ]
-        sql = " ".join(sqls)
-        sql = f"CASE {sql} END as {self._bf_column_name} "
-        output_cols.append(sql)
+        if bayes_factor_from_lookup:
+            # The Bayes factor is a column of the joined agreement pattern lookup
+            output_cols.append(self._bf_column_name)
+        else:
+            # Bayes factor case when statement
+            sqls = [
+                cl._bayes_factor_sql(self._gamma_column_name)
+                for cl in self.comparison_levels
+            ]
+            sql = " ".join(sqls)
+            sql = f"CASE {sql} END as {self._bf_column_name} "
+            output_cols.append(sql)
 
         # tf adjustment case when statement
 
@@ -22,6 +22,7 @@ from splink.internals.misc import (
     match_weight_to_bayes_factor,
 )
 from splink.internals.parse_sql import get_columns_used_from_sql
+from splink.internals.sql_parse_cache import parse_one_cached
 from splink.internals.sql_transform import sqlglot_tree_signature
 
 logger = logging.getLogger(__name__)
@@ -30,7 +31,7 @@ logger = logging.getLogger(__name__)
 def _is_exact_match(sql_syntax_tree):
     signature = sqlglot_tree_signature(sql_syntax_tree)
 
-    if signature != sqlglot_tree_signature(sqlglot.parse_one("col_l = col_r")):
+    if signature != sqlglot_tree_signature(parse_one_cached("col_l = col_r")):
         return False
 
     cols = [s.output_name for s in sql_syntax_tree.find_all(Column)]
@@ -408,7 +409,7 @@ class ComparisonLevel:
             return True
         dialect = self.sql_dialect
         try:
-            sqlglot.parse_one(sql, read=dialect)
+            parse_one_cached(sql, read=dialect)
         except sqlglot.ParseError as e:
             raise ValueError(f"Error parsing sql_statement:\n{sql}") from e
 
@@ -471,7 +472,7 @@ class ComparisonLevel:
         if self._is_else_level:
             return False
 
-        sql_syntax_tree = sqlglot.parse_one(
+        sql_syntax_tree = parse_one_cached(
             self.sql_condition.lower(), read=self.sql_dialect
         )
         sql_cnf = simplify(normalize(sql_syntax_tree))
@@ -484,7 +485,7 @@ class ComparisonLevel:
 
     @property
     def _exact_match_colnames(self):
-        sql_syntax_tree = sqlglot.parse_one(
+        sql_syntax_tree = parse_one_cached(
             self.sql_condition.lower(), read=self.sql_dialect
         )
         sql_cnf = simplify(normalize(sql_syntax_tree))
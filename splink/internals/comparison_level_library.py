@@ -2,13 +2,14 @@ from __future__ import annotations
 
 from copy import copy
 from functools import wraps
-from typing import Any, Callable, List, Literal, TypeVar, Union
+from typing import Any, Callable, List, Literal, Optional, TypeVar, Union
 
 from sqlglot import TokenError, parse_one
 
 from splink.internals.column_expression import ColumnExpression
 from splink.internals.comparison_level_sql import great_circle_distance_km_sql
 from splink.internals.dialects import SplinkDialect
+from splink.internals.sql_parse_cache import transpile_cached
 
 # import composition functions for export
 from .comparison_level_composition import And, Not, Or  # NOQA: F401
@@ -42,9 +43,9 @@ def _translate_sql_string(
     to_sqlglot_dialect: str,
     from_sqlglot_dialect: str = None,
 ) -> str:
-    tree = parse_one(sqlglot_base_dialect_sql, read=from_sqlglot_dialect)
-
-    return tree.sql(dialect=to_sqlglot_dialect)
+    return transpile_cached(
+        sqlglot_base_dialect_sql, read=from_sqlglot_dialect, write=to_sqlglot_dialect
+    )
 
 
 def validate_numeric_parameter(
@@ -358,6 +359,31 @@ class ColumnsReversedLevel(ComparisonLevelCreator):
         return f"Match on reversed cols: {col_1.label} and {col_2.label}"
 
 
+def _edit_distance_guard_sql(
+    col: ColumnExpression, sql_dialect: SplinkDialect, distance_threshold: int
+) -> Optional[str]:
+    """A cheap necessary condition for an edit distance of at most
+    `distance_threshold`: the lengths of the strings differ by at most as much.
+
+    Guards are only used for plain columns, so that transforms are not computed
+    twice.
+    """
+    if not col.is_pure_column_or_column_reference:
+        return None
+    len_fn = sql_dialect.string_length_function_name
+    return (
+        f"abs({len_fn}({col.name_l}) - {len_fn}({col.name_r})) "
+        f"<= {distance_threshold}"
+    )
+
+
+def _guarded_sql(guard_sql: Optional[str], sql: str) -> str:
+    # Backends can skip the expensive condition where the guard is false
+    if guard_sql is None:
+        return sql
+    return f"{guard_sql} and {sql}"
+
+
 class LevenshteinLevel(ComparisonLevelCreator):
     def __init__(self, col_name: Union[str, ColumnExpression], distance_threshold: int):
         """A comparison level using a sqlglot_dialect_name distance function
@@ -376,7 +402,10 @@ class LevenshteinLevel(ComparisonLevelCreator):
         self.col_expression.sql_dialect = sql_dialect
         col = self.col_expression
         lev_fn = sql_dialect.levenshtein_function_name
-        return f"{lev_fn}({col.name_l}, {col.name_r}) <= {self.distance_threshold}"
+        return _guarded_sql(
+            _edit_distance_guard_sql(col, sql_dialect, self.distance_threshold),
+            f"{lev_fn}({col.name_l}, {col.name_r}) <= {self.distance_threshold}",
+        )
 
     def create_label_for_charts(self) -> str:
         col = self.col_expression
@@ -401,7 +430,10 @@ class DamerauLevenshteinLevel(ComparisonLevelCreator):
         self.col_expression.sql_dialect = sql_dialect
         col = self.col_expression
         dm_lev_fn = sql_dialect.damerau_levenshtein_function_name
-        return f"{dm_lev_fn}({col.name_l}, {col.name_r}) <= {self.distance_threshold}"
+        return _guarded_sql(
+            _edit_distance_guard_sql(col, sql_dialect, self.distance_threshold),
+            f"{dm_lev_fn}({col.name_l}, {col.name_r}) <= {self.distance_threshold}",
+        )
 
     def create_label_for_charts(self) -> str:
         return (
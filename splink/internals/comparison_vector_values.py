@@ -1,13 +1,24 @@
 from __future__ import annotations
 
 import logging
-from typing import List, Optional
+import re
+from typing import TYPE_CHECKING, List, Optional
 
+from splink.internals.dialects import SplinkDialect
 from splink.internals.input_column import InputColumn
 from splink.internals.unique_id_concat import _composite_unique_id_from_nodes_sql
 
+if TYPE_CHECKING:
+    from splink.internals.comparison import Comparison
+
 logger = logging.getLogger(__name__)
 
+# Comparisons are memoised automatically when they have at most this many
+# distinct pairs of values per blocked pair
+MEMOISE_DISTINCT_PAIR_RATIO = 0.1
+
+MEMOISED_KEY_PREFIX = "__splink__memoised_key_"
+
 
 def compute_comparison_vector_values_sql(
     columns_to_select_for_comparison_vector_values: list[str],
@@ -43,10 +54,25 @@ def compute_comparison_vector_values_from_id_pairs_sqls(
     source_dataset_input_column: Optional[InputColumn],
     unique_id_input_column: InputColumn,
     include_clerical_match_score: bool = False,
+    blocked_pairs_tablename: str = "__splink__blocked_id_pairs",
+    memoised_comparisons: Optional[List[Comparison]] = None,
+    pruning_condition: Optional[str] = None,
 ) -> list[dict[str, str]]:
     """Compute the comparison vectors from __splink__blocked_id_pairs, the
     materialised dataframe of blocked pairwise record comparisons.
 
+    `blocked_pairs_tablename` may be set to score a subset of the blocked pairs
+    e.g. a single chunk when predicting in chunks.
+
+    The comparison vector values of `memoised_comparisons` are read from their
+    memoised tables (see `memoised_comparison_vector_values_sql`), which must be
+    inputs to the pipeline, and their case statements in
+    `columns_to_select_for_comparison_vector_values` must read from them.
+
+    Pairs for which `pruning_condition` is false are not scored, so that the
+    comparison vector values are not computed for them (see
+    `match_weight_upper_bound_condition_sql`).
+
     See [the fastlink paper](https://imai.fas.harvard.edu/research/files/linkage.pdf)
     for more details of what is meant by comparison vectors.
     """
@@ -70,7 +96,7 @@ def compute_comparison_vector_values_from_id_pairs_sqls(
     sql = sql = f"""
     select {select_cols_expr}, b.match_key
     from {input_tablename_l} as l
-    inner join __splink__blocked_id_pairs as b
+    inner join {blocked_pairs_tablename} as b
     on {uid_l_expr} = b.join_key_l
     inner join {input_tablename_r} as r
     on {uid_r_expr} = b.join_key_r
@@ -78,8 +104,14 @@ def compute_comparison_vector_values_from_id_pairs_sqls(
 
     sqls.append({"sql": sql, "output_table_name": "blocked_with_cols"})
 
+    memoised_joins = "".join(
+        _join_memoised_comparison_sql(cc) for cc in memoised_comparisons or []
+    )
+
     select_cols_expr = ", \n".join(columns_to_select_for_comparison_vector_values)
 
+    where_condition = f"where {pruning_condition}" if pruning_condition else ""
+
     if include_clerical_match_score:
         clerical_match_score = ", clerical_match_score"
     else:
@@ -89,8 +121,82 @@ def compute_comparison_vector_values_from_id_pairs_sqls(
     sql = f"""
     select {select_cols_expr} {clerical_match_score}
     from blocked_with_cols
+    {memoised_joins}
+    {where_condition}
     """
 
     sqls.append({"sql": sql, "output_table_name": "__splink__df_comparison_vectors"})
 
     return sqls
+
+
+def _memoised_input_columns(comparison: Comparison) -> list[str]:
+    return [
+        name
+        for col in comparison._input_columns_used_by_case_statement
+        for name in col.names_l_r
+    ]
+
+
+def distinct_value_pairs_sql(
+    comparison: Comparison, input_tablename: str = "blocked_with_cols"
+) -> str:
+    """Find the distinct pairs of values compared by `comparison`, e.g.
+    (first_name_l, first_name_r), and the number of pairs of records with each"""
+    cols_expr = ", ".join(_memoised_input_columns(comparison))
+    return f"""
+    select {cols_expr}, count(*) as __splink__num_pairs
+    from {input_tablename}
+    group by {cols_expr}
+    """
+
+
+def memoised_comparison_vector_values_sql(
+    comparison: Comparison,
+    input_tablename: str = "__splink__distinct_value_pairs",
+) -> str:
+    """Compute the comparison vector value of each distinct pair of values.
+
+    The compared columns are renamed to generic keys, so that they can be joined
+    back to the pairs of records without ambiguity.
+    """
+    keys_expr = ", ".join(
+        f"{col} as {MEMOISED_KEY_PREFIX}{i}"
+        for i, col in enumerate(_memoised_input_columns(comparison))
+    )
+    return f"""
+    select {keys_expr}, {comparison._case_statement}
+    from {input_tablename}
+    """
+
+
+def _join_memoised_comparison_sql(comparison: Comparison) -> str:
+    table_name = comparison._memoised_table_name
+    on_expr = " and ".join(
+        f"{col} = {table_name}.{MEMOISED_KEY_PREFIX}{i}"
+        for i, col in enumerate(_memoised_input_columns(comparison))
+    )
+    return f"\n    left join {table_name} on {on_expr}"
+
+
+def uses_string_similarity_function(
+    comparison: Comparison, sql_dialect: SplinkDialect
+) -> bool:
+    function_names = []
+    for fn in [
+        "levenshtein_function_name",
+        "damerau_levenshtein_function_name",
+        "jaro_function_name",
+        "jaro_winkler_function_name",
+        "jaccard_function_name",
+    ]:
+        try:
+            function_names.append(getattr(sql_dialect, fn))
+        except NotImplementedError:
+            pass
+
+    case_expression = comparison._case_expression.lower()
+    return any(
+        re.search(rf"\b{re.escape(name.lower())}\s*\(", case_expression)
+        for name in function_names
+    )
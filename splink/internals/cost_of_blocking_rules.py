@@ -1,10 +1,37 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Union
+from typing import TYPE_CHECKING, Dict, List, Union
+
+import sqlglot.expressions as exp
+from sqlglot.errors import ParseError
+
+from splink.internals.sql_parse_cache import parse_one_cached
+
+if TYPE_CHECKING:
+    from splink.internals.comparison import Comparison
 
 logger = logging.getLogger(__name__)
 
+# Relative costs of evaluating parts of a comparison level's SQL condition, where
+# a simple predicate such as an equality test costs 1.  String similarity and
+# other functions which look at every character of their inputs are much slower
+EXPENSIVE_FUNCTION_NAME_PARTS = (
+    "levenshtein",
+    "jaro",
+    "jaccard",
+    "cosine",
+    "distance",
+    "similarity",
+    "regexp",
+    "metaphone",
+    "soundex",
+    "intersect",
+)
+EXPENSIVE_FUNCTION_COST = 10
+FUNCTION_COST = 1
+PREDICATE_COST = 1
+
 
 def calculate_field_freedom_cost(combination_of_brs: List[Dict[str, float]]) -> float:
     """
@@ -114,3 +141,43 @@ def calculate_cost_of_combination_of_brs(
         "num_brs_cost": num_brs_cost,
         "num_comparison_rows_cost": normalised_row_count,
     }
+
+
+def estimate_cost_of_sql_condition(sql: str, sqlglot_dialect: str = None) -> float:
+    """Estimate the relative cost of evaluating a SQL condition for a single pair
+    of records, where a single equality test costs 1."""
+    try:
+        syntax_tree = parse_one_cached(sql, read=sqlglot_dialect)
+    except ParseError:
+        logger.debug(f"Could not parse {sql}, so assuming it has a cost of 1")
+        return PREDICATE_COST
+
+    cost: float = 0
+    for node in syntax_tree.find_all(exp.Func):
+        name = (node.name if isinstance(node, exp.Anonymous) else node.key).lower()
+        if any(part in name for part in EXPENSIVE_FUNCTION_NAME_PARTS):
+            cost += EXPENSIVE_FUNCTION_COST
+        else:
+            cost += FUNCTION_COST
+    for node in syntax_tree.find_all(exp.Binary):
+        if isinstance(node, exp.Predicate):
+            cost += PREDICATE_COST
+    return max(cost, PREDICATE_COST)
+
+
+def estimate_cost_per_comparison(comparisons: List["Comparison"]) -> float:
+    """Estimate the relative cost of scoring a single pair of records using
+    `comparisons`, where a single equality test costs 1.
+
+    Each comparison is a case statement, so in the worst case every level's
+    condition is evaluated.  The else level costs nothing.
+    """
+    total_cost: float = 0
+    for comparison in comparisons:
+        for level in comparison.comparison_levels:
+            if level._is_else_level:
+                continue
+            total_cost += estimate_cost_of_sql_condition(
+                level.sql_condition, level.sql_dialect
+            )
+    return total_cost
@@ -2,10 +2,23 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import threading
 import time
 from abc import ABC, abstractmethod
 from collections.abc import Sequence
-from typing import Any, Dict, Generic, List, Optional, TypeVar, Union, final
+from copy import copy
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    final,
+)
 
 import sqlglot
 from pandas import DataFrame as PandasDataFrame
@@ -13,7 +26,10 @@ from pandas import DataFrame as PandasDataFrame
 from splink.internals.cache_dict_with_logging import CacheDictWithLogging
 from splink.internals.logging_messages import execute_sql_logging_message_info, log_sql
 from splink.internals.misc import ascii_uid, ensure_is_list, parse_duration
+from splink.internals.persistent_cache import PersistentCacheManifest
 from splink.internals.pipeline import CTEPipeline
+from splink.internals.pipeline_scheduler import PipelineDAG
+from splink.internals.query_profiler import QueryProfiler
 from splink.internals.splink_dataframe import SplinkDataFrame
 
 from .dialects import (
@@ -37,6 +53,9 @@ T = TypeVar("T")
 class DatabaseAPI(ABC, Generic[TablishType]):
     sql_dialect: SplinkDialect
     debug_mode: bool = False
+    _supports_table_size_in_bytes: bool = False
+    _supports_concurrent_execution: bool = False
+    _supports_insert_into: bool = False
     """
     DatabaseAPI class handles _all_ interactions with the database
     Anything backend-specific (but not related to SQL dialects) lives here also
@@ -47,6 +66,247 @@ class DatabaseAPI(ABC, Generic[TablishType]):
     def __init__(self) -> None:
         self._intermediate_table_cache: CacheDictWithLogging = CacheDictWithLogging()
         self._cache_uid: str = ascii_uid(8)
+        self._persistent_cache: Optional[PersistentCacheManifest] = None
+        self._query_profiler: Optional[QueryProfiler] = None
+        self._max_concurrency: int = 1
+        self._optimise_pipelines: bool = False
+        self._prune_pipeline_columns: bool = False
+        self._blocking_key_index_enabled: bool = False
+        # guards the cache when pipelines are executed concurrently
+        self._cache_lock = threading.RLock()
+
+    def set_max_concurrency(self, max_concurrency: int) -> None:
+        """Set the maximum number of independent pipelines Splink may execute
+        at once.
+
+        Where Splink has several independent pieces of work - for example
+        computing term frequency tables for several columns, or materialising the
+        exploded id tables for several array-based blocking rules - these will be
+        submitted to the backend concurrently from a thread pool, up to this
+        limit.  For Postgres and Athena this means multiple concurrent queries,
+        and for Spark multiple concurrent jobs.
+
+        DuckDB already parallelises each individual query, and its connections
+        (and SQLite's) cannot be shared between threads, so for these backends
+        pipelines are always executed serially.
+
+        Args:
+            max_concurrency (int): The maximum number of pipelines to run at
+                once. Defaults to 1, meaning pipelines are run serially.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_concurrency > 1 and not self._supports_concurrent_execution:
+            logger.warning(
+                f"{type(self).__name__} does not support concurrent execution of "
+                "pipelines, so they will continue to be executed serially"
+            )
+        self._max_concurrency = max_concurrency
+
+    @property
+    def _effective_max_concurrency(self) -> int:
+        if self.debug_mode or not self._supports_concurrent_execution:
+            return 1
+        return self._max_concurrency
+
+    def sql_pipeline_dag_to_splink_dataframes(
+        self, dag: PipelineDAG
+    ) -> Dict[str, SplinkDataFrame]:
+        """
+        Execute a graph of pipelines, running independent pipelines concurrently
+        up to the limit set by `set_max_concurrency()`.
+
+        Returns a dict mapping the name of each node in the graph to its output
+        """
+        return dag.execute(
+            self.sql_pipeline_to_splink_dataframe,
+            max_concurrency=self._effective_max_concurrency,
+        )
+
+    def enable_persistent_cache(self, manifest_path: Union[str, Path]) -> None:
+        """Opt in to caching intermediate tables across sessions.
+
+        By default, the names of cached tables include a random per-session uid,
+        so tables computed by an earlier run can never be reused.  Once enabled,
+        tables are instead named using a stable fingerprint of the SQL, the
+        input tables it reads from and the Splink version, and a manifest of
+        tables created is kept at `manifest_path`.  A later session against the
+        same database with unchanged inputs will then reuse tables such as
+        `__splink__df_concat_with_tf` rather than recomputing them.
+
+        This must be called before input tables are registered (i.e. before
+        the `Linker` is created), so that they can be fingerprinted.
+
+        Examples:
+            ```py
+            db_api = DuckDBAPI("linkage.duckdb")
+            db_api.enable_persistent_cache("splink_cache_manifest.json")
+            linker = Linker(df, settings, db_api)
+            ```
+
+        Args:
+            manifest_path (str | Path): Path to the json manifest file. It will be
+                created if it does not exist.
+        """
+        self._persistent_cache = PersistentCacheManifest(manifest_path)
+
+    def set_pipeline_optimisation(
+        self, enabled: bool = True, prune_columns: bool = False
+    ) -> None:
+        """Configure the optimisation pass applied to each pipeline before it is
+        combined into a single SQL statement.
+
+        When enabled, CTEs with identical SQL are merged and CTEs which the final
+        query does not use - including unused input dataframes - are dropped.
+        Pipelines are not optimised unless this is called.
+
+        The references between CTEs are found by matching table names in the SQL
+        text, so a table name which only appears inside a string literal or
+        comment keeps a CTE which could have been dropped.
+
+        Args:
+            enabled (bool, optional): Whether to optimise pipelines. Defaults to
+                True.
+            prune_columns (bool, optional): If True, input dataframes are read
+                using only the columns later steps refer to, rather than
+                `select *`, reducing the data the backend scans.  This requires
+                looking up the columns of each input table, and is only applied
+                where every step reading from the table lists its columns
+                explicitly. Defaults to False.
+        """
+        self._optimise_pipelines = enabled
+        self._prune_pipeline_columns = prune_columns
+
+    def enable_blocking_key_index(self) -> None:
+        """Materialise a blocking key index table for each blocking rule, and
+        generate pairs by joining these rather than the input tables.
+
+        A rule's index table holds the unique id of each record, and the values of
+        the rule's join keys (e.g. `substr(surname, 1, 3)`), evaluated once and
+        ordered by key.  Index tables are cached like other intermediate tables,
+        so they are reused by `predict()`, expectation maximisation and blocking
+        analysis using the same rule, and across sessions if
+        `enable_persistent_cache()` has been called.
+
+        Only rules consisting of equi-join conditions on the same expression of
+        `l` and `r` (such as those created by `block_on`) use an index.  Where
+        preceding rules must be excluded, each preceding rule must also use an
+        index (or be an array-based or sorted neighbourhood rule).
+        """
+        self._blocking_key_index_enabled = True
+
+    def disable_blocking_key_index(self) -> None:
+        self._blocking_key_index_enabled = False
+
+    def enable_query_profiling(self, explain_analyze: bool = False) -> None:
+        """Record structured information about every pipeline executed.
+
+        For each table Splink materialises, the templated and physical name, wall
+        time, output row count and (where the backend can report it) output size
+        in bytes are recorded.  The results can be retrieved using
+        `query_profile_as_pandas_dataframe()`, or `linker.misc.query_profile()`.
+
+        Note that measuring the output size requires an additional (cheap) count
+        query per table.
+
+        Args:
+            explain_analyze (bool, optional): If True, also record the backend's
+                query plan - e.g. `EXPLAIN ANALYZE` in DuckDB, or
+                `EXPLAIN (ANALYZE, BUFFERS)` in Postgres.  This re-executes each
+                query, so roughly doubles run time. Defaults to False.
+        """
+        self._query_profiler = QueryProfiler(explain_analyze=explain_analyze)
+
+    def disable_query_profiling(self) -> None:
+        self._query_profiler = None
+
+    def query_profile_as_pandas_dataframe(self) -> PandasDataFrame:
+        """Return the records collected since `enable_query_profiling()` was
+        called, one row per executed pipeline.
+        """
+        if self._query_profiler is None:
+            raise SplinkException(
+                "Query profiling is not enabled. "
+                "Call `enable_query_profiling()` before running Splink operations."
+            )
+        return self._query_profiler.as_pandas_dataframe()
+
+    def _explain_analyze(self, sql: str) -> Optional[str]:
+        # Backends which can report an (analyzed) query plan should override
+        return None
+
+    def _table_fingerprint_sql(self, physical_name: str) -> str:
+        # sensible default - backends may add a checksum of the contents
+        return f"select count(*) as row_count from {physical_name}"
+
+    def _table_fingerprint(self, physical_name: str) -> str:
+        record = self._sql_to_record_dict(
+            self._table_fingerprint_sql(physical_name), "__splink__table_fingerprint"
+        )
+        return "_".join(str(v) for v in record.values())
+
+    def set_cache_budget(
+        self,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        pinned_tables: Optional[List[str]] = None,
+    ) -> None:
+        """Limit the total size of the intermediate tables Splink keeps in the
+        database.
+
+        By default every materialised intermediate table is kept until
+        `delete_tables_created_by_splink_from_db` is called.  Once a budget is set,
+        whenever a new table is cached the least recently used tables created by
+        Splink are dropped from the database until the total is back within
+        budget.  Tables behind SplinkDataFrames which are still referenced, e.g.
+        returned predictions or the inputs of a running pipeline, are never
+        dropped.  Evicted tables are recorded in
+        `_intermediate_table_cache.evicted_tables`, and will simply be recomputed
+        if they are needed again.
+
+        Args:
+            max_rows (int, optional): Maximum total number of rows across cached
+                tables. Defaults to None, meaning no row budget.
+            max_bytes (int, optional): Maximum total size in bytes of cached
+                tables. Only supported by backends which can report table sizes.
+                Defaults to None, meaning no byte budget.
+            pinned_tables (list[str], optional): Regexes of templated table names
+                which are never evicted.  Defaults to None, meaning
+                `__splink__df_concat`, `__splink__df_concat_with_tf`, term
+                frequency tables and exploded blocking id tables are pinned.
+        """
+        if max_bytes is not None and not self._supports_table_size_in_bytes:
+            raise NotImplementedError(
+                f"{type(self).__name__} cannot report table sizes in bytes, so "
+                "only a `max_rows` budget is supported"
+            )
+        self._intermediate_table_cache.set_budget(
+            max_rows=max_rows, max_bytes=max_bytes, pinned_tables=pinned_tables
+        )
+
+    def _table_size_sql(self, physical_name: str) -> str:
+        # sensible default - backends which can report bytes should override
+        return f"select count(*) as row_count from {physical_name}"
+
+    def _table_size(self, physical_name: str) -> Tuple[int, Optional[int]]:
+        record = self._sql_to_record_dict(
+            self._table_size_sql(physical_name), "__splink__table_size"
+        )
+        size_bytes = record.get("size_bytes")
+        return int(record["row_count"]), (
+            int(size_bytes) if size_bytes is not None else None
+        )
+
+    def _sql_to_record_dict(self, sql: str, templated_name: str) -> Dict[str, Any]:
+        # Run a query returning a single row of metadata, without adding the
+        # result to the cache or the executed queries tracker
+        splink_dataframe = self._materialise_sql(
+            sql, templated_name, f"{templated_name}_{ascii_uid(8)}"
+        )
+        splink_dataframe.created_by_splink = True
+        record = splink_dataframe.as_record_dict()[0]
+        splink_dataframe.drop_table_from_database_and_remove_from_cache()
+        return record
 
     @final
     def _log_and_run_sql_execution(
@@ -89,14 +349,45 @@ class DatabaseAPI(ABC, Generic[TablishType]):
 
         Returns a SplinkDataFrame which also uses templated_name
         """
+        start_time = time.perf_counter()
+        output_df = self._materialise_sql(sql, templated_name, physical_name)
+        wall_time = time.perf_counter() - start_time
+
+        if self._query_profiler is not None:
+            self._profile_query(sql, templated_name, physical_name, wall_time)
+
+        self._intermediate_table_cache.executed_queries.append(copy(output_df))
+        return output_df
+
+    @final
+    def _materialise_sql(
+        self, sql: str, templated_name: str, physical_name: str
+    ) -> SplinkDataFrame:
         sql = self._setup_for_execute_sql(sql, physical_name)
         spark_df = self._log_and_run_sql_execution(sql, templated_name, physical_name)
         output_df = self._cleanup_for_execute_sql(
             spark_df, templated_name, physical_name
         )
-        self._intermediate_table_cache.executed_queries.append(output_df)
         return output_df
 
+    def _profile_query(
+        self, sql: str, templated_name: str, physical_name: str, wall_time: float
+    ) -> None:
+        profiler = self._query_profiler
+        row_count, size_bytes = self._table_size(physical_name)
+        query_plan = None
+        if profiler.explain_analyze:
+            query_plan = self._explain_analyze(sql)
+        profiler.record(
+            templated_name=templated_name,
+            physical_name=physical_name,
+            wall_time_seconds=wall_time,
+            row_count=row_count,
+            size_bytes=size_bytes,
+            sql=sql,
+            query_plan=query_plan,
+        )
+
     @final
     def _get_table_from_cache_or_db(
         self, table_name_hash: str, output_tablename_templated: str
@@ -118,15 +409,28 @@ class DatabaseAPI(ABC, Generic[TablishType]):
         if table_name_hash in self._intermediate_table_cache:
             return self._intermediate_table_cache.get_with_logging(table_name_hash)
 
+        # In persistent mode, only reuse tables which a previous run has recorded
+        # as completed in the manifest
+        if (
+            self._persistent_cache is not None
+            and table_name_hash not in self._persistent_cache
+        ):
+            return None
+
         # If not in cache, fall back on checking the database
         if self.table_exists_in_database(table_name_hash):
             logger.debug(
                 f"Found cache for {output_tablename_templated} "
                 f"in database using table name with physical name {table_name_hash}"
             )
-            return self.table_to_splink_dataframe(
+            splink_dataframe = self.table_to_splink_dataframe(
                 output_tablename_templated, table_name_hash
             )
+            if self._persistent_cache is not None:
+                self._intermediate_table_cache.queries_retrieved_from_cache.append(
+                    splink_dataframe
+                )
+            return splink_dataframe
         return None
 
     @final
@@ -139,15 +443,19 @@ class DatabaseAPI(ABC, Generic[TablishType]):
         # differences from _sql_to_splink_dataframe:
         # this _calculates_ physical name, handles debug_mode,
         # and checks cache before querying
-        to_hash = (sql + self._cache_uid).encode("utf-8")
-        hash = hashlib.sha256(to_hash).hexdigest()[:9]
+        if self._persistent_cache is not None:
+            hash = self._persistent_cache.fingerprint(sql)
+        else:
+            to_hash = (sql + self._cache_uid).encode("utf-8")
+            hash = hashlib.sha256(to_hash).hexdigest()[:9]
         # Ensure hash is valid sql table name
         table_name_hash = f"{output_tablename_templated}_{hash}"
 
         if use_cache:
-            splink_dataframe = self._get_table_from_cache_or_db(
-                table_name_hash, output_tablename_templated
-            )
+            with self._cache_lock:
+                splink_dataframe = self._get_table_from_cache_or_db(
+                    table_name_hash, output_tablename_templated
+                )
             if splink_dataframe is not None:
                 return splink_dataframe
 
@@ -177,7 +485,11 @@ class DatabaseAPI(ABC, Generic[TablishType]):
 
         physical_name = splink_dataframe.physical_name
 
-        self._intermediate_table_cache[physical_name] = splink_dataframe
+        with self._cache_lock:
+            self._intermediate_table_cache[physical_name] = splink_dataframe
+
+            if self._persistent_cache is not None and not self.debug_mode:
+                self._persistent_cache.record(physical_name, output_tablename_templated)
 
         return splink_dataframe
 
@@ -194,7 +506,11 @@ class DatabaseAPI(ABC, Generic[TablishType]):
         """
 
         if not self.debug_mode:
-            sql_gen = pipeline.generate_cte_pipeline_sql()
+            sql_gen = pipeline.generate_cte_pipeline_sql(
+                optimise=self._optimise_pipelines,
+                sqlglot_dialect=self.sql_dialect.sqlglot_name,
+                prune_columns=self._prune_pipeline_columns,
+            )
             output_tablename_templated = pipeline.output_table_name
 
             splink_dataframe = self.sql_to_splink_dataframe_checking_cache(
@@ -265,6 +581,10 @@ class DatabaseAPI(ABC, Generic[TablishType]):
                 self._table_registration(table, alias)
                 table = alias
             sdf = self.table_to_splink_dataframe(alias, table)
+            if self._persistent_cache is not None:
+                self._persistent_cache.record_input_table(
+                    sdf.physical_name, self._table_fingerprint(sdf.physical_name)
+                )
             tables_as_splink_dataframes[alias] = sdf
         return tables_as_splink_dataframes
 
@@ -303,6 +623,11 @@ class DatabaseAPI(ABC, Generic[TablishType]):
         drop_sql = f"DROP TABLE IF EXISTS {name}"
         self._execute_sql_against_backend(drop_sql)
 
+    def _insert_into_table(self, physical_name: str, source_physical_name: str) -> None:
+        # Only used by backends with _supports_insert_into
+        insert_sql = f"INSERT INTO {physical_name} SELECT * FROM {source_physical_name}"
+        self._execute_sql_against_backend(insert_sql)
+
     @abstractmethod
     def _table_registration(
         self, input: AcceptableInputTableType, table_name: str
@@ -349,6 +674,9 @@ class DatabaseAPI(ABC, Generic[TablishType]):
         for k in keys_to_delete:
             del self._intermediate_table_cache[k]
 
+        if self._persistent_cache is not None:
+            self._persistent_cache.remove(splink_dataframe.physical_name)
+
     def delete_tables_created_by_splink_from_db(self):
         # Accounts for names in cache with key which are templated names
         keys = list(self._intermediate_table_cache.keys())
@@ -97,6 +97,12 @@ class SplinkDialect(ABC):
             f"Backend '{self.name}' does not have a 'Jaccard' function"
         )
 
+    @property
+    def string_length_function_name(self):
+        """The length of a string, in the units (e.g. characters or bytes) edited
+        by the backend's string similarity functions"""
+        return "length"
+
     def random_sample_sql(
         self, proportion, sample_size, seed=None, table=None, unique_id=None
     ):
@@ -110,6 +116,18 @@ class SplinkDialect(ABC):
             f"Backend '{self.name}' needs an infinity_expression added to its dialect"
         )
 
+    @property
+    def supports_grouping_sets(self) -> bool:
+        """Whether `group by grouping sets (...)` and `grouping()` are supported"""
+        return True
+
+    def hash_partition_sql(self, expression: str, num_partitions: int) -> str:
+        """SQL expression assigning each value of `expression` to a partition
+        number in the range [0, num_partitions), using a deterministic hash"""
+        raise NotImplementedError(
+            f"Backend '{self.name}' needs a hash_partition_sql added to its dialect"
+        )
+
     @staticmethod
     def _wrap_in_nullif(func):
         def nullif_wrapped_function(*args, **kwargs):
@@ -157,6 +175,32 @@ class SplinkDialect(ABC):
             f"Unnesting blocking rules are not supported for {type(self)}"
         )
 
+    def array_first_n_sql(self, array_expression: str, n: int) -> str:
+        """SQL expression for an array of the first `n` elements of an array"""
+        raise NotImplementedError(
+            f"Unnesting blocking rules are not supported for {type(self)}"
+        )
+
+    def minhash_signature_sql(
+        self, expression: str, num_hashes: int, tokens: str, qgram_size: int
+    ) -> str:
+        """SQL expression for an array of `num_hashes` MinHash values of the tokens
+        of `expression`, which are either its space separated words or its
+        q-grams of length `qgram_size`. Null or empty values have a null
+        signature"""
+        raise NotImplementedError(
+            f"MinHash LSH blocking rules are not supported for {type(self)}"
+        )
+
+    def minhash_band_keys_sql(
+        self, signature: str, num_bands: int, rows_per_band: int
+    ) -> str:
+        """SQL expression for an array of `num_bands` keys, each hashing a band of
+        `rows_per_band` consecutive values of a MinHash `signature` array"""
+        raise NotImplementedError(
+            f"MinHash LSH blocking rules are not supported for {type(self)}"
+        )
+
 
 class DuckDBDialect(SplinkDialect):
     _dialect_name_for_factory = "duckdb"
@@ -185,6 +229,11 @@ class DuckDBDialect(SplinkDialect):
     def jaccard_function_name(self):
         return "jaccard"
 
+    @property
+    def string_length_function_name(self):
+        # DuckDB's string similarity functions operate on bytes
+        return "strlen"
+
     @property
     def default_date_format(self):
         return "%Y-%m-%d"
@@ -218,6 +267,9 @@ class DuckDBDialect(SplinkDialect):
     def infinity_expression(self):
         return "cast('infinity' as float8)"
 
+    def hash_partition_sql(self, expression: str, num_partitions: int) -> str:
+        return f"hash({expression}) % {num_partitions}"
+
     def random_sample_sql(
         self, proportion, sample_size, seed=None, table=None, unique_id=None
     ):
@@ -252,6 +304,39 @@ class DuckDBDialect(SplinkDialect):
             return f"""select {','.join(cols_to_select)}
                 from ({self.explode_arrays_sql(tbl_name,columns_to_explode,other_columns_to_retain)})"""  # noqa: E501
 
+    def array_first_n_sql(self, array_expression: str, n: int) -> str:
+        return f"list_slice({array_expression}, 1, {n})"
+
+    def minhash_signature_sql(
+        self, expression: str, num_hashes: int, tokens: str, qgram_size: int
+    ) -> str:
+        if tokens == "words":
+            tokens_sql = f"list_filter(string_split({expression}, ' '), t -> t != '')"
+        else:
+            tokens_sql = f"""
+            case when length({expression}) <= {qgram_size} then [{expression}]
+            else list_transform(
+                range(1, length({expression}) - {qgram_size} + 2),
+                i -> substr({expression}, i, {qgram_size})
+            ) end"""
+        return f"""
+        case when nullif(trim({expression}), '') is null then null
+        else list_transform(
+            range({num_hashes}),
+            s -> list_min(list_transform({tokens_sql}, t -> hash(t, s)))
+        ) end"""
+
+    def minhash_band_keys_sql(
+        self, signature: str, num_bands: int, rows_per_band: int
+    ) -> str:
+        r = rows_per_band
+        return f"""
+        case when {signature} is null then null
+        else list_transform(
+            range({num_bands}),
+            b -> hash(b, list_slice({signature}, b * {r} + 1, (b + 1) * {r}))
+        ) end"""
+
 
 class SparkDialect(SplinkDialect):
     _dialect_name_for_factory = "spark"
@@ -307,6 +392,9 @@ class SparkDialect(SplinkDialect):
     def infinity_expression(self):
         return "'infinity'"
 
+    def hash_partition_sql(self, expression: str, num_partitions: int) -> str:
+        return f"pmod(hash({expression}), {num_partitions})"
+
     def random_sample_sql(
         self, proportion, sample_size, seed=None, table=None, unique_id=None
     ):
@@ -339,6 +427,39 @@ class SparkDialect(SplinkDialect):
         return f"""select {','.join(cols_to_select)}
                 from ({self.explode_arrays_sql(tbl_name,columns_to_explode,other_columns_to_retain+[column_to_explode])})"""  # noqa: E501
 
+    def array_first_n_sql(self, array_expression: str, n: int) -> str:
+        return f"slice({array_expression}, 1, {n})"
+
+    def minhash_signature_sql(
+        self, expression: str, num_hashes: int, tokens: str, qgram_size: int
+    ) -> str:
+        if tokens == "words":
+            tokens_sql = f"filter(split({expression}, ' '), t -> t != '')"
+        else:
+            tokens_sql = f"""
+            case when length({expression}) <= {qgram_size} then array({expression})
+            else transform(
+                sequence(1, length({expression}) - {qgram_size} + 1),
+                i -> substring({expression}, i, {qgram_size})
+            ) end"""
+        return f"""
+        case when nullif(trim({expression}), '') is null then null
+        else transform(
+            sequence(0, {num_hashes - 1}),
+            s -> array_min(transform({tokens_sql}, t -> xxhash64(t, s)))
+        ) end"""
+
+    def minhash_band_keys_sql(
+        self, signature: str, num_bands: int, rows_per_band: int
+    ) -> str:
+        r = rows_per_band
+        return f"""
+        case when {signature} is null then null
+        else transform(
+            sequence(0, {num_bands - 1}),
+            b -> xxhash64(b, slice({signature}, b * {r} + 1, {r}))
+        ) end"""
+
 
 class SQLiteDialect(SplinkDialect):
     _dialect_name_for_factory = "sqlite"
@@ -369,6 +490,14 @@ class SQLiteDialect(SplinkDialect):
     def infinity_expression(self):
         return "'infinity'"
 
+    @property
+    def supports_grouping_sets(self) -> bool:
+        return False
+
+    def hash_partition_sql(self, expression: str, num_partitions: int) -> str:
+        # splink_hash is registered as a udf on the SQLite connection
+        return f"splink_hash({expression}) % {num_partitions}"
+
     def random_sample_sql(
         self, proportion, sample_size, seed=None, table=None, unique_id=None
     ):
@@ -473,6 +602,12 @@ class PostgresDialect(SplinkDialect):
     def infinity_expression(self):
         return "'infinity'"
 
+    def hash_partition_sql(self, expression: str, num_partitions: int) -> str:
+        return (
+            f"abs(cast(hashtext(cast({expression} as text)) as bigint)) "
+            f"% {num_partitions}"
+        )
+
 
 class AthenaDialect(SplinkDialect):
     _dialect_name_for_factory = "athena"
@@ -504,6 +639,11 @@ class AthenaDialect(SplinkDialect):
     def infinity_expression(self):
         return "infinity()"
 
+    def hash_partition_sql(self, expression: str, num_partitions: int) -> str:
+        hashed = f"from_big_endian_64(xxhash64(to_utf8(cast({expression} as varchar))))"
+        n = num_partitions
+        return f"mod(mod({hashed}, {n}) + {n}, {n})"
+
     @property
     def levenshtein_function_name(self):
         return "levenshtein_distance"
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import logging
-from typing import Sequence, Union
+import os
+import re
+from typing import Optional, Sequence, Tuple, Union
 
 import duckdb
 import pandas as pd
@@ -27,6 +29,7 @@ ddb_con = duckdb.DuckDBPyConnection
 
 class DuckDBAPI(DatabaseAPI[duckdb.DuckDBPyRelation]):
     sql_dialect = DuckDBDialect()
+    _supports_insert_into = True
 
     def __init__(
         self,
@@ -93,6 +96,35 @@ class DuckDBAPI(DatabaseAPI[duckdb.DuckDBPyRelation]):
             return False
         return True
 
+    def _table_fingerprint_sql(self, physical_name: str) -> str:
+        return (
+            "select count(*) as row_count, sum(hash(t)) as checksum "
+            f"from {physical_name} as t"
+        )
+
+    def _table_fingerprint(self, physical_name: str) -> str:
+        fingerprint = super()._table_fingerprint(physical_name)
+        # Inputs passed as file paths are registered as e.g. read_parquet('<path>')
+        file_read = re.fullmatch(r"read_\w+\('(.+)'\)", physical_name)
+        if file_read and os.path.exists(file_read.group(1)):
+            fingerprint += f"_{os.path.getmtime(file_read.group(1))}"
+        return fingerprint
+
+    def _table_size(self, physical_name: str) -> Tuple[int, Optional[int]]:
+        # Read the row count from the catalog, rather than scanning the table
+        record = self._con.execute(
+            "select estimated_size from duckdb_tables() "
+            "where table_name = ? and schema_name = current_schema()",
+            [physical_name],
+        ).fetchone()
+        if record is None:
+            return super()._table_size(physical_name)
+        return int(record[0]), None
+
+    def _explain_analyze(self, sql: str) -> str:
+        plan = self._con.sql(f"EXPLAIN ANALYZE {sql}").fetchall()
+        return "\n".join(row[1] for row in plan)
+
     def load_from_file(self, file_path: str) -> str:
         return duckdb_load_from_file(file_path)
 
@@ -2,15 +2,21 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Iterator, Optional
 
 from pandas import DataFrame as pd_DataFrame
 
 from splink.internals.input_column import InputColumn
-from splink.internals.splink_dataframe import SplinkDataFrame
+from splink.internals.splink_dataframe import (
+    DEFAULT_BATCH_SIZE,
+    SplinkDataFrame,
+    _import_pyarrow,
+)
 
 logger = logging.getLogger(__name__)
 if TYPE_CHECKING:
+    import pyarrow as pa
+
     from .database_api import DuckDBAPI
 
 
@@ -50,6 +56,26 @@ class DuckDBDataFrame(SplinkDataFrame):
 
         return self.db_api._execute_sql_against_backend(sql).to_df()
 
+    def as_arrow_table(self, limit: Optional[int] = None) -> pa.Table:
+        _import_pyarrow()
+        sql = self._select_all_sql(limit)
+        return self.db_api._con.execute(sql).fetch_arrow_table()
+
+    def iter_record_batches(
+        self, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[pa.RecordBatch]:
+        _import_pyarrow()
+        sql = self._select_all_sql()
+        yield from self.db_api._con.execute(sql).fetch_record_batch(batch_size)
+
+    def _iter_row_batches(
+        self, batch_size: int, limit: Optional[int] = None
+    ) -> Iterator[list[dict[str, Any]]]:
+        relation = self.db_api._execute_sql_against_backend(self._select_all_sql(limit))
+        columns = relation.columns
+        while rows := relation.fetchmany(batch_size):
+            yield [dict(zip(columns, row)) for row in rows]
+
     def to_parquet(self, filepath, overwrite=False):
         if not overwrite:
             self.check_file_exists(filepath)
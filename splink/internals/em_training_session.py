@@ -3,7 +3,12 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING, List
 
-from splink.internals.blocking import BlockingRule, block_using_rules_sqls
+from splink.internals.blocking import (
+    BlockingRule,
+    SortedNeighbourhoodBlockingRule,
+    block_using_rules_sqls,
+    materialise_blocking_key_index_tables,
+)
 from splink.internals.charts import (
     ChartReturnType,
     m_u_parameters_interactive_history_chart,
@@ -74,10 +79,17 @@ class EMTrainingSession:
         self._blocking_rule_for_training = blocking_rule_for_training
         self.estimate_without_term_frequencies = estimate_without_term_frequencies
 
+        # The pairs generated by a sorted neighbourhood rule need not agree on
+        # any column, so no comparisons are 'used up' by the rule
+        if isinstance(blocking_rule_for_training, SortedNeighbourhoodBlockingRule):
+            blocking_rule_condition_sql = "1=1"
+        else:
+            blocking_rule_condition_sql = blocking_rule_for_training.blocking_rule_sql
+
         self._comparison_levels_to_reverse_blocking_rule: list[
             ComparisonAndLevelDict
         ] = Settings._get_comparison_levels_corresponding_to_training_blocking_rule(  # noqa
-            blocking_rule_sql=blocking_rule_for_training.blocking_rule_sql,
+            blocking_rule_sql=blocking_rule_condition_sql,
             sqlglot_dialect_name=self.db_api.sql_dialect.sqlglot_name,
             comparisons=core_model_settings.comparisons,
         )
@@ -96,7 +108,7 @@ class EMTrainingSession:
         # Remove comparison columns which are either 'used up' by the blocking rules
         comparisons_to_deactivate = []
         br_cols = get_columns_used_from_sql(
-            blocking_rule_for_training.blocking_rule_sql,
+            blocking_rule_condition_sql,
             self.db_api.sql_dialect.sqlglot_name,
         )
         for cc in core_model_settings.comparisons:
@@ -176,6 +188,14 @@ class EMTrainingSession:
         pipeline = CTEPipeline([nodes_with_tf])
 
         orig_settings = self._original_linker._settings_obj
+        br_with_blocking_key_index_tables = materialise_blocking_key_index_tables(
+            link_type=orig_settings._link_type,
+            blocking_rules=[self._blocking_rule_for_training],
+            db_api=self.db_api,
+            splink_df_dict=self._original_linker._input_tables_dict,
+            source_dataset_input_column=orig_settings.column_info_settings.source_dataset_input_column,
+            unique_id_input_column=orig_settings.column_info_settings.unique_id_input_column,
+        )
         sqls = block_using_rules_sqls(
             input_tablename_l="__splink__df_concat_with_tf",
             input_tablename_r="__splink__df_concat_with_tf",
@@ -187,6 +207,8 @@ class EMTrainingSession:
         pipeline.enqueue_list_of_sqls(sqls)
 
         blocked_pairs = self.db_api.sql_pipeline_to_splink_dataframe(pipeline)
+        for br in br_with_blocking_key_index_tables:
+            br.detach_blocking_key_index_tables()
 
         pipeline = CTEPipeline([blocked_pairs, nodes_with_tf])
 
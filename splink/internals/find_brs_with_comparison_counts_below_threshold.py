@@ -8,7 +8,7 @@ import pandas as pd
 
 from splink.internals.blocking import BlockingRule
 from splink.internals.blocking_analysis import (
-    _count_comparisons_generated_from_blocking_rule,
+    _count_comparisons_from_blocking_rules_pre_filter_conditions,
 )
 from splink.internals.blocking_rule_creator import BlockingRuleCreator
 from splink.internals.blocking_rule_library import CustomRule, block_on
@@ -35,6 +35,7 @@ def _generate_output_combinations_table_row(
 ) -> dict[str, Any]:
     row: dict[str, Any] = {}
 
+    row["blocking_columns"] = blocking_columns
     blocking_columns = [
         sanitise_column_name_for_one_hot_encoding(c) for c in blocking_columns
     ]
@@ -88,19 +89,13 @@ def _search_tree_for_blocking_rules_below_threshold_count(
     linker: "Linker",
     all_columns: List[str],
     threshold: int,
-    current_combination: List[str] = None,
-    already_visited: Set[frozenset[str]] = None,
-    results: List[Dict[str, str]] = None,
     max_results: Optional[int] = None,
-) -> List[Dict[str, str]]:
+    count_cache: Optional[Dict[frozenset[str], int]] = None,
+) -> List[Dict[str, Any]]:
     """
-    Recursively search combinations of fields to find ones that result in a count less
+    Search combinations of fields to find ones that result in a count less
     than the threshold.
 
-    Uses the new, fast counting function
-    linker._count_num_comparisons_from_blocking_rule_pre_filter_conditions
-    to count
-
     The full tree looks like this, where c1 c2 are columns:
     c1                    count_comparisons(c1)
     ├── c2                count_comparisons(c1, c2)
@@ -119,9 +114,18 @@ def _search_tree_for_blocking_rules_below_threshold_count(
           example, c2 -> c1 will not be evaluated because c1 -> c2 has already been
           counted
 
+    The tree is searched breadth first.  All the combinations at a given depth are
+    counted together using
+    `_count_comparisons_from_blocking_rules_pre_filter_conditions`, which scans
+    the input data once with one grouping set per combination, so the number of
+    queries grows with the number of columns rather than the number of nodes.
+    Counts are stored in `count_cache`, keyed by the set of columns, so they are
+    not recomputed if the cache is passed to a later search of the same data.
+
     When a count is below the threshold, create a dictionary with the relevant stats
     like :
     {
+        'blocking_columns':['first_name'],
         'blocking_columns_sanitised':['first_name'],
         'splink_blocking_rule':<Custom rule>',
         comparison_count':4827,
@@ -139,76 +143,96 @@ def _search_tree_for_blocking_rules_below_threshold_count(
 
     Args:
         linker: splink.Linker
-        fields (List[str]): List of fields to combine.
+        all_columns (List[str]): List of fields to combine.
         threshold (float): The count threshold.
-        current_combination (List[str], optional): Current combination of fields.
-        already_visited (Set[frozenset], optional): Set of visited combinations.
-        results (List[Dict[str, str]], optional): List of results. Defaults to [].
+        max_results (int, optional): Stop once this many results have been found.
+            As the search is breadth first, these are the results with the fewest
+            columns.
+        count_cache (Dict[frozenset, int], optional): Comparison counts of
+            combinations of fields which have already been evaluated.
 
     Returns:
         List[Dict]: List of results.  Each result is a dict with statistics like
             the number of comparisons, the blocking rule etc.
     """
-    if current_combination is None:
-        current_combination = []
-    if already_visited is None:
-        already_visited = set()
-    if results is None:
-        results = []
+    if count_cache is None:
+        count_cache = {}
+
+    results: List[Dict[str, Any]] = []
+    already_visited: Set[frozenset[str]] = set()
+    combinations_at_depth: List[List[str]] = [[]]
+
+    while combinations_at_depth:
+        rules = [
+            _generate_blocking_rule(linker._db_api, combination)
+            for combination in combinations_at_depth
+        ]
+        _count_uncached_combinations(linker, combinations_at_depth, rules, count_cache)
+        already_visited.update(frozenset(c) for c in combinations_at_depth)
+
+        next_combinations: List[List[str]] = []
+        for combination, br in zip(combinations_at_depth, rules):
+            comparison_count = count_cache[frozenset(combination)]
+            if comparison_count > threshold:
+                # A leaf, with all fields included, has nothing left to explore
+                for next_combination in _generate_combinations(
+                    all_columns, combination, already_visited
+                ):
+                    already_visited.add(frozenset(next_combination))
+                    next_combinations.append(next_combination)
+                continue
+
+            row = _generate_output_combinations_table_row(
+                combination,
+                br,
+                comparison_count,
+                all_columns,
+            )
+            results.append(row)
+
+            b_cols = row["blocking_columns_sanitised"]
+            count = f"{row['comparison_count']:,.0f}"
+            logger.info(
+                f"--\nFound BR with blocking columns: {b_cols}\n"
+                f"Comparison count: {count}"
+            )
+            if max_results is not None and len(results) >= max_results:
+                return results
+
+        combinations_at_depth = next_combinations
 
-    if max_results is not None and len(results) >= max_results:
-        return results
+    return results
 
-    if len(current_combination) == len(all_columns):
-        return results  # All fields included, meaning we're at a leaf so exit recursion
 
-    br = _generate_blocking_rule(linker._db_api, current_combination)
+def _count_uncached_combinations(
+    linker: "Linker",
+    combinations: List[List[str]],
+    rules: List[BlockingRule],
+    count_cache: Dict[frozenset[str], int],
+) -> None:
+    """Count the comparisons generated by the blocking rules of each combination of
+    fields which is not already in `count_cache`, in a single scan of the input
+    data, and add them to the cache"""
+    uncached = [
+        (frozenset(combination), br)
+        for combination, br in zip(combinations, rules)
+        if frozenset(combination) not in count_cache
+    ]
+    if not uncached:
+        return
 
-    comparison_count = _count_comparisons_generated_from_blocking_rule(
+    column_info_settings = linker._settings_obj.column_info_settings
+    counts = _count_comparisons_from_blocking_rules_pre_filter_conditions(
         splink_df_dict=linker._input_tables_dict,
-        blocking_rule=br,
+        blocking_rules=[br for _, br in uncached],
         link_type=linker._settings_obj._link_type,
         db_api=linker._db_api,
-        compute_post_filter_count=False,
-        source_dataset_input_column=linker._settings_obj.column_info_settings.source_dataset_input_column,
-        unique_id_input_column=linker._settings_obj.column_info_settings.unique_id_input_column,
-    )["number_of_comparisons_generated_pre_filter_conditions"]
-
-    already_visited.add(frozenset(current_combination))
-
-    # int just to satisfy mypy
-    comparison_count = int(comparison_count)
-    if comparison_count > threshold:
-        # Generate all valid combinations and continue the search
-        combinations = _generate_combinations(
-            all_columns, current_combination, already_visited
-        )
-        for next_combination in combinations:
-            _search_tree_for_blocking_rules_below_threshold_count(
-                linker,
-                all_columns,
-                threshold,
-                next_combination,
-                already_visited,
-                results,
-                max_results=max_results,
-            )
-    else:
-        row = _generate_output_combinations_table_row(
-            current_combination,
-            br,
-            comparison_count,
-            all_columns,
-        )
-        results.append(row)
-
-        b_cols = row["blocking_columns_sanitised"]
-        count = f"{row['comparison_count']:,.0f}"
-        logger.info(
-            f"--\nFound BR with blocking columns: {b_cols}\nComparison count: {count}"
-        )
-
-    return results
+        unique_id_input_column=column_info_settings.unique_id_input_column,
+        source_dataset_input_column=column_info_settings.source_dataset_input_column,
+    )
+    for (key, _), count in zip(uncached, counts):
+        # int just to satisfy mypy
+        count_cache[key] = int(count or 0)
 
 
 def find_blocking_rules_below_threshold_comparison_count(
@@ -216,6 +240,7 @@ def find_blocking_rules_below_threshold_comparison_count(
     max_comparisons_per_rule: int,
     column_expressions: Optional[Sequence[str | InputColumn]] = None,
     max_results: Optional[int] = None,
+    count_cache: Optional[Dict[frozenset[str], int]] = None,
 ) -> pd.DataFrame:
     """
     Finds blocking rules which return a comparison count below a given threshold.
@@ -238,6 +263,10 @@ def find_blocking_rules_below_threshold_comparison_count(
             entry in this list.
         max_results (int, optional): Maximum number of results to return. Defaults to
             None
+        count_cache (dict, optional): A dict in which comparison counts are stored,
+            keyed by the set of column expressions.  Passing the same dict to
+            repeated searches of the same linker avoids recounting combinations.
+            Defaults to None
 
     Returns:
         pd.DataFrame: DataFrame with blocking rules, comparison_count and num_equi_joins
@@ -262,6 +291,7 @@ def find_blocking_rules_below_threshold_comparison_count(
         column_expressions_as_strings,
         max_comparisons_per_rule,
         max_results=max_results,
+        count_cache=count_cache,
     )
 
     if not results:
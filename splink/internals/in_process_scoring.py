@@ -0,0 +1,733 @@
+"""Score blocked record pairs in the Python process rather than in the database.
+
+The in-process engine takes the table of blocked pairs with their comparison
+columns (`col_l`, `col_r`, term frequency columns etc.) as an Arrow table and:
+
+- evaluates each comparison level's `sql_condition` with vectorised NumPy
+  operations, using `rapidfuzz` for string distance and similarity functions,
+- looks up each comparison's Bayes factor from its comparison vector value,
+- applies term frequency adjustments,
+- combines the prior and Bayes factors into a match weight and probability.
+
+The arithmetic follows the sql generated by
+`predict_from_comparison_vectors_sqls` term by term, so the results are the same
+as those computed by the database.
+
+Only a subset of sql is understood. If a comparison level uses anything else,
+`InProcessScoringUnsupportedError` is raised and the caller should fall back to
+scoring in the database.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import sqlglot
+from sqlglot import exp
+
+from splink.internals.comparison import Comparison
+from splink.internals.dialects import SplinkDialect
+from splink.internals.exceptions import MissingDependencyException
+from splink.internals.misc import prob_to_bayes_factor
+from splink.internals.pipeline import CTEPipeline
+from splink.internals.predict import threshold_as_match_weight
+from splink.internals.settings import Settings
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+    from splink.internals.database_api import DatabaseAPI
+
+# The rapidfuzz module and scorer corresponding to each supported string
+# function, by dialect.  Where a dialect's implementation differs from rapidfuzz
+# (e.g. a Spark jar udf) the function is not listed, and levels using it are
+# scored in the database.  DuckDB's functions compare the UTF-8 bytes of their
+# arguments, so are scored on the encoded values
+_STRING_FUNCTIONS: Dict[str, Dict[str, Tuple[str, str]]] = {
+    "duckdb": {
+        "levenshtein": ("Levenshtein", "distance"),
+        "damerau_levenshtein": ("DamerauLevenshtein", "distance"),
+        "jaro_similarity": ("Jaro", "similarity"),
+        "jaro_winkler_similarity": ("JaroWinkler", "similarity"),
+    },
+    # The SQLite udfs are registered from rapidfuzz, and return distances
+    "sqlite": {
+        "levenshtein": ("Levenshtein", "distance"),
+        "damerau_levenshtein": ("DamerauLevenshtein", "distance"),
+        "jaro": ("Jaro", "distance"),
+        "jaro_winkler": ("JaroWinkler", "distance"),
+    },
+    "spark": {
+        "levenshtein": ("Levenshtein", "distance"),
+    },
+}
+
+
+class InProcessScoringUnsupportedError(Exception):
+    """Raised when the model cannot be scored in process, e.g. because a
+    comparison level uses sql the in-process engine does not understand"""
+
+
+def _import_rapidfuzz():
+    try:
+        import rapidfuzz
+    except ImportError:
+        raise MissingDependencyException(
+            "You need to install the 'rapidfuzz' package to compute string "
+            "similarity functions with the in-process scoring engine."
+        ) from None
+    return rapidfuzz
+
+
+class _Vector:
+    """A column of values with a separate mask of sql nulls.
+
+    `kind` is one of 'string', 'number', 'boolean' or 'temporal'.  The values
+    at null positions are placeholders and must not be relied on.
+    """
+
+    def __init__(self, values: np.ndarray, is_null: np.ndarray, kind: str):
+        self.values = values
+        self.is_null = is_null
+        self.kind = kind
+
+    @property
+    def is_true(self) -> np.ndarray:
+        return self.values.astype(bool) & ~self.is_null
+
+
+def _vector_from_arrow(column: pa.ChunkedArray) -> _Vector:
+    import pyarrow as pa
+
+    is_null = column.is_null().to_numpy(zero_copy_only=False)
+    t = column.type
+    if pa.types.is_string(t) or pa.types.is_large_string(t):
+        values = column.fill_null("").to_numpy(zero_copy_only=False).astype(object)
+        return _Vector(values, is_null, "string")
+    if pa.types.is_integer(t) or pa.types.is_floating(t):
+        values = column.fill_null(0).to_numpy(zero_copy_only=False)
+        return _Vector(values, is_null, "number")
+    if pa.types.is_boolean(t):
+        values = column.fill_null(False).to_numpy(zero_copy_only=False)
+        return _Vector(values, is_null, "boolean")
+    if pa.types.is_date(t) or pa.types.is_timestamp(t):
+        # Temporal values are only compared to one another, so their integer
+        # representation is sufficient
+        as_int = column.cast(pa.int64() if pa.types.is_timestamp(t) else pa.int32())
+        values = as_int.fill_null(0).to_numpy(zero_copy_only=False)
+        return _Vector(values, is_null, "temporal")
+    if pa.types.is_null(t):
+        values = np.zeros(len(column), dtype=bool)
+        return _Vector(values, is_null, "null")
+    raise InProcessScoringUnsupportedError(f"Unsupported column type {t}")
+
+
+class _ExpressionEvaluator:
+    """Evaluates a sqlglot expression against the columns of an Arrow table,
+    following sql's three valued logic"""
+
+    def __init__(self, table: pa.Table, sql_dialect: str):
+        self.table = table
+        self.num_rows = table.num_rows
+        self.sql_dialect = sql_dialect
+        self._columns: Dict[str, _Vector] = {}
+
+    def column(self, name: str) -> _Vector:
+        if name not in self._columns:
+            if name not in self.table.column_names:
+                raise InProcessScoringUnsupportedError(f"Unknown column {name}")
+            self._columns[name] = _vector_from_arrow(self.table.column(name))
+        return self._columns[name]
+
+    def _full(self, value, kind: str) -> _Vector:
+        if kind == "string":
+            values = np.full(self.num_rows, value, dtype=object)
+        else:
+            values = np.full(self.num_rows, value)
+        return _Vector(values, np.zeros(self.num_rows, dtype=bool), kind)
+
+    def _nulls(self) -> _Vector:
+        return _Vector(
+            np.zeros(self.num_rows, dtype=bool),
+            np.ones(self.num_rows, dtype=bool),
+            "null",
+        )
+
+    def evaluate(self, node: exp.Expression) -> _Vector:
+        if isinstance(node, exp.Paren):
+            return self.evaluate(node.this)
+        if isinstance(node, exp.Column):
+            if node.table:
+                raise InProcessScoringUnsupportedError(f"Qualified column {node.sql()}")
+            return self.column(node.name)
+        if isinstance(node, exp.Null):
+            return self._nulls()
+        if isinstance(node, exp.Boolean):
+            return self._full(node.this, "boolean")
+        if isinstance(node, exp.Literal):
+            if node.is_string:
+                return self._full(node.this, "string")
+            number = float(node.this)
+            return self._full(int(number) if number.is_integer() else number, "number")
+        if isinstance(node, exp.Neg):
+            operand = self._numeric(self.evaluate(node.this))
+            return _Vector(-operand.values, operand.is_null, "number")
+        if isinstance(node, (exp.And, exp.Or)):
+            return self._logical(node)
+        if isinstance(node, exp.Not):
+            operand = self._boolean(self.evaluate(node.this))
+            return _Vector(~operand.values, operand.is_null, "boolean")
+        if isinstance(node, exp.Is):
+            if not isinstance(node.expression, exp.Null):
+                raise InProcessScoringUnsupportedError(node.sql())
+            operand = self.evaluate(node.this)
+            return _Vector(
+                operand.is_null.copy(), np.zeros(self.num_rows, dtype=bool), "boolean"
+            )
+        if isinstance(node, (exp.EQ, exp.NEQ, exp.GT, exp.GTE, exp.LT, exp.LTE)):
+            return self._comparison(node)
+        if isinstance(node, (exp.Add, exp.Sub, exp.Mul, exp.Div)):
+            return self._arithmetic(node)
+        if isinstance(node, exp.Case):
+            return self._case(node)
+        if isinstance(node, exp.Coalesce):
+            return self._coalesce([node.this, *node.expressions])
+        if isinstance(node, exp.Abs):
+            operand = self._numeric(self.evaluate(node.this))
+            return _Vector(np.abs(operand.values), operand.is_null, "number")
+        if isinstance(node, exp.Cast):
+            return self._cast(node)
+        if isinstance(node, (exp.Lower, exp.Upper)):
+            operand = self._string(self.evaluate(node.this))
+            method = str.lower if isinstance(node, exp.Lower) else str.upper
+            values = np.array([method(v) for v in operand.values], dtype=object)
+            return _Vector(values, operand.is_null, "string")
+        if isinstance(node, exp.Length):
+            return self._length(node.this, in_bytes=False)
+        if isinstance(node, exp.Substring):
+            return self._substring(node)
+        if isinstance(node, exp.Anonymous):
+            name = node.name.lower()
+            if name == "strlen" and self.sql_dialect == "duckdb":
+                return self._length(node.expressions[0], in_bytes=True)
+            return self._string_function(name, node.expressions)
+        if isinstance(node, exp.Levenshtein):
+            return self._string_function("levenshtein", [node.this, node.expression])
+        raise InProcessScoringUnsupportedError(node.sql())
+
+    def _boolean(self, operand: _Vector) -> _Vector:
+        if operand.kind == "null":
+            return operand
+        if operand.kind != "boolean":
+            raise InProcessScoringUnsupportedError("Expected a boolean expression")
+        return _Vector(operand.values & ~operand.is_null, operand.is_null, "boolean")
+
+    def _numeric(self, operand: _Vector) -> _Vector:
+        if operand.kind not in ("number", "null"):
+            raise InProcessScoringUnsupportedError("Expected a numeric expression")
+        return operand
+
+    def _string(self, operand: _Vector) -> _Vector:
+        if operand.kind == "null":
+            return _Vector(
+                np.full(self.num_rows, "", dtype=object), operand.is_null, "string"
+            )
+        if operand.kind != "string":
+            raise InProcessScoringUnsupportedError("Expected a string expression")
+        return operand
+
+    def _logical(self, node: exp.Expression) -> _Vector:
+        left = self._boolean(self.evaluate(node.left))
+        right = self._boolean(self.evaluate(node.right))
+        if isinstance(node, exp.And):
+            is_false = (~left.values & ~left.is_null) | (~right.values & ~right.is_null)
+            values = left.values & right.values
+            is_null = (left.is_null | right.is_null) & ~is_false
+        else:
+            values = left.values | right.values
+            is_null = (left.is_null | right.is_null) & ~values
+        return _Vector(values & ~is_null, is_null, "boolean")
+
+    def _comparison(self, node: exp.Expression) -> _Vector:
+        left = self.evaluate(node.left)
+        right = self.evaluate(node.right)
+        is_null = left.is_null | right.is_null
+        if "null" in (left.kind, right.kind):
+            return _Vector(np.zeros(self.num_rows, dtype=bool), is_null, "boolean")
+        if left.kind != right.kind:
+            raise InProcessScoringUnsupportedError(
+                f"Comparison of {left.kind} with {right.kind} in {node.sql()}"
+            )
+        operators: Dict[type, Callable] = {
+            exp.EQ: np.equal,
+            exp.NEQ: np.not_equal,
+            exp.GT: np.greater,
+            exp.GTE: np.greater_equal,
+            exp.LT: np.less,
+            exp.LTE: np.less_equal,
+        }
+        values = operators[type(node)](left.values, right.values).astype(bool)
+        return _Vector(values & ~is_null, is_null, "boolean")
+
+    def _arithmetic(self, node: exp.Expression) -> _Vector:
+        left = self._numeric(self.evaluate(node.left))
+        right = self._numeric(self.evaluate(node.right))
+        is_null = left.is_null | right.is_null
+        if isinstance(node, exp.Add):
+            values = left.values + right.values
+        elif isinstance(node, exp.Sub):
+            values = left.values - right.values
+        elif isinstance(node, exp.Mul):
+            values = left.values * right.values
+        else:
+            integer_operands = np.issubdtype(
+                left.values.dtype, np.integer
+            ) and np.issubdtype(right.values.dtype, np.integer)
+            if self.sql_dialect == "sqlite" and integer_operands:
+                # SQLite performs integer division
+                raise InProcessScoringUnsupportedError("Integer division")
+            # Division by zero is null
+            is_null = is_null | (right.values == 0)
+            denominator = np.where(right.values == 0, 1, right.values)
+            values = left.values / denominator
+        return _Vector(values, is_null, "number")
+
+    def _case(self, node: exp.Case) -> _Vector:
+        if node.this is not None:
+            raise InProcessScoringUnsupportedError("CASE with an operand")
+        branches = [(i.this, i.args["true"]) for i in node.args["ifs"]]
+        default = node.args.get("default")
+        results = [self.evaluate(value) for _, value in branches]
+        results.append(self.evaluate(default) if default is not None else None)
+        kinds = {r.kind for r in results if r is not None and r.kind != "null"}
+        if len(kinds) > 1:
+            raise InProcessScoringUnsupportedError("CASE with mixed result types")
+        kind = kinds.pop() if kinds else "null"
+
+        if default is not None:
+            values = results[-1].values.copy()
+            is_null = results[-1].is_null.copy()
+        else:
+            values = np.zeros(self.num_rows, dtype=bool)
+            is_null = np.ones(self.num_rows, dtype=bool)
+        if kind == "string":
+            values = values.astype(object)
+        elif kind == "number":
+            values = values.astype(np.result_type(*[r.values for r in results if r]))
+
+        # Assign in reverse so that earlier branches take precedence
+        for (condition, _), result in reversed(list(zip(branches, results))):
+            chosen = self._boolean(self.evaluate(condition)).is_true
+            values[chosen] = result.values[chosen]
+            is_null[chosen] = result.is_null[chosen]
+        return _Vector(values, is_null, kind)
+
+    def _coalesce(self, nodes: List[exp.Expression]) -> _Vector:
+        operands = [self.evaluate(n) for n in nodes]
+        kinds = {o.kind for o in operands if o.kind != "null"}
+        if len(kinds) > 1:
+            raise InProcessScoringUnsupportedError("COALESCE with mixed types")
+        result = operands[-1]
+        values, is_null = result.values.copy(), result.is_null.copy()
+        for operand in reversed(operands[:-1]):
+            if operand.kind == "null":
+                continue
+            present = ~operand.is_null
+            if values.dtype != operand.values.dtype:
+                values = values.astype(
+                    np.result_type(values.dtype, operand.values.dtype)
+                )
+            values[present] = operand.values[present]
+            is_null[present] = False
+        return _Vector(values, is_null, kinds.pop() if kinds else "null")
+
+    def _cast(self, node: exp.Cast) -> _Vector:
+        operand = self.evaluate(node.this)
+        to = node.to
+        if to.is_type(*exp.DataType.REAL_TYPES) and operand.kind in ("number", "null"):
+            return _Vector(operand.values.astype(np.float64), operand.is_null, "number")
+        if to.is_type(*exp.DataType.TEXT_TYPES) and operand.kind in ("string", "null"):
+            return self._string(operand)
+        raise InProcessScoringUnsupportedError(node.sql())
+
+    def _length(self, node: exp.Expression, in_bytes: bool) -> _Vector:
+        operand = self._string(self.evaluate(node))
+        if in_bytes:
+            lengths = (len(v.encode("utf-8")) for v in operand.values)
+        else:
+            lengths = (len(v) for v in operand.values)
+        values = np.fromiter(lengths, dtype=np.int64, count=self.num_rows)
+        return _Vector(values, operand.is_null, "number")
+
+    def _substring(self, node: exp.Substring) -> _Vector:
+        operand = self._string(self.evaluate(node.this))
+        start, length = node.args.get("start"), node.args.get("length")
+        if not isinstance(start, exp.Literal) or start.is_string:
+            raise InProcessScoringUnsupportedError(node.sql())
+        if length is not None and (
+            not isinstance(length, exp.Literal) or length.is_string
+        ):
+            raise InProcessScoringUnsupportedError(node.sql())
+        start_position = int(start.this)
+        if start_position < 1 or (length is not None and int(length.this) < 0):
+            raise InProcessScoringUnsupportedError(node.sql())
+        begin = start_position - 1
+        end = None if length is None else begin + int(length.this)
+        values = np.array([v[begin:end] for v in operand.values], dtype=object)
+        return _Vector(values, operand.is_null, "string")
+
+    def _string_function(self, name: str, arguments: List[exp.Expression]) -> _Vector:
+        functions = _STRING_FUNCTIONS.get(self.sql_dialect, {})
+        if name not in functions or len(arguments) != 2:
+            raise InProcessScoringUnsupportedError(f"Function {name}")
+        left, right = (self._string(self.evaluate(a)) for a in arguments)
+
+        if self.sql_dialect == "sqlite":
+            # SQLite udfs are called with str() of their arguments, so nulls are
+            # compared as the string 'None' rather than propagating
+            left_values = np.where(left.is_null, "None", left.values)
+            right_values = np.where(right.is_null, "None", right.values)
+            is_null = np.zeros(self.num_rows, dtype=bool)
+        elif self.sql_dialect == "duckdb":
+            left_values = [v.encode("utf-8") for v in left.values]
+            right_values = [v.encode("utf-8") for v in right.values]
+            is_null = left.is_null | right.is_null
+        else:
+            left_values, right_values = left.values, right.values
+            is_null = left.is_null | right.is_null
+
+        _import_rapidfuzz()
+        from rapidfuzz import distance, process
+
+        metric_name, scorer_name = functions[name]
+        scorer = getattr(getattr(distance, metric_name), scorer_name)
+        # Edit distances are integers, Jaro based scores are floats
+        is_edit_distance = "Jaro" not in metric_name
+        values = process.cpdist(
+            list(left_values),
+            list(right_values),
+            scorer=scorer,
+            dtype=np.int64 if is_edit_distance else np.float64,
+            workers=-1,
+        )
+        values = np.asarray(values)
+        if self.sql_dialect == "duckdb" and not is_edit_distance:
+            # DuckDB gives a similarity of 0 for two empty strings
+            both_empty = np.fromiter(
+                (not lv and not rv for lv, rv in zip(left_values, right_values)),
+                dtype=bool,
+                count=self.num_rows,
+            )
+            values[both_empty] = 0.0
+        return _Vector(values, is_null, "number")
+
+
+def _apply_to_distinct(values: np.ndarray, func: Callable[[float], float]):
+    """Apply a scalar math function to each distinct value.
+
+    NumPy's vectorised pow and log2 may differ from the C library functions used
+    by the databases in the last bit. Bayes factors and term frequency
+    adjustments take relatively few distinct values, so it is cheap to use the
+    math module instead.
+    """
+    distinct, inverse = np.unique(values, return_inverse=True)
+    results = np.array([func(v) for v in distinct.tolist()], dtype=np.float64)
+    return results[inverse.reshape(values.shape)]
+
+
+def _pow(base: float, exponent: float) -> float:
+    try:
+        return math.pow(base, exponent)
+    except (OverflowError, ValueError):
+        return math.nan
+
+
+def _log2(value: float) -> float:
+    if value == 0:
+        return -math.inf
+    if math.isinf(value) or math.isnan(value):
+        return value
+    return math.log2(value)
+
+
+class _TfAdjustedLevel(NamedTuple):
+    comparison_vector_value: int
+    tf_name_l: str
+    tf_name_r: str
+    u_probability_exact_match: float
+    weight: float
+    minimum_u_value: float
+
+
+class InProcessScorer:
+    """Scores a table of blocked pairs using the parameters of a trained model.
+
+    `InProcessScoringUnsupportedError` is raised on construction if the model
+    has untrained levels or unparseable conditions, and when scoring if a
+    condition uses sql or column types the engine does not support.
+    """
+
+    def __init__(self, settings_obj: Settings):
+        self.settings_obj = settings_obj
+        self.sql_dialect = settings_obj._sql_dialect
+        self.sqlglot_dialect = SplinkDialect.from_string(self.sql_dialect).sqlglot_name
+        core_model_settings = settings_obj.core_model_settings
+        self.comparisons: List[Comparison] = core_model_settings.comparisons
+        self.prior = core_model_settings.probability_two_random_records_match
+
+        self._level_conditions: List[List[Tuple[Optional[exp.Expression], int]]] = []
+        self._bayes_factors: List[Dict[int, float]] = []
+        self._tf_levels: List[List[_TfAdjustedLevel]] = []
+        for cc in self.comparisons:
+            levels = []
+            bayes_factors = {}
+            tf_levels = []
+            for cl in cc.comparison_levels:
+                condition = None
+                if not cl._is_else_level:
+                    try:
+                        condition = sqlglot.parse_one(
+                            cl.sql_condition, read=self.sqlglot_dialect
+                        )
+                    except sqlglot.errors.ParseError as e:
+                        raise InProcessScoringUnsupportedError(str(e)) from e
+                levels.append((condition, cl.comparison_vector_value))
+                if cl._bayes_factor is None:
+                    raise InProcessScoringUnsupportedError(
+                        f"Comparison {cc.output_column_name} has untrained levels"
+                    )
+                bayes_factors[cl.comparison_vector_value] = cl._bayes_factor
+
+                # Levels whose tf adjustment is not 1, see _tf_adjustment_sql
+                if (
+                    cl.comparison_vector_value != -1
+                    and cl._has_tf_adjustments
+                    and cl._tf_adjustment_weight != 0
+                    and not cl._is_else_level
+                ):
+                    tf_col = cl._tf_adjustment_input_column
+                    tf_levels.append(
+                        _TfAdjustedLevel(
+                            comparison_vector_value=cl.comparison_vector_value,
+                            tf_name_l=self._column_name(tf_col.tf_name_l),
+                            tf_name_r=self._column_name(tf_col.tf_name_r),
+                            u_probability_exact_match=cl._u_probability_corresponding_to_exact_match(
+                                cc.comparison_levels
+                            ),
+                            weight=cl._tf_adjustment_weight,
+                            minimum_u_value=cl._tf_minimum_u_value,
+                        )
+                    )
+            if levels[-1][0] is not None:
+                raise InProcessScoringUnsupportedError(
+                    f"Comparison {cc.output_column_name} has no ELSE level"
+                )
+            self._level_conditions.append(levels)
+            self._bayes_factors.append(bayes_factors)
+            self._tf_levels.append(tf_levels)
+
+        self._float_literals: Dict[float, float] = {}
+
+    def _column_name(self, column_sql: str) -> str:
+        return sqlglot.parse_one(column_sql, read=self.sqlglot_dialect).alias_or_name
+
+    @property
+    def _float_literals_in_sql(self) -> List[float]:
+        """The constants which the sql casts to float8"""
+        literals = []
+        if self.prior != 1.0:
+            literals.append(prob_to_bayes_factor(self.prior))
+        for bayes_factors in self._bayes_factors:
+            literals.extend(bayes_factors.values())
+        for tf_levels in self._tf_levels:
+            for level in tf_levels:
+                literals.extend(
+                    [
+                        level.u_probability_exact_match,
+                        level.weight,
+                        level.minimum_u_value,
+                    ]
+                )
+        return [v for v in dict.fromkeys(literals) if math.isfinite(v)]
+
+    def read_float_literals_using(
+        self,
+        db_api: DatabaseAPI,
+        threshold_match_probability: float = None,
+        threshold_match_weight: float = None,
+    ) -> None:
+        """Cast the model's constants and the prediction threshold to float8 in
+        the database.
+
+        Some databases do not read long decimal literals as the nearest double
+        (DuckDB reads them as decimals first), so the constants are read back
+        from the database to reproduce its arithmetic exactly.
+        """
+        literals = self._float_literals_in_sql
+        threshold = threshold_as_match_weight(
+            threshold_match_probability, threshold_match_weight
+        )
+        if threshold is not None and threshold not in literals:
+            literals.append(threshold)
+        if not literals:
+            return
+        select_expr = ", ".join(
+            f"cast({v} as float8) as literal_{i}" for i, v in enumerate(literals)
+        )
+        pipeline = CTEPipeline()
+        pipeline.enqueue_sql(f"select {select_expr}", "__splink__float_literals")
+        df = db_api.sql_pipeline_to_splink_dataframe(pipeline, use_cache=False)
+        record = df.as_record_dict()[0]
+        df.drop_table_from_database_and_remove_from_cache()
+        self._float_literals = {
+            v: float(record[f"literal_{i}"]) for i, v in enumerate(literals)
+        }
+
+    def _float(self, value: float) -> float:
+        return self._float_literals.get(value, value)
+
+    def _comparison_vector_values(
+        self, evaluator: _ExpressionEvaluator, levels
+    ) -> np.ndarray:
+        gamma = np.full(evaluator.num_rows, levels[-1][1], dtype=np.int64)
+        assigned = np.zeros(evaluator.num_rows, dtype=bool)
+        for condition, value in levels[:-1]:
+            result = evaluator.evaluate(condition)
+            if result.kind not in ("boolean", "null"):
+                raise InProcessScoringUnsupportedError(
+                    f"Condition {condition.sql()} is not boolean"
+                )
+            chosen = result.is_true & ~assigned
+            gamma[chosen] = value
+            assigned |= chosen
+        return gamma
+
+    def _tf_adjustments(
+        self,
+        evaluator: _ExpressionEvaluator,
+        tf_levels: List[_TfAdjustedLevel],
+        gamma: np.ndarray,
+    ) -> np.ndarray:
+        # Mirrors ComparisonLevel._tf_adjustment_sql
+        adjustment = np.ones(evaluator.num_rows, dtype=np.float64)
+        for level in tf_levels:
+            tf_l = evaluator.column(level.tf_name_l)
+            tf_r = evaluator.column(level.tf_name_r)
+            tf_l_values = tf_l.values.astype(np.float64)
+            tf_r_values = tf_r.values.astype(np.float64)
+            coalesce_l_r = np.where(tf_l.is_null, tf_r_values, tf_l_values)
+            coalesce_r_l = np.where(tf_r.is_null, tf_l_values, tf_r_values)
+            exists = ~(tf_l.is_null & tf_r.is_null)
+
+            minimum_u = self._float(level.minimum_u_value)
+            if level.minimum_u_value == 0.0:
+                divisor = np.where(
+                    coalesce_l_r >= coalesce_r_l, coalesce_l_r, coalesce_r_l
+                )
+            else:
+                divisor = np.where(
+                    (coalesce_l_r >= coalesce_r_l) & (coalesce_l_r > minimum_u),
+                    coalesce_l_r,
+                    np.where(coalesce_r_l > minimum_u, coalesce_r_l, minimum_u),
+                )
+            u_exact = self._float(level.u_probability_exact_match)
+            weight = self._float(level.weight)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = u_exact / divisor
+            level_adjustment = _apply_to_distinct(ratio, lambda b, w=weight: _pow(b, w))
+
+            chosen = (gamma == level.comparison_vector_value) & exists
+            adjustment[chosen] = level_adjustment[chosen]
+        return adjustment
+
+    def predict(
+        self,
+        blocked_pairs: pa.Table,
+        threshold_match_probability: float = None,
+        threshold_match_weight: float = None,
+    ) -> pa.Table:
+        """Score the blocked pairs, returning a table with the same columns as
+        the `__splink__df_predict` table computed in the database"""
+        import pyarrow as pa
+
+        settings_obj = self.settings_obj
+        evaluator = _ExpressionEvaluator(blocked_pairs, self.sql_dialect)
+        computed: Dict[str, np.ndarray] = {}
+
+        bf_terms: List[np.ndarray] = []
+        any_term_inf = np.zeros(blocked_pairs.num_rows, dtype=bool)
+        for cc, levels, bayes_factors, tf_levels in zip(
+            self.comparisons,
+            self._level_conditions,
+            self._bayes_factors,
+            self._tf_levels,
+        ):
+            gamma = self._comparison_vector_values(evaluator, levels)
+            computed[cc._gamma_column_name] = gamma
+
+            # Look up each pair's Bayes factor by its comparison vector value
+            offset = -min(bayes_factors)
+            lookup = np.ones(max(bayes_factors) + offset + 1, dtype=np.float64)
+            for value, bf in bayes_factors.items():
+                lookup[value + offset] = self._float(bf)
+            bf = lookup[gamma + offset]
+            computed[cc._bf_column_name] = bf
+            terms = [bf]
+
+            if cc._has_tf_adjustments:
+                tf_adjustment = self._tf_adjustments(evaluator, tf_levels, gamma)
+                computed[cc._bf_tf_adj_column_name] = tf_adjustment
+                terms.append(tf_adjustment)
+
+            for term in terms:
+                any_term_inf |= np.isinf(term)
+                bf_terms.append(term)
+
+        if self.prior == 1.0:
+            bayes_factor = np.full(blocked_pairs.num_rows, np.inf)
+            match_probability = np.ones(blocked_pairs.num_rows)
+        else:
+            # Multiply in the same order as the sql expression
+            bayes_factor = np.full(
+                blocked_pairs.num_rows, self._float(prob_to_bayes_factor(self.prior))
+            )
+            for term in bf_terms:
+                bayes_factor = bayes_factor * term
+            with np.errstate(divide="ignore", invalid="ignore"):
+                match_probability = np.where(
+                    any_term_inf, 1.0, bayes_factor / (1 + bayes_factor)
+                )
+        match_weight = _apply_to_distinct(bayes_factor, _log2)
+
+        threshold = threshold_as_match_weight(
+            threshold_match_probability, threshold_match_weight
+        )
+        if threshold is not None:
+            keep = match_weight >= self._float(threshold)
+        else:
+            keep = np.ones(blocked_pairs.num_rows, dtype=bool)
+
+        select_cols = Settings.columns_to_select_for_predict(
+            unique_id_input_columns=settings_obj.column_info_settings.unique_id_input_columns,
+            comparisons=self.comparisons,
+            retain_matching_columns=settings_obj._retain_matching_columns,
+            retain_intermediate_calculation_columns=settings_obj._retain_intermediate_calculation_columns,
+            training_mode=False,
+            additional_columns_to_retain=settings_obj._additional_columns_to_retain,
+            needs_matchkey_column=settings_obj._needs_matchkey_column,
+        )
+
+        filtered = blocked_pairs.filter(pa.array(keep))
+        columns = {
+            "match_weight": pa.array(match_weight[keep]),
+            "match_probability": pa.array(match_probability[keep]),
+        }
+        for col in select_cols:
+            name = self._column_name(col)
+            if name in computed:
+                columns[name] = pa.array(computed[name][keep])
+            else:
+                columns[name] = filtered.column(name)
+        return pa.table(columns)
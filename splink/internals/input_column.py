@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING, Optional, Type
 import sqlglot
 import sqlglot.expressions as exp
 
+from splink.internals.sql_parse_cache import parse_one_cached
 from splink.internals.sql_transform import sqlglot_tree_signature
 
 if TYPE_CHECKING:
@@ -102,14 +103,14 @@ class SqlglotColumnTreeBuilder:
                 return f"{q_s}{input_str}{q_e}"
 
         valid_signatures = {
-            sqlglot_tree_signature(sqlglot.parse_one("col_name")),
-            sqlglot_tree_signature(sqlglot.parse_one("col_name[1]")),
-            sqlglot_tree_signature(sqlglot.parse_one("col_name['lat']")),
+            sqlglot_tree_signature(parse_one_cached("col_name")),
+            sqlglot_tree_signature(parse_one_cached("col_name[1]")),
+            sqlglot_tree_signature(parse_one_cached("col_name['lat']")),
         }
 
         # If the raw string parses to a valid signature, use it
         try:
-            tree = sqlglot.parse_one(input_str, read=sqlglot_dialect)
+            tree = parse_one_cached(input_str, read=sqlglot_dialect)
         except (sqlglot.ParseError, sqlglot.TokenError):
             pass
         else:
@@ -126,7 +127,7 @@ class SqlglotColumnTreeBuilder:
         q_s, q_e = _get_dialect_quotes(sqlglot_dialect)
         input_str = add_quotes_to_column_name(input_str, q_s, q_e)
         try:
-            tree = sqlglot.parse_one(input_str, read=sqlglot_dialect)
+            tree = parse_one_cached(input_str, read=sqlglot_dialect)
         except (sqlglot.ParseError, sqlglot.TokenError):
             pass
         else:
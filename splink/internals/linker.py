@@ -169,6 +169,9 @@ class Linker:
         self._validate_input_dfs()
         self._validate_settings(validate_settings)
         self._em_training_sessions: list[EMTrainingSession] = []
+        # Comparison counts of combinations of blocking columns, shared by
+        # searches for blocking rules below a threshold count
+        self._blocking_columns_count_cache: dict[frozenset[str], int] = {}
 
         self._debug_mode = False
 
@@ -600,7 +603,11 @@ class Linker:
         self, max_comparisons_per_rule, blocking_expressions=None, max_results=None
     ):
         return find_blocking_rules_below_threshold_comparison_count(
-            self, max_comparisons_per_rule, blocking_expressions, max_results
+            self,
+            max_comparisons_per_rule,
+            blocking_expressions,
+            max_results,
+            count_cache=self._blocking_columns_count_cache,
         )
 
     def _detect_blocking_rules_for_prediction(
@@ -655,7 +662,10 @@ class Linker:
         """
 
         df_br_below_thres = find_blocking_rules_below_threshold_comparison_count(
-            self, max_comparisons_per_rule, blocking_expressions
+            self,
+            max_comparisons_per_rule,
+            blocking_expressions,
+            count_cache=self._blocking_columns_count_cache,
         )
 
         blocking_rule_suggestions = suggest_blocking_rules(
@@ -734,7 +744,9 @@ class Linker:
         """
 
         df_br_below_thres = find_blocking_rules_below_threshold_comparison_count(
-            self, max_comparisons_per_rule
+            self,
+            max_comparisons_per_rule,
+            count_cache=self._blocking_columns_count_cache,
         )
 
         blocking_rule_suggestions = suggest_blocking_rules(
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List, Literal, Union
+from typing import TYPE_CHECKING, List, Literal, Optional, Union
+
+import pandas as pd
 
 from splink.internals.accuracy import (
     prediction_errors_from_label_column,
@@ -16,10 +18,14 @@ from splink.internals.charts import (
     threshold_selection_tool,
     unlinkables_chart,
 )
+from splink.internals.find_brs_with_comparison_counts_below_threshold import (
+    find_blocking_rules_below_threshold_comparison_count,
+)
 from splink.internals.labelling_tool import (
     generate_labelling_tool_comparisons,
     render_labelling_tool_html,
 )
+from splink.internals.optimise_cost_of_brs import blocking_rule_sets_pareto_frontier
 from splink.internals.splink_dataframe import SplinkDataFrame
 from splink.internals.unlinkables import unlinkables_data
 
@@ -87,6 +93,85 @@ class LinkerEvalution:
             threshold_match_probability,
         )
 
+    def blocking_rules_cost_recall_frontier(
+        self,
+        labels_splinkdataframe_or_table_name: str | SplinkDataFrame,
+        max_comparisons_per_rule: int,
+        *,
+        blocking_expressions: Optional[List[str]] = None,
+        threshold_match_probability: float = 0.5,
+        min_freedom: int = 1,
+        num_runs: int = 100,
+    ) -> pd.DataFrame:
+        """Find sets of blocking rules with the best trade off between the cost of
+        scoring the comparisons they generate and the proportion of true matches
+        they generate (recall).
+
+        Candidate rules block on combinations of `blocking_expressions` and
+        generate at most `max_comparisons_per_rule` comparisons each.  The cost of
+        a set of rules is the number of comparisons it generates multiplied by
+        an estimate of the cost of scoring each comparison, based on the
+        conditions in the model's comparison levels.  Recall is measured using a
+        table of labels, or a table of high probability predictions such as the
+        output of `linker.inference.predict(threshold_match_probability=0.99)`.
+
+        The sets returned form a Pareto frontier: no other set found has both a
+        lower cost and a higher recall.  To choose rules for a given compute
+        budget, pick the last row whose cost is within it.
+
+        Args:
+            labels_splinkdataframe_or_table_name (str | SplinkDataFrame): Name of
+                table containing labels in the database, or predictions
+            max_comparisons_per_rule (int): The maximum number of comparisons that
+                each blocking rule is allowed to generate
+            blocking_expressions (list[str], optional): Column expressions to
+                block on.  If None, uses the columns used by the model's
+                comparisons. Defaults to None.
+            threshold_match_probability (float, optional): Pairs with a
+                `clerical_match_score` (or, for predictions, `match_probability`)
+                of at least this value are treated as true matches.
+                Defaults to 0.5.
+            min_freedom (int, optional): The minimum number of rules in the
+                heuristically selected sets in which each column is allowed to
+                vary. Defaults to 1.
+            num_runs (int, optional): The number of heuristic selections of rules
+                to try. Defaults to 100.
+
+        Examples:
+            ```py
+            labels_table = linker.table_management.register_labels_table(df_labels)
+            frontier = linker.evaluation.blocking_rules_cost_recall_frontier(
+                labels_table, max_comparisons_per_rule=1_000_000
+            )
+            budget = 1e9
+            rules = frontier[frontier["estimated_scoring_cost"] <= budget].iloc[-1]
+            rules["blocking_rules_as_splink_brs"]
+            ```
+
+        Returns:
+            pd.DataFrame: One row per set of blocking rules, ordered by increasing
+                `estimated_scoring_cost` and `recall`
+        """
+        linker = self._linker
+        labels_tablename = linker._get_labels_tablename_from_input(
+            labels_splinkdataframe_or_table_name
+        )
+        df_block_stats = find_blocking_rules_below_threshold_comparison_count(
+            linker,
+            max_comparisons_per_rule,
+            blocking_expressions,
+            count_cache=linker._blocking_columns_count_cache,
+        )
+        return blocking_rule_sets_pareto_frontier(
+            linker,
+            df_block_stats,
+            labels_tablename,
+            threshold_match_probability=threshold_match_probability,
+            min_freedom=min_freedom,
+            num_runs=num_runs,
+            count_cache=linker._blocking_columns_count_cache,
+        )
+
     def accuracy_analysis_from_labels_column(
         self,
         labels_column_name: str,
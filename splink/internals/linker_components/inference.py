@@ -1,30 +1,46 @@
 from __future__ import annotations
 
 import logging
+import os
 import time
 from typing import TYPE_CHECKING, Any
 
 from splink.internals.blocking import (
     BlockingRule,
     block_using_rules_sqls,
+    materialise_blocking_key_index_tables,
     materialise_exploded_id_tables,
 )
+from splink.internals.blocking_analysis import materialise_heavy_block_keys_tables
 from splink.internals.blocking_rule_creator import BlockingRuleCreator
 from splink.internals.blocking_rule_creator_utils import to_blocking_rule_creator
 from splink.internals.comparison_vector_values import (
+    MEMOISE_DISTINCT_PAIR_RATIO,
     compute_comparison_vector_values_from_id_pairs_sqls,
+    distinct_value_pairs_sql,
+    memoised_comparison_vector_values_sql,
+    uses_string_similarity_function,
 )
 from splink.internals.database_api import AcceptableInputTableType
+from splink.internals.exceptions import SplinkException
 from splink.internals.find_matches_to_new_records import (
     add_unique_id_and_source_dataset_cols_if_needed,
 )
+from splink.internals.in_process_scoring import (
+    InProcessScorer,
+    InProcessScoringUnsupportedError,
+)
 from splink.internals.misc import (
     ascii_uid,
     ensure_is_list,
 )
 from splink.internals.pipeline import CTEPipeline
 from splink.internals.predict import (
+    agreement_pattern_lookup_table,
+    match_weight_upper_bound_condition_sql,
     predict_from_comparison_vectors_sqls_using_settings,
+    predict_from_comparison_vectors_using_lookup_sqls_using_settings,
+    threshold_as_match_weight,
 )
 from splink.internals.splink_dataframe import SplinkDataFrame
 from splink.internals.term_frequencies import (
@@ -38,10 +54,20 @@ from splink.internals.vertically_concatenate import (
 )
 
 if TYPE_CHECKING:
+    from splink.internals.comparison import Comparison
     from splink.internals.linker import Linker
 
 logger = logging.getLogger(__name__)
 
+SCORING_ENGINES = ("sql", "in_process")
+
+
+def _validate_engine(engine: str) -> None:
+    if engine not in SCORING_ENGINES:
+        raise ValueError(
+            f"engine must be one of {', '.join(SCORING_ENGINES)}, got {engine!r}"
+        )
+
 
 class LinkerInference:
     """Use your Splink model to make predictions (perform inference). Accessed via
@@ -117,6 +143,23 @@ class LinkerInference:
             unique_id_input_column=self._linker._settings_obj.column_info_settings.unique_id_input_column,
         )
 
+        salted_br_with_heavy_block_tables = materialise_heavy_block_keys_tables(
+            blocking_rules=self._linker._settings_obj._blocking_rules_to_generate_predictions,
+            link_type=self._linker._settings_obj._link_type,
+            db_api=self._linker._db_api,
+            splink_df_dict=self._linker._input_tables_dict,
+        )
+
+        br_with_blocking_key_index_tables = materialise_blocking_key_index_tables(
+            link_type=link_type,
+            blocking_rules=self._linker._settings_obj._blocking_rules_to_generate_predictions,
+            db_api=self._linker._db_api,
+            splink_df_dict=self._linker._input_tables_dict,
+            source_dataset_input_column=self._linker._settings_obj.column_info_settings.source_dataset_input_column,
+            unique_id_input_column=self._linker._settings_obj.column_info_settings.unique_id_input_column,
+            deduplication_strategy=self._linker._settings_obj._blocking_deduplication_strategy,
+        )
+
         sqls = block_using_rules_sqls(
             input_tablename_l=blocking_input_tablename_l,
             input_tablename_r=blocking_input_tablename_r,
@@ -124,6 +167,7 @@ class LinkerInference:
             link_type=link_type,
             source_dataset_input_column=self._linker._settings_obj.column_info_settings.source_dataset_input_column,
             unique_id_input_column=self._linker._settings_obj.column_info_settings.unique_id_input_column,
+            deduplication_strategy=self._linker._settings_obj._blocking_deduplication_strategy,
         )
         pipeline.enqueue_list_of_sqls(sqls)
         blocked_pairs = self._linker._db_api.sql_pipeline_to_splink_dataframe(pipeline)
@@ -146,6 +190,9 @@ class LinkerInference:
         deterministic_link_df.metadata["is_deterministic_link"] = True
 
         [b.drop_materialised_id_pairs_dataframe() for b in exploding_br_with_id_tables]
+        [b.drop_heavy_block_keys_dataframe() for b in salted_br_with_heavy_block_tables]
+        for br in br_with_blocking_key_index_tables:
+            br.detach_blocking_key_index_tables()
         blocked_pairs.drop_table_from_database_and_remove_from_cache()
 
         return deterministic_link_df
@@ -156,6 +203,11 @@ class LinkerInference:
         threshold_match_weight: float = None,
         materialise_after_computing_term_frequencies: bool = True,
         materialise_blocked_pairs: bool = True,
+        num_chunks: int = None,
+        chunked_output_path: str = None,
+        engine: str = "sql",
+        agreement_pattern_lookup: bool = False,
+        memoise_comparisons: list[str] | str | None = None,
     ) -> SplinkDataFrame:
         """Create a dataframe of scored pairwise comparisons using the parameters
         of the linkage model.
@@ -171,6 +223,9 @@ class LinkerInference:
             threshold_match_weight (float, optional): If specified,
                 filter the results to include only pairwise comparisons with a
                 match_weight above this threshold. Defaults to None.
+                With either threshold, comparisons using string similarity
+                functions are not computed for pairs which could not reach it
+                whatever their levels of these comparisons.
             materialise_after_computing_term_frequencies (bool): If true, Splink
                 will materialise the table containing the input nodes (rows)
                 joined to any term frequencies which have been asked
@@ -178,6 +233,44 @@ class LinkerInference:
                 computed as part of a large CTE pipeline.   Defaults to True
             materialise_blocked_pairs: In the blocking phase, materialise the table
                 of pairs of records that will be scored
+            num_chunks (int, optional): If specified, the blocked pairs are
+                split into this many chunks (by a hash of the left hand record's
+                id), and each chunk is scored separately, bounding the memory
+                needed to score very large numbers of comparisons. Each chunk
+                is appended to a single output table as it is scored. Implies
+                materialisation of the term frequency table and the blocked
+                pairs. Defaults to None (no chunking).
+            chunked_output_path (str, optional): If specified alongside
+                `num_chunks`, each scored chunk is written to a parquet file in
+                this directory (`chunk_0.parquet`, `chunk_1.parquet`, ...) and
+                dropped from the database, rather than being appended to an
+                output table. The returned SplinkDataFrame reads from the
+                parquet files. DuckDB only. Defaults to None.
+            engine (str, optional): Where to score the blocked pairs. `"sql"`
+                scores them in the database. `"in_process"` fetches the blocked
+                pairs as an Arrow table and scores them in Python with NumPy and
+                rapidfuzz, giving the same results as `"sql"`. If the model uses
+                sql the in-process engine does not support, the pairs are scored
+                in the database. Defaults to "sql".
+            agreement_pattern_lookup (bool, optional): If True, the Bayes factors,
+                match weight and match probability of every combination of
+                comparison levels are precomputed into a small lookup table,
+                which is joined to the comparison vectors, rather than evaluating
+                a CASE expression per comparison for every pair. Term frequency
+                adjustments are still computed per pair. Models with more than
+                100,000 combinations of levels are scored without the lookup.
+                Defaults to False.
+            memoise_comparisons (list[str] | str, optional): The output column
+                names of comparisons whose comparison vector values are computed
+                once per distinct pair of compared values, and joined back to the
+                blocked pairs, rather than evaluated for every pair. This avoids
+                repeatedly evaluating expensive functions such as Jaro-Winkler on
+                values which recur in many pairs. If `"auto"`, comparisons using
+                a string similarity function are memoised when they have at most
+                one distinct pair of values per ten blocked pairs. Each memoised
+                comparison needs an extra pass over the blocked pairs, so this
+                helps most when the similarity functions are expensive, such as
+                user defined functions. Defaults to None.
 
         Examples:
             ```py
@@ -185,10 +278,43 @@ class LinkerInference:
             splink_df = linker.inference.predict(threshold_match_probability=0.95)
             splink_df.as_pandas_dataframe(limit=5)
             ```
+
+            Score a very large number of comparisons in 20 chunks, writing the
+            results to a directory of parquet files:
+            ```py
+            splink_df = linker.inference.predict(
+                num_chunks=20, chunked_output_path="predictions/"
+            )
+            ```
         Returns:
             SplinkDataFrame: A SplinkDataFrame of the scored pairwise comparisons.
         """
 
+        if num_chunks is not None and (
+            not isinstance(num_chunks, int) or num_chunks < 1
+        ):
+            raise ValueError(
+                f"num_chunks must be a positive integer, got {num_chunks!r}"
+            )
+        _validate_engine(engine)
+        memoised_comparisons = self._memoised_comparisons_from_names(
+            memoise_comparisons
+        )
+        chunked = num_chunks is not None and num_chunks > 1
+        if chunked_output_path is not None:
+            if not chunked:
+                raise ValueError(
+                    "chunked_output_path can only be used with num_chunks > 1"
+                )
+            if self._linker._sql_dialect != "duckdb":
+                raise SplinkException(
+                    "Writing chunked predictions to parquet with "
+                    "`chunked_output_path` is only supported by the DuckDB backend"
+                )
+        if chunked:
+            materialise_after_computing_term_frequencies = True
+            materialise_blocked_pairs = True
+
         pipeline = CTEPipeline()
 
         # If materialise_after_computing_term_frequencies=False and the user only
@@ -238,6 +364,23 @@ class LinkerInference:
             unique_id_input_column=self._linker._settings_obj.column_info_settings.unique_id_input_column,
         )
 
+        salted_br_with_heavy_block_tables = materialise_heavy_block_keys_tables(
+            blocking_rules=self._linker._settings_obj._blocking_rules_to_generate_predictions,
+            link_type=self._linker._settings_obj._link_type,
+            db_api=self._linker._db_api,
+            splink_df_dict=self._linker._input_tables_dict,
+        )
+
+        br_with_blocking_key_index_tables = materialise_blocking_key_index_tables(
+            link_type=link_type,
+            blocking_rules=self._linker._settings_obj._blocking_rules_to_generate_predictions,
+            db_api=self._linker._db_api,
+            splink_df_dict=self._linker._input_tables_dict,
+            source_dataset_input_column=self._linker._settings_obj.column_info_settings.source_dataset_input_column,
+            unique_id_input_column=self._linker._settings_obj.column_info_settings.unique_id_input_column,
+            deduplication_strategy=self._linker._settings_obj._blocking_deduplication_strategy,
+        )
+
         sqls = block_using_rules_sqls(
             input_tablename_l=blocking_input_tablename_l,
             input_tablename_r=blocking_input_tablename_r,
@@ -245,6 +388,7 @@ class LinkerInference:
             link_type=link_type,
             source_dataset_input_column=self._linker._settings_obj.column_info_settings.source_dataset_input_column,
             unique_id_input_column=self._linker._settings_obj.column_info_settings.unique_id_input_column,
+            deduplication_strategy=self._linker._settings_obj._blocking_deduplication_strategy,
         )
 
         pipeline.enqueue_list_of_sqls(sqls)
@@ -259,25 +403,36 @@ class LinkerInference:
             logger.info(f"Blocking time: {blocking_time:.2f} seconds")
             start_time = time.time()
 
-        sqls = compute_comparison_vector_values_from_id_pairs_sqls(
-            self._linker._settings_obj._columns_to_select_for_blocking,
-            self._linker._settings_obj._columns_to_select_for_comparison_vector_values,
-            input_tablename_l="__splink__df_concat_with_tf",
-            input_tablename_r="__splink__df_concat_with_tf",
-            source_dataset_input_column=self._linker._settings_obj.column_info_settings.source_dataset_input_column,
-            unique_id_input_column=self._linker._settings_obj.column_info_settings.unique_id_input_column,
-        )
-        pipeline.enqueue_list_of_sqls(sqls)
-
-        sqls = predict_from_comparison_vectors_sqls_using_settings(
-            self._linker._settings_obj,
-            threshold_match_probability,
-            threshold_match_weight,
-            sql_infinity_expression=self._linker._infinity_expression,
-        )
-        pipeline.enqueue_list_of_sqls(sqls)
-
-        predictions = self._linker._db_api.sql_pipeline_to_splink_dataframe(pipeline)
+        lookup = None
+        if agreement_pattern_lookup:
+            lookup = self._register_agreement_pattern_lookup()
+
+        if chunked:
+            predictions = self._predict_in_chunks(
+                blocked_pairs,
+                df_concat_with_tf,
+                num_chunks,
+                threshold_match_probability,
+                threshold_match_weight,
+                chunked_output_path,
+                engine,
+                lookup,
+                memoised_comparisons,
+            )
+        else:
+            predictions = self._score_comparison_vectors(
+                pipeline,
+                self._comparison_vector_sqls(
+                    threshold_match_weight=threshold_as_match_weight(
+                        threshold_match_probability, threshold_match_weight
+                    )
+                ),
+                engine,
+                threshold_match_probability,
+                threshold_match_weight,
+                agreement_pattern_lookup=lookup,
+                memoised_comparisons=memoised_comparisons,
+            )
 
         predict_time = time.time() - start_time
         logger.info(f"Predict time: {predict_time:.2f} seconds")
@@ -285,8 +440,384 @@ class LinkerInference:
         self._linker._predict_warning()
 
         [b.drop_materialised_id_pairs_dataframe() for b in exploding_br_with_id_tables]
+        [b.drop_heavy_block_keys_dataframe() for b in salted_br_with_heavy_block_tables]
+        for br in br_with_blocking_key_index_tables:
+            br.detach_blocking_key_index_tables()
         if materialise_blocked_pairs:
             blocked_pairs.drop_table_from_database_and_remove_from_cache()
+        if lookup is not None:
+            lookup.drop_table_from_database_and_remove_from_cache()
+
+        return predictions
+
+    def _register_agreement_pattern_lookup(self) -> SplinkDataFrame | None:
+        """Register the table of precomputed Bayes factors of each agreement
+        pattern, or return None if the model is unsuitable for a lookup"""
+        core_model_settings = self._linker._settings_obj.core_model_settings
+        table = agreement_pattern_lookup_table(
+            core_model_settings.comparisons,
+            core_model_settings.probability_two_random_records_match,
+        )
+        if table is None:
+            logger.info("Scoring pairs without an agreement pattern lookup")
+            return None
+        lookup = self._linker._db_api.register_table(
+            table, f"__splink__agreement_pattern_lookup_{ascii_uid(8)}"
+        )
+        lookup.templated_name = "__splink__agreement_pattern_lookup"
+        lookup.created_by_splink = True
+        return lookup
+
+    def _memoised_comparisons_from_names(
+        self, memoise_comparisons: list[str] | str | None
+    ) -> list[Comparison] | str:
+        """Look up the comparisons to memoise by output column name. Comparisons
+        to memoise automatically ("auto") are chosen when scoring"""
+        if memoise_comparisons is None:
+            return []
+        if memoise_comparisons == "auto":
+            return "auto"
+        if isinstance(memoise_comparisons, str):
+            raise ValueError(
+                "memoise_comparisons must be a list of comparison output column "
+                f"names or 'auto', got {memoise_comparisons!r}"
+            )
+        comparisons = {
+            cc.output_column_name: cc for cc in self._linker._settings_obj.comparisons
+        }
+        unknown = [name for name in memoise_comparisons if name not in comparisons]
+        if unknown:
+            raise ValueError(
+                f"Cannot memoise comparisons {unknown}: the model's comparisons "
+                f"are {list(comparisons)}"
+            )
+        return [comparisons[name] for name in memoise_comparisons]
+
+    def _materialise_memoised_comparisons(
+        self,
+        pipeline: CTEPipeline,
+        blocked_with_cols_sql: dict[str, str],
+        memoised_comparisons: list[Comparison] | str,
+    ) -> list[tuple[Comparison, SplinkDataFrame]]:
+        """Materialise a table of the comparison vector values of each distinct
+        pair of values compared by each memoised comparison, reading the pairs of
+        records from `pipeline`.
+
+        With "auto", comparisons using string similarity functions are memoised
+        if they have few distinct pairs of values relative to the number of pairs
+        of records.
+        """
+        db_api = self._linker._db_api
+        if memoised_comparisons == "auto":
+            comparisons = [
+                cc
+                for cc in self._linker._settings_obj.comparisons
+                if uses_string_similarity_function(cc, self._linker._sql_dialect_object)
+            ]
+        else:
+            comparisons = memoised_comparisons
+
+        memoised_tables = []
+        for cc in comparisons:
+            distinct_pipeline = pipeline.copy()
+            distinct_pipeline.enqueue_sql(**blocked_with_cols_sql)
+            distinct_pipeline.enqueue_sql(
+                distinct_value_pairs_sql(cc), "__splink__distinct_value_pairs"
+            )
+            distinct_value_pairs = db_api.sql_pipeline_to_splink_dataframe(
+                distinct_pipeline, use_cache=False
+            )
+
+            if memoised_comparisons == "auto":
+                counts_pipeline = CTEPipeline([distinct_value_pairs])
+                counts_pipeline.enqueue_sql(
+                    """
+                    select count(*) as num_distinct,
+                    sum(__splink__num_pairs) as num_pairs
+                    from __splink__distinct_value_pairs
+                    """,
+                    "__splink__distinct_value_pairs_counts",
+                )
+                counts = db_api.sql_pipeline_to_splink_dataframe(
+                    counts_pipeline, use_cache=False
+                )
+                row = counts.as_record_dict()[0]
+                counts.drop_table_from_database_and_remove_from_cache()
+                num_distinct, num_pairs = (
+                    row["num_distinct"],
+                    int(row["num_pairs"] or 0),
+                )
+                logger.info(
+                    f"Comparison {cc.output_column_name} has {num_distinct:,} "
+                    f"distinct pairs of values in {num_pairs:,} pairs of records"
+                )
+                if num_distinct > MEMOISE_DISTINCT_PAIR_RATIO * num_pairs:
+                    distinct_value_pairs.drop_table_from_database_and_remove_from_cache()
+                    continue
+
+            memoised_pipeline = CTEPipeline([distinct_value_pairs])
+            memoised_pipeline.enqueue_sql(
+                memoised_comparison_vector_values_sql(cc),
+                cc._memoised_table_name,
+            )
+            memoised_tables.append(
+                (
+                    cc,
+                    db_api.sql_pipeline_to_splink_dataframe(
+                        memoised_pipeline, use_cache=False
+                    ),
+                )
+            )
+            distinct_value_pairs.drop_table_from_database_and_remove_from_cache()
+
+        return memoised_tables
+
+    def _comparison_vector_sqls(
+        self,
+        blocked_pairs_tablename: str = "__splink__blocked_id_pairs",
+        memoised_comparisons: list[Comparison] | None = None,
+        threshold_match_weight: float | None = None,
+    ) -> list[dict[str, str]]:
+        settings_obj = self._linker._settings_obj
+        pruning_condition = None
+        if threshold_match_weight is not None:
+            pruning_condition = match_weight_upper_bound_condition_sql(
+                settings_obj.core_model_settings,
+                self._linker._sql_dialect_object,
+                threshold_match_weight,
+            )
+        return compute_comparison_vector_values_from_id_pairs_sqls(
+            settings_obj._columns_to_select_for_blocking,
+            settings_obj.columns_to_select_for_comparison_vector_values(
+                unique_id_input_columns=settings_obj.column_info_settings.unique_id_input_columns,
+                comparisons=settings_obj.comparisons,
+                retain_matching_columns=settings_obj._retain_matching_columns,
+                additional_columns_to_retain=settings_obj._additional_columns_to_retain,
+                needs_matchkey_column=settings_obj._needs_matchkey_column,
+                memoised_comparisons=memoised_comparisons,
+            ),
+            input_tablename_l="__splink__df_concat_with_tf",
+            input_tablename_r="__splink__df_concat_with_tf",
+            source_dataset_input_column=settings_obj.column_info_settings.source_dataset_input_column,
+            unique_id_input_column=settings_obj.column_info_settings.unique_id_input_column,
+            blocked_pairs_tablename=blocked_pairs_tablename,
+            memoised_comparisons=memoised_comparisons,
+            pruning_condition=pruning_condition,
+        )
+
+    def _score_comparison_vectors(
+        self,
+        pipeline: CTEPipeline,
+        comparison_vector_sqls: list[dict[str, str]],
+        engine: str,
+        threshold_match_probability: float | None = None,
+        threshold_match_weight: float | None = None,
+        use_cache: bool = True,
+        agreement_pattern_lookup: SplinkDataFrame | None = None,
+        memoised_comparisons: list[Comparison] | str | None = None,
+    ) -> SplinkDataFrame:
+        """Compute the comparison vectors and predictions for the pairs of records
+        joined to their columns by the first of `comparison_vector_sqls`.
+
+        With `engine="in_process"` the joined pairs are materialised and scored
+        in Python, unless the model cannot be scored in process. Otherwise, if
+        an `agreement_pattern_lookup` table is given, the Bayes factors are read
+        from it.
+
+        When scoring in the database, the comparison vector values of
+        `memoised_comparisons` (or those chosen automatically, if "auto") are
+        computed once per distinct pair of values and read from memoised tables.
+        """
+        db_api = self._linker._db_api
+        settings_obj = self._linker._settings_obj
+        if agreement_pattern_lookup is not None:
+            predict_sqls = (
+                predict_from_comparison_vectors_using_lookup_sqls_using_settings(
+                    settings_obj,
+                    threshold_match_probability,
+                    threshold_match_weight,
+                    sql_infinity_expression=self._linker._infinity_expression,
+                )
+            )
+        else:
+            predict_sqls = predict_from_comparison_vectors_sqls_using_settings(
+                settings_obj,
+                threshold_match_probability,
+                threshold_match_weight,
+                sql_infinity_expression=self._linker._infinity_expression,
+            )
+
+        scorer = None
+        if engine == "in_process":
+            try:
+                scorer = InProcessScorer(settings_obj)
+                scorer.read_float_literals_using(
+                    db_api, threshold_match_probability, threshold_match_weight
+                )
+            except InProcessScoringUnsupportedError as e:
+                logger.info(f"Scoring pairs in the database instead of in process: {e}")
+
+        if scorer is None:
+            memoised_tables = []
+            if memoised_comparisons:
+                memoised_tables = self._materialise_memoised_comparisons(
+                    pipeline, comparison_vector_sqls[0], memoised_comparisons
+                )
+                # The sqls following blocked_with_cols do not depend on the
+                # blocked pairs table it reads from
+                comparison_vector_sqls = [
+                    comparison_vector_sqls[0],
+                    *self._comparison_vector_sqls(
+                        memoised_comparisons=[cc for cc, _ in memoised_tables],
+                        threshold_match_weight=threshold_as_match_weight(
+                            threshold_match_probability, threshold_match_weight
+                        ),
+                    )[1:],
+                ]
+            for _, memoised_table in memoised_tables:
+                pipeline.append_input_dataframe(memoised_table)
+            if agreement_pattern_lookup is not None:
+                pipeline.append_input_dataframe(agreement_pattern_lookup)
+            pipeline.enqueue_list_of_sqls(comparison_vector_sqls + predict_sqls)
+            predictions = db_api.sql_pipeline_to_splink_dataframe(
+                pipeline, use_cache=use_cache and not memoised_tables
+            )
+            for _, memoised_table in memoised_tables:
+                memoised_table.drop_table_from_database_and_remove_from_cache()
+            return predictions
+
+        blocked_with_cols_sql, *comparison_vector_sqls = comparison_vector_sqls
+        pipeline.enqueue_sql(**blocked_with_cols_sql)
+        blocked_with_cols = db_api.sql_pipeline_to_splink_dataframe(
+            pipeline, use_cache=False
+        )
+        try:
+            scored = scorer.predict(
+                blocked_with_cols.as_arrow_table(),
+                threshold_match_probability,
+                threshold_match_weight,
+            )
+        except InProcessScoringUnsupportedError as e:
+            logger.info(f"Scoring pairs in the database instead of in process: {e}")
+            pipeline = CTEPipeline([blocked_with_cols])
+            if agreement_pattern_lookup is not None:
+                pipeline.append_input_dataframe(agreement_pattern_lookup)
+            pipeline.enqueue_list_of_sqls(comparison_vector_sqls + predict_sqls)
+            predictions = db_api.sql_pipeline_to_splink_dataframe(
+                pipeline, use_cache=False
+            )
+        else:
+            predictions = db_api.register_table(
+                scored, f"__splink__df_predict_{ascii_uid(8)}"
+            )
+            predictions.templated_name = "__splink__df_predict"
+            predictions.created_by_splink = True
+
+        blocked_with_cols.drop_table_from_database_and_remove_from_cache()
+        return predictions
+
+    def _predict_in_chunks(
+        self,
+        blocked_pairs: SplinkDataFrame,
+        df_concat_with_tf: SplinkDataFrame,
+        num_chunks: int,
+        threshold_match_probability: float | None,
+        threshold_match_weight: float | None,
+        chunked_output_path: str | None,
+        engine: str = "sql",
+        agreement_pattern_lookup: SplinkDataFrame | None = None,
+        memoised_comparisons: list[Comparison] | str | None = None,
+    ) -> SplinkDataFrame:
+        """Score the materialised blocked pairs in `num_chunks` chunks, partitioned
+        by a hash of join_key_l, so that only one chunk of comparison vectors is
+        computed at a time.
+
+        Each scored chunk is either appended to the output table as it is
+        scored, or written to a parquet file in `chunked_output_path` and
+        dropped.  Backends which cannot insert into a table union the scored
+        chunks once they have all been scored.
+        """
+        db_api = self._linker._db_api
+        partition_expr = self._linker._sql_dialect_object.hash_partition_sql(
+            "join_key_l", num_chunks
+        )
+
+        predictions = None
+        chunks = []
+        parquet_paths = []
+        for chunk_number in range(num_chunks):
+            chunk_start_time = time.time()
+
+            pipeline = CTEPipeline([blocked_pairs, df_concat_with_tf])
+            sql = f"""
+            select *
+            from __splink__blocked_id_pairs
+            where {partition_expr} = {chunk_number}
+            """
+            pipeline.enqueue_sql(sql, "__splink__blocked_id_pairs_chunk")
+            chunk = self._score_comparison_vectors(
+                pipeline,
+                self._comparison_vector_sqls(
+                    blocked_pairs_tablename="__splink__blocked_id_pairs_chunk",
+                    threshold_match_weight=threshold_as_match_weight(
+                        threshold_match_probability, threshold_match_weight
+                    ),
+                ),
+                engine,
+                threshold_match_probability,
+                threshold_match_weight,
+                use_cache=False,
+                agreement_pattern_lookup=agreement_pattern_lookup,
+                memoised_comparisons=memoised_comparisons,
+            )
+
+            if chunked_output_path is not None:
+                parquet_path = os.path.join(
+                    chunked_output_path, f"chunk_{chunk_number}.parquet"
+                )
+                chunk.to_parquet(parquet_path, overwrite=True)
+                parquet_paths.append(parquet_path)
+                chunk.drop_table_from_database_and_remove_from_cache()
+            elif not db_api._supports_insert_into:
+                chunks.append(chunk)
+            elif predictions is None:
+                pipeline = CTEPipeline()
+                pipeline.enqueue_sql(
+                    f"select * from {chunk.physical_name}", "__splink__df_predict"
+                )
+                predictions = db_api.sql_pipeline_to_splink_dataframe(
+                    pipeline, use_cache=False
+                )
+                chunk.drop_table_from_database_and_remove_from_cache()
+            else:
+                db_api._insert_into_table(
+                    predictions.physical_name, chunk.physical_name
+                )
+                chunk.drop_table_from_database_and_remove_from_cache()
+
+            logger.info(
+                f"Scored chunk {chunk_number + 1} of {num_chunks} in "
+                f"{time.time() - chunk_start_time:.2f} seconds"
+            )
+
+        if chunked_output_path is not None:
+            # Only read the files written by this call, not those left in the
+            # directory by earlier runs
+            parquet_files = ", ".join(f"'{path}'" for path in parquet_paths)
+            return db_api.table_to_splink_dataframe(
+                "__splink__df_predict", f"read_parquet([{parquet_files}])"
+            )
+
+        if predictions is not None:
+            return predictions
+
+        sql = " union all ".join(f"select * from {c.physical_name}" for c in chunks)
+        pipeline = CTEPipeline()
+        pipeline.enqueue_sql(sql, "__splink__df_predict")
+        predictions = db_api.sql_pipeline_to_splink_dataframe(pipeline, use_cache=False)
+
+        for chunk in chunks:
+            chunk.drop_table_from_database_and_remove_from_cache()
 
         return predictions
 
@@ -298,6 +829,7 @@ class LinkerInference:
         | dict[str, Any]
         | str = [],
         match_weight_threshold: float = -4,
+        engine: str = "sql",
     ) -> SplinkDataFrame:
         """Given one or more records, find records in the input dataset(s) which match
         and return in order of the Splink prediction score.
@@ -314,6 +846,9 @@ class LinkerInference:
                 provided to the linker when it was instantiated. Defaults to [].
             match_weight_threshold (int, optional): Return matches with a match weight
                 above this threshold. Defaults to -4.
+            engine (str, optional): Score the blocked pairs in the database
+                (`"sql"`) or in Python (`"in_process"`). See
+                `linker.inference.predict()`. Defaults to "sql".
 
         Examples:
             ```py
@@ -341,6 +876,7 @@ class LinkerInference:
             SplinkDataFrame: The pairwise comparisons.
         """
 
+        _validate_engine(engine)
         original_blocking_rules = (
             self._linker._settings_obj._blocking_rules_to_generate_predictions
         )
@@ -397,6 +933,7 @@ class LinkerInference:
             link_type="two_dataset_link_only",
             source_dataset_input_column=settings.column_info_settings.source_dataset_input_column,
             unique_id_input_column=settings.column_info_settings.unique_id_input_column,
+            deduplication_strategy=settings._blocking_deduplication_strategy,
         )
         pipeline.enqueue_list_of_sqls(sqls)
 
@@ -441,13 +978,20 @@ class LinkerInference:
             unique_id_input_column=settings.column_info_settings.unique_id_input_column,
         )
 
-        pipeline.enqueue_list_of_sqls(sqls)
+        scored_in_process = None
+        if engine == "in_process":
+            scored_in_process = self._score_comparison_vectors(
+                pipeline, sqls, engine, use_cache=False
+            )
+            pipeline = CTEPipeline([scored_in_process])
+        else:
+            pipeline.enqueue_list_of_sqls(sqls)
 
-        sqls = predict_from_comparison_vectors_sqls_using_settings(
-            self._linker._settings_obj,
-            sql_infinity_expression=self._linker._infinity_expression,
-        )
-        pipeline.enqueue_list_of_sqls(sqls)
+            sqls = predict_from_comparison_vectors_sqls_using_settings(
+                self._linker._settings_obj,
+                sql_infinity_expression=self._linker._infinity_expression,
+            )
+            pipeline.enqueue_list_of_sqls(sqls)
 
         sql = f"""
         select * from __splink__df_predict
@@ -466,11 +1010,16 @@ class LinkerInference:
         self._linker._settings_obj._link_type = original_link_type
 
         blocked_pairs.drop_table_from_database_and_remove_from_cache()
+        if scored_in_process is not None:
+            scored_in_process.drop_table_from_database_and_remove_from_cache()
 
         return predictions
 
     def compare_two_records(
-        self, record_1: dict[str, Any], record_2: dict[str, Any]
+        self,
+        record_1: dict[str, Any],
+        record_2: dict[str, Any],
+        engine: str = "sql",
     ) -> SplinkDataFrame:
         """Use the linkage model to compare and score a pairwise record comparison
         based on the two input records provided
@@ -480,6 +1029,9 @@ class LinkerInference:
                 and data types must be the same as the columns in the settings object
             record_2 (dict): dictionary representing the second record.  Columns names
                 and data types must be the same as the columns in the settings object
+            engine (str, optional): Score the comparison in the database
+                (`"sql"`) or in Python (`"in_process"`). See
+                `linker.inference.predict()`. Defaults to "sql".
 
         Examples:
             ```py
@@ -514,6 +1066,7 @@ class LinkerInference:
             SplinkDataFrame: Pairwise comparison with scored prediction
         """
 
+        _validate_engine(engine)
         cache = self._linker._intermediate_table_cache
 
         uid = ascii_uid(8)
@@ -599,16 +1152,8 @@ class LinkerInference:
             source_dataset_input_column=source_dataset_ic,
             unique_id_input_column=uid_ic,
         )
-        pipeline.enqueue_list_of_sqls(sqls)
-
-        sqls = predict_from_comparison_vectors_sqls_using_settings(
-            self._linker._settings_obj,
-            sql_infinity_expression=self._linker._infinity_expression,
-        )
-        pipeline.enqueue_list_of_sqls(sqls)
-
-        predictions = self._linker._db_api.sql_pipeline_to_splink_dataframe(
-            pipeline, use_cache=False
+        predictions = self._score_comparison_vectors(
+            pipeline, sqls, engine, use_cache=False
         )
 
         return predictions
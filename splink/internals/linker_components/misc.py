@@ -4,6 +4,8 @@ import json
 import os
 from typing import TYPE_CHECKING, Any
 
+from pandas import DataFrame as PandasDataFrame
+
 from splink.internals.pipeline import CTEPipeline
 
 if TYPE_CHECKING:
@@ -89,3 +91,27 @@ class LinkerMisc:
                 f"output_type '{output_type}' is not supported.",
                 "Must be one of 'splink_df'/'splinkdf' or 'pandas'",
             )
+
+    def query_profile(self) -> PandasDataFrame:
+        """Return structured timing and size information about every pipeline
+        executed since query profiling was enabled on the `db_api`.
+
+        This is useful for identifying which steps of e.g. `predict()`, EM
+        training or clustering dominate run time at scale.
+
+        Examples:
+            ```py
+            db_api = DuckDBAPI()
+            db_api.enable_query_profiling(explain_analyze=True)
+            linker = Linker(df, settings, db_api)
+            linker.inference.predict()
+            linker.misc.query_profile().sort_values("wall_time_seconds")
+            ```
+
+        Returns:
+            pandas.DataFrame: One row per executed pipeline, with the templated and
+                physical name of the output table, wall time, output row count,
+                output size in bytes (where available), query plan (if requested)
+                and SQL.
+        """
+        return self._linker._db_api.query_profile_as_pandas_dataframe()
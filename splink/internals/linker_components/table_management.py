@@ -149,10 +149,10 @@ class LinkerTableManagement:
         splink_dataframe = self.register_table(
             input_data, table_name_physical, overwrite=overwrite
         )
+        splink_dataframe.templated_name = "__splink__df_predict"
         self._linker._intermediate_table_cache["__splink__df_predict"] = (
             splink_dataframe
         )
-        splink_dataframe.templated_name = "__splink__df_predict"
         return splink_dataframe
 
     def register_term_frequency_lookup(self, input_data, col_name, overwrite=False):
@@ -166,8 +166,8 @@ class LinkerTableManagement:
         splink_dataframe = self.register_table(
             input_data, table_name_physical, overwrite=overwrite
         )
-        self._linker._intermediate_table_cache[table_name_templated] = splink_dataframe
         splink_dataframe.templated_name = table_name_templated
+        self._linker._intermediate_table_cache[table_name_templated] = splink_dataframe
         return splink_dataframe
 
     def register_labels_table(self, input_data, overwrite=False):
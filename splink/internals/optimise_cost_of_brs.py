@@ -1,12 +1,25 @@
 from __future__ import annotations
 
 import logging
+from collections import Counter
 from random import randint
-from typing import TypeVar
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, TypeVar
 
 import pandas as pd
 
-from splink.internals.cost_of_blocking_rules import calculate_cost_of_combination_of_brs
+from splink.internals.cost_of_blocking_rules import (
+    calculate_cost_of_combination_of_brs,
+    estimate_cost_per_comparison,
+)
+from splink.internals.find_brs_with_comparison_counts_below_threshold import (
+    _count_uncached_combinations,
+    _generate_blocking_rule,
+)
+from splink.internals.pipeline import CTEPipeline
+from splink.internals.vertically_concatenate import enqueue_df_concat
+
+if TYPE_CHECKING:
+    from splink.internals.linker import Linker
 
 logger = logging.getLogger(__name__)
 
@@ -216,3 +229,310 @@ def suggest_blocking_rules(
     )
 
     return min_scores_df
+
+
+def _union_inclusion_exclusion_terms(
+    rule_columns: List[frozenset[str]],
+) -> Counter[frozenset[str]]:
+    """The terms of the inclusion-exclusion formula for the number of pairs
+    generated by any of a set of equi-join rules on columns.
+
+    Pairs generated by all of a subset of rules are the pairs generated by
+    blocking on the union of their columns, so
+    |A ∪ B ∪ ...| = Σ coefficient * count(union of columns), summing over the
+    returned {union of columns: coefficient}.  Subsets with the same union of
+    columns are combined, so there are at most 2^(number of columns) terms.
+    """
+    terms: Counter[frozenset[str]] = Counter()
+    for cols in rule_columns:
+        new_terms: Counter[frozenset[str]] = Counter({cols: 1})
+        for union, coefficient in terms.items():
+            new_terms[union | cols] -= coefficient
+        terms.update(new_terms)
+    return Counter({k: v for k, v in terms.items() if v != 0})
+
+
+def _count_records_with_non_null_keys(
+    linker: "Linker", combinations: List[frozenset[str]]
+) -> Dict[frozenset[str], int]:
+    """The number of input records with non-null values of every column in each
+    combination, in a single scan of the input data"""
+    counts_sql = ", ".join(
+        f"count(case when {' and '.join(f'({c}) is not null' for c in sorted(cols))}"
+        f" then 1 end) as n_{i}"
+        if cols
+        else f"count(*) as n_{i}"
+        for i, cols in enumerate(combinations)
+    )
+    pipeline = CTEPipeline()
+    pipeline = enqueue_df_concat(linker, pipeline)
+    pipeline.enqueue_sql(
+        f"select {counts_sql} from __splink__df_concat",
+        "__splink__non_null_key_counts",
+    )
+    df_counts = linker._db_api.sql_pipeline_to_splink_dataframe(pipeline)
+    counts = df_counts.as_record_dict()[0]
+    df_counts.drop_table_from_database_and_remove_from_cache()
+    return {cols: int(counts[f"n_{i}"] or 0) for i, cols in enumerate(combinations)}
+
+
+def _matches_found_by_rules_sqls(
+    linker: "Linker",
+    labels_tablename: str,
+    rules: list,
+    threshold_match_probability: float,
+) -> list[dict[str, str]]:
+    """SQL to count the labelled matches found by each combination of `rules`.
+
+    The output has a column `__splink_found_by_{i}` for each rule, which is 1 if
+    the rule generates the pair, and the number of matches with each
+    combination of these values"""
+    labels = linker._table_to_splink_dataframe(labels_tablename, labels_tablename)
+    colnames = [c.unquote().name for c in labels.columns]
+    if "clerical_match_score" in colnames:
+        score_col = "clerical_match_score"
+    elif "match_probability" in colnames:
+        score_col = "match_probability"
+    else:
+        raise ValueError(
+            f"Table {labels_tablename} must have a `clerical_match_score` "
+            "or `match_probability` column"
+        )
+
+    column_info_settings = linker._settings_obj.column_info_settings
+    unique_id_col = column_info_settings.unique_id_column_name
+    source_dataset_col = column_info_settings.source_dataset_column_name
+    join_conditions = {}
+    for side in ["l", "r"]:
+        join_condition = f"{side}.{unique_id_col} = m.{unique_id_col}_{side}"
+        if source_dataset_col and f"{source_dataset_col}_{side}" in colnames:
+            join_condition += (
+                f" and {side}.{source_dataset_col} = m.{source_dataset_col}_{side}"
+            )
+        join_conditions[side] = join_condition
+
+    found_cols = [f"__splink_found_by_{i}" for i in range(len(rules))]
+    found_sql = ", ".join(
+        f"case when coalesce(({br.blocking_rule_sql}), false) then 1 else 0 end "
+        f"as {col}"
+        for br, col in zip(rules, found_cols)
+    )
+    return [
+        {
+            "sql": f"""
+            select * from {labels.physical_name}
+            where {score_col} >= {threshold_match_probability}
+            """,
+            "output_table_name": "__splink__labelled_matches",
+        },
+        {
+            "sql": f"""
+            select {found_sql}
+            from __splink__labelled_matches as m
+            inner join __splink__df_concat as l on {join_conditions["l"]}
+            inner join __splink__df_concat as r on {join_conditions["r"]}
+            """,
+            "output_table_name": "__splink__labelled_matches_found_by_rules",
+        },
+        {
+            "sql": f"""
+            select {", ".join(found_cols)}, count(*) as num_matches
+            from __splink__labelled_matches_found_by_rules
+            group by {", ".join(found_cols)}
+            """,
+            "output_table_name": "__splink__labelled_matches_found_by_rule_counts",
+        },
+    ]
+
+
+def _pareto_frontier(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The candidates for which no other candidate has both a lower or equal
+    cost and a higher or equal recall, sorted by cost"""
+    frontier: List[Dict[str, Any]] = []
+    ordered = sorted(
+        candidates, key=lambda c: (c["estimated_scoring_cost"], -c["recall"])
+    )
+    for candidate in ordered:
+        if not frontier or candidate["recall"] > frontier[-1]["recall"]:
+            frontier.append(candidate)
+    return frontier
+
+
+def blocking_rule_sets_pareto_frontier(
+    linker: "Linker",
+    df_block_stats: pd.DataFrame,
+    labels_tablename: str,
+    threshold_match_probability: float = 0.5,
+    min_freedom: int = 1,
+    num_runs: int = 100,
+    count_cache: Optional[Dict[frozenset[str], int]] = None,
+) -> pd.DataFrame:
+    """Find the sets of blocking rules with the best trade off between the
+    cost of scoring the comparisons they generate and their recall.
+
+    Candidate sets of the rules in `df_block_stats` are chosen using the same
+    heuristic as `suggest_blocking_rules`, and by greedily adding the rule which
+    finds the most matches not yet found per comparison it generates.
+
+    The cost of a set is the number of comparisons it generates (counted
+    exactly from the counts of blocking on combinations of columns) multiplied
+    by the estimated cost of scoring a comparison using the linker's
+    comparisons.  Its recall is the proportion of the matches in the labels
+    table which it generates.  When linking more than two input tables, the
+    number of comparisons includes pairs of records from the same table, so is
+    an overestimate.
+
+    Args:
+        linker (Linker): The Linker object
+        df_block_stats: Dataframe returned by
+            find_blocking_rules_below_threshold_comparison_count
+        labels_tablename (str): Table of labelled pairs, or of predictions
+        threshold_match_probability (float, optional): Pairs with a
+            `clerical_match_score` (or, if there is no such column,
+            `match_probability`) of at least this are matches. Defaults to 0.5.
+        min_freedom (int, optional): See `suggest_blocking_rules`. Defaults to 1.
+        num_runs (int, optional): How many heuristic selections of rules to try.
+            Defaults to 100.
+        count_cache (dict, optional): Comparison counts keyed by the set of
+            columns blocked on, as used by
+            find_blocking_rules_below_threshold_comparison_count
+
+    Returns:
+        pd.DataFrame: One row for each set of rules on the frontier, sorted by
+            cost, so that each row has a higher cost and a higher recall than
+            the row before it
+    """
+    if count_cache is None:
+        count_cache = {}
+
+    recs = df_block_stats.to_dict(orient="records")
+    rules = [row["splink_blocking_rule"] for row in recs]
+
+    pipeline = CTEPipeline()
+    pipeline = enqueue_df_concat(linker, pipeline)
+    pipeline.enqueue_list_of_sqls(
+        _matches_found_by_rules_sqls(
+            linker, labels_tablename, rules, threshold_match_probability
+        )
+    )
+    df_found = linker._db_api.sql_pipeline_to_splink_dataframe(pipeline)
+    found_patterns = [
+        (
+            frozenset(i for i in range(len(rules)) if r[f"__splink_found_by_{i}"]),
+            r["num_matches"],
+        )
+        for r in df_found.as_record_dict()
+    ]
+    df_found.drop_table_from_database_and_remove_from_cache()
+
+    num_matches = sum(n for _, n in found_patterns)
+    if num_matches == 0:
+        raise ValueError(
+            f"No pairs in {labels_tablename} have a score of at least "
+            f"{threshold_match_probability}, so recall cannot be measured"
+        )
+
+    def matches_found(rule_indices: frozenset[int]) -> int:
+        return sum(n for found_by, n in found_patterns if found_by & rule_indices)
+
+    # Candidate sets from the heuristic used by suggest_blocking_rules
+    field_names = [c for c in recs[0].keys() if c.startswith("__fixed__")]
+    for row_index, row in enumerate(recs):
+        row["__splink_row_index"] = row_index
+    ordered_recs = sorted(
+        recs, key=lambda r: (r["num_equi_joins"], -r["comparison_count"])
+    )
+    candidate_sets = set()
+    for _ in range(num_runs):
+        selected_rows = heuristic_select_brs_that_have_min_freedom(
+            ordered_recs, field_names, min_field_freedom=min_freedom
+        )
+        candidate_sets.add(frozenset(r["__splink_row_index"] for r in selected_rows))
+
+    # A greedy chain of increasingly large sets
+    selected: frozenset[int] = frozenset()
+    while True:
+        num_found = matches_found(selected)
+        gains = {
+            i: (matches_found(selected | {i}) - num_found)
+            / max(row["comparison_count"], 1)
+            for i, row in enumerate(recs)
+            if i not in selected
+        }
+        best = max(gains, key=lambda i: gains[i], default=None)
+        if best is None or gains[best] <= 0:
+            break
+        selected = selected | {best}
+        candidate_sets.add(selected)
+
+    # A rule blocking on a superset of another rule's columns generates no
+    # additional pairs, so is removed
+    def without_redundant_rules(rule_indices: frozenset[int]) -> frozenset[int]:
+        cols = {i: frozenset(recs[i]["blocking_columns"]) for i in rule_indices}
+        return frozenset(
+            i
+            for i in rule_indices
+            if not any(
+                cols[j] < cols[i] or (cols[j] == cols[i] and j < i)
+                for j in rule_indices
+            )
+        )
+
+    candidate_sets = {without_redundant_rules(c) for c in candidate_sets}
+
+    terms_by_set = {
+        rule_indices: _union_inclusion_exclusion_terms(
+            [frozenset(recs[i]["blocking_columns"]) for i in rule_indices]
+        )
+        for rule_indices in candidate_sets
+    }
+    combinations = sorted(
+        {cols for terms in terms_by_set.values() for cols in terms}, key=sorted
+    )
+    uncached = [cols for cols in combinations if cols not in count_cache]
+    _count_uncached_combinations(
+        linker,
+        [sorted(cols) for cols in uncached],
+        [_generate_blocking_rule(linker._db_api, sorted(cols)) for cols in uncached],
+        count_cache,
+    )
+
+    # The cached counts are of the rows generated by the join before any
+    # filtering, i.e. n^2 for a block of n records.  Unless linking two tables,
+    # each pair is scored once and records are not compared to themselves, so
+    # there are (n^2 - n) / 2 comparisons to score
+    if (
+        linker._settings_obj._link_type == "link_only"
+        and len(linker._input_tables_dict) == 2
+    ):
+        pairs_to_score = {cols: count_cache[cols] for cols in combinations}
+    else:
+        non_null_counts = _count_records_with_non_null_keys(linker, combinations)
+        pairs_to_score = {
+            cols: (count_cache[cols] - non_null_counts[cols]) // 2
+            for cols in combinations
+        }
+
+    cost_per_comparison = estimate_cost_per_comparison(linker._settings_obj.comparisons)
+    candidates = []
+    for rule_indices, terms in terms_by_set.items():
+        ordered_indices = sorted(rule_indices)
+        num_comparisons = sum(
+            coefficient * pairs_to_score[cols] for cols, coefficient in terms.items()
+        )
+        num_found = matches_found(rule_indices)
+        candidates.append(
+            {
+                "blocking_rules": [rules[i].blocking_rule_sql for i in ordered_indices],
+                "blocking_rules_as_splink_brs": [rules[i] for i in ordered_indices],
+                "num_blocking_rules": len(ordered_indices),
+                "num_comparisons": num_comparisons,
+                "cost_per_comparison": cost_per_comparison,
+                "estimated_scoring_cost": num_comparisons * cost_per_comparison,
+                "num_matches_found": num_found,
+                "num_matches": num_matches,
+                "recall": num_found / num_matches,
+            }
+        )
+
+    return pd.DataFrame(_pareto_frontier(candidates))
@@ -2,16 +2,16 @@ from __future__ import annotations
 
 from collections.abc import Sequence
 
-import sqlglot
 import sqlglot.expressions as exp
 from sqlglot.expressions import Bracket, Column, Lambda
 
+from splink.internals.sql_parse_cache import parse_one_cached
 from splink.internals.sql_transform import remove_quotes_from_identifiers
 
 
 def get_columns_used_from_sql(sql, dialect=None, retain_table_prefix=False):
     column_names = set()
-    syntax_tree = sqlglot.parse_one(sql, read=dialect)
+    syntax_tree = parse_one_cached(sql, read=dialect)
 
     for subtree in syntax_tree.find_all(exp.Column):
         # check if any parents are lambdas
@@ -60,7 +60,7 @@ def parse_columns_in_sql(
             be returned.
     """
     try:
-        syntax_tree = sqlglot.parse_one(sql, read=sql_dialect)
+        syntax_tree = parse_one_cached(sql, read=sql_dialect)
     except Exception:  # Consider catching a more specific exception if possible
         # If we can't parse a SQL condition, it's better to just pass.
         return []
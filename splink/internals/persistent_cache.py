@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PersistentCacheManifest:
+    """On-disk record of the intermediate tables Splink has materialised under a
+    stable (cross-session) fingerprint.
+
+    The default cache appends a random per-session uid to every hash, so a table
+    built in one process can never be found by another.  In persistent mode the
+    hash is instead derived from:
+
+    - the SQL used to create the table
+    - fingerprints (row count, checksum, file modification time where available)
+      of the input tables referenced by that SQL
+    - the Splink version
+
+    so a fresh process running against unchanged inputs computes the same physical
+    table names, and can reuse tables left in the database by an earlier run.
+
+    The manifest is a json file mapping physical table names to metadata about how
+    they were created.  A table is only reused from the database if it is recorded
+    in the manifest, so tables from an interrupted run are never picked up.
+    """
+
+    def __init__(self, manifest_path: str | Path):
+        self.manifest_path = Path(manifest_path)
+        self.input_table_fingerprints: Dict[str, str] = {}
+        self._entries: Dict[str, Dict[str, Any]] = self._read()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        if not self.manifest_path.exists():
+            return {}
+        with open(self.manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        return manifest.get("tables", {})
+
+    def _write(self) -> None:
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump({"tables": self._entries}, f, indent=4)
+
+    @staticmethod
+    def _splink_version() -> str:
+        from splink import __version__
+
+        return __version__
+
+    def record_input_table(self, physical_name: str, fingerprint: str) -> None:
+        self.input_table_fingerprints[physical_name] = fingerprint
+
+    def _input_fingerprints_used_by(self, sql: str) -> Dict[str, str]:
+        # Only the input tables the sql actually reads from should affect the hash,
+        # so that e.g. registering a labels table does not invalidate the
+        # fingerprint of every subsequent query
+        return {
+            name: fingerprint
+            for name, fingerprint in sorted(self.input_table_fingerprints.items())
+            if re.search(rf"(?<!\w){re.escape(name)}(?!\w)", sql)
+        }
+
+    def fingerprint(self, sql: str) -> str:
+        to_hash = json.dumps(
+            {
+                "sql": sql,
+                "inputs": self._input_fingerprints_used_by(sql),
+                "splink_version": self._splink_version(),
+            },
+            sort_keys=True,
+        ).encode("utf-8")
+        return hashlib.sha256(to_hash).hexdigest()[:9]
+
+    def __contains__(self, physical_name: str) -> bool:
+        return physical_name in self._entries
+
+    def get(self, physical_name: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(physical_name)
+
+    def record(self, physical_name: str, templated_name: str) -> None:
+        self._entries[physical_name] = {
+            "templated_name": templated_name,
+            "splink_version": self._splink_version(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._write()
+        logger.debug(
+            f"Recorded {templated_name} with physical name {physical_name} "
+            f"in persistent cache manifest {self.manifest_path}"
+        )
+
+    def remove(self, physical_name: str) -> None:
+        if self._entries.pop(physical_name, None) is not None:
+            self._write()
@@ -3,11 +3,12 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING, List, Optional
 
-import sqlglot
 from sqlglot.errors import ParseError
 from sqlglot.expressions import Table
 
 from splink.internals.misc import ensure_is_list
+from splink.internals.pipeline_optimiser import optimise_ctes
+from splink.internals.sql_parse_cache import parse_one_cached
 
 from .splink_dataframe import SplinkDataFrame
 
@@ -25,7 +26,7 @@ class CTE:
     @property
     def _uses_tables(self):
         try:
-            tree = sqlglot.parse_one(self.sql, read=None)
+            tree = parse_one_cached(self.sql, read=None)
         except ParseError:
             return ["Failure to parse SQL - tablenames not known"]
 
@@ -72,6 +73,15 @@ class CTEPipeline:
         new_pipeline = CTEPipeline(input_dataframes=[df])
         return new_pipeline
 
+    def copy(self) -> "CTEPipeline":
+        """A pipeline with the same inputs and queued sql, which can be used
+        independently of this one"""
+        if self.spent:
+            raise ValueError("This pipeline has already been used")
+        new_pipeline = CTEPipeline(input_dataframes=list(self.input_dataframes))
+        new_pipeline.queue = list(self.queue)
+        return new_pipeline
+
     def append_input_dataframe(self, df: SplinkDataFrame) -> None:
         self.input_dataframes.append(df)
 
@@ -98,10 +108,22 @@ class CTEPipeline:
         """Common table expressions"""
         return self._input_dataframes_as_cte() + self.queue
 
-    def generate_cte_pipeline_sql(self) -> str:
+    def generate_cte_pipeline_sql(
+        self,
+        optimise: bool = False,
+        sqlglot_dialect: Optional[str] = None,
+        prune_columns: bool = False,
+    ) -> str:
         self.spent = True
 
         pipeline = self.ctes_pipeline()
+        if optimise:
+            pipeline = optimise_ctes(
+                pipeline,
+                self.input_dataframes,
+                sqlglot_dialect=sqlglot_dialect,
+                prune_columns=prune_columns,
+            )
 
         self._log_pipeline(pipeline)
 
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import logging
+import re
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+from sqlglot.errors import ParseError
+from sqlglot.expressions import Count, Expression, Identifier, Star
+
+from splink.internals.sql_parse_cache import parse_one_cached
+
+if TYPE_CHECKING:
+    from splink.internals.pipeline import CTE
+    from splink.internals.splink_dataframe import SplinkDataFrame
+
+logger = logging.getLogger(__name__)
+
+
+def _references(sql: str, table_name: str) -> bool:
+    # Deliberately conservative: a plain text match may find references which
+    # are not really there (e.g. in a string literal), but will never miss one
+    return re.search(rf"(?<!\w){re.escape(table_name)}(?!\w)", sql) is not None
+
+
+def _parse(sql: str, sqlglot_dialect: Optional[str]) -> Optional[Expression]:
+    try:
+        return parse_one_cached(sql, read=sqlglot_dialect)
+    except ParseError:
+        return None
+
+
+def _canonical_sql(sql: str, sqlglot_dialect: Optional[str]) -> str:
+    tree = _parse(sql, sqlglot_dialect)
+    if tree is None:
+        return " ".join(sql.split())
+    return tree.sql(dialect=sqlglot_dialect)
+
+
+def _deduplicate_ctes(ctes: List[CTE], sqlglot_dialect: Optional[str]) -> List[CTE]:
+    from splink.internals.pipeline import CTE
+
+    seen: Dict[str, str] = {}
+    deduplicated = []
+    for cte in ctes:
+        canonical = _canonical_sql(cte.sql, sqlglot_dialect)
+        if canonical in seen:
+            logger.log(
+                5,
+                f"CTE {cte.output_table_name} is identical to "
+                f"{seen[canonical]}, so will be read from it",
+            )
+            cte = CTE(f"\nselect * from {seen[canonical]}", cte.output_table_name)
+        else:
+            seen[canonical] = cte.output_table_name
+        deduplicated.append(cte)
+    return deduplicated
+
+
+def _eliminate_dead_ctes(ctes: List[CTE]) -> List[CTE]:
+    # Walk backwards from the final query, keeping only CTEs which are
+    # referenced by something that is itself kept
+    kept = [ctes[-1]]
+    for cte in reversed(ctes[:-1]):
+        if any(_references(k.sql, cte.output_table_name) for k in kept):
+            kept.append(cte)
+        else:
+            logger.log(5, f"CTE {cte.output_table_name} is unused, so was removed")
+    return list(reversed(kept))
+
+
+def _identifiers_if_no_star(
+    sql: str, sqlglot_dialect: Optional[str]
+) -> Optional[Set[str]]:
+    tree = _parse(sql, sqlglot_dialect)
+    if tree is None:
+        return None
+    for star in tree.find_all(Star):
+        if not isinstance(star.parent, Count):
+            return None
+    return {i.this.lower() for i in tree.find_all(Identifier)}
+
+
+def _prune_input_dataframe_columns(
+    ctes: List[CTE],
+    input_dataframes: List[SplinkDataFrame],
+    sqlglot_dialect: Optional[str],
+) -> List[CTE]:
+    from splink.internals.pipeline import CTE
+
+    input_dataframes_by_name = {
+        df.templated_name: df
+        for df in input_dataframes
+        if not df.physical_and_template_names_equal
+    }
+
+    pruned = []
+    for i, cte in enumerate(ctes):
+        df = input_dataframes_by_name.get(cte.output_table_name)
+        # Only the 'select * from' wrappers of input dataframes are pruned, and
+        # only if every query reading from them names its columns explicitly
+        if df is None or i == len(ctes) - 1:
+            pruned.append(cte)
+            continue
+
+        identifiers: Set[str] = set()
+        for consumer in ctes[i + 1 :]:
+            if not _references(consumer.sql, cte.output_table_name):
+                continue
+            consumer_identifiers = _identifiers_if_no_star(
+                consumer.sql, sqlglot_dialect
+            )
+            if consumer_identifiers is None:
+                identifiers = set()
+                break
+            identifiers.update(consumer_identifiers)
+
+        if not identifiers:
+            pruned.append(cte)
+            continue
+
+        try:
+            columns = df.columns
+        except Exception:
+            # e.g. some backends cannot report the columns of an empty table
+            pruned.append(cte)
+            continue
+        used_columns = [c for c in columns if c.unquote().name.lower() in identifiers]
+        if used_columns and len(used_columns) < len(columns):
+            select_cols = ", ".join(c.quote().name for c in used_columns)
+            cte = CTE(
+                f"\nselect {select_cols} from {df.physical_name}",
+                cte.output_table_name,
+            )
+        pruned.append(cte)
+    return pruned
+
+
+def optimise_ctes(
+    ctes: List[CTE],
+    input_dataframes: List[SplinkDataFrame],
+    sqlglot_dialect: Optional[str] = None,
+    prune_columns: bool = False,
+) -> List[CTE]:
+    """Simplify a list of CTEs before they are combined into a single query.
+
+    - CTEs with identical SQL are merged, with later copies reading from the first
+    - CTEs (including input dataframe wrappers) which are not referenced, directly
+      or indirectly, by the final query are dropped
+    - If `prune_columns` is True, the `select * from` wrappers of input dataframes
+      are replaced with a select of only the columns downstream queries use.  This
+      requires the columns of each input dataframe, so may query the database.
+
+    Args:
+        ctes (list[CTE]): The CTEs in the pipeline, ending with the final query
+        input_dataframes (list[SplinkDataFrame]): The input dataframes of the
+            pipeline
+        sqlglot_dialect (str, optional): The sqlglot dialect used to parse the SQL
+        prune_columns (bool, optional): Whether to prune unused columns from input
+            dataframes. Defaults to False.
+
+    Returns:
+        list[CTE]: The optimised CTEs, ending with the final query
+    """
+    if len(ctes) <= 1:
+        return ctes
+
+    ctes = _deduplicate_ctes(ctes, sqlglot_dialect)
+    ctes = _eliminate_dead_ctes(ctes)
+    if prune_columns:
+        ctes = _prune_input_dataframe_columns(ctes, input_dataframes, sqlglot_dialect)
+    return ctes
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Union
+
+from splink.internals.pipeline import CTEPipeline
+from splink.internals.splink_dataframe import SplinkDataFrame
+
+logger = logging.getLogger(__name__)
+
+PipelineFactory = Callable[[Dict[str, SplinkDataFrame]], CTEPipeline]
+
+
+class PipelineNode:
+    def __init__(
+        self,
+        name: str,
+        pipeline: Union[CTEPipeline, PipelineFactory],
+        depends_on: Optional[List[str]] = None,
+        transient: bool = False,
+    ):
+        self.name = name
+        self.pipeline = pipeline
+        self.depends_on = depends_on or []
+        self.transient = transient
+
+    def build_pipeline(self, results: Dict[str, SplinkDataFrame]) -> CTEPipeline:
+        # Pipelines which depend on other nodes usually need the outputs of those
+        # nodes as input dataframes, so cannot be built until they have run
+        if isinstance(self.pipeline, CTEPipeline):
+            return self.pipeline
+        dependency_results = {name: results[name] for name in self.depends_on}
+        return self.pipeline(dependency_results)
+
+
+class PipelineDAG:
+    """A graph of `CTEPipeline`s, where edges represent 'must run after'.
+
+    Nodes whose dependencies have all completed are independent of one another,
+    so may be executed concurrently.
+
+    Examples:
+        ```py
+        dag = PipelineDAG()
+        dag.add_pipeline("tf_first_name", tf_first_name_pipeline)
+        dag.add_pipeline("tf_surname", tf_surname_pipeline)
+        dag.add_pipeline(
+            "joined",
+            lambda deps: make_join_pipeline(deps["tf_first_name"], deps["tf_surname"]),
+            depends_on=["tf_first_name", "tf_surname"],
+        )
+        results = db_api.sql_pipeline_dag_to_splink_dataframes(dag)
+        ```
+    """
+
+    def __init__(self) -> None:
+        self.nodes: Dict[str, PipelineNode] = {}
+
+    def add_pipeline(
+        self,
+        name: str,
+        pipeline: Union[CTEPipeline, PipelineFactory],
+        depends_on: Optional[List[str]] = None,
+        transient: bool = False,
+    ) -> None:
+        """Add a pipeline to the graph.
+
+        Args:
+            name (str): Name of the node, used to refer to its output
+            pipeline (CTEPipeline | Callable): The pipeline, or a function which
+                builds it from a dict of the outputs of `depends_on`
+            depends_on (list[str], optional): Nodes which must run first
+            transient (bool, optional): If True, the output is dropped from the
+                database as soon as every node which depends on it has run, and
+                is not returned by `execute`. Defaults to False.
+        """
+        if name in self.nodes:
+            raise ValueError(f"A pipeline named '{name}' is already in the graph")
+        self.nodes[name] = PipelineNode(name, pipeline, depends_on, transient)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def _validate(self) -> None:
+        for node in self.nodes.values():
+            missing = [d for d in node.depends_on if d not in self.nodes]
+            if missing:
+                raise ValueError(
+                    f"Pipeline '{node.name}' depends on unknown pipeline(s): "
+                    f"{', '.join(missing)}"
+                )
+        # Raises if there is a cycle
+        self.topological_order()
+
+    def topological_order(self) -> List[str]:
+        """The order in which pipelines are run serially: at each step, the
+        earliest added pipeline whose dependencies have all run.  This runs each
+        pipeline as soon after the pipelines it depends on as possible, so
+        transient outputs are dropped early"""
+        remaining = {name: set(node.depends_on) for name, node in self.nodes.items()}
+        order: List[str] = []
+        while remaining:
+            ready = next((name for name, deps in remaining.items() if not deps), None)
+            if ready is None:
+                raise ValueError(
+                    "Pipeline graph contains a cycle between: "
+                    f"{', '.join(remaining.keys())}"
+                )
+            order.append(ready)
+            del remaining[ready]
+            for deps in remaining.values():
+                deps.discard(ready)
+        return order
+
+    def _release_dependencies(
+        self,
+        name: str,
+        results: Dict[str, SplinkDataFrame],
+        num_dependents: Dict[str, int],
+    ) -> None:
+        # Once `name` has run, drop any transient outputs nothing else needs
+        for dep in self.nodes[name].depends_on:
+            if dep not in num_dependents:
+                continue
+            num_dependents[dep] -= 1
+            if num_dependents[dep] == 0:
+                logger.debug(f"Dropping transient output of pipeline '{dep}'")
+                results.pop(dep).drop_table_from_database_and_remove_from_cache()
+
+    def execute(
+        self,
+        execute_pipeline: Callable[[CTEPipeline], SplinkDataFrame],
+        max_concurrency: int = 1,
+    ) -> Dict[str, SplinkDataFrame]:
+        """Run every pipeline in the graph, respecting dependencies.
+
+        Args:
+            execute_pipeline: Function which executes a single pipeline, usually
+                `db_api.sql_pipeline_to_splink_dataframe`
+            max_concurrency (int, optional): The maximum number of pipelines to
+                run at once.  If 1, pipelines are run serially in topological
+                order. Defaults to 1.
+
+        Returns:
+            dict: Mapping of node name to the resultant `SplinkDataFrame`, for
+                each node which is not transient
+        """
+        self._validate()
+        results: Dict[str, SplinkDataFrame] = {}
+        num_dependents = {
+            name: sum(name in n.depends_on for n in self.nodes.values())
+            for name, node in self.nodes.items()
+            if node.transient
+        }
+
+        if max_concurrency <= 1:
+            for name in self.topological_order():
+                pipeline = self.nodes[name].build_pipeline(results)
+                results[name] = execute_pipeline(pipeline)
+                self._release_dependencies(name, results, num_dependents)
+            return self._drop_unused_transient_outputs(results)
+
+        waiting = {name: set(node.depends_on) for name, node in self.nodes.items()}
+        running: Dict[Future[SplinkDataFrame], str] = {}
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            while waiting or running:
+                ready = [name for name, deps in waiting.items() if not deps]
+                for name in ready:
+                    del waiting[name]
+                    pipeline = self.nodes[name].build_pipeline(results)
+                    logger.debug(f"Submitting pipeline '{name}' for execution")
+                    running[executor.submit(execute_pipeline, pipeline)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception:
+                        for f in running:
+                            f.cancel()
+                        raise
+                    for deps in waiting.values():
+                        deps.discard(name)
+                    self._release_dependencies(name, results, num_dependents)
+
+        return self._drop_unused_transient_outputs(results)
+
+    def _drop_unused_transient_outputs(
+        self, results: Dict[str, SplinkDataFrame]
+    ) -> Dict[str, SplinkDataFrame]:
+        # Transient outputs which no other node depends on are never needed
+        for name, node in self.nodes.items():
+            if node.transient and name in results:
+                results.pop(name).drop_table_from_database_and_remove_from_cache()
+        return results
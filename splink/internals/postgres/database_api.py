@@ -1,11 +1,19 @@
+import datetime
+import io
 import logging
-from typing import Any, List, Union
+import math
+from typing import Any, Dict, Iterator, List, Union
 
 import duckdb
 import pandas as pd
 from sqlalchemy import CursorResult, text
 from sqlalchemy.engine import Engine
 
+from splink.internals.bulk_load import (
+    BulkLoadTable,
+    is_parquet_path,
+    read_parquet_as_arrow_table,
+)
 from splink.internals.database_api import DatabaseAPI
 from splink.internals.dialects import (
     PostgresDialect,
@@ -18,9 +26,44 @@ from .dataframe import PostgresDataFrame
 
 logger = logging.getLogger(__name__)
 
+POSTGRES_TYPES = {
+    "integer": "BIGINT",
+    "float": "DOUBLE PRECISION",
+    "boolean": "BOOLEAN",
+    "date": "DATE",
+    "timestamp": "TIMESTAMP",
+    "string": "TEXT",
+}
+
+_COPY_TEXT_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"}
+)
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _copy_text_value(v: Any) -> str:
+    if v is None or (isinstance(v, float) and math.isnan(v)):
+        return "\\N"
+    if isinstance(v, bool):
+        return "t" if v else "f"
+    if isinstance(v, datetime.datetime):
+        return v.isoformat(sep=" ")
+    return str(v).translate(_COPY_TEXT_ESCAPES)
+
+
+def _copy_text_row(row: tuple) -> str:
+    # A row in the text format of postgres' COPY
+    return "\t".join(map(_copy_text_value, row)) + "\n"
+
 
 class PostgresAPI(DatabaseAPI[CursorResult[Any]]):
     sql_dialect = PostgresDialect()
+    _supports_table_size_in_bytes = True
+    _supports_concurrent_execution = True
+    _supports_insert_into = True
 
     def __init__(
         self,
@@ -42,11 +85,39 @@ class PostgresAPI(DatabaseAPI[CursorResult[Any]]):
         self._register_extensions()
 
     def _table_registration(self, input, table_name):
-        if isinstance(input, dict):
-            input = pd.DataFrame(input)
-        elif isinstance(input, list):
-            input = pd.DataFrame.from_records(input)
+        table = BulkLoadTable(input)
+
+        # Nested types such as arrays cannot be written in COPY's text format, so
+        # are loaded via duckdb's postgres extension, which handles the conversion
+        if "other" in table.kinds:
+            self._table_registration_via_duckdb(table.input, table_name)
+            return
+
+        qualified_name = (
+            f"{_quote_identifier(self._db_schema)}.{_quote_identifier(table_name)}"
+        )
+        col_defs = ", ".join(
+            f"{_quote_identifier(c)} {POSTGRES_TYPES[kind]}"
+            for c, kind in table.column_kinds.items()
+        )
+
+        raw_con = self._engine.raw_connection()
+        try:
+            cur = raw_con.cursor()
+            if not hasattr(cur, "copy_expert"):
+                # Not a psycopg2 connection
+                self._table_registration_via_duckdb(table.input, table_name)
+                return
+            cur.execute(f"DROP TABLE IF EXISTS {qualified_name}")
+            cur.execute(f"CREATE TABLE {qualified_name} ({col_defs})")
+            for rows in table.iter_row_batches():
+                buffer = io.StringIO("".join(map(_copy_text_row, rows)))
+                cur.copy_expert(f"COPY {qualified_name} FROM STDIN", buffer)
+            raw_con.commit()
+        finally:
+            raw_con.close()
 
+    def _table_registration_via_duckdb(self, input, table_name):
         # Using Duckdb to insert the data ensures the correct datatypes
         # and faster insertion (duckdb>=0.9.2)
         con = duckdb.connect()
@@ -69,6 +140,8 @@ class PostgresAPI(DatabaseAPI[CursorResult[Any]]):
             )
 
         except (duckdb.HTTPException, duckdb.BinderException):
+            if not isinstance(input, pd.DataFrame):
+                input = input.to_pandas()
             input.to_sql(
                 table_name,
                 con=self._engine,
@@ -77,6 +150,26 @@ class PostgresAPI(DatabaseAPI[CursorResult[Any]]):
                 schema=self._db_schema,
             )
 
+    def process_input_tables(self, input_tables):
+        input_tables = super().process_input_tables(input_tables)
+        return [
+            read_parquet_as_arrow_table(t) if is_parquet_path(t) else t
+            for t in input_tables
+        ]
+
+    def _table_size_sql(self, physical_name: str) -> str:
+        return (
+            "select count(*) as row_count, "
+            f"pg_total_relation_size('{physical_name}') as size_bytes "
+            f"from {physical_name}"
+        )
+
+    def _explain_analyze(self, sql: str) -> str:
+        plan = self._execute_sql_against_backend(
+            f"EXPLAIN (ANALYZE, BUFFERS) {sql}"
+        ).all()
+        return "\n".join(row[0] for row in plan)
+
     def table_to_splink_dataframe(self, templated_name, physical_name):
         return PostgresDataFrame(templated_name, physical_name, self)
 
@@ -97,6 +190,17 @@ class PostgresAPI(DatabaseAPI[CursorResult[Any]]):
             res = con.execute(text(final_sql))
         return res
 
+    def _stream_sql_against_backend(
+        self, final_sql: str, batch_size: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        # A server-side cursor, so that only one batch is held in memory at once
+        with self._engine.connect() as con:
+            res = con.execution_options(
+                stream_results=True, max_row_buffer=batch_size
+            ).execute(text(final_sql))
+            for partition in res.mappings().partitions(batch_size):
+                yield [dict(r) for r in partition]
+
     # postgres udf registrations:
     def _create_log2_function(self):
         sql = """
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Iterator, Optional
 
 from splink.internals.input_column import InputColumn
 from splink.internals.splink_dataframe import SplinkDataFrame
@@ -69,3 +69,10 @@ class PostgresDataFrame(SplinkDataFrame):
         sql += ";"
         res = self.db_api._execute_sql_against_backend(sql).mappings().all()
         return [dict(r) for r in res]
+
+    def _iter_row_batches(
+        self, batch_size: int, limit: Optional[int] = None
+    ) -> Iterator[list[dict[str, Any]]]:
+        yield from self.db_api._stream_sql_against_backend(
+            self._select_all_sql(limit), batch_size
+        )
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 # This is otherwise known as the expectation step of the EM algorithm.
+import itertools
 import logging
-from typing import List
+import math
+from typing import Any, Dict, List, Optional
 
 from splink.internals.comparison import Comparison
+from splink.internals.comparison_level import ComparisonLevel
+from splink.internals.comparison_vector_values import uses_string_similarity_function
+from splink.internals.dialects import SplinkDialect
 from splink.internals.input_column import InputColumn
 from splink.internals.misc import prob_to_bayes_factor, prob_to_match_weight
 
@@ -12,6 +17,16 @@ from .settings import CoreModelSettings, Settings
 
 logger = logging.getLogger(__name__)
 
+# Models with more agreement patterns than this are scored with per-row CASE
+# expressions rather than a lookup table
+MAX_AGREEMENT_PATTERNS = 100_000
+
+AGREEMENT_PATTERN_KEY_COLUMN = "__splink__agreement_pattern"
+
+# Pairs are only pruned if the upper bound of their match weight is below the
+# threshold by more than this, allowing for floating point error
+MATCH_WEIGHT_BOUND_TOLERANCE = 1e-6
+
 
 def predict_from_comparison_vectors_sqls_using_settings(
     settings_obj: Settings,
@@ -100,17 +115,10 @@ def predict_from_comparison_vectors_sqls(
         sql_infinity_expression,
     )
 
-    # In case user provided both, take the minimum of the two thresholds
-    if threshold_match_probability is not None:
-        thres_prob_as_weight = prob_to_match_weight(threshold_match_probability)
-    else:
-        thres_prob_as_weight = None
-    if threshold_match_probability is not None or threshold_match_weight is not None:
-        thresholds = [
-            thres_prob_as_weight,
-            threshold_match_weight,
-        ]
-        threshold = max([t for t in thresholds if t is not None])
+    threshold = threshold_as_match_weight(
+        threshold_match_probability, threshold_match_weight
+    )
+    if threshold is not None:
         threshold_expr = f" where log2({bayes_factor_expr}) >= {threshold} "
     else:
         threshold_expr = ""
@@ -133,6 +141,299 @@ def predict_from_comparison_vectors_sqls(
     return sqls
 
 
+def threshold_as_match_weight(
+    threshold_match_probability: float | None, threshold_match_weight: float | None
+) -> float | None:
+    # In case user provided both, take the higher of the two thresholds
+    thresholds = []
+    if threshold_match_probability is not None:
+        thresholds.append(prob_to_match_weight(threshold_match_probability))
+    if threshold_match_weight is not None:
+        thresholds.append(threshold_match_weight)
+    return max(thresholds) if thresholds else None
+
+
+def _level_match_weight_bound(level: ComparisonLevel) -> float | None:
+    """An upper bound on the match weight a pair of records receives from the
+    level, rounded up, or None if the level's match weight is unbounded or
+    unknown e.g. because of term frequency adjustments"""
+    if level.is_null_level:
+        return 0.0
+    if level._has_tf_adjustments and level._tf_adjustment_weight != 0:
+        return None
+    bayes_factor = level._bayes_factor
+    if bayes_factor is None or not 0 < bayes_factor < math.inf:
+        return None
+    return math.ceil(math.log2(bayes_factor) * 1e9) / 1e9
+
+
+def match_weight_upper_bound_condition_sql(
+    core_model_settings: CoreModelSettings,
+    sql_dialect: SplinkDialect,
+    threshold_match_weight: float,
+) -> str | None:
+    """A condition on pairs of records which is false only for pairs whose match
+    weight cannot reach `threshold_match_weight`.
+
+    The levels of comparisons which do not use string similarity functions are
+    evaluated, and the other, expensive, comparisons contribute the largest
+    match weight of any of their levels. Filtering on the condition means the
+    expensive comparisons need only be computed for pairs which could reach the
+    threshold.
+
+    Returns None if no pairs could be pruned in this way.
+    """
+    prior = core_model_settings.probability_two_random_records_match
+    if not 0 < prior < 1 or not math.isfinite(threshold_match_weight):
+        return None
+
+    cheap_comparisons = []
+    expensive_comparisons = []
+    for cc in core_model_settings.comparisons:
+        if uses_string_similarity_function(cc, sql_dialect):
+            expensive_comparisons.append(cc)
+        else:
+            cheap_comparisons.append(cc)
+    if not cheap_comparisons or not expensive_comparisons:
+        return None
+
+    bound = prob_to_match_weight(prior)
+    for cc in expensive_comparisons:
+        level_bounds = [_level_match_weight_bound(cl) for cl in cc.comparison_levels]
+        if None in level_bounds:
+            return None
+        bound += max(level_bounds)
+
+    bound_terms = [str(math.ceil(bound * 1e9) / 1e9)]
+    for cc in cheap_comparisons:
+        whens = []
+        for cl in cc.comparison_levels:
+            level_bound = _level_match_weight_bound(cl)
+            # Pairs at levels with unbounded match weights are never pruned
+            value = "NULL" if level_bound is None else str(level_bound)
+            if cl._is_else_level:
+                whens.append(f"ELSE {value}")
+            else:
+                whens.append(f"WHEN {cl.sql_condition} THEN {value}")
+        bound_terms.append(f"CASE {' '.join(whens)} END")
+
+    threshold = threshold_match_weight - MATCH_WEIGHT_BOUND_TOLERANCE
+    return f"coalesce({' + '.join(bound_terms)} >= {threshold}, true)"
+
+
+def _agreement_pattern_strides(comparisons: List[Comparison]) -> List[int]:
+    # Each comparison vector value (from -1) is a digit of the pattern key
+    strides = []
+    stride = 1
+    for cc in comparisons:
+        strides.append(stride)
+        max_value = max(cl.comparison_vector_value for cl in cc.comparison_levels)
+        stride *= max_value + 2
+    return strides
+
+
+def agreement_pattern_key_sql(comparisons: List[Comparison]) -> str:
+    """An integer expression which identifies the agreement pattern (the
+    combination of comparison vector values) of each row"""
+    strides = _agreement_pattern_strides(comparisons)
+    return " + ".join(
+        f"({cc._gamma_column_name} + 1) * {stride}"
+        for cc, stride in zip(comparisons, strides)
+    )
+
+
+def agreement_pattern_lookup_table(
+    comparisons: List[Comparison],
+    probability_two_random_records_match: float,
+) -> Optional[Dict[str, List[Any]]]:
+    """Compute the Bayes factor of every possible agreement pattern of the model,
+    and the combined Bayes factor, match weight and match probability of each
+    pattern before any term frequency adjustments.
+
+    Returns None if the model has untrained levels, or more than
+    `MAX_AGREEMENT_PATTERNS` agreement patterns.
+    """
+    levels_by_comparison = [cc.comparison_levels for cc in comparisons]
+    num_patterns = math.prod(len(levels) for levels in levels_by_comparison)
+    if num_patterns > MAX_AGREEMENT_PATTERNS:
+        logger.info(
+            f"The model has {num_patterns:,.0f} agreement patterns, more than "
+            f"{MAX_AGREEMENT_PATTERNS:,.0f}, so they will not be precomputed"
+        )
+        return None
+    if any(
+        cl._bayes_factor is None for levels in levels_by_comparison for cl in levels
+    ):
+        return None
+
+    strides = _agreement_pattern_strides(comparisons)
+    prior = probability_two_random_records_match
+    bf_prior = prob_to_bayes_factor(prior) if prior != 1.0 else math.inf
+
+    table: Dict[str, List[Any]] = {AGREEMENT_PATTERN_KEY_COLUMN: []}
+    for cc in comparisons:
+        table[cc._bf_column_name] = []
+    for column in [
+        "__splink__pattern_bayes_factor",
+        "__splink__pattern_has_infinite_bf",
+        "__splink__pattern_match_weight",
+        "__splink__pattern_match_probability",
+    ]:
+        table[column] = []
+
+    for levels in itertools.product(*levels_by_comparison):
+        key = 0
+        bayes_factor = bf_prior
+        for cc, cl, stride in zip(comparisons, levels, strides):
+            key += (cl.comparison_vector_value + 1) * stride
+            table[cc._bf_column_name].append(cl._bayes_factor)
+            bayes_factor = bayes_factor * cl._bayes_factor
+        has_infinite_bf = math.isinf(bf_prior) or any(
+            math.isinf(cl._bayes_factor) for cl in levels
+        )
+
+        if bayes_factor == 0:
+            match_weight = -math.inf
+        elif math.isinf(bayes_factor) or math.isnan(bayes_factor):
+            match_weight = bayes_factor
+        else:
+            match_weight = math.log2(bayes_factor)
+
+        if has_infinite_bf:
+            match_probability = 1.0
+        else:
+            match_probability = bayes_factor / (1 + bayes_factor)
+
+        table[AGREEMENT_PATTERN_KEY_COLUMN].append(key)
+        table["__splink__pattern_bayes_factor"].append(bayes_factor)
+        table["__splink__pattern_has_infinite_bf"].append(has_infinite_bf)
+        table["__splink__pattern_match_weight"].append(match_weight)
+        table["__splink__pattern_match_probability"].append(match_probability)
+
+    return table
+
+
+def predict_from_comparison_vectors_using_lookup_sqls_using_settings(
+    settings_obj: Settings,
+    threshold_match_probability: float = None,
+    threshold_match_weight: float = None,
+    sql_infinity_expression: str = "'infinity'",
+    lookup_tablename: str = "__splink__agreement_pattern_lookup",
+) -> list[dict[str, str]]:
+    return predict_from_comparison_vectors_using_lookup_sqls(
+        unique_id_input_columns=settings_obj.column_info_settings.unique_id_input_columns,
+        core_model_settings=settings_obj.core_model_settings,
+        threshold_match_probability=threshold_match_probability,
+        threshold_match_weight=threshold_match_weight,
+        retain_matching_columns=settings_obj._retain_matching_columns,
+        retain_intermediate_calculation_columns=settings_obj._retain_intermediate_calculation_columns,
+        additional_columns_to_retain=settings_obj._additional_columns_to_retain,
+        needs_matchkey_column=settings_obj._needs_matchkey_column,
+        sql_infinity_expression=sql_infinity_expression,
+        lookup_tablename=lookup_tablename,
+    )
+
+
+def predict_from_comparison_vectors_using_lookup_sqls(
+    unique_id_input_columns: List[InputColumn],
+    core_model_settings: CoreModelSettings,
+    threshold_match_probability: float = None,
+    threshold_match_weight: float = None,
+    retain_matching_columns: bool = False,
+    retain_intermediate_calculation_columns: bool = False,
+    additional_columns_to_retain: List[InputColumn] = [],
+    needs_matchkey_column: bool = False,
+    sql_infinity_expression: str = "'infinity'",
+    lookup_tablename: str = "__splink__agreement_pattern_lookup",
+) -> list[dict[str, str]]:
+    """As `predict_from_comparison_vectors_sqls`, but the Bayes factors are read
+    from a table of precomputed agreement patterns (see
+    `agreement_pattern_lookup_table`), joined on the agreement pattern key,
+    rather than computed with a CASE expression per comparison.
+
+    Term frequency adjustments are still computed per row, and multiplied into
+    the Bayes factor of the pattern.
+    """
+    sqls = []
+    comparisons = core_model_settings.comparisons
+
+    select_cols = Settings.columns_to_select_for_bayes_factor_parts(
+        unique_id_input_columns=unique_id_input_columns,
+        comparisons=comparisons,
+        retain_matching_columns=retain_matching_columns,
+        retain_intermediate_calculation_columns=retain_intermediate_calculation_columns,
+        additional_columns_to_retain=additional_columns_to_retain,
+        needs_matchkey_column=needs_matchkey_column,
+        bayes_factors_from_lookup=True,
+    )
+    select_cols.extend(
+        [
+            "p.__splink__pattern_bayes_factor",
+            "p.__splink__pattern_has_infinite_bf",
+            "p.__splink__pattern_match_weight",
+            "p.__splink__pattern_match_probability",
+        ]
+    )
+    select_cols_expr = ",".join(select_cols)
+
+    sql = f"""
+    select {select_cols_expr}
+    from __splink__df_comparison_vectors as cv
+    left join {lookup_tablename} as p
+    on p.{AGREEMENT_PATTERN_KEY_COLUMN} = {agreement_pattern_key_sql(comparisons)}
+    """
+
+    sqls.append({"sql": sql, "output_table_name": "__splink__df_match_weight_parts"})
+
+    select_cols = Settings.columns_to_select_for_predict(
+        unique_id_input_columns=unique_id_input_columns,
+        comparisons=comparisons,
+        retain_matching_columns=retain_matching_columns,
+        retain_intermediate_calculation_columns=retain_intermediate_calculation_columns,
+        training_mode=False,
+        additional_columns_to_retain=additional_columns_to_retain,
+        needs_matchkey_column=needs_matchkey_column,
+    )
+    select_cols_expr = ",".join(select_cols)
+
+    tf_terms = [
+        cc._bf_tf_adj_column_name for cc in comparisons if cc._has_tf_adjustments
+    ]
+    if tf_terms:
+        bayes_factor_expr = "__splink__pattern_bayes_factor * " + " * ".join(tf_terms)
+        match_weight_expr = f"log2({bayes_factor_expr})"
+        any_term_inf = " OR ".join(
+            ["__splink__pattern_has_infinite_bf"]
+            + [f"{term} = {sql_infinity_expression}" for term in tf_terms]
+        )
+        mp_raw = f"({bayes_factor_expr})/(1+({bayes_factor_expr}))"
+        match_prob_expr = f"CASE WHEN {any_term_inf} THEN 1.0 ELSE {mp_raw} END"
+    else:
+        match_weight_expr = "__splink__pattern_match_weight"
+        match_prob_expr = "__splink__pattern_match_probability"
+
+    threshold = threshold_as_match_weight(
+        threshold_match_probability, threshold_match_weight
+    )
+    if threshold is not None:
+        threshold_expr = f" where {match_weight_expr} >= {threshold} "
+    else:
+        threshold_expr = ""
+
+    sql = f"""
+    select
+    {match_weight_expr} as match_weight,
+    {match_prob_expr} as match_probability,
+    {select_cols_expr}
+    from __splink__df_match_weight_parts
+    {threshold_expr}
+    """
+
+    sqls.append({"sql": sql, "output_table_name": "__splink__df_predict"})
+
+    return sqls
+
+
 def predict_from_agreement_pattern_counts_sqls(
     comparisons: List[Comparison],
     probability_two_random_records_match: float,
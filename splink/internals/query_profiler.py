@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from pandas import DataFrame as PandasDataFrame
+
+
+class QueryProfiler:
+    """Records structured timing and size information about every pipeline a
+    `DatabaseAPI` executes.
+
+    Each record contains the templated and physical name of the table created,
+    the wall time taken to create it, the number of rows and (where the backend
+    can report it) the size in bytes of the output, and optionally the backend's
+    query plan as reported by EXPLAIN ANALYZE or equivalent.
+    """
+
+    def __init__(self, explain_analyze: bool = False):
+        self.explain_analyze = explain_analyze
+        self.records: List[Dict[str, Any]] = []
+
+    def record(
+        self,
+        templated_name: str,
+        physical_name: str,
+        wall_time_seconds: float,
+        row_count: Optional[int],
+        size_bytes: Optional[int],
+        sql: str,
+        query_plan: Optional[str] = None,
+    ) -> None:
+        self.records.append(
+            {
+                "query_number": len(self.records) + 1,
+                "templated_name": templated_name,
+                "physical_name": physical_name,
+                "wall_time_seconds": wall_time_seconds,
+                "row_count": row_count,
+                "size_bytes": size_bytes,
+                "query_plan": query_plan,
+                "sql": sql,
+            }
+        )
+
+    def reset(self) -> None:
+        self.records = []
+
+    def as_pandas_dataframe(self) -> PandasDataFrame:
+        return PandasDataFrame(
+            self.records,
+            columns=[
+                "query_number",
+                "templated_name",
+                "physical_name",
+                "wall_time_seconds",
+                "row_count",
+                "size_bytes",
+                "query_plan",
+                "sql",
+            ],
+        )
@@ -3,11 +3,13 @@ from __future__ import annotations
 import logging
 from copy import deepcopy
 from dataclasses import asdict, dataclass
-from typing import Any, List, Literal, Sequence, TypedDict
+from typing import Any, List, Literal, Optional, Sequence, TypedDict
 
 from splink.internals.blocking import (
+    BlockingDeduplicationStrategy,
     BlockingRule,
     SaltedBlockingRule,
+    blocking_deduplication_strategies,
     blocking_rule_to_obj,
 )
 from splink.internals.charts import m_u_parameters_chart, match_weights_chart
@@ -200,6 +202,10 @@ class Settings:
         # TrainingSettings
         em_convergence: float = 0.0001,
         max_iterations: int = 25,
+        # Blocking
+        blocking_deduplication_strategy: BlockingDeduplicationStrategy = (
+            "exclude_preceding_rules"
+        ),
         # other
         sql_dialect: str,
         linker_uid: str = None,
@@ -248,6 +254,14 @@ class Settings:
             blocking_rules_to_generate_predictions
         )
 
+        if blocking_deduplication_strategy not in blocking_deduplication_strategies:
+            raise ValueError(
+                "blocking_deduplication_strategy must be one of "
+                f"{blocking_deduplication_strategies}, "
+                f"got '{blocking_deduplication_strategy}'"
+            )
+        self._blocking_deduplication_strategy = blocking_deduplication_strategy
+
         self._cache_uid = linker_uid
 
         self._warn_if_no_null_level_in_comparisons()
@@ -297,7 +311,7 @@ class Settings:
             used_by_brs = []
             for br in self._blocking_rules_to_generate_predictions:
                 used_by_brs.extend(
-                    get_columns_used_from_sql(br.blocking_rule_sql, br.sql_dialect)
+                    get_columns_used_from_sql(br._input_columns_sql, br.sql_dialect)
                 )
 
             used_by_brs = [InputColumn(c) for c in used_by_brs]
@@ -397,8 +411,10 @@ class Settings:
         retain_matching_columns: bool,
         additional_columns_to_retain: List[InputColumn],
         needs_matchkey_column: bool,
+        memoised_comparisons: Optional[List[Comparison]] = None,
     ) -> List[str]:
         cols = []
+        memoised_comparisons = memoised_comparisons or []
 
         for uid_col in unique_id_input_columns:
             cols.extend(uid_col.names_l_r)
@@ -406,7 +422,8 @@ class Settings:
         for cc in comparisons:
             cols.extend(
                 cc._columns_to_select_for_comparison_vector_values(
-                    retain_matching_columns
+                    retain_matching_columns,
+                    memoised=any(cc is m for m in memoised_comparisons),
                 )
             )
 
@@ -427,6 +444,7 @@ class Settings:
         retain_intermediate_calculation_columns: bool,
         additional_columns_to_retain: List[InputColumn],
         needs_matchkey_column: bool,
+        bayes_factors_from_lookup: bool = False,
     ) -> List[str]:
         cols = []
 
@@ -438,6 +456,7 @@ class Settings:
                 cc._columns_to_select_for_bayes_factor_parts(
                     retain_matching_columns,
                     retain_intermediate_calculation_columns,
+                    bayes_factor_from_lookup=bayes_factors_from_lookup,
                 )
             )
 
@@ -576,6 +595,7 @@ class Settings:
                 self._retain_intermediate_calculation_columns
             ),
             "additional_columns_to_retain": self._additional_col_names_to_retain,
+            "blocking_deduplication_strategy": self._blocking_deduplication_strategy,
             "sql_dialect": self._sql_dialect,
             "linker_uid": self._cache_uid,
             **self.training_settings.as_dict(),
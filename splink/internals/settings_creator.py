@@ -33,6 +33,10 @@ class SettingsCreator:
     em_convergence: float = 0.0001
     max_iterations: int = 25
 
+    blocking_deduplication_strategy: Literal[
+        "exclude_preceding_rules", "min_match_key"
+    ] = "exclude_preceding_rules"
+
     retain_matching_columns: bool = True
     retain_intermediate_calculation_columns: bool = False
     additional_columns_to_retain: List[str] = field(default_factory=list)
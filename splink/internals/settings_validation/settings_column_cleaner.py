@@ -147,7 +147,7 @@ class SettingsColumnCleaner:
     @property
     def blocking_rules(self):
         brs = self._settings_obj._blocking_rules_to_generate_predictions
-        return [br.blocking_rule_sql for br in brs]
+        return [br._input_columns_sql for br in brs]
 
     @property
     def comparisons(self):
@@ -9,6 +9,7 @@ from numpy import nan
 from pyspark.sql.dataframe import DataFrame as spark_df
 from pyspark.sql.utils import AnalysisException
 
+from splink.internals.bulk_load import is_arrow_table
 from splink.internals.database_api import AcceptableInputTableType, DatabaseAPI
 from splink.internals.databricks.enable_splink import enable_splink
 from splink.internals.dialects import (
@@ -26,6 +27,7 @@ logger = logging.getLogger(__name__)
 
 class SparkAPI(DatabaseAPI[spark_df]):
     sql_dialect = SparkDialect()
+    _supports_concurrent_execution = True
 
     def __init__(
         self,
@@ -68,6 +70,8 @@ class SparkAPI(DatabaseAPI[spark_df]):
             input = pd.DataFrame(input)
         elif isinstance(input, list):
             input = pd.DataFrame.from_records(input)
+        elif is_arrow_table(input):
+            input = input.to_pandas()
 
         if isinstance(input, pd.DataFrame):
             input = self._clean_pandas_df(input)
@@ -120,6 +124,13 @@ class SparkAPI(DatabaseAPI[spark_df]):
         output_df = self.table_to_splink_dataframe(templated_name, physical_name)
         return output_df
 
+    def _explain_analyze(self, sql: str) -> str:
+        # Spark does not execute the query to explain it - report the formatted
+        # physical plan instead
+        sql = self._setup_for_execute_sql(sql, "")
+        plan = self._execute_sql_against_backend(f"EXPLAIN FORMATTED {sql}")
+        return plan.collect()[0][0]
+
     def _execute_sql_against_backend(self, final_sql: str) -> spark_df:
         return self.spark.sql(final_sql)
 
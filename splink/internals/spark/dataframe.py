@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Iterator, Optional
 
 from pandas import DataFrame as PandasDataFrame
 
 from splink.internals.input_column import InputColumn
-from splink.internals.splink_dataframe import SplinkDataFrame
+from splink.internals.splink_dataframe import SplinkDataFrame, _import_pyarrow
 
 from .spark_helpers.custom_spark_dialect import Dialect
 
@@ -14,6 +14,8 @@ logger = logging.getLogger(__name__)
 
 Dialect["customspark"]
 if TYPE_CHECKING:
+    import pyarrow as pa
+
     from .database_api import SparkAPI
 
 
@@ -52,6 +54,29 @@ class SparkDataFrame(SplinkDataFrame):
 
         return self.db_api._execute_sql_against_backend(sql).toPandas()
 
+    def as_arrow_table(self, limit: Optional[int] = None) -> pa.Table:
+        pa = _import_pyarrow()
+        spark_df = self.db_api._execute_sql_against_backend(self._select_all_sql(limit))
+        if hasattr(spark_df, "toArrow"):
+            # pyspark >= 4.0
+            return spark_df.toArrow()
+        # Uses Arrow for the transfer if spark.sql.execution.arrow.pyspark.enabled
+        return pa.Table.from_pandas(spark_df.toPandas(), preserve_index=False)
+
+    def _iter_row_batches(
+        self, batch_size: int, limit: Optional[int] = None
+    ) -> Iterator[list[dict[str, Any]]]:
+        spark_df = self.db_api._execute_sql_against_backend(self._select_all_sql(limit))
+        # Only one partition at a time is held on the driver
+        rows = []
+        for row in spark_df.toLocalIterator():
+            rows.append(row.asDict())
+            if len(rows) == batch_size:
+                yield rows
+                rows = []
+        if rows:
+            yield rows
+
     def as_spark_dataframe(self):
         return self.db_api.spark.table(self.physical_name)
 
@@ -3,16 +3,32 @@ from __future__ import annotations
 import logging
 from abc import ABC, abstractmethod, abstractproperty
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any, Iterator, Optional
 
+from splink.internals.exceptions import MissingDependencyException
 from splink.internals.input_column import InputColumn
 
 logger = logging.getLogger(__name__)
 
 # https://stackoverflow.com/questions/39740632/python-type-hinting-without-cyclic-imports
 if TYPE_CHECKING:
+    import pyarrow as pa
+
     from splink.internals.database_api import DatabaseAPI
 
+DEFAULT_BATCH_SIZE = 100_000
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise MissingDependencyException(
+            "You need to install the 'pyarrow' package to retrieve results "
+            "as Arrow tables or record batches."
+        ) from None
+    return pa
+
 
 class SplinkDataFrame(ABC):
     """Abstraction over dataframe to handle basic operations like retrieving data and
@@ -136,6 +152,98 @@ class SplinkDataFrame(ABC):
 
         return pd.DataFrame(self.as_record_dict(limit=limit))
 
+    def _select_all_sql(self, limit: Optional[int] = None) -> str:
+        sql = f"select * from {self.physical_name}"
+        if limit:
+            sql += f" limit {limit}"
+        return sql
+
+    def _iter_row_batches(
+        self, batch_size: int, limit: Optional[int] = None
+    ) -> Iterator[list[dict[str, Any]]]:
+        # Backends should override this to fetch from a cursor in batches, rather
+        # than retrieving all records at once, so that memory use is bounded
+        records = self.as_record_dict(limit=limit)
+        for i in range(0, len(records), batch_size):
+            yield records[i : i + batch_size]
+
+    def iter_batches(self, rows: int = 10_000) -> Iterator[list[dict[str, Any]]]:
+        """Iterate over the dataframe in batches of record dictionaries.
+
+        Unlike `as_record_dict()`, only one batch is held in memory at once, so
+        this can be used to consume very large tables such as predictions. Rows are
+        fetched from a server-side cursor in Postgres, `fetchmany` in SQLite, a
+        streaming query result in DuckDB and `toLocalIterator` in Spark.
+
+        Examples:
+            ```py
+            df_predict = linker.inference.predict()
+            for batch in df_predict.iter_batches(rows=5_000):
+                publish_edges(batch)
+            ```
+        Args:
+            rows (int, optional): The maximum number of records in each batch.
+                Defaults to 10,000.
+
+        Returns:
+            Iterator[list[dict]]: Lists of records, each of which is a dictionary
+        """
+        if rows < 1:
+            raise ValueError("rows must be at least 1")
+        return self._iter_row_batches(rows)
+
+    def iter_record_batches(
+        self, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[pa.RecordBatch]:
+        """Return an iterator of Arrow record batches containing the rows of the
+        dataframe.
+
+        This requires the `pyarrow` package.
+
+        Examples:
+            ```py
+            df_predict = linker.inference.predict()
+            for batch in df_predict.iter_record_batches(batch_size=50_000):
+                process(batch)
+            ```
+        Args:
+            batch_size (int, optional): The maximum number of rows in each batch.
+                Defaults to 100,000.
+
+        Returns:
+            Iterator[pyarrow.RecordBatch]: The record batches. Unless the backend
+                returns data in Arrow format, the schema of each batch is inferred
+                from its values.
+        """
+        pa = _import_pyarrow()
+        for rows in self._iter_row_batches(batch_size):
+            yield pa.RecordBatch.from_pylist(rows)
+
+    def as_arrow_table(self, limit: Optional[int] = None) -> pa.Table:
+        """Return the dataframe as a pyarrow Table.
+
+        This requires the `pyarrow` package.  Where the backend supports it, the
+        data is transferred in Arrow format, without being converted to Python
+        objects.
+
+        Examples:
+            ```py
+            df_predict = linker.inference.predict()
+            arrow_table = df_predict.as_arrow_table()
+            ```
+        Args:
+            limit (int, optional): If provided, return this number of rows (equivalent
+                to a limit statement in SQL). Defaults to None, meaning return all rows
+
+        Returns:
+            pyarrow.Table: pyarrow Table
+        """
+        pa = _import_pyarrow()
+        records = self.as_record_dict(limit=limit)
+        if not records:
+            return pa.table({c.unquote().name: [] for c in self.columns})
+        return pa.Table.from_pylist(records)
+
     def _repr_pretty_(self, p, cycle):
         msg = (
             f"Table name in database: `{self.physical_name}`\n"
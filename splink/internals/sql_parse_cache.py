@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional, Tuple, Type
+
+import sqlglot
+from sqlglot.expressions import Expression
+
+DEFAULT_MAX_SIZE = 2048
+
+
+class ParseCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class SQLParseCache:
+    """A bounded, process-wide, least recently used cache of sqlglot parse and
+    transpile results, keyed by (sql, dialect).
+
+    Splink parses the same SQL fragments (blocking rules, comparison level
+    conditions, column names) many times over, e.g. each time a property of a
+    `BlockingRule` is accessed or a `ComparisonLevel` is copied.  sqlglot trees are
+    mutable, so a copy of the cached tree is returned on every call, meaning
+    callers are free to modify the result.
+
+    Statements which fail to parse are not cached, so the error is raised on every
+    call.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAX_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Tuple[Any, ...], Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: Tuple[Any, ...]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def _set(self, key: Tuple[Any, ...], value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def parse_one(
+        self,
+        sql: str,
+        read: Optional[str] = None,
+        into: Optional[Type[Expression]] = None,
+    ) -> Expression:
+        key = ("parse", sql, read, into)
+        tree = self._get(key)
+        if tree is None:
+            tree = sqlglot.parse_one(sql, read=read, into=into)
+            self._set(key, tree)
+        return tree.copy()
+
+    def transpile(
+        self, sql: str, read: Optional[str] = None, write: Optional[str] = None
+    ) -> str:
+        key = ("transpile", sql, read, write)
+        transpiled = self._get(key)
+        if transpiled is None:
+            transpiled = sqlglot.parse_one(sql, read=read).sql(dialect=write)
+            self._set(key, transpiled)
+        return transpiled
+
+    def info(self) -> ParseCacheInfo:
+        return ParseCacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = OrderedDict()
+            self.hits = 0
+            self.misses = 0
+
+
+_parse_cache = SQLParseCache()
+
+
+def parse_one_cached(
+    sql: str,
+    read: Optional[str] = None,
+    into: Optional[Type[Expression]] = None,
+) -> Expression:
+    """Equivalent to `sqlglot.parse_one(sql, read=read, into=into)`, but memoised
+    in the process-wide parse cache"""
+    return _parse_cache.parse_one(sql, read=read, into=into)
+
+
+def transpile_cached(
+    sql: str, read: Optional[str] = None, write: Optional[str] = None
+) -> str:
+    """Equivalent to `sqlglot.parse_one(sql, read=read).sql(dialect=write)`, but
+    memoised in the process-wide parse cache"""
+    return _parse_cache.transpile(sql, read=read, write=write)
+
+
+def parse_cache_info() -> ParseCacheInfo:
+    return _parse_cache.info()
+
+
+def clear_parse_cache() -> None:
+    _parse_cache.clear()
@@ -1,9 +1,16 @@
+import datetime
 import math
 import sqlite3
-from typing import Union
-
-import pandas as pd
-
+import zlib
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Union
+
+from splink.internals.bulk_load import (
+    BulkLoadTable,
+    ColumnKind,
+    is_parquet_path,
+    read_parquet_as_arrow_table,
+)
 from splink.internals.database_api import DatabaseAPI
 from splink.internals.dialects import (
     SQLiteDialect,
@@ -14,9 +21,65 @@ from .dataframe import SQLiteDataFrame
 
 sql_con = sqlite3.Connection
 
+SQLITE_TYPES = {
+    "integer": "INTEGER",
+    "float": "REAL",
+    "boolean": "INTEGER",
+    "date": "TEXT",
+    "timestamp": "TIMESTAMP",
+    "string": "TEXT",
+    "other": "",
+}
+
+
+def _splink_hash(value: Any) -> Optional[int]:
+    # A deterministic hash, since SQLite has no built-in hash function
+    if value is None:
+        return None
+    return zlib.crc32(str(value).encode("utf-8"))
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sqlite_row_converter(kinds: List[ColumnKind]) -> Callable[[tuple], tuple]:
+    # Dates and times are stored as text, matching pandas' to_sql
+    temporal = [i for i, kind in enumerate(kinds) if kind in ("date", "timestamp")]
+    if not temporal:
+        return lambda row: row
+
+    def convert(row: tuple) -> tuple:
+        row_list = list(row)
+        for i in temporal:
+            v = row_list[i]
+            if isinstance(v, datetime.datetime):
+                row_list[i] = v.isoformat(sep=" ")
+            elif isinstance(v, datetime.date):
+                row_list[i] = v.isoformat()
+        return tuple(row_list)
+
+    return convert
+
+
+@contextmanager
+def _pragmas(con: sqlite3.Connection, **pragmas: Any) -> Iterator[None]:
+    original = {
+        name: list(con.execute(f"PRAGMA {name}").fetchone().values())[0]
+        for name in pragmas
+    }
+    try:
+        for name, value in pragmas.items():
+            con.execute(f"PRAGMA {name} = {value}")
+        yield
+    finally:
+        for name, value in original.items():
+            con.execute(f"PRAGMA {name} = {value}")
+
 
 class SQLiteAPI(DatabaseAPI[sqlite3.Cursor]):
     sql_dialect = SQLiteDialect()
+    _supports_insert_into = True
 
     @staticmethod
     def dict_factory(cursor, row):
@@ -29,6 +92,7 @@ class SQLiteAPI(DatabaseAPI[sqlite3.Cursor]):
         self.con.create_function("log2", 1, math.log2)
         self.con.create_function("pow", 2, pow)
         self.con.create_function("power", 2, pow)
+        self.con.create_function("splink_hash", 1, _splink_hash, deterministic=True)
 
         if register_udfs:
             try:
@@ -75,18 +139,47 @@ class SQLiteAPI(DatabaseAPI[sqlite3.Cursor]):
         self._register_udfs(register_udfs)
 
     def _table_registration(self, input, table_name):
-        if isinstance(input, dict):
-            input = pd.DataFrame(input)
-        elif isinstance(input, list):
-            input = pd.DataFrame.from_records(input)
-
-        # Will error if an invalid data type is passed
-        input.to_sql(
-            table_name,
-            self.con,
-            index=False,
-            if_exists="replace",
+        table = BulkLoadTable(input)
+
+        col_defs = ", ".join(
+            f"{_quote_identifier(c)} {SQLITE_TYPES[kind]}".strip()
+            for c, kind in table.column_kinds.items()
+        )
+        placeholders = ", ".join("?" for _ in table.columns)
+        insert_sql = (
+            f"INSERT INTO {_quote_identifier(table_name)} VALUES ({placeholders})"
         )
+        convert_row = _sqlite_row_converter(table.kinds)
+
+        # Rows are inserted in batches within a single transaction, with journalling
+        # relaxed for the duration of the load
+        with _pragmas(self.con, synchronous="OFF", journal_mode="MEMORY"):
+            with self.con:
+                self.con.execute(
+                    f"DROP TABLE IF EXISTS {_quote_identifier(table_name)}"
+                )
+                self.con.execute(
+                    f"CREATE TABLE {_quote_identifier(table_name)} ({col_defs})"
+                )
+                for rows in table.iter_row_batches():
+                    self.con.executemany(insert_sql, map(convert_row, rows))
+
+    def _insert_into_table(self, physical_name: str, source_physical_name: str) -> None:
+        # Commit, so the implicit transaction opened by the insert is not left open
+        with self.con:
+            super()._insert_into_table(physical_name, source_physical_name)
+
+    def process_input_tables(self, input_tables):
+        input_tables = super().process_input_tables(input_tables)
+        return [
+            read_parquet_as_arrow_table(t) if is_parquet_path(t) else t
+            for t in input_tables
+        ]
+
+    def _explain_analyze(self, sql: str) -> str:
+        # SQLite has no EXPLAIN ANALYZE, so report the (unexecuted) query plan
+        plan = self._execute_sql_against_backend(f"EXPLAIN QUERY PLAN {sql}")
+        return "\n".join(row["detail"] for row in plan.fetchall())
 
     def table_to_splink_dataframe(self, templated_name, physical_name):
         return SQLiteDataFrame(templated_name, physical_name, self)
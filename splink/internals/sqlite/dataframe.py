@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Iterator, Optional
 
 from splink.internals.input_column import InputColumn
 from splink.internals.splink_dataframe import SplinkDataFrame
@@ -74,3 +74,11 @@ class SQLiteDataFrame(SplinkDataFrame):
         sql += ";"
         cur = self.db_api.con.cursor()
         return cur.execute(sql).fetchall()
+
+    def _iter_row_batches(
+        self, batch_size: int, limit: Optional[int] = None
+    ) -> Iterator[list[dict[str, Any]]]:
+        cur = self.db_api.con.cursor()
+        cur.execute(self._select_all_sql(limit))
+        while rows := cur.fetchmany(batch_size):
+            yield rows
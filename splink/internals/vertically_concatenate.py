@@ -5,9 +5,14 @@ from typing import TYPE_CHECKING, Dict
 
 from splink.internals.input_column import InputColumn
 from splink.internals.pipeline import CTEPipeline
+from splink.internals.pipeline_scheduler import PipelineDAG
 from splink.internals.splink_dataframe import SplinkDataFrame
 
-from .term_frequencies import compute_all_term_frequencies_sqls
+from .term_frequencies import (
+    colname_to_tf_tablename,
+    compute_all_term_frequencies_sqls,
+    term_frequencies_for_single_column_sql,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -104,6 +109,41 @@ def enqueue_df_concat_with_tf(linker: Linker, pipeline: CTEPipeline) -> CTEPipel
     return pipeline
 
 
+def _materialise_tf_tables_concurrently(linker: Linker) -> None:
+    """Compute any term frequency tables which are not yet in the cache as separate,
+    independent pipelines, so they can be executed concurrently.
+
+    Once in the cache, they will be picked up by compute_all_term_frequencies_sqls
+    rather than being computed as CTEs.
+    """
+    cache = linker._intermediate_table_cache
+    db_api = linker._db_api
+
+    tf_cols_to_compute = [
+        tf_col
+        for tf_col in linker._settings_obj._term_frequency_columns
+        if colname_to_tf_tablename(tf_col) not in cache
+    ]
+    if len(tf_cols_to_compute) < 2:
+        return
+
+    nodes_concat = compute_df_concat(linker, CTEPipeline())
+
+    dag = PipelineDAG()
+    for tf_col in tf_cols_to_compute:
+        pipeline = CTEPipeline([nodes_concat])
+        tf_tablename = colname_to_tf_tablename(tf_col)
+        pipeline.enqueue_sql(
+            term_frequencies_for_single_column_sql(tf_col), tf_tablename
+        )
+        dag.add_pipeline(tf_tablename, pipeline)
+
+    for tf_tablename, tf_df in db_api.sql_pipeline_dag_to_splink_dataframes(
+        dag
+    ).items():
+        cache[tf_tablename] = tf_df
+
+
 def compute_df_concat_with_tf(linker: Linker, pipeline: CTEPipeline) -> SplinkDataFrame:
     cache = linker._intermediate_table_cache
     db_api = linker._db_api
@@ -111,6 +151,9 @@ def compute_df_concat_with_tf(linker: Linker, pipeline: CTEPipeline) -> SplinkDa
     if "__splink__df_concat_with_tf" in cache:
         return cache.get_with_logging("__splink__df_concat_with_tf")
 
+    if db_api._effective_max_concurrency > 1:
+        _materialise_tf_tables_concurrently(linker)
+
     sds_ic = linker._settings_obj.column_info_settings.source_dataset_input_column
 
     sql = vertically_concatenate_sql(
@@ -0,0 +1,90 @@
+import pandas as pd
+import pytest
+
+import splink.internals.comparison_library as cl
+from splink.internals.blocking_rule_library import block_on
+from splink.internals.duckdb.database_api import DuckDBAPI
+from splink.internals.linker import Linker
+from splink.internals.misc import prob_to_match_weight
+from splink.internals.predict import (
+    MAX_AGREEMENT_PATTERNS,
+    agreement_pattern_lookup_table,
+)
+
+from .basic_settings import get_settings_dict
+from .decorator import mark_with_dialects_excluding
+
+
+def _sorted(df_predict):
+    df = df_predict.as_pandas_dataframe()
+    return df.sort_values(["unique_id_l", "unique_id_r"]).reset_index(drop=True)
+
+
+@mark_with_dialects_excluding()
+@pytest.mark.parametrize("retain_columns", [False, True])
+def test_agreement_pattern_lookup_matches_case_expressions(
+    test_helpers, dialect, retain_columns
+):
+    helper = test_helpers[dialect]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    settings = get_settings_dict()
+    settings["retain_matching_columns"] = retain_columns
+    settings["retain_intermediate_calculation_columns"] = retain_columns
+    certain_match_level = dialect != "sqlite"
+    if certain_match_level:
+        # SQLite cannot represent the infinite Bayes factor of a level with u=0
+        settings["comparisons"][2]["comparison_levels"][1]["u_probability"] = 0.0
+
+    linker = Linker(df, settings, helper.DatabaseAPI(**helper.db_api_args()))
+
+    for thresholds in [{}, {"threshold_match_probability": 0.5}]:
+        expected = _sorted(linker.inference.predict(**thresholds))
+        with_lookup = _sorted(
+            linker.inference.predict(agreement_pattern_lookup=True, **thresholds)
+        )
+        assert list(with_lookup.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(
+            expected, with_lookup, check_dtype=False, rtol=1e-12
+        )
+        if certain_match_level:
+            assert (with_lookup.match_probability == 1.0).any()
+
+    chunked = linker.inference.predict(agreement_pattern_lookup=True, num_chunks=2)
+    pd.testing.assert_frame_equal(
+        _sorted(linker.inference.predict()),
+        _sorted(chunked),
+        check_dtype=False,
+        rtol=1e-12,
+    )
+
+
+def test_agreement_pattern_lookup_table():
+    settings = {
+        "link_type": "dedupe_only",
+        "comparisons": [
+            cl.ExactMatch("first_name"),
+            cl.LevenshteinAtThresholds("surname", [1, 2]),
+        ],
+        "blocking_rules_to_generate_predictions": [block_on("surname")],
+    }
+    df = pd.read_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    linker = Linker(df, settings, DuckDBAPI())
+    comparisons = linker._settings_obj.core_model_settings.comparisons
+    table = agreement_pattern_lookup_table(comparisons, 0.01)
+
+    # Null, exact match and else levels, times null, exact, two fuzzy and else
+    assert len(table["__splink__agreement_pattern"]) == 3 * 5
+    assert len(set(table["__splink__agreement_pattern"])) == 3 * 5
+    # Both comparisons null, so the match weight is that of the prior
+    assert table["__splink__agreement_pattern"][0] == 0
+    assert table["__splink__pattern_match_weight"][0] == pytest.approx(
+        prob_to_match_weight(0.01)
+    )
+
+    wide = [cl.ExactMatch(f"col_{i}") for i in range(12)]
+    settings["comparisons"] = wide
+    df_wide = pd.DataFrame({"unique_id": [1], **{f"col_{i}": ["a"] for i in range(12)}})
+    linker = Linker(df_wide, settings, DuckDBAPI())
+    comparisons = linker._settings_obj.core_model_settings.comparisons
+    assert 3**12 > MAX_AGREEMENT_PATTERNS
+    assert agreement_pattern_lookup_table(comparisons, 0.01) is None
@@ -1,5 +1,6 @@
 import duckdb
 import pandas as pd
+import pytest
 
 from splink.blocking_analysis import (
     count_comparisons_from_blocking_rule,
@@ -7,10 +8,27 @@ from splink.blocking_analysis import (
     cumulative_comparisons_to_be_scored_from_blocking_rules_data,
     n_largest_blocks,
 )
+from splink.internals import find_brs_with_comparison_counts_below_threshold
 from splink.internals.blocking import BlockingRule
-from splink.internals.blocking_rule_library import CustomRule, Or, block_on
+from splink.internals.blocking_analysis import (
+    _count_comparisons_from_blocking_rules_pre_filter_conditions,
+    _count_comparisons_generated_from_blocking_rule,
+    _process_unique_id_columns,
+)
+from splink.internals.blocking_rule_creator_utils import to_blocking_rule_creator
+from splink.internals.blocking_rule_library import (
+    CustomRule,
+    Or,
+    SortedNeighbourhoodRule,
+    block_on,
+)
 from splink.internals.duckdb.database_api import DuckDBAPI
+from splink.internals.exceptions import SplinkException
+from splink.internals.find_brs_with_comparison_counts_below_threshold import (
+    find_blocking_rules_below_threshold_comparison_count,
+)
 
+from .basic_settings import get_settings_dict
 from .decorator import mark_with_dialects_excluding, mark_with_dialects_including
 
 
@@ -814,3 +832,265 @@ def test_n_largest_blocks(test_helpers, dialect):
             ["key_0", "key_1"]
         ).reset_index(drop=True),
     )
+
+
+@mark_with_dialects_excluding()
+def test_pre_filter_counts_in_single_scan(test_helpers, dialect):
+    helper = test_helpers[dialect]
+    db_api = helper.DatabaseAPI(**helper.db_api_args())
+    df = pd.read_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+
+    blocking_rules = [
+        block_on("first_name"),
+        block_on("surname", "first_name"),
+        block_on("first_name", "surname"),
+        "l.dob = r.dob and l.city != r.city",
+        "1=1",
+        "l.first_name = r.surname",
+        block_on("substr(surname,1,2)", "city"),
+    ]
+    for link_type, tables in [
+        ("dedupe_only", df),
+        ("link_only", [df.iloc[:400], df.iloc[400:]]),
+        ("link_and_dedupe", [df.iloc[:400], df.iloc[400:]]),
+    ]:
+        splink_df_dict = db_api.register_multiple_tables(tables)
+        source_dataset_input_column, unique_id_input_column = (
+            _process_unique_id_columns(
+                "unique_id", None, splink_df_dict, link_type, db_api.sql_dialect.name
+            )
+        )
+        brs = [
+            to_blocking_rule_creator(br).get_blocking_rule(db_api.sql_dialect.name)
+            for br in blocking_rules
+        ]
+        args = dict(
+            splink_df_dict=splink_df_dict,
+            link_type=link_type,
+            db_api=db_api,
+            unique_id_input_column=unique_id_input_column,
+            source_dataset_input_column=source_dataset_input_column,
+        )
+        expected = [
+            _count_comparisons_generated_from_blocking_rule(
+                blocking_rule=br, compute_post_filter_count=False, **args
+            )["number_of_comparisons_generated_pre_filter_conditions"]
+            for br in brs
+        ]
+        counts = _count_comparisons_from_blocking_rules_pre_filter_conditions(
+            blocking_rules=brs, **args
+        )
+        assert counts == [int(c) for c in expected]
+
+
+@mark_with_dialects_excluding()
+def test_cumulative_comparisons_from_sample(test_helpers, dialect):
+    helper = test_helpers[dialect]
+    db_api = helper.DatabaseAPI(**helper.db_api_args())
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    blocking_rules = [block_on("first_name"), block_on("dob")]
+
+    exact = cumulative_comparisons_to_be_scored_from_blocking_rules_data(
+        table_or_tables=df,
+        blocking_rules=blocking_rules,
+        link_type="dedupe_only",
+        db_api=db_api,
+    )
+    estimate = cumulative_comparisons_to_be_scored_from_blocking_rules_data(
+        table_or_tables=df,
+        blocking_rules=blocking_rules,
+        link_type="dedupe_only",
+        db_api=db_api,
+        sample_proportion=0.7,
+    )
+    assert list(estimate.columns) == list(exact.columns) + [
+        "row_count_ci_lower",
+        "row_count_ci_upper",
+    ]
+    assert (estimate["cartesian"] == exact["cartesian"]).all()
+    for exact_count, estimated_count in zip(exact["row_count"], estimate["row_count"]):
+        assert abs(estimated_count - exact_count) < 0.25 * exact_count
+
+    # Estimates are reproducible
+    assert estimate.equals(
+        cumulative_comparisons_to_be_scored_from_blocking_rules_data(
+            table_or_tables=df,
+            blocking_rules=blocking_rules,
+            link_type="dedupe_only",
+            db_api=db_api,
+            sample_proportion=0.7,
+        )
+    )
+
+    # max_rows_limit applies to the comparisons generated from the sample
+    cumulative_comparisons_to_be_scored_from_blocking_rules_data(
+        table_or_tables=df,
+        blocking_rules=["1=1"],
+        link_type="dedupe_only",
+        db_api=db_api,
+        max_rows_limit=300_000,
+        sample_proportion=0.5,
+    )
+    with pytest.raises(ValueError):
+        cumulative_comparisons_to_be_scored_from_blocking_rules_data(
+            table_or_tables=df,
+            blocking_rules=["1=1"],
+            link_type="dedupe_only",
+            db_api=db_api,
+            max_rows_limit=300_000,
+        )
+
+
+@mark_with_dialects_excluding()
+def test_find_blocking_rules_below_threshold_batched(
+    test_helpers, dialect, monkeypatch
+):
+    helper = test_helpers[dialect]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    linker = helper.Linker(df, get_settings_dict(), **helper.extra_linker_args())
+    columns = ["first_name", "surname", "dob", "substr(city, 1, 1)"]
+    threshold = 2_500
+
+    count_calls = []
+    count_function = (
+        find_brs_with_comparison_counts_below_threshold._count_comparisons_from_blocking_rules_pre_filter_conditions  # noqa: E501
+    )
+
+    def counting_count_function(**kwargs):
+        count_calls.append(len(kwargs["blocking_rules"]))
+        return count_function(**kwargs)
+
+    monkeypatch.setattr(
+        find_brs_with_comparison_counts_below_threshold,
+        "_count_comparisons_from_blocking_rules_pre_filter_conditions",
+        counting_count_function,
+    )
+
+    count_cache = {}
+    results = find_blocking_rules_below_threshold_comparison_count(
+        linker, threshold, columns, count_cache=count_cache
+    )
+    max_depth = results["num_equi_joins"].max()
+    # One batch of counts per depth of the tree, including the root
+    assert len(count_calls) == max_depth + 1
+    assert count_calls[0] == 1
+
+    for _, row in results.iterrows():
+        assert row["comparison_count"] <= threshold
+        expected = _count_comparisons_generated_from_blocking_rule(
+            splink_df_dict=linker._input_tables_dict,
+            blocking_rule=row["splink_blocking_rule"],
+            link_type="dedupe_only",
+            db_api=linker._db_api,
+            compute_post_filter_count=False,
+            unique_id_input_column=linker._settings_obj.column_info_settings.unique_id_input_column,
+            source_dataset_input_column=None,
+        )["number_of_comparisons_generated_pre_filter_conditions"]
+        assert row["comparison_count"] == int(expected)
+
+    # Every single column is either a result or has been searched beyond
+    assert set(count_cache) >= {frozenset([c]) for c in columns}
+    below_threshold = {k for k, v in count_cache.items() if v <= threshold}
+    assert len(results) == len(below_threshold)
+
+    # Counts are reused from the cache
+    count_calls.clear()
+    cached_results = find_blocking_rules_below_threshold_comparison_count(
+        linker, threshold, columns, count_cache=count_cache
+    )
+    assert count_calls == []
+    pd.testing.assert_frame_equal(
+        results.drop(columns="splink_blocking_rule"),
+        cached_results.drop(columns="splink_blocking_rule"),
+    )
+
+    results = find_blocking_rules_below_threshold_comparison_count(
+        linker, threshold, columns, max_results=2
+    )
+    assert len(results) == 2
+
+
+@mark_with_dialects_excluding()
+def test_approximate_counts_have_confidence_intervals(test_helpers, dialect):
+    helper = test_helpers[dialect]
+    db_api = helper.DatabaseAPI(**helper.db_api_args())
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    args = {"table_or_tables": df, "link_type": "dedupe_only", "db_api": db_api}
+
+    pre_key = "number_of_comparisons_generated_pre_filter_conditions"
+    post_key = "number_of_comparisons_to_be_scored_post_filter_conditions"
+    for blocking_rule in [
+        block_on("first_name"),
+        block_on("substr(surname, 1, 1)", "dob"),
+        "l.first_name = r.first_name and levenshtein(l.surname, r.surname) < 3",
+    ]:
+        exact = count_comparisons_from_blocking_rule(
+            blocking_rule=blocking_rule, **args
+        )
+        estimate = count_comparisons_from_blocking_rule(
+            blocking_rule=blocking_rule, approximate=True, sample_proportion=0.5, **args
+        )
+        for key in [pre_key, post_key]:
+            assert estimate[f"{key}_ci_lower"] <= exact[key]
+            assert exact[key] <= estimate[f"{key}_ci_upper"]
+            assert estimate[f"{key}_ci_lower"] <= estimate[key]
+        assert (
+            estimate["filter_conditions_identified"]
+            == (exact["filter_conditions_identified"])
+        )
+
+    # Sampling every block gives the exact counts
+    estimate = count_comparisons_from_blocking_rule(
+        blocking_rule=block_on("first_name"), sample_proportion=1.0, **args
+    )
+    exact = count_comparisons_from_blocking_rule(
+        blocking_rule=block_on("first_name"), **args
+    )
+    for key in [pre_key, post_key]:
+        assert estimate[key] == estimate[f"{key}_ci_upper"] == exact[key]
+
+    # Blocks cannot be sampled without equi-join conditions
+    with pytest.raises(SplinkException):
+        count_comparisons_from_blocking_rule(
+            blocking_rule="1=1", approximate=True, **args
+        )
+    with pytest.raises(ValueError):
+        count_comparisons_from_blocking_rule(
+            blocking_rule=block_on("first_name"), sample_proportion=0, **args
+        )
+
+    blocking_rules = [block_on("first_name"), block_on("surname")]
+    exact = cumulative_comparisons_to_be_scored_from_blocking_rules_data(
+        blocking_rules=blocking_rules, **args
+    )
+    estimate = cumulative_comparisons_to_be_scored_from_blocking_rules_data(
+        blocking_rules=blocking_rules, approximate=True, sample_proportion=0.5, **args
+    )
+    assert "row_count_ci_lower" not in exact.columns
+    assert (estimate["row_count_ci_lower"] <= exact["row_count"]).all()
+    assert (exact["row_count"] <= estimate["row_count_ci_upper"]).all()
+
+
+@mark_with_dialects_including("duckdb", "sqlite", pass_dialect=True)
+def test_sorted_neighbourhood_rule_analysis(test_helpers, dialect):
+    helper = test_helpers[dialect]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    args = {
+        "table_or_tables": df,
+        "link_type": "dedupe_only",
+        "db_api": helper.DatabaseAPI(**helper.db_api_args()),
+    }
+    sn_rule = SortedNeighbourhoodRule("surname", "dob", window_size=3)
+
+    records = cumulative_comparisons_to_be_scored_from_blocking_rules_data(
+        blocking_rules=[block_on("first_name"), sn_rule], **args
+    ).to_dict(orient="records")
+    label = records[1]["blocking_rule"]
+    assert label == sn_rule.get_blocking_rule(dialect).blocking_rule_sql
+    assert label.startswith("sorted_neighbourhood(") and "window=3" in label
+    assert records[1]["row_count"] > 0
+
+    with pytest.raises(SplinkException, match="do not generate blocks"):
+        n_largest_blocks(blocking_rule=sn_rule, **args)
+    with pytest.raises(SplinkException, match="do not generate blocks"):
+        count_comparisons_from_blocking_rule(blocking_rule=sn_rule, **args)
@@ -1,8 +1,10 @@
 import random
 
 import pandas as pd
+import pytest
 
 import splink.internals.comparison_library as cl
+from splink.internals.blocking_rule_library import block_on
 from tests.decorator import mark_with_dialects_including
 
 
@@ -256,3 +258,127 @@ def test_link_only_unique_id_ambiguity(test_helpers, dialect):
 
     all_tuples = rule1_tuples.union(rule2_tuples)
     assert actual_triples == all_tuples
+
+
+@mark_with_dialects_including("duckdb", "spark", pass_dialect=True)
+def test_array_length_cap_and_frequent_element_pruning(test_helpers, dialect):
+    helper = test_helpers[dialect]
+    df = pd.DataFrame.from_dict(
+        [
+            {"unique_id": 1, "tokens": ["the", "john", "smith"]},
+            {"unique_id": 2, "tokens": ["the", "jon", "smith"]},
+            {"unique_id": 3, "tokens": ["the", "john", "jones"]},
+            {"unique_id": 4, "tokens": ["the", "mary", "jones"]},
+        ]
+    )
+
+    def predicted_pairs(**kwargs):
+        settings = {
+            "link_type": "dedupe_only",
+            "blocking_rules_to_generate_predictions": [
+                block_on("tokens", arrays_to_explode=["tokens"], **kwargs)
+            ],
+            "comparisons": [cl.ArrayIntersectAtSizes("tokens", [1])],
+        }
+        linker = helper.Linker(df, settings, **helper.extra_linker_args())
+        predictions = linker.inference.predict().as_pandas_dataframe()
+
+        # The unnested table is dropped once the id pairs have been computed
+        assert not any(
+            name.startswith("__splink__df_concat_unnested")
+            for name in linker._db_api._intermediate_table_cache
+        )
+        return set(zip(predictions.unique_id_l, predictions.unique_id_r))
+
+    all_pairs = {(1, 2), (1, 3), (1, 4), (2, 3), (2, 4), (3, 4)}
+    assert predicted_pairs() == all_pairs
+
+    # "the" is in every record, so is pruned
+    assert predicted_pairs(max_array_element_frequency=2) == {(1, 2), (1, 3), (3, 4)}
+
+    # Only "the" and the first name are exploded
+    assert predicted_pairs(max_array_length=2) == all_pairs
+    assert predicted_pairs(max_array_length=2, max_array_element_frequency=3) == {
+        (1, 3)
+    }
+
+    with pytest.raises(ValueError):
+        block_on("tokens", max_array_length=2).get_blocking_rule(dialect)
+
+
+@mark_with_dialects_including("duckdb", "spark", pass_dialect=True)
+def test_unnested_tables_only_materialised_when_concurrent(test_helpers, dialect):
+    helper = test_helpers[dialect]
+    df = pd.DataFrame.from_dict(
+        [
+            {"unique_id": 1, "first": ["john", "j"], "last": ["smith"]},
+            {"unique_id": 2, "first": ["jon", "j"], "last": ["smith"]},
+            {"unique_id": 3, "first": ["john"], "last": ["jones", "smith"]},
+            {"unique_id": 4, "first": ["mary"], "last": ["jones"]},
+        ]
+    )
+    settings = {
+        "link_type": "dedupe_only",
+        "blocking_rules_to_generate_predictions": [
+            block_on("first", arrays_to_explode=["first"]),
+            block_on("last", arrays_to_explode=["last"]),
+        ],
+        "comparisons": [cl.ArrayIntersectAtSizes("first", [1])],
+    }
+
+    def predicted_pairs(max_concurrency):
+        linker_args = helper.extra_linker_args()
+        linker_args["db_api"].set_max_concurrency(max_concurrency)
+        linker = helper.Linker(df, settings, **linker_args)
+        predictions = linker.inference.predict().as_pandas_dataframe()
+
+        cache = linker._db_api._intermediate_table_cache
+        unnested_materialised = any(
+            df.templated_name.startswith("__splink__df_concat_unnested")
+            for df in cache.executed_queries
+        )
+        concurrent = linker._db_api._effective_max_concurrency > 1
+        assert unnested_materialised == concurrent
+        return set(zip(predictions.unique_id_l, predictions.unique_id_r))
+
+    expected = {(1, 2), (1, 3), (2, 3), (3, 4)}
+    assert predicted_pairs(max_concurrency=1) == expected
+    assert predicted_pairs(max_concurrency=2) == expected
+
+
+@mark_with_dialects_including("duckdb", "spark", pass_dialect=True)
+def test_rules_exploding_same_arrays_share_unnested_table(test_helpers, dialect):
+    helper = test_helpers[dialect]
+    df = pd.DataFrame.from_dict(
+        [
+            {"unique_id": 1, "first": ["john", "j"], "city": "leeds"},
+            {"unique_id": 2, "first": ["jon", "j"], "city": "york"},
+            {"unique_id": 3, "first": ["john"], "city": "leeds"},
+            {"unique_id": 4, "first": ["mary", "j"], "city": "leeds"},
+        ]
+    )
+    settings = {
+        "link_type": "dedupe_only",
+        "blocking_rules_to_generate_predictions": [
+            block_on("first", "city", arrays_to_explode=["first"]),
+            block_on("first", arrays_to_explode=["first"]),
+        ],
+        "comparisons": [cl.ArrayIntersectAtSizes("first", [1])],
+    }
+    linker = helper.Linker(df, settings, **helper.extra_linker_args())
+    predictions = linker.inference.predict().as_pandas_dataframe()
+
+    cache = linker._db_api._intermediate_table_cache
+    unnested_tables = [
+        df
+        for df in cache.executed_queries
+        if df.templated_name.startswith("__splink__df_concat_unnested")
+    ]
+    assert len(unnested_tables) == 1
+    # and it is dropped once both rules have generated their id pairs
+    assert not any(name.startswith("__splink__df_concat_unnested") for name in cache)
+
+    pairs = set(
+        zip(predictions.unique_id_l, predictions.unique_id_r, predictions.match_key)
+    )
+    assert pairs == {(1, 3, "0"), (1, 4, "0"), (1, 2, "1"), (2, 4, "1")}
@@ -0,0 +1,76 @@
+import pyarrow as pa
+import pytest
+
+from splink.internals.linker import Linker
+
+from .basic_settings import get_settings_dict
+from .decorator import mark_with_dialects_excluding
+
+
+@mark_with_dialects_excluding()
+def test_as_arrow_table_and_record_batches(dialect, test_helpers):
+    helper = test_helpers[dialect]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+
+    linker = Linker(df, get_settings_dict(), helper.DatabaseAPI(**helper.db_api_args()))
+    df_predict = linker.inference.predict()
+
+    num_rows = len(df_predict.as_record_dict())
+    expected_columns = [c.unquote().name for c in df_predict.columns]
+
+    arrow_table = df_predict.as_arrow_table()
+    assert isinstance(arrow_table, pa.Table)
+    assert arrow_table.num_rows == num_rows
+    assert arrow_table.column_names == expected_columns
+
+    assert df_predict.as_arrow_table(limit=10).num_rows == 10
+
+    batches = list(df_predict.iter_record_batches(batch_size=1000))
+    assert all(isinstance(b, pa.RecordBatch) for b in batches)
+    assert all(b.num_rows <= 1000 for b in batches)
+    assert sum(b.num_rows for b in batches) == num_rows
+    assert len(batches) == -(-num_rows // 1000)
+
+    uids_from_batches = sorted(
+        (r["unique_id_l"], r["unique_id_r"]) for b in batches for r in b.to_pylist()
+    )
+    uids = sorted(
+        zip(
+            arrow_table.column("unique_id_l").to_pylist(),
+            arrow_table.column("unique_id_r").to_pylist(),
+        )
+    )
+    assert uids_from_batches == uids
+
+
+@mark_with_dialects_excluding("spark")
+def test_as_arrow_table_empty(dialect, test_helpers):
+    helper = test_helpers[dialect]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+
+    linker = Linker(df, get_settings_dict(), helper.DatabaseAPI(**helper.db_api_args()))
+    df_predict = linker.inference.predict(threshold_match_weight=500)
+
+    assert df_predict.as_arrow_table().num_rows == 0
+    assert sum(b.num_rows for b in df_predict.iter_record_batches()) == 0
+
+
+@mark_with_dialects_excluding()
+def test_iter_batches(dialect, test_helpers):
+    helper = test_helpers[dialect]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+
+    linker = Linker(df, get_settings_dict(), helper.DatabaseAPI(**helper.db_api_args()))
+    df_predict = linker.inference.predict()
+
+    records = df_predict.as_record_dict()
+    batches = df_predict.iter_batches(rows=500)
+    first_batch = next(batches)
+    assert len(first_batch) == 500
+    assert set(first_batch[0].keys()) == set(records[0].keys())
+
+    remaining = [r for batch in batches for r in batch]
+    assert len(first_batch) + len(remaining) == len(records)
+
+    with pytest.raises(ValueError):
+        df_predict.iter_batches(rows=0)
@@ -1,5 +1,8 @@
+import pandas as pd
+
 from splink.internals.blocking import BlockingRule, blocking_rule_to_obj
-from splink.internals.blocking_rule_library import block_on
+from splink.internals.blocking_rule_creator_utils import to_blocking_rule_creator
+from splink.internals.blocking_rule_library import SortedNeighbourhoodRule, block_on
 from splink.internals.input_column import _get_dialect_quotes
 from splink.internals.linker import Linker
 from splink.internals.settings_creator import SettingsCreator
@@ -73,3 +76,83 @@ def test_simple_end_to_end(test_helpers, dialect):
     linker.training.estimate_parameters_using_expectation_maximisation(block_on("dob"))
 
     linker.inference.predict()
+
+
+@mark_with_dialects_excluding()
+def test_blocking_deduplication_strategies_agree(test_helpers, dialect):
+    helper = test_helpers[dialect]
+
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+
+    # SQLite's random() is not in [0, 1), so salting does not work there
+    salting_partitions = None if dialect == "sqlite" else 3
+
+    settings = get_settings_dict()
+    settings["blocking_rules_to_generate_predictions"] = [
+        block_on("first_name"),
+        block_on("surname", salting_partitions=salting_partitions),
+        block_on("dob"),
+        "l.city = r.city and substr(l.surname, 1, 1) = substr(r.surname, 1, 1)",
+    ]
+
+    match_keys_by_strategy = {}
+    for strategy in ["exclude_preceding_rules", "min_match_key"]:
+        settings["blocking_deduplication_strategy"] = strategy
+        linker = Linker(df, settings, **helper.extra_linker_args())
+        records = linker.inference.predict().as_record_dict()
+        match_keys = {
+            (r["unique_id_l"], r["unique_id_r"]): r["match_key"] for r in records
+        }
+        assert len(match_keys) == len(records)
+        match_keys_by_strategy[strategy] = match_keys
+
+    assert (
+        match_keys_by_strategy["exclude_preceding_rules"]
+        == match_keys_by_strategy["min_match_key"]
+    )
+    assert (
+        linker._settings_obj.as_dict()["blocking_deduplication_strategy"]
+        == "min_match_key"
+    )
+
+
+@mark_with_dialects_excluding()
+def test_sorted_neighbourhood_blocking(test_helpers, dialect):
+    helper = test_helpers[dialect]
+
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    pd_df = pd.read_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    n = pd_df[["surname", "dob"]].notna().all(axis=1).sum()
+    window_size = 5
+
+    sn_rule = SortedNeighbourhoodRule("surname", "dob", window_size=window_size)
+    settings = get_settings_dict()
+    settings["blocking_rules_to_generate_predictions"] = [sn_rule]
+
+    linker = Linker(df, settings, **helper.extra_linker_args())
+    records = linker.inference.predict().as_record_dict()
+    pairs = {(r["unique_id_l"], r["unique_id_r"]) for r in records}
+    assert len(records) == len(pairs)
+    assert len(pairs) == n * window_size - window_size * (window_size + 1) // 2
+
+    br_dict = sn_rule.get_blocking_rule(dialect).as_dict()
+    assert len(br_dict["sort_keys"]) == 2
+    assert br_dict["window_size"] == window_size
+    round_tripped = to_blocking_rule_creator(br_dict).get_blocking_rule(dialect)
+    assert round_tripped.as_dict() == br_dict
+
+    # Pairs found by the sorted neighbourhood rule are not repeated by later rules
+    settings["blocking_rules_to_generate_predictions"] = [
+        block_on("first_name"),
+        sn_rule,
+        block_on("surname"),
+    ]
+    for strategy in ["exclude_preceding_rules", "min_match_key"]:
+        settings["blocking_deduplication_strategy"] = strategy
+        linker = Linker(df, settings, **helper.extra_linker_args())
+        records = linker.inference.predict().as_record_dict()
+        match_keys = {
+            (r["unique_id_l"], r["unique_id_r"]): r["match_key"] for r in records
+        }
+        assert len(match_keys) == len(records)
+        assert {k for k, mk in match_keys.items() if mk == "1"} <= pairs
@@ -0,0 +1,109 @@
+import pandas as pd
+import pytest
+
+import splink.internals.comparison_library as cl
+from splink.internals.blocking_rule_library import block_on
+from splink.internals.linker import Linker
+
+from .basic_settings import get_settings_dict
+from .decorator import mark_with_dialects_excluding
+
+blocking_rules = [
+    block_on("first_name"),
+    # Rules with filter conditions cannot use an index, so subsequent rules
+    # which exclude their pairs cannot either
+    "l.surname = r.surname and levenshtein(l.dob, r.dob) <= 1",
+    block_on("substr(surname, 1, 2)", "dob"),
+]
+
+
+def _blocked_pairs(db_api, df, link_type, deduplication_strategy):
+    settings = get_settings_dict()
+    settings["link_type"] = link_type
+    settings["blocking_rules_to_generate_predictions"] = blocking_rules
+    settings["blocking_deduplication_strategy"] = deduplication_strategy
+    linker = Linker(df, settings, db_api)
+    predictions = linker.inference.predict().as_pandas_dataframe()
+    id_cols = [
+        c
+        for c in ["source_dataset_l", "unique_id_l", "source_dataset_r", "unique_id_r"]
+        if c in predictions.columns
+    ]
+    return (
+        predictions[id_cols + ["match_key"]].sort_values(id_cols).reset_index(drop=True)
+    )
+
+
+def _index_tables(db_api):
+    return [
+        name
+        for name in db_api._intermediate_table_cache
+        if name.startswith("__splink__blocking_key_index")
+    ]
+
+
+@mark_with_dialects_excluding()
+@pytest.mark.parametrize(
+    "deduplication_strategy", ["exclude_preceding_rules", "min_match_key"]
+)
+@pytest.mark.parametrize("link_type", ["dedupe_only", "link_only", "link_and_dedupe"])
+def test_blocking_key_index_gives_same_pairs(
+    test_helpers, dialect, link_type, deduplication_strategy
+):
+    helper = test_helpers[dialect]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    if link_type != "dedupe_only":
+        df_pd = pd.read_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+        df = [
+            helper.convert_frame(df_pd.iloc[:600]),
+            helper.convert_frame(df_pd.iloc[400:]),
+        ]
+
+    db_api = helper.DatabaseAPI(**helper.db_api_args())
+    expected = _blocked_pairs(db_api, df, link_type, deduplication_strategy)
+    assert _index_tables(db_api) == []
+
+    db_api = helper.DatabaseAPI(**helper.db_api_args())
+    db_api.enable_blocking_key_index()
+    pairs = _blocked_pairs(db_api, df, link_type, deduplication_strategy)
+    pd.testing.assert_frame_equal(expected, pairs, check_dtype=False)
+
+    # Two dataset link only has separate left and right index tables
+    num_sides = 2 if link_type == "link_only" else 1
+    num_index_tables = len(_index_tables(db_api))
+    if deduplication_strategy == "min_match_key":
+        assert num_index_tables == 2 * num_sides
+    else:
+        assert num_index_tables == 1 * num_sides
+
+
+@mark_with_dialects_excluding()
+def test_blocking_key_index_is_reused(test_helpers, dialect):
+    helper = test_helpers[dialect]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+
+    db_api = helper.DatabaseAPI(**helper.db_api_args())
+    db_api.enable_blocking_key_index()
+    settings = get_settings_dict()
+    settings["blocking_rules_to_generate_predictions"] = [
+        block_on("first_name"),
+        block_on("surname"),
+    ]
+    settings["comparisons"] = [cl.ExactMatch("dob"), cl.ExactMatch("city")]
+    linker = Linker(df, settings, db_api)
+
+    linker.inference.predict()
+    index_tables = _index_tables(db_api)
+    assert len(index_tables) == 2
+
+    # Expectation maximisation and later predictions using the same rules read
+    # from the existing index tables
+    linker.training.estimate_parameters_using_expectation_maximisation(
+        block_on("first_name")
+    )
+    linker.inference.predict()
+    assert _index_tables(db_api) == index_tables
+
+    # Rules only hold a reference to the index while generating pairs
+    for br in linker._settings_obj._blocking_rules_to_generate_predictions:
+        assert br.blocking_key_index_tables is None
@@ -0,0 +1,87 @@
+import itertools
+
+import pandas as pd
+import pytest
+
+import splink.internals.comparison_library as cl
+from splink.internals.blocking_analysis import (
+    cumulative_comparisons_to_be_scored_from_blocking_rules_data,
+)
+from splink.internals.cost_of_blocking_rules import (
+    estimate_cost_of_sql_condition,
+    estimate_cost_per_comparison,
+)
+from splink.internals.optimise_cost_of_brs import _union_inclusion_exclusion_terms
+
+from .basic_settings import get_settings_dict
+from .decorator import mark_with_dialects_excluding
+
+
+def _labels_from_clusters(df):
+    pairs = []
+    for _, group in df.groupby("cluster"):
+        for uid_l, uid_r in itertools.combinations(sorted(group["unique_id"]), 2):
+            pairs.append(
+                {"unique_id_l": uid_l, "unique_id_r": uid_r, "clerical_match_score": 1}
+            )
+    return pd.DataFrame(pairs)
+
+
+@mark_with_dialects_excluding()
+def test_blocking_rules_cost_recall_frontier(test_helpers, dialect):
+    helper = test_helpers[dialect]
+    df_pd = pd.read_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    df = helper.convert_frame(df_pd)
+    db_api = helper.DatabaseAPI(**helper.db_api_args())
+    linker = helper.Linker(df, get_settings_dict(), **helper.extra_linker_args())
+    labels = linker.table_management.register_labels_table(
+        helper.convert_frame(_labels_from_clusters(df_pd))
+    )
+
+    frontier = linker.evaluation.blocking_rules_cost_recall_frontier(
+        labels,
+        max_comparisons_per_rule=5_000,
+        blocking_expressions=["first_name", "surname", "dob", "city"],
+    )
+    assert len(frontier) > 1
+    assert frontier["estimated_scoring_cost"].is_monotonic_increasing
+    assert frontier["recall"].is_monotonic_increasing
+    assert frontier["recall"].between(0, 1).all()
+
+    for _, row in frontier.iterrows():
+        # Comparison counts allow for pairs generated by more than one rule
+        cumulative = cumulative_comparisons_to_be_scored_from_blocking_rules_data(
+            table_or_tables=df_pd,
+            blocking_rules=row["blocking_rules"],
+            link_type="dedupe_only",
+            db_api=db_api,
+        )
+        assert row["num_comparisons"] == cumulative["row_count"].sum()
+        assert row["estimated_scoring_cost"] == pytest.approx(
+            row["num_comparisons"] * row["cost_per_comparison"]
+        )
+
+    with pytest.raises(ValueError):
+        linker.evaluation.blocking_rules_cost_recall_frontier(
+            labels,
+            max_comparisons_per_rule=5_000,
+            threshold_match_probability=2,
+        )
+
+
+def test_union_inclusion_exclusion_terms():
+    a, b, c = frozenset(["a"]), frozenset(["b"]), frozenset(["a", "b"])
+    assert _union_inclusion_exclusion_terms([a, b]) == {a: 1, b: 1, c: -1}
+    # A rule which is stricter than another adds nothing
+    assert _union_inclusion_exclusion_terms([a, c]) == {a: 1}
+
+
+def test_estimate_cost_per_comparison():
+    assert estimate_cost_of_sql_condition("l.a = r.a") == 1
+    assert estimate_cost_of_sql_condition(
+        "levenshtein(l.a, r.a) <= 2"
+    ) > estimate_cost_of_sql_condition("l.a = r.a")
+
+    exact = [cl.ExactMatch("a").get_comparison("duckdb")]
+    fuzzy = [cl.LevenshteinAtThresholds("a", [1, 2]).get_comparison("duckdb")]
+    assert estimate_cost_per_comparison(fuzzy) > estimate_cost_per_comparison(exact)
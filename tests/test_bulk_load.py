@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from splink.internals.bulk_load import BulkLoadTable
+from splink.internals.linker import Linker
+
+from .basic_settings import get_settings_dict
+from .decorator import mark_with_dialects_excluding
+
+
+def _input_df():
+    return pd.DataFrame(
+        {
+            "unique_id": [1, 2, 3],
+            "score": [1.5, np.nan, 3.0],
+            "name": ["a", None, "tab\tnew\nline\\"],
+            "flag": [True, False, True],
+            "dob": pd.to_datetime(["2020-01-01", None, "2021-06-30"]),
+        }
+    )
+
+
+def test_bulk_load_table_batches():
+    df = _input_df()
+    for table_input in [df, pa.Table.from_pandas(df, preserve_index=False)]:
+        table = BulkLoadTable(table_input)
+        assert table.column_kinds == {
+            "unique_id": "integer",
+            "score": "float",
+            "name": "string",
+            "flag": "boolean",
+            "dob": "timestamp",
+        }
+        batches = list(table.iter_row_batches(batch_size=2))
+        assert [len(b) for b in batches] == [2, 1]
+        assert batches[0][1][1:4] == (None, None, False)
+        assert batches[0][1][4] is None
+
+
+@mark_with_dialects_excluding("duckdb", "spark")
+def test_register_arrow_and_parquet(dialect, test_helpers, tmp_path):
+    helper = test_helpers[dialect]
+    db_api = helper.DatabaseAPI(**helper.db_api_args())
+
+    df = _input_df()
+    arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+    parquet_path = str(tmp_path / "input.parquet")
+    pq.write_table(arrow_table, parquet_path)
+
+    expected = db_api.register_table(df, "from_pandas").as_record_dict()
+    assert len(expected) == 3
+    assert expected[1]["score"] is None
+    assert expected[2]["name"] == "tab\tnew\nline\\"
+
+    from_arrow = db_api.register_table(arrow_table, "from_arrow")
+    from_parquet = db_api.register_table(parquet_path, "from_parquet")
+    assert from_arrow.as_record_dict() == expected
+    assert from_parquet.as_record_dict() == expected
+
+
+@mark_with_dialects_excluding("duckdb", "spark")
+def test_linker_with_arrow_input(dialect, test_helpers):
+    helper = test_helpers[dialect]
+    df = pd.read_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+
+    predictions = []
+    for table in [df, pa.Table.from_pandas(df, preserve_index=False)]:
+        db_api = helper.DatabaseAPI(**helper.db_api_args())
+        linker = Linker(table, get_settings_dict(), db_api)
+        predictions.append(len(linker.inference.predict().as_record_dict()))
+
+    assert predictions[0] == predictions[1]
@@ -265,3 +265,68 @@ def test_cache_register_compute_tf_table(debug_mode):
         # now this should be cached, as I have manually registered
         linker.table_management.compute_tf_table("first_name")
         mockexecute_sql_pipeline.assert_not_called()
+
+
+def test_persistent_cache_reused_across_sessions(tmp_path):
+    db_path = os.path.join(tmp_path, "persistent.duckdb")
+    manifest_path = os.path.join(tmp_path, "manifest.json")
+    settings = get_settings_dict()
+
+    db_api = DuckDBAPI(db_path)
+    db_api.enable_persistent_cache(manifest_path)
+    linker = Linker(df, settings, db_api=db_api)
+    df_predict = linker.inference.predict()
+    cache = linker._intermediate_table_cache
+    assert cache.is_in_executed_queries("__splink__df_concat_with_tf")
+    db_api._con.close()
+
+    # A fresh session against unchanged inputs should not recompute anything
+    db_api = DuckDBAPI(db_path)
+    db_api.enable_persistent_cache(manifest_path)
+    linker = Linker(df, settings, db_api=db_api)
+    df_predict_2 = linker.inference.predict()
+    cache = linker._intermediate_table_cache
+    assert not cache.is_in_executed_queries("__splink__df_concat_with_tf")
+    assert not cache.is_in_executed_queries("__splink__df_predict")
+    assert cache.is_in_queries_retrieved_from_cache("__splink__df_predict")
+    assert df_predict_2.physical_name == df_predict.physical_name
+    db_api._con.close()
+
+    # but if the input data changes, tables must be recomputed
+    db_api = DuckDBAPI(db_path)
+    db_api.enable_persistent_cache(manifest_path)
+    linker = Linker(df.head(500), settings, db_api=db_api)
+    df_predict_3 = linker.inference.predict()
+    cache = linker._intermediate_table_cache
+    assert cache.is_in_executed_queries("__splink__df_concat_with_tf")
+    assert df_predict_3.physical_name != df_predict.physical_name
+
+
+def test_persistent_cache_requires_manifest_entry(tmp_path):
+    db_path = os.path.join(tmp_path, "persistent.duckdb")
+    settings = get_settings_dict()
+
+    db_api = DuckDBAPI(db_path)
+    db_api.enable_persistent_cache(os.path.join(tmp_path, "manifest.json"))
+    linker = Linker(df, settings, db_api=db_api)
+    linker.inference.predict()
+    db_api._con.close()
+
+    # Tables exist in the database, but are unknown to a new manifest
+    db_api = DuckDBAPI(db_path)
+    db_api.enable_persistent_cache(os.path.join(tmp_path, "other_manifest.json"))
+    linker = Linker(df, settings, db_api=db_api)
+    linker.inference.predict()
+    cache = linker._intermediate_table_cache
+    assert cache.is_in_executed_queries("__splink__df_predict")
+
+
+def test_tables_found_in_database_not_logged_without_persistent_cache():
+    db_api = DuckDBAPI()
+    db_api._con.execute("create table __splink__existing_table as select 1 as a")
+
+    splink_df = db_api._get_table_from_cache_or_db(
+        "__splink__existing_table", "__splink__existing"
+    )
+    assert splink_df.as_record_dict() == [{"a": 1}]
+    assert db_api._intermediate_table_cache.queries_retrieved_from_cache == []
@@ -1,6 +1,8 @@
 import duckdb
 import pandas as pd
+import pytest
 
+from splink.internals.blocking_rule_library import block_on
 from splink.internals.comparison_library import ExactMatch, LevenshteinAtThresholds
 from splink.internals.duckdb.database_api import DuckDBAPI
 from splink.internals.linker import Linker
@@ -343,3 +345,94 @@ def test_single_deletion():
     # Check it is no longer in the cache or database
     assert table_name not in get_duckdb_table_names_as_list(db_api._con)
     assert "__splink__df_tf_name" not in cache
+
+
+def test_cache_budget_evicts_least_recently_used():
+    data = [
+        {"unique_id": 1, "name": "Amanda"},
+        {"unique_id": 2, "name": "Robin"},
+        {"unique_id": 3, "name": "Robyn"},
+        {"unique_id": 4, "name": "Robin"},
+    ]
+    df = pd.DataFrame(data)
+
+    settings = {
+        "link_type": "dedupe_only",
+        "comparisons": [LevenshteinAtThresholds("name", 2)],
+        "blocking_rules_to_generate_predictions": ["l.name = r.name"],
+    }
+
+    db_api = DuckDBAPI()
+    db_api.set_cache_budget(max_rows=1)
+
+    linker = Linker(df, settings, db_api=db_api)
+    cache = linker._intermediate_table_cache
+
+    df_predict = linker.inference.predict()
+    df_predict_2 = linker.inference.predict(threshold_match_probability=0.5)
+
+    # Tables behind frames the caller still holds are never evicted
+    physical_name = df_predict.physical_name
+    assert not cache.is_in_evicted_tables(physical_name)
+    assert physical_name in get_duckdb_table_names_as_list(db_api._con)
+
+    # Once released, the first predictions are least recently used, so are
+    # evicted when the next table is cached
+    del df_predict
+    df_predict_3 = linker.inference.predict(threshold_match_probability=0.9)
+    assert cache.is_in_evicted_tables(physical_name)
+    assert physical_name not in get_duckdb_table_names_as_list(db_api._con)
+    for df in [df_predict_2, df_predict_3]:
+        assert not cache.is_in_evicted_tables(df.physical_name)
+        assert df.physical_name in get_duckdb_table_names_as_list(db_api._con)
+
+    # Pinned tables are never evicted
+    assert not cache.is_in_evicted_tables("__splink__df_concat_with_tf")
+    assert "__splink__df_concat_with_tf" in cache
+
+    # Evicted tables are recomputed if needed again
+    cache.reset_executed_queries_tracker()
+    linker.inference.predict()
+    assert cache.is_in_executed_queries("__splink__df_predict")
+
+
+def test_cache_budget_bytes_unsupported_backend():
+    db_api = DuckDBAPI()
+    with pytest.raises(NotImplementedError):
+        db_api.set_cache_budget(max_bytes=1_000_000)
+
+
+def test_cache_budget_keeps_tables_in_use():
+    df = pd.read_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    settings = {
+        "link_type": "dedupe_only",
+        "comparisons": [
+            ExactMatch("dob"),
+            LevenshteinAtThresholds("first_name"),
+            ExactMatch("surname").configure(term_frequency_adjustments=True),
+        ],
+        "blocking_rules_to_generate_predictions": [
+            block_on("first_name"),
+            block_on("surname"),
+        ],
+    }
+
+    db_api = DuckDBAPI()
+    # Smaller than any intermediate table, so every cached table not in use is
+    # evicted as soon as another is cached
+    db_api.set_cache_budget(max_rows=10)
+    linker = Linker(df, settings, db_api=db_api)
+    cache = linker._intermediate_table_cache
+
+    # Each of these reads tables it has cached earlier in the same operation
+    linker.training.estimate_u_using_random_sampling(max_pairs=1e4)
+    linker.training.estimate_parameters_using_expectation_maximisation(block_on("dob"))
+    df_predict = linker.inference.predict()
+    linker.training.estimate_parameters_using_expectation_maximisation(
+        block_on("surname")
+    )
+    linker.inference.predict(threshold_match_probability=0.5)
+
+    assert len(cache.evicted_tables) > 0
+    assert not cache.is_in_evicted_tables(df_predict.physical_name)
+    assert df_predict.as_pandas_dataframe().shape[0] > 0
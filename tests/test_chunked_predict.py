@@ -0,0 +1,78 @@
+import os
+
+import pandas as pd
+import pytest
+
+from splink.internals.exceptions import SplinkException
+from splink.internals.linker import Linker
+
+from .basic_settings import get_settings_dict
+from .decorator import mark_with_dialects_excluding, mark_with_dialects_including
+
+
+def _sorted_predictions(df_predict):
+    df = df_predict.as_pandas_dataframe()
+    return df.sort_values(["unique_id_l", "unique_id_r"]).reset_index(drop=True)
+
+
+@mark_with_dialects_excluding()
+def test_chunked_predict_matches_unchunked(dialect, test_helpers):
+    helper = test_helpers[dialect]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+
+    linker = Linker(df, get_settings_dict(), helper.DatabaseAPI(**helper.db_api_args()))
+    expected = _sorted_predictions(linker.inference.predict(threshold_match_weight=-10))
+
+    chunked = _sorted_predictions(
+        linker.inference.predict(threshold_match_weight=-10, num_chunks=4)
+    )
+    pd.testing.assert_frame_equal(expected, chunked, check_dtype=False)
+
+
+@mark_with_dialects_including("duckdb")
+def test_chunked_predict_to_parquet(test_helpers, tmp_path):
+    helper = test_helpers["duckdb"]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+
+    linker = Linker(df, get_settings_dict(), helper.DatabaseAPI(**helper.db_api_args()))
+    expected = _sorted_predictions(linker.inference.predict())
+
+    output_path = str(tmp_path / "predictions")
+    df_predict = linker.inference.predict(num_chunks=3, chunked_output_path=output_path)
+    assert sorted(os.listdir(output_path)) == [
+        "chunk_0.parquet",
+        "chunk_1.parquet",
+        "chunk_2.parquet",
+    ]
+    pd.testing.assert_frame_equal(
+        expected, _sorted_predictions(df_predict), check_dtype=False
+    )
+
+    # Chunks left in the directory by an earlier run with more chunks are not
+    # read as part of the predictions
+    df_predict = linker.inference.predict(num_chunks=2, chunked_output_path=output_path)
+    pd.testing.assert_frame_equal(
+        expected, _sorted_predictions(df_predict), check_dtype=False
+    )
+
+
+@mark_with_dialects_including("duckdb")
+def test_chunked_predict_validation(test_helpers):
+    helper = test_helpers["duckdb"]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    linker = Linker(df, get_settings_dict(), helper.DatabaseAPI(**helper.db_api_args()))
+
+    with pytest.raises(ValueError):
+        linker.inference.predict(num_chunks=0)
+    with pytest.raises(ValueError):
+        linker.inference.predict(chunked_output_path="predictions")
+
+
+@mark_with_dialects_including("sqlite")
+def test_chunked_predict_to_parquet_requires_duckdb(test_helpers):
+    helper = test_helpers["sqlite"]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    linker = Linker(df, get_settings_dict(), helper.DatabaseAPI(**helper.db_api_args()))
+
+    with pytest.raises(SplinkException):
+        linker.inference.predict(num_chunks=2, chunked_output_path="predictions")
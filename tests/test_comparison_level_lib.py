@@ -1,8 +1,11 @@
+import random
+
 import pandas as pd
 
 import splink.internals.comparison_level_library as cll
+from splink.internals.dialects import SplinkDialect
 
-from .decorator import mark_with_dialects_excluding
+from .decorator import mark_with_dialects_excluding, mark_with_dialects_including
 
 
 @mark_with_dialects_excluding()
@@ -254,3 +257,50 @@ def test_damerau_levenshtein_level(test_helpers, dialect):
         expected_gamma_lev = gamma_lev_from_distance(lev_dist)
         row = dict(df_e.query(f"id_l == 1 and id_r == {id_r}").iloc[0])
         assert row["gamma_name"] == expected_gamma_lev
+
+
+@mark_with_dialects_including("duckdb", "sqlite", pass_dialect=True)
+def test_guards_do_not_change_fuzzy_levels(test_helpers, dialect):
+    helper = test_helpers[dialect]
+    db_api = helper.DatabaseAPI(**helper.db_api_args())
+    sql_dialect = SplinkDialect.from_string(dialect)
+
+    rng = random.Random(1)
+    # Multibyte characters, as DuckDB measures edit distances in bytes
+    alphabet = "abcdeé日"
+    names = ["".join(rng.choices(alphabet, k=rng.randint(0, 9))) for _ in range(60)]
+    names = names + [None]
+    df = pd.DataFrame(
+        [{"name_l": name_l, "name_r": name_r} for name_l in names for name_r in names]
+    )
+    pairs = db_api.register_table(df, "__splink__test_name_pairs")
+
+    levels = [
+        cll.LevenshteinLevel("name", 1),
+        cll.LevenshteinLevel("name", 3),
+        cll.DamerauLevenshteinLevel("name", 2),
+    ]
+    for level in levels:
+        guarded_sql = level.create_sql(sql_dialect)
+        # The condition following the guard
+        unguarded_sql = guarded_sql.split(" and ")[-1]
+        assert guarded_sql != unguarded_sql
+
+        sql = f"""
+        select
+        coalesce({guarded_sql}, false) as guarded,
+        coalesce({unguarded_sql}, false) as unguarded,
+        name_l is null or name_r is null as has_null
+        from {pairs.physical_name}
+        """
+        result = db_api._execute_sql_against_backend(sql)
+        if dialect == "duckdb":
+            result = result.df()
+        else:
+            result = pd.DataFrame(
+                result.fetchall(), columns=["guarded", "unguarded", "has_null"]
+            )
+        result = result[~result["has_null"].astype(bool)]
+        assert (
+            result["guarded"].astype(bool) == result["unguarded"].astype(bool)
+        ).all()
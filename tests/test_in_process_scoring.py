@@ -0,0 +1,182 @@
+import logging
+
+import pandas as pd
+import pytest
+
+import splink.internals.comparison_level_library as cll
+import splink.internals.comparison_library as cl
+from splink.internals.blocking_rule_library import block_on
+from splink.internals.linker import Linker
+
+from .basic_settings import get_settings_dict
+from .decorator import mark_with_dialects_including
+
+
+def _sorted(df_predict):
+    df = df_predict.as_pandas_dataframe()
+    return df.sort_values(["unique_id_l", "unique_id_r"]).reset_index(drop=True)
+
+
+def _fuzzy_settings(dialect):
+    if dialect == "duckdb":
+        jaro_winkler = cl.JaroWinklerAtThresholds("first_name")
+    else:
+        # The SQLite udf returns the Jaro-Winkler distance
+        jaro_winkler = cl.CustomComparison(
+            output_column_name="first_name",
+            comparison_levels=[
+                cll.NullLevel("first_name"),
+                cll.ExactMatchLevel("first_name"),
+                cll.CustomLevel("jaro_winkler(first_name_l, first_name_r) <= 0.1"),
+                cll.ElseLevel(),
+            ],
+        )
+    return {
+        "link_type": "dedupe_only",
+        "comparisons": [
+            jaro_winkler,
+            cl.LevenshteinAtThresholds("surname").configure(
+                term_frequency_adjustments=True
+            ),
+            cl.DamerauLevenshteinAtThresholds("city", [1, 2]),
+            cl.ExactMatch("dob"),
+        ],
+        "blocking_rules_to_generate_predictions": [
+            block_on("surname"),
+            block_on("first_name"),
+        ],
+        "retain_matching_columns": True,
+        "retain_intermediate_calculation_columns": True,
+    }
+
+
+@mark_with_dialects_including("duckdb", "sqlite", pass_dialect=True)
+@pytest.mark.parametrize("settings_name", ["basic", "fuzzy"])
+def test_in_process_predict_matches_sql(test_helpers, dialect, settings_name, caplog):
+    helper = test_helpers[dialect]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    if settings_name == "basic":
+        settings = get_settings_dict()
+        settings["retain_intermediate_calculation_columns"] = True
+    else:
+        settings = _fuzzy_settings(dialect)
+
+    linker = Linker(df, settings, helper.DatabaseAPI(**helper.db_api_args()))
+    caplog.set_level(logging.INFO, logger="splink")
+
+    for thresholds in [{}, {"threshold_match_weight": -2}]:
+        expected = _sorted(linker.inference.predict(**thresholds))
+        in_process = _sorted(
+            linker.inference.predict(engine="in_process", **thresholds)
+        )
+        assert list(in_process.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(
+            expected, in_process, check_dtype=False, check_exact=True
+        )
+
+    chunked = _sorted(linker.inference.predict(engine="in_process", num_chunks=3))
+    pd.testing.assert_frame_equal(
+        _sorted(linker.inference.predict()),
+        chunked,
+        check_dtype=False,
+        check_exact=True,
+    )
+    # The pairs were scored in process, rather than falling back to sql
+    assert "instead of in process" not in caplog.text
+
+
+@mark_with_dialects_including("duckdb", "sqlite", pass_dialect=True)
+def test_in_process_new_records_match_sql(test_helpers, dialect):
+    helper = test_helpers[dialect]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    linker = Linker(df, get_settings_dict(), helper.DatabaseAPI(**helper.db_api_args()))
+    linker.table_management.compute_tf_table("first_name")
+
+    record_1 = {
+        "unique_id": 1,
+        "first_name": "Julia",
+        "surname": "Taylor",
+        "dob": "2015-07-31",
+        "city": "London",
+        "email": "hannah88@powers.com",
+        "cluster": 0,
+    }
+    record_2 = dict(record_1, unique_id=2, first_name="Julai", city=None)
+
+    expected = linker.inference.compare_two_records(record_1, record_2)
+    in_process = linker.inference.compare_two_records(
+        record_1, record_2, engine="in_process"
+    )
+    pd.testing.assert_frame_equal(
+        expected.as_pandas_dataframe(),
+        in_process.as_pandas_dataframe(),
+        check_dtype=False,
+        check_exact=True,
+    )
+
+    blocking_rules = [block_on("first_name"), block_on("surname")]
+    expected = linker.inference.find_matches_to_new_records(
+        [record_1, record_2], blocking_rules=blocking_rules
+    )
+    in_process = linker.inference.find_matches_to_new_records(
+        [record_1, record_2], blocking_rules=blocking_rules, engine="in_process"
+    )
+    pd.testing.assert_frame_equal(
+        _sorted(expected), _sorted(in_process), check_dtype=False, check_exact=True
+    )
+
+
+@mark_with_dialects_including("duckdb")
+def test_in_process_falls_back_to_sql(test_helpers, caplog):
+    helper = test_helpers["duckdb"]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    settings = get_settings_dict()
+    settings["comparisons"] = [cl.ExactMatch("first_name"), cl.EmailComparison("email")]
+    linker = Linker(df, settings, helper.DatabaseAPI(**helper.db_api_args()))
+
+    expected = _sorted(linker.inference.predict())
+    with caplog.at_level(logging.INFO, logger="splink"):
+        in_process = _sorted(linker.inference.predict(engine="in_process"))
+    assert "instead of in process" in caplog.text
+    pd.testing.assert_frame_equal(expected, in_process, check_dtype=False)
+
+    with pytest.raises(ValueError):
+        linker.inference.predict(engine="numpy")
+
+
+@mark_with_dialects_including("duckdb", "sqlite", pass_dialect=True)
+def test_in_process_non_ascii_matches_sql(test_helpers, dialect, caplog):
+    helper = test_helpers[dialect]
+    names = [
+        ("Müller", "Muller"),
+        ("Renée", "Renee"),
+        ("Zoë", "Zoe"),
+        ("Jürgen", "Jurgen"),
+        ("Łukasz", "Lukasz"),
+        ("", "é"),
+        ("", ""),
+    ]
+    records = []
+    for i, (first_name, surname) in enumerate(names):
+        for j, name in enumerate([first_name, surname]):
+            records.append(
+                {
+                    "unique_id": 2 * i + j,
+                    "first_name": name,
+                    "surname": [first_name, surname][1 - j],
+                    "city": "Köln" if j else "Koln",
+                    "dob": "2000-01-01",
+                }
+            )
+    df = helper.convert_frame(pd.DataFrame(records))
+    settings = _fuzzy_settings(dialect)
+    settings["blocking_rules_to_generate_predictions"] = [block_on("dob")]
+
+    linker = Linker(df, settings, helper.DatabaseAPI(**helper.db_api_args()))
+    expected = _sorted(linker.inference.predict())
+    with caplog.at_level(logging.INFO, logger="splink"):
+        in_process = _sorted(linker.inference.predict(engine="in_process"))
+    assert "instead of in process" not in caplog.text
+    pd.testing.assert_frame_equal(
+        expected, in_process, check_dtype=False, check_exact=True
+    )
@@ -0,0 +1,102 @@
+import pandas as pd
+import pytest
+
+import splink.internals.comparison_library as cl
+from splink.internals.blocking_analysis import count_comparisons_from_blocking_rule
+from splink.internals.blocking_rule_creator_utils import to_blocking_rule_creator
+from splink.internals.blocking_rule_library import MinHashLSHRule, block_on
+from tests.decorator import mark_with_dialects_including
+
+from .basic_settings import get_settings_dict
+
+
+def _predicted_pairs(linker):
+    df = linker.inference.predict().as_pandas_dataframe()
+    pairs = list(zip(df.unique_id_l, df.unique_id_r))
+    assert len(pairs) == len(set(pairs))
+    if "match_key" not in df.columns:
+        return set(pairs)
+    return dict(zip(pairs, df.match_key))
+
+
+@mark_with_dialects_including("duckdb", "spark", pass_dialect=True)
+def test_lsh_blocking_pairs_similar_token_sets(test_helpers, dialect):
+    helper = test_helpers[dialect]
+    df = pd.DataFrame(
+        [
+            {"unique_id": 1, "name": "john smith"},
+            {"unique_id": 2, "name": "smith  john"},
+            {"unique_id": 3, "name": "mary jones"},
+            {"unique_id": 4, "name": None},
+            {"unique_id": 5, "name": None},
+            {"unique_id": 6, "name": ""},
+        ]
+    )
+    settings = {
+        "link_type": "dedupe_only",
+        "blocking_rules_to_generate_predictions": [
+            MinHashLSHRule("name", num_bands=4, rows_per_band=2, tokens="words")
+        ],
+        "comparisons": [cl.ExactMatch("name")],
+    }
+    linker = helper.Linker(df, settings, **helper.extra_linker_args())
+
+    # Identical sets of words always share every band key, and null or empty
+    # values are never paired
+    assert _predicted_pairs(linker) == {(1, 2)}
+
+
+@mark_with_dialects_including("duckdb", "spark", pass_dialect=True)
+def test_lsh_blocking_with_other_rules(test_helpers, dialect):
+    helper = test_helpers[dialect]
+    df = pd.read_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    df["full_name"] = df["first_name"] + " " + df["surname"]
+
+    lsh_rule = MinHashLSHRule("full_name", num_bands=10, rows_per_band=2)
+    db_api = helper.DatabaseAPI(**helper.db_api_args())
+    lsh_count = count_comparisons_from_blocking_rule(
+        table_or_tables=df,
+        blocking_rule=lsh_rule,
+        link_type="dedupe_only",
+        db_api=db_api,
+    )
+
+    settings = get_settings_dict()
+    settings["blocking_rules_to_generate_predictions"] = [lsh_rule]
+    linker = helper.Linker(df, settings, **helper.extra_linker_args())
+    lsh_pairs = _predicted_pairs(linker)
+    assert (
+        len(lsh_pairs)
+        == lsh_count["number_of_comparisons_to_be_scored_post_filter_conditions"]
+    )
+    assert lsh_count["number_of_comparisons_generated_pre_filter_conditions"] > 2 * len(
+        lsh_pairs
+    )
+
+    # Pairs are not duplicated when the LSH rule overlaps with other rules
+    settings["blocking_rules_to_generate_predictions"] = [
+        block_on("first_name"),
+        lsh_rule,
+        block_on("surname"),
+    ]
+    linker = helper.Linker(df, settings, **helper.extra_linker_args())
+    pairs = _predicted_pairs(linker)
+    assert {k for k, mk in pairs.items() if mk == "1"} <= lsh_pairs
+
+    br_dict = lsh_rule.get_blocking_rule(dialect).as_dict()
+    round_tripped = to_blocking_rule_creator(br_dict).get_blocking_rule(dialect)
+    assert round_tripped.as_dict() == br_dict
+
+
+def test_lsh_probability_of_pairing():
+    rule = MinHashLSHRule("name", num_bands=20, rows_per_band=5)
+    assert rule.probability_of_pairing(1.0) == 1.0
+    assert rule.probability_of_pairing(0.0) == 0.0
+    assert rule.probability_of_pairing(0.8) == pytest.approx(0.99965, abs=1e-5)
+
+    br = rule.get_blocking_rule("duckdb")
+    assert br.probability_of_pairing(0.8) == rule.probability_of_pairing(0.8)
+    assert br.similarity_threshold == pytest.approx((1 / 20) ** (1 / 5))
+
+    with pytest.raises(ValueError):
+        MinHashLSHRule("name", num_bands=0, rows_per_band=5).get_blocking_rule("duckdb")
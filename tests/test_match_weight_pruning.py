@@ -0,0 +1,133 @@
+import pandas as pd
+
+import splink.internals.comparison_library as cl
+import splink.internals.linker_components.inference as inference
+from splink.internals.blocking_rule_library import block_on
+from splink.internals.linker import Linker
+from splink.internals.predict import match_weight_upper_bound_condition_sql
+
+from .decorator import mark_with_dialects_including
+
+
+def _sorted(df_predict):
+    df = df_predict.as_pandas_dataframe()
+    return df.sort_values(["unique_id_l", "unique_id_r"]).reset_index(drop=True)
+
+
+def _comparison_vectors_row_count(linker, **predict_kwargs):
+    # In debug mode each step of the pipeline is materialised, so the number of
+    # comparison vectors computed can be counted
+    db_api = linker._db_api
+    db_api.debug_mode = True
+    try:
+        linker.inference.predict(**predict_kwargs)
+    finally:
+        db_api.debug_mode = False
+    df_comparison_vectors = [
+        df
+        for df in linker._intermediate_table_cache.executed_queries
+        if df.templated_name == "__splink__df_comparison_vectors"
+    ][-1]
+    return len(df_comparison_vectors.as_pandas_dataframe())
+
+
+def _settings(surname_term_frequency_adjustments=False):
+    return {
+        "link_type": "dedupe_only",
+        "probability_two_random_records_match": 0.01,
+        "comparisons": [
+            cl.ExactMatch("dob").configure(
+                m_probabilities=[0.9, 0.1], u_probabilities=[0.01, 0.99]
+            ),
+            cl.ExactMatch("city").configure(
+                term_frequency_adjustments=True,
+                m_probabilities=[0.8, 0.2],
+                u_probabilities=[0.2, 0.8],
+            ),
+            cl.LevenshteinAtThresholds("first_name").configure(
+                m_probabilities=[0.7, 0.1, 0.1, 0.1],
+                u_probabilities=[0.01, 0.02, 0.03, 0.94],
+            ),
+            cl.LevenshteinAtThresholds("surname").configure(
+                term_frequency_adjustments=surname_term_frequency_adjustments,
+                m_probabilities=[0.7, 0.1, 0.1, 0.1],
+                u_probabilities=[0.01, 0.02, 0.03, 0.94],
+            ),
+        ],
+        "blocking_rules_to_generate_predictions": [
+            block_on("substr(first_name, 1, 1)"),
+            block_on("substr(surname, 1, 1)"),
+        ],
+        "retain_intermediate_calculation_columns": True,
+    }
+
+
+@mark_with_dialects_including("duckdb", "sqlite", pass_dialect=True)
+def test_pruning_does_not_change_predictions(test_helpers, dialect, monkeypatch):
+    helper = test_helpers[dialect]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    linker = Linker(df, _settings(), helper.DatabaseAPI(**helper.db_api_args()))
+
+    condition = match_weight_upper_bound_condition_sql(
+        linker._settings_obj.core_model_settings, linker._sql_dialect_object, 0
+    )
+    assert condition is not None
+
+    thresholds = [
+        {"threshold_match_weight": -5},
+        {"threshold_match_weight": 0},
+        {"threshold_match_weight": 6},
+        {"threshold_match_probability": 0.99},
+    ]
+    pruned = [_sorted(linker.inference.predict(**t)) for t in thresholds]
+    pruned_chunks = _sorted(
+        linker.inference.predict(threshold_match_weight=0, num_chunks=3)
+    )
+    # Count on a separate linker, as debug mode leaves its steps in the cache
+    n_pruned = _comparison_vectors_row_count(
+        Linker(df, _settings(), helper.DatabaseAPI(**helper.db_api_args())),
+        threshold_match_weight=6,
+    )
+
+    monkeypatch.setattr(
+        inference, "match_weight_upper_bound_condition_sql", lambda *args: None
+    )
+    for t, df_pruned in zip(thresholds, pruned):
+        expected = _sorted(linker.inference.predict(**t))
+        pd.testing.assert_frame_equal(expected, df_pruned, check_exact=True)
+        if t == {"threshold_match_weight": 0}:
+            pd.testing.assert_frame_equal(expected, pruned_chunks, check_exact=True)
+
+    # Pruning skips the comparison of pairs which cannot reach the threshold
+    n_unpruned = _comparison_vectors_row_count(
+        Linker(df, _settings(), helper.DatabaseAPI(**helper.db_api_args())),
+        threshold_match_weight=6,
+    )
+    assert 0 < n_pruned < n_unpruned
+
+
+@mark_with_dialects_including("duckdb")
+def test_no_pruning_when_bound_is_unknown(test_helpers):
+    helper = test_helpers["duckdb"]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    db_api = helper.DatabaseAPI(**helper.db_api_args())
+
+    # Term frequency adjustments make the match weight of surname unbounded
+    linker = Linker(df, _settings(surname_term_frequency_adjustments=True), db_api)
+    assert (
+        match_weight_upper_bound_condition_sql(
+            linker._settings_obj.core_model_settings, linker._sql_dialect_object, 0
+        )
+        is None
+    )
+
+    # There are no expensive comparisons to avoid
+    settings = _settings()
+    settings["comparisons"] = settings["comparisons"][:2]
+    linker = Linker(df, settings, db_api)
+    assert (
+        match_weight_upper_bound_condition_sql(
+            linker._settings_obj.core_model_settings, linker._sql_dialect_object, 0
+        )
+        is None
+    )
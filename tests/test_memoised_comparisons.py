@@ -0,0 +1,80 @@
+import logging
+
+import pandas as pd
+import pytest
+
+import splink.internals.comparison_library as cl
+from splink.internals.blocking_rule_library import block_on
+from splink.internals.linker import Linker
+
+from .decorator import mark_with_dialects_including
+
+
+def _sorted(df_predict):
+    df = df_predict.as_pandas_dataframe()
+    return df.sort_values(["unique_id_l", "unique_id_r"]).reset_index(drop=True)
+
+
+def _settings():
+    return {
+        "link_type": "dedupe_only",
+        "comparisons": [
+            cl.LevenshteinAtThresholds("first_name"),
+            cl.LevenshteinAtThresholds("surname").configure(
+                term_frequency_adjustments=True
+            ),
+            cl.ExactMatch("dob"),
+            cl.DamerauLevenshteinAtThresholds("city", [1, 2]),
+        ],
+        "blocking_rules_to_generate_predictions": [
+            block_on("city"),
+            block_on("surname"),
+        ],
+        "retain_matching_columns": True,
+        "retain_intermediate_calculation_columns": True,
+    }
+
+
+@mark_with_dialects_including("duckdb", "sqlite", pass_dialect=True)
+def test_memoised_comparisons_match_predict(test_helpers, dialect, caplog):
+    helper = test_helpers[dialect]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    linker = Linker(df, _settings(), helper.DatabaseAPI(**helper.db_api_args()))
+
+    expected = _sorted(linker.inference.predict())
+
+    memoised = _sorted(
+        linker.inference.predict(memoise_comparisons=["first_name", "city"])
+    )
+    pd.testing.assert_frame_equal(expected, memoised, check_exact=True)
+
+    chunked = _sorted(
+        linker.inference.predict(memoise_comparisons=["surname"], num_chunks=3)
+    )
+    pd.testing.assert_frame_equal(expected, chunked, check_exact=True)
+
+    with caplog.at_level(logging.INFO, logger="splink"):
+        auto = _sorted(linker.inference.predict(memoise_comparisons="auto"))
+    pd.testing.assert_frame_equal(expected, auto, check_exact=True)
+    # dob uses no string similarity function, so is never memoised automatically
+    assert "Comparison city has" in caplog.text
+    assert "Comparison dob has" not in caplog.text
+
+    memoised_tables = [
+        name
+        for name in linker._db_api._intermediate_table_cache
+        if name.startswith("__splink__memoised")
+    ]
+    assert memoised_tables == []
+
+
+@mark_with_dialects_including("duckdb")
+def test_memoise_comparisons_must_name_comparisons(test_helpers):
+    helper = test_helpers["duckdb"]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    linker = Linker(df, _settings(), helper.DatabaseAPI(**helper.db_api_args()))
+
+    with pytest.raises(ValueError):
+        linker.inference.predict(memoise_comparisons=["email"])
+    with pytest.raises(ValueError):
+        linker.inference.predict(memoise_comparisons="city")
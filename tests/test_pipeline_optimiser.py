@@ -0,0 +1,121 @@
+import re
+
+import pandas as pd
+
+from splink.internals.duckdb.database_api import DuckDBAPI
+from splink.internals.linker import Linker
+from splink.internals.pipeline import CTEPipeline
+
+from .basic_settings import get_settings_dict
+
+
+def _output_table_names(sql):
+    return re.findall(r"^(\w+) as \(", sql, flags=re.MULTILINE)
+
+
+def test_unused_ctes_are_removed():
+    pipeline = CTEPipeline()
+    pipeline.enqueue_sql("select 1 as x", "a")
+    pipeline.enqueue_sql("select 2 as y", "unused")
+    pipeline.enqueue_sql("select x from a", "b")
+    pipeline.enqueue_sql("select x from b", "final")
+
+    sql = pipeline.generate_cte_pipeline_sql(optimise=True, sqlglot_dialect="duckdb")
+    assert _output_table_names(sql) == ["a", "b"]
+
+
+def test_duplicate_ctes_are_merged():
+    pipeline = CTEPipeline()
+    pipeline.enqueue_sql("select 1 as x", "a")
+    pipeline.enqueue_sql("SELECT  1 AS x", "a_again")
+    pipeline.enqueue_sql("select * from a union all select * from a_again", "final")
+
+    sql = pipeline.generate_cte_pipeline_sql(optimise=True, sqlglot_dialect="duckdb")
+    assert sql.count("1 as x") + sql.count("1 AS x") == 1
+    assert "a_again as (\nselect * from a)" in sql
+
+
+def test_pipeline_not_optimised_by_default():
+    pipeline = CTEPipeline()
+    pipeline.enqueue_sql("select 2 as y", "unused")
+    pipeline.enqueue_sql("select 1 as x", "final")
+
+    sql = pipeline.generate_cte_pipeline_sql()
+    assert _output_table_names(sql) == ["unused"]
+
+
+def test_unused_input_dataframes_are_removed():
+    db_api = DuckDBAPI()
+    db_api.set_pipeline_optimisation()
+    dfs = db_api.register_multiple_tables(
+        [pd.DataFrame({"a": [1], "b": [2]}), pd.DataFrame({"c": [3]})],
+        ["df_1", "df_2"],
+    )
+    df_1, df_2 = dfs.values()
+    df_1.templated_name = "__splink__first"
+    df_2.templated_name = "__splink__second"
+
+    pipeline = CTEPipeline([df_1, df_2])
+    pipeline.enqueue_sql("select a from __splink__first", "final")
+    out = db_api.sql_pipeline_to_splink_dataframe(pipeline)
+
+    assert "__splink__second" not in out.sql_used_to_create
+    assert out.as_record_dict() == [{"a": 1}]
+
+    # Pipelines run through a DatabaseAPI are not optimised unless enabled
+    db_api = DuckDBAPI()
+    df_1, df_2 = db_api.register_multiple_tables(
+        [pd.DataFrame({"a": [1], "b": [2]}), pd.DataFrame({"c": [3]})],
+        ["df_1", "df_2"],
+    ).values()
+    df_1.templated_name = "__splink__first"
+    df_2.templated_name = "__splink__second"
+
+    pipeline = CTEPipeline([df_1, df_2])
+    pipeline.enqueue_sql("select a from __splink__first", "final")
+    out = db_api.sql_pipeline_to_splink_dataframe(pipeline)
+
+    assert "__splink__second" in out.sql_used_to_create
+    assert out.as_record_dict() == [{"a": 1}]
+
+
+def test_prune_columns():
+    db_api = DuckDBAPI()
+    db_api.set_pipeline_optimisation(prune_columns=True)
+    df = db_api.register_table(
+        pd.DataFrame({"a": [1], "b": [2], "c": [3]}), "df_to_prune"
+    )
+    df.templated_name = "__splink__input"
+
+    pipeline = CTEPipeline([df])
+    pipeline.enqueue_sql("select a, c + 1 as d from __splink__input", "final")
+    out = db_api.sql_pipeline_to_splink_dataframe(pipeline)
+
+    assert '"b"' not in out.sql_used_to_create
+    assert out.as_record_dict() == [{"a": 1, "d": 4}]
+
+    # select * in a downstream step means no columns can be pruned
+    pipeline = CTEPipeline([df])
+    pipeline.enqueue_sql("select * from __splink__input", "final")
+    out = db_api.sql_pipeline_to_splink_dataframe(pipeline)
+    assert out.as_record_dict() == [{"a": 1, "b": 2, "c": 3}]
+
+
+def test_predictions_unchanged_by_column_pruning():
+    df = pd.read_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+    settings = get_settings_dict()
+
+    predictions = []
+    for enabled, prune_columns in [(False, False), (True, False), (True, True)]:
+        db_api = DuckDBAPI()
+        db_api.set_pipeline_optimisation(enabled, prune_columns=prune_columns)
+        linker = Linker(df, settings, db_api=db_api)
+        df_predict = linker.inference.predict().as_pandas_dataframe()
+        predictions.append(
+            df_predict.sort_values(["unique_id_l", "unique_id_r"]).reset_index(
+                drop=True
+            )
+        )
+
+    for df_predict in predictions[1:]:
+        pd.testing.assert_frame_equal(predictions[0], df_predict)
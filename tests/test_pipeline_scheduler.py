@@ -0,0 +1,146 @@
+import threading
+import time
+
+import pytest
+
+from splink.internals.duckdb.database_api import DuckDBAPI
+from splink.internals.duckdb.dataframe import DuckDBDataFrame
+from splink.internals.pipeline import CTEPipeline
+from splink.internals.pipeline_scheduler import PipelineDAG
+
+
+def _pipeline(name):
+    pipeline = CTEPipeline()
+    pipeline.enqueue_sql("select 1 as x", name)
+    return pipeline
+
+
+def _fake_execute_factory(db_api, log, sleep=0.0):
+    lock = threading.Lock()
+    state = {"running": 0, "max_running": 0}
+
+    def execute(pipeline):
+        name = pipeline.output_table_name
+        with lock:
+            state["running"] += 1
+            state["max_running"] = max(state["max_running"], state["running"])
+        log.append(("start", name))
+        time.sleep(sleep)
+        log.append(("end", name))
+        with lock:
+            state["running"] -= 1
+        return DuckDBDataFrame(name, name, db_api)
+
+    return execute, state
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 4])
+def test_dag_respects_dependencies(max_concurrency):
+    db_api = DuckDBAPI()
+    dag = PipelineDAG()
+    dag.add_pipeline("a", _pipeline("a"))
+    dag.add_pipeline("b", _pipeline("b"))
+
+    def make_c(deps):
+        assert set(deps.keys()) == {"a", "b"}
+        pipeline = CTEPipeline(list(deps.values()))
+        pipeline.enqueue_sql("select 1 as x", "c")
+        return pipeline
+
+    dag.add_pipeline("c", make_c, depends_on=["a", "b"])
+
+    log = []
+    execute, _ = _fake_execute_factory(db_api, log, sleep=0.01)
+    results = dag.execute(execute, max_concurrency=max_concurrency)
+
+    assert set(results.keys()) == {"a", "b", "c"}
+    assert log.index(("start", "c")) > log.index(("end", "a"))
+    assert log.index(("start", "c")) > log.index(("end", "b"))
+
+
+def test_dag_runs_independent_pipelines_concurrently():
+    db_api = DuckDBAPI()
+    dag = PipelineDAG()
+    for name in ["a", "b", "c", "d", "e"]:
+        dag.add_pipeline(name, _pipeline(name))
+
+    execute, state = _fake_execute_factory(db_api, [], sleep=0.05)
+    dag.execute(execute, max_concurrency=2)
+    assert state["max_running"] == 2
+
+    execute, state = _fake_execute_factory(db_api, [], sleep=0.01)
+    dag.execute(execute, max_concurrency=1)
+    assert state["max_running"] == 1
+
+
+def test_dag_validation():
+    dag = PipelineDAG()
+    dag.add_pipeline("a", _pipeline("a"), depends_on=["missing"])
+    with pytest.raises(ValueError, match="unknown"):
+        dag.execute(lambda p: None)
+
+    dag = PipelineDAG()
+    dag.add_pipeline("a", lambda deps: _pipeline("a"), depends_on=["b"])
+    dag.add_pipeline("b", lambda deps: _pipeline("b"), depends_on=["a"])
+    with pytest.raises(ValueError, match="cycle"):
+        dag.execute(lambda p: None)
+
+    with pytest.raises(ValueError, match="already"):
+        dag.add_pipeline("a", _pipeline("a"))
+
+
+def test_dag_propagates_errors():
+    dag = PipelineDAG()
+    dag.add_pipeline("a", _pipeline("a"))
+    dag.add_pipeline("b", _pipeline("b"))
+
+    def execute(pipeline):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        dag.execute(execute, max_concurrency=2)
+
+
+def test_db_api_executes_dag_serially_where_unsupported():
+    db_api = DuckDBAPI()
+    db_api.set_max_concurrency(4)
+    assert db_api._effective_max_concurrency == 1
+
+    dag = PipelineDAG()
+    dag.add_pipeline("a", _pipeline("__splink__a"))
+    dag.add_pipeline(
+        "b",
+        lambda deps: _join_pipeline(deps["a"]),
+        depends_on=["a"],
+    )
+    results = db_api.sql_pipeline_dag_to_splink_dataframes(dag)
+    assert results["b"].as_record_dict() == [{"x": 2}]
+
+    with pytest.raises(ValueError):
+        db_api.set_max_concurrency(0)
+
+
+def _join_pipeline(df_a):
+    pipeline = CTEPipeline([df_a])
+    pipeline.enqueue_sql("select x + 1 as x from __splink__a", "__splink__b")
+    return pipeline
+
+
+def test_dag_drops_transient_outputs():
+    db_api = DuckDBAPI()
+    dag = PipelineDAG()
+    dag.add_pipeline("a", _pipeline("__splink__a"), transient=True)
+    dag.add_pipeline("b", lambda deps: _join_pipeline(deps["a"]), depends_on=["a"])
+    dag.add_pipeline("c", _pipeline("__splink__c"), transient=True)
+    dag.add_pipeline("d", _pipeline("__splink__d"), depends_on=["b"])
+
+    # Each pipeline runs as soon as possible after those it depends on
+    assert dag.topological_order() == ["a", "b", "c", "d"]
+
+    results = db_api.sql_pipeline_dag_to_splink_dataframes(dag)
+    assert set(results.keys()) == {"b", "d"}
+    assert results["b"].as_record_dict() == [{"x": 2}]
+    assert not any(
+        name.startswith(("__splink__a", "__splink__c"))
+        for name in db_api._intermediate_table_cache
+    )
@@ -0,0 +1,54 @@
+import pytest
+
+from splink.internals.exceptions import SplinkException
+from splink.internals.linker import Linker
+
+from .basic_settings import get_settings_dict
+from .decorator import mark_with_dialects_excluding
+
+
+@mark_with_dialects_excluding()
+def test_query_profile_records_each_pipeline(dialect, test_helpers):
+    helper = test_helpers[dialect]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+
+    db_api = helper.DatabaseAPI(**helper.db_api_args())
+    db_api.enable_query_profiling()
+    linker = Linker(df, get_settings_dict(), db_api)
+
+    df_predict = linker.inference.predict()
+    profile = linker.misc.query_profile()
+
+    assert list(profile["query_number"]) == list(range(1, len(profile) + 1))
+    assert "__splink__df_concat_with_tf" in set(profile["templated_name"])
+
+    predict_row = profile[profile["physical_name"] == df_predict.physical_name]
+    assert len(predict_row) == 1
+    assert predict_row["row_count"].iloc[0] == len(df_predict.as_record_dict())
+    assert (profile["wall_time_seconds"] >= 0).all()
+    # metadata queries used by the profiler are not themselves profiled
+    assert not profile["templated_name"].str.startswith("__splink__table_").any()
+    assert profile["query_plan"].isna().all()
+
+
+@mark_with_dialects_excluding("spark", "postgres")
+def test_query_profile_explain_analyze(dialect, test_helpers):
+    helper = test_helpers[dialect]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+
+    db_api = helper.DatabaseAPI(**helper.db_api_args())
+    db_api.enable_query_profiling(explain_analyze=True)
+    linker = Linker(df, get_settings_dict(), db_api)
+    linker.inference.predict()
+
+    profile = linker.misc.query_profile()
+    assert profile["query_plan"].notna().all()
+    assert (profile["query_plan"].str.len() > 0).all()
+
+
+def test_query_profile_requires_profiling_enabled():
+    from splink.internals.duckdb.database_api import DuckDBAPI
+
+    db_api = DuckDBAPI()
+    with pytest.raises(SplinkException):
+        db_api.query_profile_as_pandas_dataframe()
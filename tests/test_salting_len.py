@@ -1,10 +1,15 @@
+import pandas as pd
 import pytest
 
+from splink.internals.blocking import _sql_gen_where_condition
+from splink.internals.blocking_analysis import materialise_heavy_block_keys_tables
 from splink.internals.blocking_rule_library import block_on
 from splink.internals.linker import Linker
+from splink.internals.pipeline import CTEPipeline
+from splink.internals.vertically_concatenate import compute_df_concat
 from tests.basic_settings import get_settings_dict
 
-from .decorator import mark_with_dialects_including
+from .decorator import mark_with_dialects_excluding, mark_with_dialects_including
 
 
 def check_same_ids(df1, df2, unique_id_col="unique_id"):
@@ -83,3 +88,100 @@ def test_salting_spark(spark, spark_api):
 
     check_same_ids(df1, df2)
     check_answer(df1, df2)
+
+
+# SQLite's random() is not in [0, 1), so salting does not work there
+@mark_with_dialects_excluding("sqlite")
+def test_adaptive_salting(test_helpers, dialect):
+    helper = test_helpers[dialect]
+    df = helper.load_frame_from_csv("./tests/datasets/fake_1000_from_splink_demos.csv")
+
+    blocking_rules_no_salt = [
+        "l.surname = r.surname",
+        "l.first_name = r.first_name",
+    ]
+    blocking_rules_adaptive = [
+        block_on("surname", salting_partitions=3, salting_min_block_size=100),
+        {
+            "blocking_rule": "l.first_name = r.first_name",
+            "salting_partitions": 4,
+            "salting_min_block_size": 100,
+        },
+    ]
+
+    db_api = helper.DatabaseAPI(**helper.db_api_args())
+    df1 = generate_linker_output(df, db_api, blocking_rules=blocking_rules_no_salt)
+
+    settings = get_settings_dict()
+    settings["blocking_rules_to_generate_predictions"] = blocking_rules_adaptive
+    db_api = helper.DatabaseAPI(**helper.db_api_args())
+    linker = Linker(df, settings, db_api)
+
+    brs = linker._settings_obj._blocking_rules_to_generate_predictions
+    assert [br.salting_min_block_size for br in brs] == [100, 100]
+    assert linker._settings_obj.as_dict()["blocking_rules_to_generate_predictions"][0][
+        "salting_min_block_size"
+    ] == (100)
+
+    df2 = linker.inference.predict().as_pandas_dataframe()
+    df2 = df2.sort_values(by=["unique_id_l", "unique_id_r"], ignore_index=True)
+
+    check_same_ids(df1, df2)
+    check_answer(df1, df2)
+    # The heavy block key tables are dropped after predicting
+    assert all(br.heavy_block_keys_table is None for br in brs)
+
+    # Only surnames whose block generates more than 100 comparisons are heavy
+    assert (
+        materialise_heavy_block_keys_tables(
+            blocking_rules=brs,
+            link_type="dedupe_only",
+            db_api=db_api,
+            splink_df_dict=linker._input_tables_dict,
+        )
+        == brs
+    )
+    surname_counts = pd.read_csv("./tests/datasets/fake_1000_from_splink_demos.csv")[
+        "surname"
+    ].value_counts()
+    heavy_surnames = set(surname_counts[surname_counts**2 > 100].index)
+    br = brs[0]
+    heavy_keys = br.heavy_block_keys_table.as_pandas_dataframe()["key_0"]
+    assert len(heavy_surnames) > 0
+    assert set(heavy_keys) == heavy_surnames
+    assert len(brs[1].heavy_block_keys_table.as_pandas_dataframe()) > 0
+
+    # The first join generates the pairs in light blocks without salting, and the
+    # salted joins which follow only generate pairs in heavy blocks
+    input_df = compute_df_concat(linker, CTEPipeline())
+    uid = linker._settings_obj.column_info_settings.unique_id_input_column
+    blocked_pairs_sqls = br.create_blocked_pairs_sql(
+        source_dataset_input_column=None,
+        unique_id_input_column=uid,
+        input_tablename_l=input_df.physical_name,
+        input_tablename_r=input_df.physical_name,
+        where_condition=_sql_gen_where_condition("dedupe_only", [uid]),
+        exclude_preceding_rules=False,
+    ).split(" UNION ALL ")
+    assert len(blocked_pairs_sqls) == 1 + 3
+
+    surnames_blocked = []
+    for blocked_pairs_sql in blocked_pairs_sqls:
+        pipeline = CTEPipeline()
+        pipeline.enqueue_sql(
+            f"""
+            select distinct i.surname
+            from ({blocked_pairs_sql}) as pairs
+            inner join {input_df.physical_name} as i
+            on pairs.join_key_l = i.{uid.name}
+            """,
+            "__splink__test_blocked_surnames",
+        )
+        df_surnames = db_api.sql_pipeline_to_splink_dataframe(pipeline)
+        surnames_blocked.append(set(df_surnames.as_pandas_dataframe()["surname"]))
+
+    light_surnames, *salted_surnames = surnames_blocked
+    assert light_surnames and not light_surnames & heavy_surnames
+    assert set.union(*salted_surnames) == heavy_surnames
+    for b in brs:
+        b.drop_heavy_block_keys_dataframe()
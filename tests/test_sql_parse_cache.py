@@ -0,0 +1,79 @@
+import pytest
+import sqlglot
+
+from splink.internals.blocking import BlockingRule
+from splink.internals.sql_parse_cache import (
+    SQLParseCache,
+    clear_parse_cache,
+    parse_cache_info,
+)
+
+
+def test_parse_cache_hits_and_misses():
+    cache = SQLParseCache()
+    cache.parse_one("l.first_name = r.first_name", read="duckdb")
+    cache.parse_one("l.first_name = r.first_name", read="duckdb")
+    cache.parse_one("l.first_name = r.first_name", read="spark")
+
+    info = cache.info()
+    assert info.hits == 1
+    assert info.misses == 2
+    assert info.currsize == 2
+
+
+def test_parse_cache_returns_copies():
+    cache = SQLParseCache()
+    tree = cache.parse_one("l.first_name = r.first_name")
+    for c in tree.find_all(sqlglot.exp.Column):
+        del c.args["table"]
+
+    assert cache.parse_one("l.first_name = r.first_name").sql() == (
+        "l.first_name = r.first_name"
+    )
+
+
+def test_parse_cache_is_bounded():
+    cache = SQLParseCache(maxsize=2)
+    cache.parse_one("a = 1")
+    cache.parse_one("b = 1")
+    cache.parse_one("a = 1")
+    cache.parse_one("c = 1")
+
+    assert cache.info().currsize == 2
+    # b was least recently used, so was evicted
+    cache.parse_one("b = 1")
+    assert cache.info().misses == 4
+
+
+def test_parse_errors_are_not_cached():
+    cache = SQLParseCache()
+    for _ in range(2):
+        with pytest.raises(sqlglot.ParseError):
+            cache.parse_one("select (")
+    assert cache.info().currsize == 0
+
+
+def test_transpile():
+    cache = SQLParseCache()
+    sql = "levenshtein(l.name, r.name)"
+    assert cache.transpile(sql, write="duckdb") == cache.transpile(sql, write="duckdb")
+    assert cache.info().hits == 1
+
+
+def test_blocking_rule_properties_use_parse_cache():
+    clear_parse_cache()
+    br = BlockingRule(
+        "l.first_name = r.first_name and substr(l.dob, 1, 4) = substr(r.dob, 1, 4) "
+        "and l.city != r.city",
+        sqlglot_dialect="duckdb",
+    )
+    first_result = br._equi_join_conditions
+    misses = parse_cache_info().misses
+
+    assert br._equi_join_conditions == first_result
+    assert first_result == [
+        ("first_name", "first_name"),
+        ("SUBSTR(dob, 1, 4)", "SUBSTR(dob, 1, 4)"),
+    ]
+    assert br._filter_conditions == "l.city <> r.city"
+    assert parse_cache_info().misses == misses